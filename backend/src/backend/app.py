@@ -1,11 +1,132 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+import math
+import os
+from contextlib import asynccontextmanager, suppress
 
+from backend.caching.second_level import get_second_level_cache
 from backend.controllers.region_info_controller import router as country_router
 from backend.controllers.weather_info_controller import router as weather_router
-from backend.database.connection import init_database, close_database
+from backend.controllers.ingestion_controller import router as ingestion_router
+from backend.database.connection import close_database, db_config, prepared_statements, replica_router
+from backend.database.notifications import RESYNC, ChangeListener, TableChange
+from backend.di.container import compile_providers, get_repository_backend
+from backend.indexes.region_catalog import get_region_catalog
+from backend.interpolation.idw import get_weather_interpolator
+from backend.ingestion.pipeline import IngestionPipeline, set_ingestion_pipeline
+from backend.ingestion.sources import DirectoryWatcherSource, HttpFeedSource
+from backend.resilience.admission import AdmissionController, AdmissionMiddleware
+from backend.resilience.circuit_breaker import DatabaseUnavailableError
+from backend.resilience.coalescing import get_request_coalescer
+from backend.resilience.rate_limit import RateLimiter
+from backend.repositories.backends import POSTGRESQL
+from backend.repositories.implementations.second_level_cached_weather_repository import (
+    CURRENT_WEATHER, FORECASTS, current_weather_keys, forecast_keys
+)
+from backend.streaming.weather_hub import get_weather_hub
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def region_repository_scope():
+    """Fournit un repository des régions (sans cache) sur une session dédiée (hors requête HTTP)"""
+    backend = get_repository_backend()
+    async with backend.session_factory() as session:
+        yield backend.region_repository(session)
+
+
+@asynccontextmanager
+async def weather_repository_scope():
+    """Fournit un repository météo sur une session dédiée (hors requête HTTP)"""
+    backend = get_repository_backend()
+    async with backend.session_factory() as session:
+        yield backend.weather_repository(session)
+
+
+def build_ingestion_pipeline():
+    """
+    Construit le pipeline d'ingestion selon l'environnement :
+    INGESTION_SOURCE_DIR (dossier surveillé) ou INGESTION_FEED_URL (flux HTTP local).
+    
+    Returns:
+        IngestionPipeline, ou None si aucune source n'est configurée
+    """
+    source_directory = os.getenv("INGESTION_SOURCE_DIR")
+    feed_url = os.getenv("INGESTION_FEED_URL")
+    if source_directory:
+        source = DirectoryWatcherSource(source_directory)
+    elif feed_url:
+        source = HttpFeedSource(feed_url, cursor_path=os.getenv("INGESTION_FEED_CURSOR_FILE"))
+    else:
+        return None
+    return IngestionPipeline(
+        source,
+        weather_repository_scope,
+        queue_size=int(os.getenv("INGESTION_QUEUE_SIZE", "10000")),
+        batch_size=int(os.getenv("INGESTION_BATCH_SIZE", "500")),
+        batch_timeout=float(os.getenv("INGESTION_BATCH_TIMEOUT_SECONDS", "1.0")),
+        retry_base_seconds=float(os.getenv("INGESTION_RETRY_BASE_SECONDS", "0.5")),
+        retry_max_seconds=float(os.getenv("INGESTION_RETRY_MAX_SECONDS", "30")),
+        max_attempts=int(os.getenv("INGESTION_MAX_ATTEMPTS", "5")),
+        dead_letter_path=os.getenv("INGESTION_DEAD_LETTER_FILE") or None
+    )
+
+
+def build_change_listener():
+    """
+    Construit l'écoute des notifications de modification (PostgreSQL uniquement,
+    désactivable par CACHE_INVALIDATION_LISTEN=false) et y branche les caches du worker.
+    
+    Returns:
+        ChangeListener, ou None si l'écoute est désactivée
+    """
+    if get_repository_backend().name != POSTGRESQL:
+        return None
+    if os.getenv("CACHE_INVALIDATION_LISTEN", "true").lower() != "true":
+        return None
+    listener = ChangeListener.from_database_url(db_config.get_database_url())
+    region_catalog = get_region_catalog()
+    interpolator = get_weather_interpolator()
+    weather_hub = get_weather_hub()
+    second_level_cache = get_second_level_cache()
+    
+    def on_regions_change(change: TableChange):
+        # La liste des régions du cache de second niveau est indexée par l'empreinte de la table
+        region_catalog.request_refresh()
+    
+    def on_weather_data_change(change: TableChange):
+        interpolator.expire()
+        if change.operation == RESYNC:
+            # Des écritures ont pu être manquées : aucune entrée du namespace n'est sûre
+            if second_level_cache is not None:
+                second_level_cache.invalidate_namespace_soon(CURRENT_WEATHER)
+            return
+        if second_level_cache is not None:
+            second_level_cache.invalidate_soon(CURRENT_WEATHER, current_weather_keys(change.keys))
+        # Les mesures écrites par n'importe quel worker sont diffusées aux flux de celui-ci
+        for reading in change.rows:
+            if not reading.get("is_forecast"):
+                weather_hub.publish(reading)
+    
+    def on_weather_forecasts_change(change: TableChange):
+        if second_level_cache is None:
+            return
+        if change.operation == RESYNC:
+            second_level_cache.invalidate_namespace_soon(FORECASTS)
+        else:
+            second_level_cache.invalidate_soon(FORECASTS, forecast_keys(change.keys))
+    
+    listener.register("regions", on_regions_change)
+    listener.register("weather_data", on_weather_data_change)
+    listener.register("weather_forecasts", on_weather_forecasts_change)
+    # Tant que l'écoute est connectée, la base diffuse aussi les mesures écrites par ce worker
+    weather_hub.attach_shared_feed(lambda: listener.connected)
+    return listener
 
 
 @asynccontextmanager
@@ -13,7 +134,64 @@ async def lifespan(app: FastAPI):
     """
     Gestionnaire du cycle de vie de l'application.
     Initialise la base de données au démarrage et la ferme à l'arrêt.
+    Précharge aussi le catalogue des régions et surveille ses modifications,
+    y compris celles notifiées par la base (autres workers).
     """
+    # Graphe de dépendances résolu une fois : les requêtes n'appellent plus que des fabriques
+    compile_providers()
+    repository_backend = get_repository_backend()
+    await repository_backend.initialize()
+    
+    region_catalog = get_region_catalog()
+    try:
+        async with region_repository_scope() as repository:
+            await region_catalog.refresh(repository)
+    except Exception as e:
+        logger.warning(f"Préchargement du catalogue des régions impossible: {e}")
+    
+    # Santé des réplicas en lecture (vérifiée avant la première requête)
+    replica_watcher = None
+    if replica_router.replicas:
+        await replica_router.check_health()
+        replica_watcher = asyncio.create_task(replica_router.watch(db_config.replica_health_interval))
+    
+    catalog_watcher = asyncio.create_task(region_catalog.watch(
+        region_repository_scope,
+        interval=float(os.getenv("REGION_CATALOG_REFRESH_SECONDS", "30"))
+    ))
+    
+    # Invalidation des caches par les modifications faites sur les autres workers
+    global change_listener
+    change_listener = build_change_listener()
+    listener_task = asyncio.create_task(change_listener.run()) if change_listener is not None else None
+    
+    ingestion_pipeline = build_ingestion_pipeline()
+    if ingestion_pipeline is not None:
+        await ingestion_pipeline.start()
+        set_ingestion_pipeline(ingestion_pipeline)
+    
+    yield
+    
+    if ingestion_pipeline is not None:
+        await ingestion_pipeline.stop()
+        set_ingestion_pipeline(None)
+    if listener_task is not None:
+        listener_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener_task
+    catalog_watcher.cancel()
+    with suppress(asyncio.CancelledError):
+        await catalog_watcher
+    if replica_watcher is not None:
+        replica_watcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await replica_watcher
+    if rate_limiter is not None:
+        await rate_limiter.store.close()
+    if get_second_level_cache() is not None:
+        await get_second_level_cache().close()
+    await repository_backend.close()
+    await close_database()
 
 app = FastAPI(
     title="Weather & Region Info API",
@@ -22,6 +200,20 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Écoute des notifications de modification (créée au démarrage)
+change_listener = None
+
+# Contrôle d'admission et limitation de débit par client (à l'intérieur du CORS,
+# pour que les 429 / 503 restent lisibles par le frontend)
+admission_controller = AdmissionController.from_env()
+rate_limiter = RateLimiter.from_env()
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=admission_controller,
+    rate_limiter=rate_limiter,
+    client_header=os.getenv("RATE_LIMIT_CLIENT_HEADER")
+)
+
 # Configuration CORS
 app.add_middleware(
     CORSMiddleware,
@@ -29,11 +221,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
+@app.exception_handler(DatabaseUnavailableError)
+async def database_unavailable_handler(request: Request, exc: DatabaseUnavailableError):
+    """Base en panne sans dernière valeur connue : 503 immédiat plutôt qu'une réponse inventée"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))}
+    )
+
 # Inclusion des routers
 app.include_router(country_router, prefix="/api/v1", tags=["regions"])
 app.include_router(weather_router, prefix="/api/v1", tags=["weather"])
+app.include_router(ingestion_router, prefix="/api/v1", tags=["ingestion"])
 
 @app.get("/")
 async def root():
@@ -52,6 +255,42 @@ async def health_check():
         "message": "API is running properly"
     }
 
+@app.get("/api/v1/admission/metrics", tags=["admission"])
+async def get_admission_metrics():
+    """Occupation du contrôle d'admission et requêtes limitées par client"""
+    return {
+        **admission_controller.metrics(),
+        "rate_limited": rate_limiter.limited if rate_limiter is not None else 0
+    }
+
+@app.get("/api/v1/coalescing/metrics", tags=["admission"])
+async def get_coalescing_metrics():
+    """Lectures identiques concurrentes regroupées sur une seule exécution, par opération"""
+    coalescer = get_request_coalescer()
+    if coalescer is None:
+        return {"enabled": False}
+    return {"enabled": True, **coalescer.metrics()}
+
+@app.get("/api/v1/cache/invalidation/metrics", tags=["cache"])
+async def get_cache_invalidation_metrics():
+    """État de l'écoute des notifications de modification et latence observée"""
+    if change_listener is None:
+        return {"enabled": False}
+    return {"enabled": True, **change_listener.metrics()}
+
+@app.get("/api/v1/cache/second-level/metrics", tags=["cache"])
+async def get_second_level_cache_metrics():
+    """Succès, absences et erreurs du cache de second niveau"""
+    cache = get_second_level_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.metrics()}
+
+@app.get("/api/v1/database/statements/metrics", tags=["database"])
+async def get_prepared_statement_metrics():
+    """Réutilisation des instructions préparées par les connexions asyncpg du pool"""
+    return prepared_statements.metrics()
+
 def startup():
     """Fonction de démarrage de l'application"""
     uvicorn.run(
@@ -0,0 +1,170 @@
+"""
+Archivage des mois clos de weather_data vers l'archive Parquet (voir `weather_archive.py`).
+
+weather_data n'est pas partitionnée : un « mois clos » est la plage de recorded_at d'un mois
+civil terminé depuis plus de WEATHER_ARCHIVE_HOT_MONTHS mois pleins. Chaque mois est archivé
+dans sa propre transaction PostgreSQL, en lecture répétable :
+
+1. les mesures du mois (hors prévisions) sont lues en flux, triées par (region_name,
+   recorded_at), et écrites par groupes de lignes dans un fichier temporaire ;
+2. elles sont supprimées de la table (la suppression ne touche que les lignes lues : celles
+   insérées entre-temps restent pour le prochain passage) ;
+3. le fichier remplace atomiquement celui du mois, puis la transaction est validée.
+
+Si la validation échoue après le remplacement du fichier, les lignes sont à la fois en base
+et dans le fichier : les lectures ne voient que le fichier (la base n'est lue qu'à partir de
+la limite de l'archive) et le passage suivant les fusionne par id. Une mesure tardive d'un mois
+déjà archivé est de même fusionnée dans son fichier au passage suivant.
+
+À lancer périodiquement (cron), un seul processus à la fois :
+    python -m backend.archive.archiver
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import Float, and_, bindparam, cast, delete, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.archive.weather_archive import WeatherArchive, add_months, as_utc, get_weather_archive, month_start
+from backend.database.connection import AsyncSessionLocal, close_database
+from backend.database.models import WeatherData
+
+logger = logging.getLogger(__name__)
+
+# Mesures d'un mois dans l'ordre des fichiers, numériques convertis en float8 par la base
+MONTH_ROWS = (select(
+                  WeatherData.id,
+                  WeatherData.region_name,
+                  cast(WeatherData.temperature, Float).label("temperature"),
+                  WeatherData.condition,
+                  WeatherData.humidity,
+                  cast(WeatherData.pressure, Float).label("pressure"),
+                  cast(WeatherData.wind_speed, Float).label("wind_speed"),
+                  WeatherData.wind_direction,
+                  WeatherData.recorded_at
+              )
+              .where(and_(
+                  WeatherData.recorded_at >= bindparam("start"),
+                  WeatherData.recorded_at < bindparam("end"),
+                  WeatherData.is_forecast == False
+              ))
+              .order_by(WeatherData.region_name, WeatherData.recorded_at))
+
+MONTH_DELETE = (delete(WeatherData)
+                .where(and_(
+                    WeatherData.recorded_at >= bindparam("start"),
+                    WeatherData.recorded_at < bindparam("end"),
+                    WeatherData.is_forecast == False
+                )))
+
+OLDEST_BEFORE = (select(func.min(WeatherData.recorded_at))
+                 .where(and_(WeatherData.recorded_at < bindparam("cutoff"), WeatherData.is_forecast == False)))
+
+
+class WeatherArchiver:
+    """
+    Déplace les mesures des mois clos de weather_data vers l'archive Parquet.
+    """
+
+    def __init__(self, archive: WeatherArchive, session_factory: async_sessionmaker):
+        """
+        Args:
+            archive: Archive de destination
+            session_factory: Fabrique de sessions PostgreSQL
+        """
+        self.archive = archive
+        self.session_factory = session_factory
+
+    async def archive_closed_months(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Archive chaque mois clos encore présent en base, du plus ancien au plus récent
+
+        Args:
+            now: Instant de référence (par défaut : maintenant)
+
+        Returns:
+            Nombre de mesures archivées par mois (`AAAA-MM`)
+        """
+        cutoff = self.archive.cutoff(now)
+        async with self.session_factory() as session:
+            oldest = (await session.execute(OLDEST_BEFORE, {"cutoff": cutoff})).scalar()
+        archived = {}
+        if oldest is None:
+            logger.info(f"Aucune mesure antérieure au {cutoff:%Y-%m-%d} à archiver")
+            return archived
+        month = month_start(oldest)
+        while month < cutoff:
+            archived[f"{month:%Y-%m}"] = await self.archive_month(month)
+            month = add_months(month, 1)
+        return archived
+
+    async def archive_month(self, month: datetime) -> int:
+        """
+        Archive les mesures d'un mois (fusionnées avec son fichier s'il existe déjà)
+
+        Args:
+            month: Premier instant du mois
+
+        Returns:
+            Nombre de mesures retirées de la base
+        """
+        bounds = {"start": month, "end": add_months(month, 1)}
+        existing = self.archive.read_month(month)
+        temporary = self.archive.temporary_path(month)
+        moved = 0
+        try:
+            async with self.session_factory() as session:
+                # Lecture et suppression sur le même instantané
+                await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+                result = await session.stream(
+                    MONTH_ROWS, bounds, execution_options={"yield_per": self.archive.row_group_size}
+                )
+                pending: List = []
+                with self.archive.writer(temporary) as writer:
+                    async for partition in result.partitions():
+                        batch = self.archive.batch(partition)
+                        moved += batch.num_rows
+                        if existing is None:
+                            writer.write_batch(batch, row_group_size=self.archive.row_group_size)
+                        else:
+                            pending.append(batch)
+                    if existing is not None and moved:
+                        writer.write_table(self.archive.merge(existing, pending),
+                                           row_group_size=self.archive.row_group_size)
+                if not moved:
+                    await session.rollback()
+                    return 0
+                await session.execute(MONTH_DELETE, bounds)
+                self.archive.publish(temporary, month)
+                await session.commit()
+        finally:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+        logger.info(f"📦 {moved} mesures de {month:%Y-%m} archivées dans {self.archive.path(month)}")
+        return moved
+
+
+async def main(now: Optional[datetime] = None):
+    """Archive les mois clos de la base configurée par les variables DB_*"""
+    archive = get_weather_archive()
+    if archive is None:
+        raise SystemExit("Archive désactivée : définir WEATHER_ARCHIVE_DIR (et installer pyarrow)")
+    try:
+        archived = await WeatherArchiver(archive, AsyncSessionLocal).archive_closed_months(now)
+    finally:
+        await close_database()
+    for month, count in archived.items():
+        print(f"{month}: {count} mesures archivées")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--now", type=datetime.fromisoformat, default=None,
+                        help="Instant de référence ISO 8601 (par défaut : maintenant)")
+    arguments = parser.parse_args()
+    asyncio.run(main(as_utc(arguments.now)))
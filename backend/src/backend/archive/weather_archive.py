@@ -0,0 +1,250 @@
+"""
+Archive Parquet de l'historique météo ancien.
+
+Les mesures des mois clos (au-delà de WEATHER_ARCHIVE_HOT_MONTHS mois pleins) quittent
+weather_data pour un fichier Parquet par mois (`AAAA-MM.parquet`, voir `archive/archiver.py`) :
+colonnes compressées (zstd), lignes triées par région puis date, en groupes de lignes dont les
+statistiques min/max permettent de ne lire que les groupes de la région et de la période
+demandées. Les lectures ouvrent les fichiers en mémoire projetée (`memory_map`).
+
+La limite de l'archive est le premier jour du mois qui suit le dernier mois archivé : avant
+elle, l'historique est lu dans les fichiers ; à partir d'elle, dans la base (voir
+`ArchivedWeatherRepository`).
+
+pyarrow est facultatif (extra `archive` : `poetry install --extras archive`) : sans lui,
+l'archive est désactivée.
+"""
+
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+# Colonnes des fichiers : celles de weather_data (hors indicateurs de prévision), id compris
+ARCHIVE_COLUMNS = (
+    "id", "region_name", "temperature", "condition", "humidity", "pressure", "wind_speed", "wind_direction",
+    "recorded_at"
+)
+ARCHIVE_KINDS = "isfsiffst"
+
+_FILE_NAME = re.compile(r"^(\d{4})-(\d{2})\.parquet$")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def month_start(moment: datetime) -> datetime:
+    """Premier instant (UTC) du mois de `moment`"""
+    moment = as_utc(moment)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    """Premier instant du mois situé `count` mois après (ou avant) `month`"""
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def as_utc(value: Any) -> Optional[datetime]:
+    """Horodatage en datetime UTC (sans fuseau ou chaîne ISO : UTC)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def column_values(column: "pyarrow.ChunkedArray") -> List[Any]:
+    """
+    Valeurs Python d'une colonne lue dans l'archive. Les horodatages sont reconstruits depuis
+    les microsecondes : `to_pylist()` attache un fuseau ZoneInfo à chaque valeur (8 fois plus lent).
+    """
+    if pyarrow.types.is_timestamp(column.type):
+        return [None if value is None else _EPOCH + timedelta(microseconds=value)
+                for value in column.cast(pyarrow.int64()).to_pylist()]
+    return column.to_pylist()
+
+
+class WeatherArchive:
+    """
+    Dossier des fichiers Parquet mensuels de weather_data : écriture atomique d'un mois,
+    lecture d'une région sur une période avec filtrage au niveau des groupes de lignes.
+    """
+
+    def __init__(self, directory: str, hot_months: int = 2, row_group_size: int = 16384,
+                 compression: str = "zstd"):
+        """
+        Args:
+            directory: Dossier des fichiers (créé au besoin)
+            hot_months: Mois pleins gardés en base en plus du mois en cours
+            row_group_size: Lignes par groupe (granularité du filtrage à la lecture)
+            compression: Codec Parquet des colonnes
+        """
+        self.directory = directory
+        self.hot_months = hot_months
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.schema = pyarrow.schema([
+            ("id", pyarrow.int64()),
+            ("region_name", pyarrow.string()),
+            ("temperature", pyarrow.float64()),
+            ("condition", pyarrow.string()),
+            ("humidity", pyarrow.int64()),
+            ("pressure", pyarrow.float64()),
+            ("wind_speed", pyarrow.float64()),
+            ("wind_direction", pyarrow.string()),
+            ("recorded_at", pyarrow.timestamp("us", tz="UTC")),
+        ])
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["WeatherArchive"]:
+        """
+        Construit l'archive à partir de WEATHER_ARCHIVE_DIR (non définie : archive désactivée),
+        WEATHER_ARCHIVE_HOT_MONTHS, WEATHER_ARCHIVE_ROW_GROUP_SIZE et WEATHER_ARCHIVE_COMPRESSION.
+
+        Returns:
+            WeatherArchive, ou None si l'archive est désactivée
+        """
+        directory = os.getenv("WEATHER_ARCHIVE_DIR")
+        if not directory:
+            return None
+        if pyarrow is None:
+            logger.warning("⚠️ WEATHER_ARCHIVE_DIR est défini mais pyarrow n'est pas installé "
+                           "(extra archive) : archive désactivée")
+            return None
+        return cls(
+            directory,
+            hot_months=int(os.getenv("WEATHER_ARCHIVE_HOT_MONTHS", "2")),
+            row_group_size=int(os.getenv("WEATHER_ARCHIVE_ROW_GROUP_SIZE", "16384")),
+            compression=os.getenv("WEATHER_ARCHIVE_COMPRESSION", "zstd")
+        )
+
+    def path(self, month: datetime) -> str:
+        """Chemin du fichier d'un mois"""
+        return os.path.join(self.directory, f"{month.year:04d}-{month.month:02d}.parquet")
+
+    def months(self) -> List[datetime]:
+        """Mois archivés, du plus ancien au plus récent"""
+        months = []
+        for name in os.listdir(self.directory):
+            match = _FILE_NAME.match(name)
+            if match:
+                months.append(datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc))
+        return sorted(months)
+
+    def boundary(self) -> Optional[datetime]:
+        """Premier instant non archivé (lendemain du dernier mois archivé), None si l'archive est vide"""
+        months = self.months()
+        return add_months(months[-1], 1) if months else None
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Premier instant gardé en base : les mois qui finissent avant sont clos et archivables"""
+        return add_months(month_start(now or datetime.now(timezone.utc)), -self.hot_months)
+
+    def writer(self, path: str) -> "pyarrow.parquet.ParquetWriter":
+        """Écrivain Parquet au format de l'archive (statistiques par groupe de lignes)"""
+        return pyarrow.parquet.ParquetWriter(
+            path, self.schema, compression=self.compression, write_statistics=True
+        )
+
+    def batch(self, rows: List[tuple]) -> "pyarrow.RecordBatch":
+        """Lot Arrow à partir de lignes dans l'ordre de ARCHIVE_COLUMNS"""
+        return pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array([as_utc(row[position]) for row in rows] if kind == "t"
+                           else [row[position] for row in rows], type=field.type)
+             for position, (kind, field) in enumerate(zip(ARCHIVE_KINDS, self.schema))],
+            schema=self.schema
+        )
+
+    def read_month(self, month: datetime) -> Optional["pyarrow.Table"]:
+        """Contenu complet du fichier d'un mois, None s'il n'existe pas"""
+        path = self.path(month)
+        if not os.path.exists(path):
+            return None
+        return pyarrow.parquet.read_table(path, memory_map=True)
+
+    def temporary_path(self, month: datetime) -> str:
+        """Fichier temporaire d'écriture d'un mois (voir `publish`)"""
+        return f"{self.path(month)}.{os.getpid()}.tmp"
+
+    def publish(self, temporary: str, month: datetime):
+        """
+        Remplace atomiquement le fichier d'un mois par le fichier temporaire, une fois
+        celui-ci synchronisé sur disque : les lectures voient l'ancien fichier ou le nouveau
+
+        Args:
+            temporary: Fichier écrit (voir `temporary_path`)
+            month: Premier instant du mois
+        """
+        with open(temporary, "rb") as file:
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path(month))
+
+    def merge(self, existing: "pyarrow.Table", batches: List["pyarrow.RecordBatch"]) -> "pyarrow.Table":
+        """
+        Fusionne un fichier existant et des lignes relues en base : les lignes relues remplacent
+        celles de même id, le tout trié par (region_name, recorded_at)
+        """
+        new_rows = pyarrow.Table.from_batches(batches, schema=self.schema)
+        kept = existing.filter(pyarrow.compute.invert(pyarrow.compute.is_in(existing["id"], value_set=new_rows["id"])))
+        return (pyarrow.concat_tables([kept, new_rows])
+                .sort_by([("region_name", "ascending"), ("recorded_at", "ascending")]))
+
+    def read_history(self, region_name: str, start: datetime, end: datetime,
+                     columns: Tuple[str, ...] = ARCHIVE_COLUMNS) -> "pyarrow.Table":
+        """
+        Mesures archivées d'une région sur [start, end), de la plus récente à la plus ancienne.
+        Seuls les fichiers des mois concernés sont ouverts ; dans chacun, les groupes de lignes
+        dont les statistiques excluent la région ou la période ne sont pas lus.
+
+        Args:
+            region_name: Nom exact de la région
+            start: Début de la période (inclus)
+            end: Fin de la période (exclue)
+            columns: Colonnes à lire
+
+        Returns:
+            Table Arrow des mesures
+        """
+        start, end = as_utc(start), as_utc(end)
+        field = pyarrow.compute.field
+        predicate = ((field("region_name") == region_name)
+                     & (field("recorded_at") >= pyarrow.scalar(start, type=self.schema.field("recorded_at").type))
+                     & (field("recorded_at") < pyarrow.scalar(end, type=self.schema.field("recorded_at").type)))
+        tables = [
+            pyarrow.parquet.read_table(self.path(month), columns=list(columns), filters=predicate, memory_map=True)
+            for month in self.months()
+            if month < end and add_months(month, 1) > start
+        ]
+        if not tables:
+            return self.schema.empty_table().select(list(columns))
+        table = pyarrow.concat_tables(tables) if len(tables) > 1 else tables[0]
+        return table.sort_by([("recorded_at", "descending")])
+
+
+# Instance globale de l'archive (None : désactivée)
+_weather_archive = None
+_weather_archive_loaded = False
+
+def get_weather_archive() -> Optional[WeatherArchive]:
+    """
+    Retourne l'instance globale de l'archive météo.
+
+    Returns:
+        WeatherArchive partagée par tout le processus, ou None si elle est désactivée
+    """
+    global _weather_archive, _weather_archive_loaded
+    if not _weather_archive_loaded:
+        _weather_archive = WeatherArchive.from_env()
+        _weather_archive_loaded = True
+    return _weather_archive
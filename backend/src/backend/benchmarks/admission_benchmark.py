@@ -0,0 +1,155 @@
+"""
+Rafale de requêtes sur une application dont le pool de connexions est limité, sans et
+avec le middleware d'admission : latence de /health, des lectures du catalogue et des
+lectures en base, réponses 200 / 429 / 503 / 500 (pool épuisé).
+
+Deux scénarios :
+- rafale : `--burst` requêtes météo de nombreux clients (rechargement de tableaux de bord) ;
+- client bruyant : un client envoie `--burst` requêtes, 20 autres en envoient 10 chacun.
+
+Utilisation :
+    python -m backend.benchmarks.admission_benchmark --burst 2000 --pool 15 --query-ms 20
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from backend.resilience.admission import AdmissionController, AdmissionMiddleware
+from backend.resilience.rate_limit import InMemoryRateLimitStore, RateLimiter
+
+
+class _PoolBoundApp:
+    """Application ASGI : /api/v1/weather/* occupe une connexion d'un pool borné, le reste est en mémoire"""
+
+    def __init__(self, pool_size: int, query_seconds: float, pool_timeout: float):
+        self.pool = asyncio.Semaphore(pool_size)
+        self.query_seconds = query_seconds
+        self.pool_timeout = pool_timeout
+
+    async def __call__(self, scope, receive, send):
+        status = 200
+        if scope["path"].startswith("/api/v1/weather/"):
+            try:
+                async with asyncio.timeout(self.pool_timeout):
+                    await self.pool.acquire()
+            except TimeoutError:
+                # QueuePool limit … connection timed out : erreur 500
+                status = 500
+            else:
+                try:
+                    await asyncio.sleep(self.query_seconds)
+                finally:
+                    self.pool.release()
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _asgi_get(app, path: str, client: str) -> int:
+    """Envoie une requête GET à l'application ASGI et retourne le code HTTP"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "headers": [(b"host", b"benchmark"), (b"x-client-id", client.encode())],
+        "client": ("127.0.0.1", 0), "server": ("benchmark", 80), "root_path": ""
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _run_scenario(app, requests: List[tuple], probe_interval: float):
+    """Lance toutes les requêtes d'un coup, et des sondes /health et /regions pendant la rafale"""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    async def request(label: str, path: str, client: str):
+        start = time.perf_counter()
+        status = await _asgi_get(app, path, client)
+        latencies[label].append((time.perf_counter() - start) * 1e3)
+        statuses[label][status] += 1
+
+    burst = [asyncio.create_task(request(label, path, client)) for label, path, client in requests]
+    probes = []
+    while not all(task.done() for task in burst):
+        probes.append(asyncio.create_task(request("/health", "/health", "sonde")))
+        probes.append(asyncio.create_task(request("/regions", "/api/v1/regions", "sonde")))
+        await asyncio.sleep(probe_interval)
+    await asyncio.gather(*burst, *probes)
+    return latencies, statuses
+
+
+def _report(label: str, latencies, statuses):
+    print(f"\n{label}")
+    for name in sorted(latencies):
+        values = sorted(latencies[name])
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        print(f"  {name:<16} n={len(values):<5} p50 {statistics.median(values):8.1f} ms   "
+              f"p99 {p99:8.1f} ms   {dict(statuses[name])}")
+
+
+def _build(pool: int, query_ms: float, pool_timeout: float, protected: bool,
+           rate_limiter: Optional[RateLimiter], max_in_flight: int, queue_timeout: float, max_queue: int):
+    app = _PoolBoundApp(pool, query_ms / 1e3, pool_timeout)
+    if not protected:
+        return app, None
+    controller = AdmissionController(max_in_flight=max_in_flight, reserved_slots=4, queue_timeout=queue_timeout,
+                                     max_queue=max_queue)
+    return AdmissionMiddleware(app, controller, rate_limiter, client_header="x-client-id"), controller
+
+
+async def run(burst: int, pool: int, query_ms: float, pool_timeout: float, max_in_flight: int,
+              queue_timeout: float, max_queue: int, rate: float, rate_burst: float):
+    logging.disable(logging.WARNING)
+    print(f"Pool de {pool} connexions, requête de {query_ms:.0f} ms, attente du pool {pool_timeout:.1f} s ; "
+          f"admission : {max_in_flight} en vol, file de {max_queue} places et {queue_timeout:.1f} s")
+
+    dashboards = [("météo (rafale)", f"/api/v1/weather/Région {i % 500}", f"tableau-{i % 200}")
+                  for i in range(burst)]
+    for protected in (False, True):
+        app, controller = _build(pool, query_ms, pool_timeout, protected, None,
+                                 max_in_flight, queue_timeout, max_queue)
+        label = "Rafale, avec admission" if protected else "Rafale, sans admission"
+        _report(label, *await _run_scenario(app, dashboards, 0.02))
+        if controller is not None:
+            print(f"  admission        : {controller.metrics()}")
+
+    noisy = [("bruyant", f"/api/v1/weather/Région {i % 500}", "bruyant") for i in range(burst)]
+    polite = [("autres clients", f"/api/v1/weather/Région {i}", f"client-{i % 20}") for i in range(200)]
+    for protected in (False, True):
+        rate_limiter = RateLimiter(InMemoryRateLimitStore(), rate, rate_burst) if protected else None
+        app, controller = _build(pool, query_ms, pool_timeout, protected, rate_limiter,
+                                 max_in_flight, queue_timeout, max_queue)
+        label = (f"Client bruyant, avec admission et {rate:.0f} req/s par client (seau de {rate_burst:.0f})"
+                 if protected else "Client bruyant, sans admission")
+        _report(label, *await _run_scenario(app, noisy + polite, 0.02))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", type=int, default=2000, help="Requêtes de la rafale")
+    parser.add_argument("--pool", type=int, default=15, help="Connexions du pool (pool_size + max_overflow)")
+    parser.add_argument("--query-ms", type=float, default=20.0)
+    parser.add_argument("--pool-timeout", type=float, default=2.0)
+    parser.add_argument("--max-in-flight", type=int, default=32)
+    parser.add_argument("--queue-timeout", type=float, default=1.0)
+    parser.add_argument("--max-queue", type=int, default=256)
+    parser.add_argument("--rate", type=float, default=20.0)
+    parser.add_argument("--rate-burst", type=float, default=60.0)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.burst, arguments.pool, arguments.query_ms, arguments.pool_timeout,
+                    arguments.max_in_flight, arguments.queue_timeout, arguments.max_queue,
+                    arguments.rate, arguments.rate_burst))
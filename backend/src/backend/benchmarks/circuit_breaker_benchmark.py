@@ -0,0 +1,134 @@
+"""
+Panne de la base sous charge ouverte (arrivées à débit fixe) : latence, requêtes en vol
+et réponses servies, sans et avec le disjoncteur.
+
+Chronologie : base saine, puis bloquée (chaque requête attend `--stall-seconds` avant
+l'annulation par statement_timeout), puis de nouveau saine.
+
+Utilisation :
+    python -m backend.benchmarks.circuit_breaker_benchmark --rate 200 --outage 1:4 --duration 7
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from backend.repositories.implementations.circuit_breaker_weather_repository import CircuitBreakerWeatherRepository
+from backend.resilience.circuit_breaker import CircuitBreaker, DatabaseUnavailableError
+from backend.resilience.stale_cache import StaleCache
+
+
+class _DegradableRepository:
+    """Lecture de 2 ms quand la base est saine ; bloquée puis annulée pendant la panne"""
+
+    def __init__(self, outage: Tuple[float, float], stall_seconds: float):
+        self.outage = outage
+        self.stall_seconds = stall_seconds
+        self.started = 0.0
+
+    async def get_weather_by_region(self, region_name: str) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        if self.outage[0] <= elapsed < self.outage[1]:
+            await asyncio.sleep(self.stall_seconds)
+            raise TimeoutError("canceling statement due to statement timeout")
+        await asyncio.sleep(0.002)
+        return {"region_name": region_name, "temperature": 18.5, "condition": "Sunny", "humidity": 60}
+
+
+class _SwallowingRepository:
+    """Comportement d'origine : l'erreur est masquée par un résultat par défaut"""
+
+    def __init__(self, repository: _DegradableRepository):
+        self.repository = repository
+
+    async def get_weather_by_region(self, region_name: str) -> Dict[str, Any]:
+        try:
+            return await self.repository.get_weather_by_region(region_name)
+        except Exception:
+            return {"region_name": region_name, "temperature": 20.0, "condition": "Unknown", "humidity": 50}
+
+
+async def _drive(repository, source: _DegradableRepository, rate: float, duration: float, regions: List[str]):
+    """Lance `rate` requêtes par seconde pendant `duration` secondes, sans attendre les réponses"""
+    rng = random.Random(3)
+    latencies: Dict[str, List[float]] = {"avant": [], "panne": [], "après": []}
+    outcomes: Counter = Counter()
+    in_flight = peak = 0
+    tasks = []
+    outage = source.outage
+
+    async def request(phase: str):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        start = time.perf_counter()
+        try:
+            weather = await repository.get_weather_by_region(rng.choice(regions))
+            if weather.get("stale"):
+                outcomes["périmée"] += 1
+            elif weather.get("condition") == "Unknown":
+                outcomes["inventée"] += 1
+            else:
+                outcomes["fraîche"] += 1
+        except DatabaseUnavailableError:
+            outcomes["503"] += 1
+        finally:
+            in_flight -= 1
+            latencies[phase].append((time.perf_counter() - start) * 1e3)
+
+    start = source.started = time.perf_counter()
+    for position in range(int(rate * duration)):
+        target = start + position / rate
+        await asyncio.sleep(max(0.0, target - time.perf_counter()))
+        elapsed = time.perf_counter() - start
+        phase = "avant" if elapsed < outage[0] else "panne" if elapsed < outage[1] else "après"
+        tasks.append(asyncio.create_task(request(phase)))
+    await asyncio.gather(*tasks)
+    return latencies, outcomes, peak
+
+
+def _report(label: str, latencies, outcomes, peak):
+    print(f"\n{label}")
+    print(f"  requêtes en vol (max) : {peak}")
+    print(f"  réponses              : {dict(outcomes)}")
+    for phase, values in latencies.items():
+        if values:
+            values.sort()
+            p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+            print(f"  {phase:<6} n={len(values):<5} p50 {statistics.median(values):8.1f} ms   p99 {p99:8.1f} ms")
+
+
+async def run(rate: float, outage: Tuple[float, float], duration: float, stall_seconds: float,
+              call_timeout: float, open_seconds: float):
+    logging.disable(logging.WARNING)
+    regions = [f"Région {position}" for position in range(200)]
+
+    source = _DegradableRepository(outage, stall_seconds)
+    _report("Sans disjoncteur (erreur masquée par une valeur par défaut)",
+            *await _drive(_SwallowingRepository(source), source, rate, duration, regions))
+
+    source = _DegradableRepository(outage, stall_seconds)
+    breaker = CircuitBreaker("database", call_timeout=call_timeout, open_seconds=open_seconds)
+    repository = CircuitBreakerWeatherRepository(source, breaker, StaleCache())
+    latencies, outcomes, peak = await _drive(repository, source, rate, duration, regions)
+    _report(f"Avec disjoncteur (appel borné à {call_timeout} s, ouvert {open_seconds} s)", latencies, outcomes, peak)
+    print(f"  disjoncteur           : {breaker.metrics()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=float, default=200.0, help="Requêtes par seconde")
+    parser.add_argument("--outage", default="1:4", help="Début et fin de la panne, en secondes")
+    parser.add_argument("--duration", type=float, default=7.0)
+    parser.add_argument("--stall-seconds", type=float, default=3.0, help="statement_timeout de la base")
+    parser.add_argument("--call-timeout", type=float, default=0.5)
+    parser.add_argument("--open-seconds", type=float, default=1.0)
+    arguments = parser.parse_args()
+    begin, end = (float(value) for value in arguments.outage.split(":"))
+    asyncio.run(run(arguments.rate, (begin, end), arguments.duration, arguments.stall_seconds,
+                    arguments.call_timeout, arguments.open_seconds))
@@ -0,0 +1,103 @@
+"""
+Regroupement des appels identiques concurrents (`RequestCoalescer`) : une rafale de clients
+demande au même instant la météo et les prévisions d'une même région, avec et sans
+regroupement. Mesure le nombre de lectures du stockage, la durée de la rafale et les
+erreurs. Un dernier scénario annule la moitié des clients, dont le premier, pendant la
+lecture : les autres doivent tous recevoir la réponse.
+
+Par défaut sur le backend de simulation (latence constante) ; avec `--backend postgresql`,
+sur la base configurée par les variables DB_* (pool de connexions réel).
+
+Utilisation :
+    python -m backend.benchmarks.coalescing_benchmark --clients 2000 --median-ms 20
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+
+async def run(backend: str, clients: int, median_ms: float):
+    os.environ["DATABASE_BACKEND"] = backend
+    os.environ["SIMULATION_LATENCY"] = "constant"
+    os.environ["SIMULATION_LATENCY_MEDIAN_MS"] = str(median_ms)
+    os.environ.setdefault("SIMULATION_REGIONS", "1000")
+    # Sans cache : chaque lecture paie la latence du stockage
+    os.environ["SECOND_LEVEL_CACHE_URL"] = "none"
+    logging.disable(logging.CRITICAL)
+
+    from sqlalchemy import event
+
+    from backend.database.connection import close_database, engine
+    from backend.di import container
+    from backend.resilience.coalescing import RequestCoalescer
+    from backend.services.implementation.coalescing_weather_service import CoalescingWeatherService
+
+    engine.echo = False
+    repository_backend = container.get_repository_backend()
+    await repository_backend.initialize()
+    factory = repository_backend.session_factory
+    statements = [0]
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args, **kwargs: statements.__setitem__(0, statements[0] + 1))
+
+    async with factory() as session:
+        region_name = (await container.get_region_repository(session).get_all_regions())[0]["name"]
+
+    def storage_reads() -> int:
+        return repository_backend.latency.calls if backend == "simulation" else statements[0]
+
+    async def direct_call(operation):
+        async with container.weather_service_scope() as service:
+            return await operation(service)
+
+    async def burst(label: str, coalescer):
+        reads_before = storage_reads()
+        operations = [
+            lambda service: service.get_current_weather(region_name),
+            lambda service: service.get_weather_forecast(region_name, 3),
+        ]
+        if coalescer is None:
+            calls = [direct_call(operations[client % 2]) for client in range(clients)]
+        else:
+            service = CoalescingWeatherService(container.weather_service_scope, coalescer)
+            calls = [operations[client % 2](service) for client in range(clients)]
+        start = time.perf_counter()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        errors = sum(isinstance(result, BaseException) for result in results)
+        print(f"  {label:<16}: {storage_reads() - reads_before:>6} lectures du stockage, rafale {elapsed:8.1f} ms, "
+              f"{errors} erreurs")
+
+    print(f"Backend {backend}, {clients} clients simultanés (moitié météo actuelle, moitié prévisions)"
+          + (f", latence {median_ms} ms par lecture" if backend == "simulation" else ""))
+    await burst("sans regroupement", None)
+    coalescer = RequestCoalescer()
+    await burst("avec regroupement", coalescer)
+    print(f"  compteurs: {coalescer.metrics()['operations']}")
+
+    # Annulation : le premier client et un client sur deux partent pendant la lecture
+    coalescer = RequestCoalescer()
+    service = CoalescingWeatherService(container.weather_service_scope, coalescer)
+    tasks = [asyncio.create_task(service.get_current_weather(region_name)) for _ in range(clients)]
+    await asyncio.sleep(0)
+    for task in tasks[::2]:
+        task.cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    cancelled = sum(isinstance(result, asyncio.CancelledError) for result in results)
+    served = sum(not isinstance(result, BaseException) for result in results)
+    print(f"  annulation      : {cancelled} clients partis (dont le premier), {served} servis, "
+          f"{coalescer.metrics()['operations']['weather.current']['executions']} exécution")
+
+    await repository_backend.close()
+    await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=("simulation", "postgresql"), default="simulation")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--median-ms", type=float, default=20.0)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.backend, arguments.clients, arguments.median_ms))
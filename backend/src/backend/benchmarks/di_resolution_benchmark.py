@@ -0,0 +1,57 @@
+"""
+Benchmark de la résolution des services par requête : injector enfant
+(`Injector.get` à chaque requête) contre fabriques compilées au démarrage.
+
+Utilisation :
+    python -m backend.benchmarks.di_resolution_benchmark --requests 20000
+"""
+
+import argparse
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.di import container
+from backend.services.interfaces.Iregion_info_service import IRegionInformationService
+from backend.services.interfaces.Iweather_interpolation_service import IWeatherInterpolationService
+from backend.services.interfaces.Iweather_service import IWeatherService
+
+INTERFACES = (IWeatherService, IRegionInformationService, IWeatherInterpolationService)
+
+
+def _measure(resolve, requests: int) -> float:
+    """Durée moyenne en µs pour résoudre les trois services d'une requête"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        session = AsyncSession()
+        for interface in INTERFACES:
+            resolve(interface, session)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def run(requests: int):
+    # Les journaux "... initialisé avec ..." ne doivent pas fausser la mesure
+    logging.disable(logging.INFO)
+    container.reset_injector()
+    container.compile_providers()
+    compiled = container.get_compiled_providers()
+
+    def resolve_with_injector(interface, session):
+        return container.get_request_injector(session).get(interface)
+
+    session_only_us = _measure(lambda interface, session: None, requests)
+    injector_us = _measure(resolve_with_injector, requests)
+    compiled_us = _measure(compiled.get, requests)
+
+    print(f"Requêtes simulées          : {requests} (3 services par requête)")
+    print(f"Création de session seule  : {session_only_us:.1f} µs/requête")
+    print(f"Injector enfant            : {injector_us - session_only_us:.1f} µs/requête")
+    print(f"Fabriques compilées        : {compiled_us - session_only_us:.1f} µs/requête")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    arguments = parser.parse_args()
+    run(arguments.requests)
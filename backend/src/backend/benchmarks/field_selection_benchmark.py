@@ -0,0 +1,92 @@
+"""
+Sélection des champs (`?fields=`) : taille des réponses et durée des endpoints de liste des
+régions et de météo actuelle, complets puis réduits aux champs d'un client mobile
+(`id,name` pour la liste, `region,temperature` pour la météo). Avec `--backend postgresql`,
+mesure aussi la lecture du repository : ligne complète (entité ORM) contre projection réduite.
+
+Par défaut sur le backend de simulation (SIMULATION_REGIONS régions), sans cache de second
+niveau : chaque lecture de la météo passe par le stockage.
+
+Utilisation :
+    python -m backend.benchmarks.field_selection_benchmark --requests 500
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+
+def _median_ms(call, requests: int) -> float:
+    durations = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        call()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def run(backend: str, requests: int):
+    os.environ["DATABASE_BACKEND"] = backend
+    os.environ["APP_ENV"] = "test"
+    os.environ.setdefault("SIMULATION_REGIONS", "10000")
+    os.environ["SECOND_LEVEL_CACHE_URL"] = "none"
+    os.environ["REQUEST_COALESCING"] = "false"
+    os.environ["RATE_LIMIT_PER_SECOND"] = "0"
+    logging.disable(logging.CRITICAL)
+
+    from fastapi.testclient import TestClient
+
+    from backend.app import app
+    from backend.database.connection import engine
+
+    engine.echo = False
+    with TestClient(app) as client:
+        region_name = client.get("/api/v1/regions", params={"fields": "name"}).json()[0]["name"]
+        scenarios = [
+            ("/api/v1/regions", "id,name"),
+            (f"/api/v1/weather/{region_name}", "region,temperature"),
+        ]
+        print(f"Backend {backend}, médiane sur {requests} requêtes")
+        for url, fields in scenarios:
+            for params in ({}, {"fields": fields}):
+                response = client.get(url, params=params)
+                response.raise_for_status()
+                body = response.content
+                median = _median_ms(lambda: client.get(url, params=params), requests)
+                label = f"{url.split('/')[3]}{'?fields=' + fields if params else ''}"
+                print(f"  {label:<32}: {len(body):>9,} octets, {median:6.2f} ms")
+
+    if backend == "postgresql":
+        asyncio.run(_repository(region_name, requests))
+
+
+async def _repository(region_name: str, requests: int):
+    from backend.database.connection import AsyncSessionLocal, close_database
+    from backend.repositories.implementations.postgresql_weather_repository import PostgreSQLWeatherRepository
+    from backend.services.schemas.field_selection import WEATHER_RESPONSE_FIELDS
+
+    columns = WEATHER_RESPONSE_FIELDS.columns(("region", "temperature"))
+    async with AsyncSessionLocal() as session:
+        repository = PostgreSQLWeatherRepository(session)
+        for label, selected in (("ligne complète", None), (f"colonnes {', '.join(columns)}", columns)):
+            await repository.get_weather_by_region(region_name, selected)
+            durations = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                await repository.get_weather_by_region(region_name, selected)
+                durations.append((time.perf_counter() - start) * 1000)
+                # Entités rechargées à chaque lecture, comme sur une session de requête neuve
+                session.expunge_all()
+            print(f"  repository, {label:<32}: médiane {statistics.median(durations):6.3f} ms")
+    await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=("simulation", "postgresql", "mock"), default="simulation")
+    parser.add_argument("--requests", type=int, default=500)
+    arguments = parser.parse_args()
+    run(arguments.backend, arguments.requests)
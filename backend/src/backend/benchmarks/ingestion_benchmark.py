@@ -0,0 +1,89 @@
+"""
+Benchmark du pipeline d'ingestion face à une rafale : la source produit bien
+plus vite que l'écriture ; la file doit rester bornée et la mémoire stable.
+
+Utilisation :
+    python -m backend.benchmarks.ingestion_benchmark --records 200000 --write-ms 20
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
+
+from backend.ingestion.pipeline import IngestionPipeline
+from backend.ingestion.sources import IWeatherSource
+
+
+class _BurstSource(IWeatherSource):
+    """Produit `count` mesures d'un coup, sans jamais attendre"""
+
+    def __init__(self, count: int):
+        self.count = count
+
+    async def records(self) -> AsyncIterator[Dict[str, Any]]:
+        for position in range(self.count):
+            yield {
+                "type": "observation",
+                "region_name": f"Station {position % 500}",
+                "temperature": 20.0,
+                "condition": "Sunny",
+                "humidity": 50
+            }
+
+
+class _SlowRepository:
+    """Simule une écriture groupée de durée fixe (même contrat que IWeatherRepository)"""
+
+    def __init__(self, write_seconds: float):
+        self.write_seconds = write_seconds
+        self.rows = 0
+
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        await asyncio.sleep(self.write_seconds)
+        self.rows += len(weather_records)
+        return len(weather_records)
+
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        return await self.bulk_create_weather_data(forecast_records)
+
+
+async def run(records: int, write_ms: float, queue_size: int, batch_size: int):
+    repository = _SlowRepository(write_ms / 1000)
+
+    @asynccontextmanager
+    async def repository_scope():
+        yield repository
+
+    pipeline = IngestionPipeline(_BurstSource(records), repository_scope,
+                                 queue_size=queue_size, batch_size=batch_size, batch_timeout=0.05)
+    tracemalloc.start()
+    start = time.perf_counter()
+    await pipeline.start()
+    peak_depth = 0
+    while repository.rows < records:
+        peak_depth = max(peak_depth, pipeline._queue.qsize())
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await pipeline.stop()
+
+    metrics = pipeline.metrics.to_dict()
+    print(f"Enregistrements       : {records} (écriture simulée {write_ms} ms / lot de {batch_size})")
+    print(f"Durée                 : {elapsed:.1f} s, {records / elapsed:.0f} enregistrements/s")
+    print(f"File                  : pic {peak_depth} / capacité {queue_size}")
+    print(f"Retard max d'un lot   : {metrics['max_lag_seconds']} s")
+    print(f"Pic mémoire (traced)  : {peak_memory / 1024 / 1024:.1f} Mio")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--write-ms", type=float, default=20.0)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.records, arguments.write_ms, arguments.queue_size, arguments.batch_size))
@@ -0,0 +1,86 @@
+"""
+Benchmark de l'interpolation spatiale IDW : point unique, cache par cellule et lot de points.
+
+Utilisation :
+    python -m backend.benchmarks.interpolation_benchmark --stations 5000 --points 10000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Dict, List
+
+from backend.interpolation.idw import WeatherInterpolator, WeatherStationField
+
+
+class _StaticReadings:
+    """Fournit des mesures fixes à l'interpolateur (même contrat que IWeatherRepository)"""
+
+    def __init__(self, readings: List[Dict[str, Any]]):
+        self.readings = readings
+
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        return self.readings
+
+
+def generate_readings(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Génère une mesure par station, répartie sur la France métropolitaine"""
+    rng = random.Random(seed)
+    conditions = ["Sunny", "Partly Cloudy", "Cloudy", "Rainy"]
+    return [
+        {
+            "region_name": f"Station {position}",
+            "latitude": rng.uniform(42.0, 51.0),
+            "longitude": rng.uniform(-4.5, 8.0),
+            "temperature": round(rng.uniform(5.0, 30.0), 2),
+            "humidity": rng.randint(30, 95),
+            "pressure": round(rng.uniform(995.0, 1030.0), 2),
+            "wind_speed": round(rng.uniform(0.0, 40.0), 2),
+            "condition": rng.choice(conditions),
+            "wind_direction": rng.choice(["N", "E", "S", "W"])
+        }
+        for position in range(count)
+    ]
+
+
+async def run(stations: int, points: int):
+    readings = generate_readings(stations)
+    repository = _StaticReadings(readings)
+    rng = random.Random(5)
+    coordinates = [(rng.uniform(42.0, 51.0), rng.uniform(-4.5, 8.0)) for _ in range(points)]
+
+    field = WeatherStationField(readings)
+    start = time.perf_counter()
+    for latitude, longitude in coordinates[:2000]:
+        field.estimate(latitude, longitude)
+    uncached_us = (time.perf_counter() - start) / 2000 * 1e6
+
+    interpolator = WeatherInterpolator()
+    await interpolator.refresh(repository)
+    start = time.perf_counter()
+    await interpolator.estimate_many(repository, coordinates)
+    cold_batch_ms = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    await interpolator.estimate_many(repository, coordinates)
+    warm_batch_ms = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    for latitude, longitude in coordinates[:2000]:
+        await interpolator.estimate(repository, latitude, longitude)
+    cached_us = (time.perf_counter() - start) / 2000 * 1e6
+
+    cells = len({interpolator._cell_of(latitude, longitude) for latitude, longitude in coordinates})
+    print(f"Stations                         : {stations}")
+    print(f"Estimation sans cache            : {uncached_us:.1f} µs/point")
+    print(f"Estimation, cellule en cache     : {cached_us:.1f} µs/point")
+    print(f"Lot de {points} points ({cells} cellules) : {cold_batch_ms:.1f} ms à froid, {warm_batch_ms:.1f} ms à chaud")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stations", type=int, default=5_000)
+    parser.add_argument("--points", type=int, default=10_000)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.stations, arguments.points))
@@ -0,0 +1,215 @@
+"""
+Bus d'invalidation LISTEN/NOTIFY entre deux workers : latence écriture → gestionnaire
+dans chaque worker (processus distincts), et coût des déclencheurs sur une insertion
+en lot (une instruction par ligne ou une seule instruction par lot). Nécessite la base PostgreSQL configurée (DB_HOST, DB_PORT, …) avec la
+migration 003 appliquée ; les lignes écrites sont préfixées par `bench-` puis supprimées.
+
+Utilisation :
+    python -m backend.benchmarks.invalidation_benchmark --writes 200 --bulk-rows 10000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+import asyncpg
+
+from backend.database.connection import db_config
+from backend.database.notifications import ChangeListener
+
+TABLES = ("regions", "weather_data", "weather_forecasts")
+
+
+def _worker(dsn: str, ready, stop, results):
+    """Processus « worker » : écoute le canal et horodate chaque notification reçue"""
+    async def main():
+        listener = ChangeListener(dsn)
+        received: Dict[str, List[float]] = defaultdict(list)
+        for table in TABLES:
+            listener.register(table, lambda change: received[change.table].append(time.time()))
+        task = asyncio.create_task(listener.run())
+        while not listener.connected:
+            await asyncio.sleep(0.01)
+        ready.set()
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        results.put(dict(received))
+
+    asyncio.run(main())
+
+
+def _percentile(values: List[float], share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def _weather_rows(count: int, regions: int, prefix: str):
+    now = datetime.now(timezone.utc)
+    return [(f"{prefix}{position % regions}", 15.0, "Cloudy", 70, now, False, 0) for position in range(count)]
+
+
+async def _insert_weather(connection, rows):
+    """Une seule instruction pour tout le lot, comme `bulk_create_weather_data`"""
+    await connection.execute(
+        "INSERT INTO weather_data (region_name, temperature, condition, humidity, recorded_at, is_forecast, forecast_day) "
+        "SELECT * FROM unnest($1::text[], $2::float8[], $3::text[], $4::int[], $5::timestamptz[], $6::bool[], $7::int[])",
+        *zip(*rows)
+    )
+
+
+async def _insert_weather_per_row(connection, rows):
+    """Une instruction par ligne (executemany) : les déclencheurs s'exécutent pour chaque ligne"""
+    await connection.executemany(
+        "INSERT INTO weather_data (region_name, temperature, condition, humidity, recorded_at, is_forecast, forecast_day) "
+        "VALUES ($1, $2, $3, $4, $5, $6, $7)", rows
+    )
+
+
+async def _writes(dsn: str, writes: int, bulk_regions: int, pause: float) -> Dict[str, List[float]]:
+    """
+    Écrit dans chaque table (une instruction à la fois) et retourne l'instant d'envoi de chaque
+    écriture : la notification part au COMMIT, souvent avant que l'écrivain n'en reçoive l'accusé.
+    """
+    connection = await asyncpg.connect(dsn)
+    committed: Dict[str, List[float]] = defaultdict(list)
+    try:
+        committed["regions"].append(time.time())
+        region_id = await connection.fetchval(
+            "INSERT INTO regions (name, nb_habitants, language, country) "
+            "VALUES ('bench-region', 1, 'fr', 'Bench') RETURNING id"
+        )
+        await asyncio.sleep(pause)
+        today = date.today()
+        for step in range(writes):
+            committed["regions"].append(time.time())
+            await connection.execute("UPDATE regions SET nb_habitants = $1 WHERE id = $2", step + 2, region_id)
+            await asyncio.sleep(pause)
+
+            committed["weather_data"].append(time.time())
+            await _insert_weather(connection, _weather_rows(1, 1, f"bench-single-{step}-"))
+            await asyncio.sleep(pause)
+
+            committed["weather_forecasts"].append(time.time())
+            await connection.execute(
+                "INSERT INTO weather_forecasts (region_name, forecast_date, day_name, condition, humidity, "
+                "precipitation_probability) VALUES ('bench-region', $1, 'Bench', 'Sunny', 50, 10) "
+                "ON CONFLICT (region_name, forecast_date) DO UPDATE SET humidity = EXCLUDED.humidity",
+                today + timedelta(days=step % 14)
+            )
+            await asyncio.sleep(pause)
+        # Lot multi-régions : plusieurs notifications (pages de 15 régions), la dernière fait foi
+        committed["bulk"].append(time.time())
+        await _insert_weather(connection, _weather_rows(bulk_regions * 10, bulk_regions, "bench-bulk-"))
+        await asyncio.sleep(pause)
+    finally:
+        await connection.close()
+    return committed
+
+
+async def _bulk_throughput(dsn: str, rows: int, regions: int) -> Dict[str, float]:
+    """Débit d'insertion d'un lot selon la forme de l'insertion, déclencheurs actifs puis désactivés"""
+    connection = await asyncpg.connect(dsn)
+    throughput = {}
+    try:
+        for shape, insert_rows in (("par ligne", _insert_weather_per_row), ("par lot", _insert_weather)):
+            for triggers in (True, False):
+                batch = _weather_rows(rows, regions, "bench-throughput-")
+                # Déclencheurs désactivés dans la transaction uniquement (annulé au ROLLBACK)
+                transaction = connection.transaction()
+                await transaction.start()
+                if not triggers:
+                    await connection.execute("ALTER TABLE weather_data DISABLE TRIGGER USER")
+                start = time.perf_counter()
+                await insert_rows(connection, batch)
+                throughput[f"{shape}, {'avec' if triggers else 'sans'} déclencheurs"] = (
+                    rows / (time.perf_counter() - start)
+                )
+                await transaction.rollback()
+    finally:
+        await connection.close()
+    return throughput
+
+
+async def _cleanup(dsn: str):
+    connection = await asyncpg.connect(dsn)
+    try:
+        await connection.execute("DELETE FROM weather_data WHERE region_name LIKE 'bench-%'")
+        await connection.execute("DELETE FROM weather_forecasts WHERE region_name LIKE 'bench-%'")
+        await connection.execute("DELETE FROM regions WHERE name LIKE 'bench-%'")
+    finally:
+        await connection.close()
+
+
+def _report(name: str, committed: List[float], received: List[float]):
+    latencies = [(receipt - commit) * 1e3 for commit, receipt in zip(committed, received)]
+    if not latencies:
+        print(f"    {name:<18}: aucune notification reçue")
+        return
+    print(f"    {name:<18}: {len(received)}/{len(committed)} notifications, "
+          f"p50 {statistics.median(latencies):.2f} ms, p99 {_percentile(latencies, 0.99):.2f} ms")
+
+
+def run(writes: int, bulk_rows: int, bulk_regions: int, pause: float):
+    dsn = ChangeListener.from_database_url(db_config.get_database_url()).dsn
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    results = context.Queue()
+    workers = []
+    for _ in range(2):
+        ready = context.Event()
+        worker = context.Process(target=_worker, args=(dsn, ready, stop, results))
+        worker.start()
+        workers.append((worker, ready))
+    for worker, ready in workers:
+        if not ready.wait(15):
+            stop.set()
+            raise OSError("worker non connecté à la base")
+
+    try:
+        committed = asyncio.run(_writes(dsn, writes, bulk_regions, pause))
+    finally:
+        stop.set()
+    received = [results.get(timeout=15) for _ in workers]
+    for worker, _ in workers:
+        worker.join()
+
+    print(f"Invalidation entre 2 workers : {writes} écritures par table, pause de {pause * 1e3:.0f} ms")
+    for position, worker_received in enumerate(received, start=1):
+        print(f"  worker {position} (écriture → gestionnaire)")
+        _report("regions", committed["regions"], worker_received.get("regions", []))
+        # La première notification weather_data d'après les écritures unitaires est celle du lot
+        weather = worker_received.get("weather_data", [])
+        _report("weather_data", committed["weather_data"], weather[:writes])
+        _report("weather_forecasts", committed["weather_forecasts"], worker_received.get("weather_forecasts", []))
+        if len(weather) > writes:
+            print(f"    {'lot ' + str(bulk_regions * 10) + ' lignes':<18}: {len(weather) - writes} notifications, "
+                  f"dernière reçue {(weather[-1] - committed['bulk'][0]) * 1e3:.2f} ms après l'envoi")
+
+    throughput = asyncio.run(_bulk_throughput(dsn, bulk_rows, bulk_regions))
+    print(f"  insertion d'un lot de {bulk_rows} mesures sur {bulk_regions} régions")
+    for label, rows_per_second in throughput.items():
+        print(f"    {label:<30}: {rows_per_second:,.0f} lignes/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writes", type=int, default=200, help="Écritures unitaires par table")
+    parser.add_argument("--bulk-rows", type=int, default=10_000)
+    parser.add_argument("--bulk-regions", type=int, default=100)
+    parser.add_argument("--pause-ms", type=float, default=20.0, help="Pause entre deux écritures")
+    arguments = parser.parse_args()
+    try:
+        run(arguments.writes, arguments.bulk_rows, arguments.bulk_regions, arguments.pause_ms / 1e3)
+    except (OSError, asyncpg.PostgresError) as e:
+        print(f"Base indisponible: {e}")
+    finally:
+        try:
+            asyncio.run(_cleanup(ChangeListener.from_database_url(db_config.get_database_url()).dsn))
+        except (OSError, asyncpg.PostgresError):
+            pass
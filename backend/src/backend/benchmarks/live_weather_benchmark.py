@@ -0,0 +1,92 @@
+"""
+Diffusion des mesures par le hub des flux SSE : coût de publication, latence de
+livraison, fusion des mises à jour rapprochées, et effet des abonnés lents.
+
+Chaque tour, l'ingestion écrit `--burst` mesures par région (un lot) ; `--slow-share`
+des abonnés ne lisent jamais leur flux.
+
+Utilisation :
+    python -m backend.benchmarks.live_weather_benchmark --subscribers 10000 --regions 500 --rounds 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from backend.streaming.weather_hub import WeatherHub
+
+
+async def _consume(subscription, latencies: List[float]):
+    while True:
+        reading = await subscription.next()
+        latencies.append((time.perf_counter() - reading["published_at"]) * 1e3)
+
+
+def _percentile(values: List[float], share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def run(subscribers: int, regions: int, rounds: int, burst: int, interval: float,
+              coalesce_seconds: float, buffer_size: int, slow_share: float, poll_seconds: float):
+    hub = WeatherHub(coalesce_seconds=coalesce_seconds, buffer_size=buffer_size, max_subscribers=subscribers)
+    names = [f"Région {position}" for position in range(regions)]
+    slow_count = int(subscribers * slow_share)
+
+    subscriptions = [hub.subscribe(names[position % regions]) for position in range(subscribers)]
+    latencies: List[float] = []
+    consumers = [asyncio.create_task(_consume(subscription, latencies))
+                 for subscription in subscriptions[slow_count:]]
+
+    publish_seconds = 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for name in names:
+            for step in range(burst):
+                hub.publish({"region_name": name, "temperature": 15.0 + step, "condition": "Cloudy",
+                             "humidity": 70, "published_at": time.perf_counter()})
+        publish_seconds += time.perf_counter() - start
+        await asyncio.sleep(interval)
+    await asyncio.sleep(coalesce_seconds + 0.2)
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+
+    metrics = hub.metrics()
+    published = rounds * regions * burst
+    slow = subscriptions[:slow_count]
+    print(f"{subscribers} abonnés sur {regions} régions ({slow_count} ne lisent jamais), "
+          f"{rounds} lots de {burst} mesures par région, fusion sur {coalesce_seconds * 1e3:.0f} ms")
+    print(f"  publication         : {publish_seconds / published * 1e6:.2f} µs par mesure "
+          f"({published} mesures, {metrics['coalesced']} fusionnées)")
+    print(f"  livraisons          : {metrics['delivered']} "
+          f"(sans fusion : {published * subscribers // regions})")
+    print(f"  latence de livraison: p50 {statistics.median(latencies):.1f} ms, "
+          f"p99 {_percentile(latencies, 0.99):.1f} ms (abonnés qui lisent)")
+    if slow:
+        print(f"  abonnés lents       : {sum(len(subscription._buffer) for subscription in slow) / len(slow):.1f} "
+              f"mesures en attente chacun (borne {buffer_size}), "
+              f"{sum(subscription.dropped for subscription in slow)} mesures perdues au total")
+    print(f"  lectures évitées    : {subscribers / poll_seconds:.0f} req/s avec un rafraîchissement "
+          f"toutes les {poll_seconds:.0f} s, contre {subscribers} lectures à l'ouverture des flux")
+    for subscription in subscriptions:
+        subscription.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--regions", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--burst", type=int, default=5, help="Mesures par région dans chaque lot")
+    parser.add_argument("--interval", type=float, default=0.5, help="Secondes entre deux lots")
+    parser.add_argument("--coalesce-ms", type=float, default=250.0)
+    parser.add_argument("--buffer-size", type=int, default=8)
+    parser.add_argument("--slow-share", type=float, default=0.1)
+    parser.add_argument("--poll-seconds", type=float, default=5.0, help="Période de rafraîchissement comparée")
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.subscribers, arguments.regions, arguments.rounds, arguments.burst,
+                    arguments.interval, arguments.coalesce_ms / 1e3, arguments.buffer_size,
+                    arguments.slow_share, arguments.poll_seconds))
@@ -0,0 +1,114 @@
+"""
+Décodage des mesures numériques : NUMERIC (Decimal côté Python, puis float() ligne par ligne
+dans `to_dict()`) contre double precision (float natif d'asyncpg, migration 004).
+
+Deux tables temporaires de `--rows` mesures (température, pression, vent ; quelques zéros et
+NULL) sont créées sur la base configurée par les variables DB_*, l'une en NUMERIC(5, 2) /
+NUMERIC(6, 2), l'autre en double precision. Pour chacune, mesure la lecture brute par asyncpg,
+puis la lecture SQLAlchemy jusqu'aux dictionnaires : ancien mapping (Numeric, Decimal puis
+`float(x) if x else None`), nouveau mapping (Double, valeurs directes) sur la table NUMERIC
+(avant la migration) et sur la table double precision (après).
+
+Utilisation :
+    python -m backend.benchmarks.numeric_decode_benchmark --rows 1000000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+from sqlalchemy import Column, Double, Integer, MetaData, Numeric, Table, select, text
+
+FILL = """
+INSERT INTO {table} (id, temperature, pressure, wind_speed)
+SELECT n,
+       CASE WHEN n % 97 = 0 THEN 0 ELSE round((10 + 15 * sin(n / 500.0))::numeric, 2) END,
+       CASE WHEN n % 89 = 0 THEN NULL ELSE round((1013 + 8 * cos(n / 700.0))::numeric, 2) END,
+       CASE WHEN n % 7 = 0 THEN 0 ELSE round((abs(12 * sin(n / 300.0)))::numeric, 2) END
+FROM generate_series(1, :rows) AS n
+"""
+
+
+def _tables():
+    metadata = MetaData()
+    numeric = Table("decode_numeric", metadata, Column("id", Integer, primary_key=True),
+                    Column("temperature", Numeric(5, 2)), Column("pressure", Numeric(6, 2)),
+                    Column("wind_speed", Numeric(5, 2)), prefixes=["TEMPORARY"])
+    float8 = Table("decode_float8", metadata, Column("id", Integer, primary_key=True),
+                   Column("temperature", Double), Column("pressure", Double),
+                   Column("wind_speed", Double), prefixes=["TEMPORARY"])
+    # Nouveau mapping sur une base pas encore migrée : Decimal converti par SQLAlchemy
+    numeric_as_double = Table("decode_numeric", MetaData(), Column("id", Integer, primary_key=True),
+                              Column("temperature", Double), Column("pressure", Double), Column("wind_speed", Double))
+    return metadata, numeric, float8, numeric_as_double
+
+
+def _old_to_dict(row) -> dict:
+    # Conversion de l'ancien WeatherData.to_dict (0.0 devenait None)
+    return {
+        "id": row.id,
+        "temperature": float(row.temperature),
+        "pressure": float(row.pressure) if row.pressure else None,
+        "wind_speed": float(row.wind_speed) if row.wind_speed else None,
+    }
+
+
+def _new_to_dict(row) -> dict:
+    return {"id": row.id, "temperature": row.temperature, "pressure": row.pressure, "wind_speed": row.wind_speed}
+
+
+async def run(rows: int, repeats: int):
+    os.environ.setdefault("DB_STATEMENT_TIMEOUT_SECONDS", "300")
+    logging.disable(logging.CRITICAL)
+
+    from backend.database.connection import close_database, engine
+
+    engine.echo = False
+    metadata, numeric, float8, numeric_as_double = _tables()
+    async with engine.connect() as connection:
+        await connection.run_sync(metadata.create_all)
+        for table in (numeric, float8):
+            await connection.execute(text(FILL.format(table=table.name)), {"rows": rows})
+        raw = (await connection.get_raw_connection()).driver_connection
+
+        async def timed(call):
+            durations = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                result = await call()
+                durations.append((time.perf_counter() - start) * 1000)
+            return statistics.median(durations), result
+
+        print(f"{rows:,} mesures, médiane sur {repeats} lectures")
+        scenarios = [
+            ("NUMERIC, ancien mapping", numeric, _old_to_dict),
+            ("NUMERIC, Double", numeric_as_double, _new_to_dict),
+            ("double precision", float8, _new_to_dict),
+        ]
+        for label, table, to_dict in scenarios:
+            sql = f"SELECT id, temperature, pressure, wind_speed FROM {table.name}"
+            raw_ms, records = await timed(lambda: raw.fetch(sql))
+            kind = type(records[0]["temperature"]).__name__
+
+            async def decoded():
+                result = await connection.execute(select(table))
+                return [to_dict(row) for row in result]
+
+            dicts_ms, readings = await timed(decoded)
+            zeros = sum(record["wind_speed"] == 0 for record in records)
+            kept = sum(reading["wind_speed"] == 0 for reading in readings)
+            print(f"  {label:<24}: asyncpg {raw_ms:7.0f} ms ({kind}), SQLAlchemy + to_dict {dicts_ms:7.0f} ms, "
+                  f"vents nuls conservés {kept:,}/{zeros:,}")
+        await connection.rollback()
+    await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.rows, arguments.repeats))
@@ -0,0 +1,105 @@
+"""
+Vue d'ensemble d'une région (`/api/v1/region/{id}/overview`) : lectures séquentielles sur
+une session (région, météo actuelle, prévisions, comme une page région aujourd'hui)
+comparées aux lectures concurrentes de `RegionOverviewService`, chacune sur sa session.
+
+Par défaut sur le backend de simulation, avec une latence log-normale par appel ; avec
+`--backend postgresql`, sur la base configurée par les variables DB_*. Une dernière mesure
+fixe le délai des sous-requêtes sous la latence de queue et compte les réponses partielles.
+
+Utilisation :
+    python -m backend.benchmarks.overview_benchmark --requests 300 --median-ms 8 --p99-ms 40
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import time
+from typing import List
+
+
+def _summary(latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+    return (f"médiane {statistics.median(ordered):6.1f} ms, p95 {ordered[int(len(ordered) * 0.95)]:6.1f} ms, "
+            f"p99 {ordered[int(len(ordered) * 0.99)]:6.1f} ms")
+
+
+async def run(backend: str, requests: int, median_ms: float, p99_ms: float, days: int):
+    # Configuration lue à la première résolution de l'injector et du cache de second niveau
+    os.environ["DATABASE_BACKEND"] = backend
+    os.environ["SIMULATION_LATENCY"] = "lognormal"
+    os.environ["SIMULATION_LATENCY_MEDIAN_MS"] = str(median_ms)
+    os.environ["SIMULATION_LATENCY_P99_MS"] = str(p99_ms)
+    os.environ.setdefault("SIMULATION_REGIONS", "1000")
+    # Sans cache : chaque appel paie la latence du stockage
+    os.environ["SECOND_LEVEL_CACHE_URL"] = "none"
+    logging.disable(logging.WARNING)
+
+    from backend.database.connection import close_database, engine
+    from backend.di import container
+    from backend.services.implementation.region_overview_service import RegionOverviewService
+
+    engine.echo = False
+    repository_backend = container.get_repository_backend()
+    await repository_backend.initialize()
+    factory = repository_backend.session_factory
+    async with factory() as session:
+        region_ids = [region["id"] for region in await container.get_region_repository(session).get_all_regions()]
+    rng = random.Random(7)
+
+    async def sequential(region_id: int):
+        async with factory() as session:
+            region = await container.get_region_repository(session).get_region_info_by_id(region_id)
+            weather_service = container.get_weather_service(session)
+            await weather_service.get_current_weather(region["name"])
+            await weather_service.get_weather_forecast_series(region["name"], days)
+
+    async def concurrent(region_id: int, timeout_seconds: float = 5.0):
+        async with factory() as session:
+            service = RegionOverviewService(
+                container.get_region_repository(session), container.weather_service_scope, timeout_seconds
+            )
+            return await service.get_region_overview(region_id, days)
+
+    async def measure(call) -> List[float]:
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            await call(rng.choice(region_ids))
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    print(f"Backend {backend}, {len(region_ids)} régions, {requests} pages région, prévisions sur {days} jours"
+          + (f", latence simulée médiane {median_ms} ms / p99 {p99_ms} ms" if backend == "simulation" else ""))
+    await measure(sequential)
+    print(f"  séquentiel (une session)         : {_summary(await measure(sequential))}")
+    print(f"  concurrent (une session par lecture): {_summary(await measure(concurrent))}")
+
+    if backend == "simulation":
+        timeout_seconds = 2 * median_ms / 1000
+        partial = 0
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            overview = await concurrent(rng.choice(region_ids), timeout_seconds)
+            latencies.append((time.perf_counter() - start) * 1000)
+            partial += overview.partial
+        print(f"  concurrent, délai {timeout_seconds * 1000:.0f} ms par lecture : {_summary(latencies)}, "
+              f"{partial / requests:.1%} de réponses partielles")
+
+    await repository_backend.close()
+    await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=("simulation", "postgresql"), default="simulation")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--median-ms", type=float, default=8.0)
+    parser.add_argument("--p99-ms", type=float, default=40.0)
+    parser.add_argument("--days", type=int, default=7)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.backend, arguments.requests, arguments.median_ms, arguments.p99_ms, arguments.days))
@@ -0,0 +1,65 @@
+"""
+Benchmark du catalogue des régions en mémoire.
+Mesure l'empreinte mémoire et le temps de recherche pour un grand nombre de régions.
+
+Utilisation :
+    python -m backend.benchmarks.region_catalog_benchmark --regions 100000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Any, List
+
+from backend.indexes.prefix_index import RegionPrefixIndex
+from backend.indexes.region_catalog import RegionCatalogSnapshot
+from backend.simulation.dataset import generate_regions
+
+
+def _time_per_call(function, arguments: List[Any]) -> float:
+    """Retourne le temps moyen par appel en microsecondes"""
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - start) / len(arguments) * 1e6
+
+
+def run(count: int):
+    # Empreinte des lignes source seules (ce que retournerait get_all_regions)
+    tracemalloc.start()
+    regions = generate_regions(count)
+    rows_footprint = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Empreinte résidente de l'instantané : lignes copiées + index, une fois la liste source libérée
+    tracemalloc.start()
+    source = generate_regions(count)
+    snapshot = RegionCatalogSnapshot(source, {"count": count, "max_updated_at": None})
+    del source
+    footprint = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    rng = random.Random(7)
+    ids = [rng.randint(1, count) for _ in range(10_000)]
+    names = [regions[region_id - 1]["name"].upper() for region_id in ids]
+    prefixes = [name[:4] for name in names]
+
+    print(f"Régions                         : {count}")
+    print(f"Lignes seules (dicts)           : {rows_footprint / 1024 / 1024:.1f} Mio")
+    print(f"Instantané complet (avec index) : {footprint / 1024 / 1024:.1f} Mio")
+    print(f"get_by_id                       : {_time_per_call(snapshot.get_by_id, ids):.2f} µs/appel")
+    print(f"get_by_name                     : {_time_per_call(snapshot.get_by_name, names):.2f} µs/appel")
+    print(f"find_by_prefix (limit=10)       : {_time_per_call(snapshot.find_by_prefix, prefixes):.2f} µs/appel")
+
+    # Autocomplétion : coût selon la longueur du texte saisi
+    prefix_index = RegionPrefixIndex(regions)
+    for length in (1, 2, 3, 4, 6):
+        queries = [name[:length] for name in names]
+        print(f"search q de {length} caractère(s)       : {_time_per_call(prefix_index.search, queries):.2f} µs/appel")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--regions", type=int, default=100_000)
+    run(parser.parse_args().regions)
@@ -0,0 +1,138 @@
+"""
+Routage primaire / réplicas avec des bases SQLite de substitution : répartition des
+sessions de lecture (round-robin, least-busy), read-your-writes, retrait d'une réplica
+en panne et surcoût de `RoutingSession.get_bind`.
+
+Utilisation :
+    python -m backend.benchmarks.replica_routing_benchmark --sessions 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.database.models import Region
+from backend.database.routing import LEAST_BUSY, ROUND_ROBIN, Replica, ReplicaRouter, RoutingSession
+from backend.database.sqlite import SQLiteDatabase
+from backend.repositories.implementations.sqlite_region_repository import SQLiteRegionRepository
+from backend.repositories.implementations.sqlite_weather_repository import SQLiteWeatherRepository
+from backend.simulation.dataset import generate_regions
+
+
+def _count_statements(databases):
+    """Compte les instructions exécutées par chaque base"""
+    counts = Counter()
+    for name, database in databases.items():
+        event.listen(database.engine.sync_engine, "before_cursor_execute",
+                     lambda *args, name=name, **kwargs: counts.update([name]))
+    return counts
+
+
+async def _seed(database: SQLiteDatabase, regions):
+    await database.initialize()
+    async with database.session_factory() as session:
+        await session.execute(insert(Region), [
+            {key: value for key, value in region.items() if key not in ("id", "created_at", "updated_at")}
+            for region in regions
+        ])
+        await session.commit()
+
+
+async def _request(factory, name: str):
+    """Requête de lecture type : une région et ses prévisions sur une même session"""
+    async with factory() as session:
+        await SQLiteRegionRepository(session).get_region_by_name(name)
+        await SQLiteWeatherRepository(session).get_weather_forecast(name, 7)
+        await asyncio.sleep(0)
+
+
+async def run(sessions: int, concurrency: int):
+    logging.disable(logging.WARNING)
+    directory = tempfile.mkdtemp(prefix="replicas-")
+    regions = generate_regions(500)
+    names = [region["name"] for region in regions]
+    databases = {name: SQLiteDatabase(os.path.join(directory, f"{name}.db")) for name in ("primary", "replica-a", "replica-b")}
+    for database in databases.values():
+        await _seed(database, regions)
+    counts = _count_statements(databases)
+
+    def router_for(strategy, extra_replicas=()):
+        replicas = [Replica(name, databases[name].engine) for name in ("replica-a", "replica-b")]
+        router = ReplicaRouter(databases["primary"].engine, replicas + list(extra_replicas), strategy=strategy)
+        factory = async_sessionmaker(databases["primary"].engine, class_=AsyncSession,
+                                     sync_session_class=RoutingSession, router=router, expire_on_commit=False)
+        return router, factory
+
+    for strategy in (ROUND_ROBIN, LEAST_BUSY):
+        router, factory = router_for(strategy)
+        counts.clear()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(position):
+            async with semaphore:
+                await _request(factory, names[position % len(names)])
+
+        start = time.perf_counter()
+        await asyncio.gather(*(limited(position) for position in range(sessions)))
+        elapsed = time.perf_counter() - start
+        print(f"{strategy:<12}: {sessions} sessions en {elapsed:.2f} s, instructions par base {dict(sorted(counts.items()))}")
+
+    # Read-your-writes : après une écriture, la session lit sur la primaire
+    router, factory = router_for(ROUND_ROBIN)
+    counts.clear()
+    async with factory() as session:
+        repository = SQLiteWeatherRepository(session)
+        await repository.create_weather_forecast({
+            "region_name": names[0], "forecast_date": (date.today() + timedelta(days=1)).isoformat(),
+            "condition": "Sunny", "humidity": 40, "temperature_avg": 21.5
+        })
+        forecasts = await repository.get_weather_forecast(names[0], 7)
+    print(f"read-your-writes : {len(forecasts)} prévision(s) relue(s), instructions par base {dict(sorted(counts.items()))}")
+
+    # Réplica en panne : retirée par la vérification de santé, le trafic se répartit sur les autres
+    broken = Replica("replica-down", SQLiteDatabase(os.path.join(directory, "absent", "down.db")).engine)
+    router, factory = router_for(ROUND_ROBIN, [broken])
+    await router.check_health()
+    counts.clear()
+    await asyncio.gather(*(_request(factory, names[position % len(names)]) for position in range(300)))
+    print(f"réplica en panne : saines {[replica.name for replica in router.replicas if replica.healthy]}, "
+          f"instructions par base {dict(sorted(counts.items()))}")
+
+    # Surcoût du routage : même lecture sur une session simple et sur une session routée
+    router, routed = router_for(ROUND_ROBIN)
+    plain = databases["primary"].session_factory
+    for label, factory in (("session simple", plain), ("session routée", routed)):
+        start = time.perf_counter()
+        async with factory() as session:
+            repository = SQLiteRegionRepository(session)
+            for position in range(sessions):
+                await repository.get_region_by_name(names[position % len(names)])
+        print(f"{label:<15}: {(time.perf_counter() - start) / sessions * 1e6:7.1f} µs par lecture")
+
+    start = time.perf_counter()
+    session = RoutingSession(router=router)
+    statement = Region.__table__.select()
+    for _ in range(100_000):
+        session.get_bind(clause=statement)
+    print(f"get_bind       : {(time.perf_counter() - start) / 100_000 * 1e6:7.2f} µs par appel")
+    session.close()
+
+    for database in databases.values():
+        await database.close()
+    await broken.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.sessions, arguments.concurrency))
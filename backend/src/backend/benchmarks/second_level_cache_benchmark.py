@@ -0,0 +1,108 @@
+"""
+Cache de second niveau : taille des charges utiles et coût de (dé)sérialisation du codec
+binaire comparés à JSON, puis latence d'un succès de cache (lecture + désérialisation)
+avec le stockage en mémoire et avec un serveur Redis (ou compatible) s'il répond.
+
+Les charges utiles viennent du jeu simulé : météo actuelle d'une région, 7 jours de
+prévisions, liste complète des régions.
+
+Utilisation :
+    python -m backend.benchmarks.second_level_cache_benchmark --regions 10000 --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Callable, List
+
+from backend.caching.backends import CacheBackend, InMemoryCacheBackend, RespCacheBackend
+from backend.repositories.implementations.second_level_cached_region_repository import ALL_REGIONS
+from backend.repositories.implementations.second_level_cached_weather_repository import CURRENT_WEATHER, FORECASTS
+from backend.repositories.implementations.simulated_weather_repository import SimulatedWeatherRepository
+from backend.resilience.resp_client import RespClient
+from backend.simulation.dataset import SimulatedDataset, generate_regions
+from backend.simulation.latency import LatencyModel
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _per_call_us(function: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def _hit_latencies_us(backend: CacheBackend, key: str, decode: Callable[[bytes], Any], repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode((await backend.get_many([key]))[0])
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return latencies
+
+
+async def _measure_hits(name: str, backend: CacheBackend, payloads, repeat: int):
+    print(f"  succès de cache, stockage {name} (lecture + désérialisation, médiane / p99)")
+    for label, namespace, value, count in payloads:
+        row = []
+        for format_name, encoded, decode in (
+            ("binaire", namespace.codec.encode(value), namespace.codec.decode),
+            ("JSON", _json_encode(value), json.loads),
+        ):
+            key = f"benchmark:{namespace.name}:{format_name}"
+            await backend.set_many({key: encoded}, 60)
+            latencies = await _hit_latencies_us(backend, key, decode, max(1, repeat // count))
+            row.append(f"{format_name} {statistics.median(latencies):,.1f} / "
+                       f"{sorted(latencies)[int(len(latencies) * 0.99)]:,.1f} µs")
+            await backend.delete([key])
+        print(f"    {label:<22}: {' ; '.join(row)}")
+
+
+async def run(regions: int, repeat: int, redis_url: str):
+    dataset = SimulatedDataset(region_count=regions, readings_per_region=4)
+    repository = SimulatedWeatherRepository(dataset, LatencyModel())
+    region_list = generate_regions(regions)
+    region_name = region_list[0]["name"]
+    payloads = [
+        ("météo actuelle", CURRENT_WEATHER, await repository.get_weather_by_region(region_name), 1),
+        ("prévisions 7 jours", FORECASTS, await repository.get_weather_forecast(region_name, 7), 7),
+        (f"{regions} régions", ALL_REGIONS, region_list, regions),
+    ]
+
+    print(f"Charges utiles (jeu simulé, {regions} régions)")
+    for label, namespace, value, count in payloads:
+        compact = namespace.codec.encode(value)
+        as_json = _json_encode(value)
+        assert namespace.codec.decode(compact) == json.loads(as_json)
+        calls = max(1, repeat // count)
+        print(f"  {label:<22}: {len(compact):>9,} octets contre {len(as_json):>9,} en JSON "
+              f"({len(compact) / len(as_json):.0%}) ; encodage {_per_call_us(lambda: namespace.codec.encode(value), calls):,.1f} µs "
+              f"(JSON {_per_call_us(lambda: _json_encode(value), calls):,.1f}), décodage "
+              f"{_per_call_us(lambda: namespace.codec.decode(compact), calls):,.1f} µs "
+              f"(JSON {_per_call_us(lambda: json.loads(as_json), calls):,.1f})")
+
+    await _measure_hits("en mémoire", InMemoryCacheBackend(), payloads, repeat)
+    backend = RespCacheBackend(RespClient.from_url(redis_url, timeout=2.0))
+    try:
+        await backend.client.execute("PING")
+    except (OSError, asyncio.TimeoutError) as e:
+        print(f"  stockage Redis ({redis_url}) indisponible, mesure ignorée: {e!r}")
+        return
+    try:
+        await _measure_hits(f"Redis ({redis_url})", backend, payloads, repeat)
+    finally:
+        await backend.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--regions", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20_000, help="Appels par mesure (divisés par le nombre de lignes)")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.regions, arguments.repeat, arguments.redis_url))
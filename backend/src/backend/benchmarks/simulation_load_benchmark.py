@@ -0,0 +1,127 @@
+"""
+Test de charge des couches contrôleur et service sur le backend de simulation,
+sans base de données : l'application FastAPI est appelée directement en ASGI
+(routage, validation, injection, sérialisation), avec N clients concurrents.
+
+Utilisation :
+    python -m backend.benchmarks.simulation_load_benchmark --regions 10000 --requests 5000 \
+        --concurrency 100 --latency lognormal --median-ms 2 --p99-ms 20 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+
+async def _asgi_get(app, path: str, query: str = "") -> int:
+    """Envoie une requête GET à l'application ASGI et retourne le code HTTP"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": query.encode(), "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0), "server": ("benchmark", 80), "root_path": ""
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+def _requests(count: int, regions: List[Tuple[int, str]], seed: int = 7) -> List[Tuple[str, str, str]]:
+    """Mélange de requêtes : (nom de l'endpoint, chemin, query string)"""
+    rng = random.Random(seed)
+    mix = []
+    for _ in range(count):
+        region_id, name = rng.choice(regions)
+        kind = rng.choices(["weather", "forecast", "region", "search", "at"], weights=[40, 20, 20, 10, 10])[0]
+        if kind == "weather":
+            mix.append((kind, f"/api/v1/weather/{name}", ""))
+        elif kind == "forecast":
+            mix.append((kind, f"/api/v1/weather/forecast/{name}/series", "days=7"))
+        elif kind == "region":
+            mix.append((kind, f"/api/v1/region/{region_id}", ""))
+        elif kind == "search":
+            mix.append((kind, "/api/v1/regions/search", f"q={name[:3]}"))
+        else:
+            mix.append((kind, "/api/v1/weather/at", f"lat={rng.uniform(42, 51):.4f}&lon={rng.uniform(-4, 8):.4f}"))
+    return mix
+
+
+async def run(requests: int, concurrency: int):
+    # Les erreurs injectées sont journalisées par les repositories : on ne mesure pas les journaux
+    logging.disable(logging.ERROR)
+    from backend.app import app
+    from backend.di.container import get_injector
+    from backend.repositories.backends import RepositoryBackend
+
+    async with app.router.lifespan_context(app):
+        backend = get_injector().get(RepositoryBackend)
+        regions = [(region["id"], region["name"]) for region in backend.dataset.snapshot().all()]
+        mix = _requests(requests, regions)
+        latencies: Dict[str, List[float]] = defaultdict(list)
+        statuses: Counter = Counter()
+        queue: "asyncio.Queue[Tuple[str, str, str]]" = asyncio.Queue()
+        for request in mix:
+            queue.put_nowait(request)
+
+        async def client():
+            while not queue.empty():
+                kind, path, query = queue.get_nowait()
+                start = time.perf_counter()
+                status = await _asgi_get(app, path, query)
+                latencies[kind].append((time.perf_counter() - start) * 1e3)
+                statuses[status] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    print(f"Régions / mesures         : {len(backend.dataset)} / {backend.dataset.reading_count}")
+    print(f"Latence simulée           : {backend.latency.distribution}, médiane {backend.latency.median_ms} ms, "
+          f"p99 {backend.latency.p99_ms} ms, erreurs {backend.latency.error_rate:.1%}")
+    print(f"Requêtes                  : {requests} avec {concurrency} clients en {elapsed:.2f} s "
+          f"({requests / elapsed:.0f} req/s)")
+    print(f"Codes HTTP                : {dict(sorted(statuses.items()))}")
+    print(f"Erreurs injectées         : {backend.latency.errors} sur {backend.latency.calls} appels")
+    for kind, values in sorted(latencies.items()):
+        values.sort()
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        print(f"  {kind:<10} n={len(values):<6} p50 {statistics.median(values):7.2f} ms   p99 {p99:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--regions", type=int, default=10_000)
+    parser.add_argument("--readings", type=int, default=48, help="Mesures par région")
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", default="lognormal", help="none | constant | uniform | lognormal")
+    parser.add_argument("--median-ms", type=float, default=2.0)
+    parser.add_argument("--p99-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    arguments = parser.parse_args()
+    # Le backend est choisi à la création de l'injector : l'environnement doit être prêt avant
+    os.environ.update({
+        "DATABASE_BACKEND": "simulation",
+        "SIMULATION_REGIONS": str(arguments.regions),
+        "SIMULATION_READINGS_PER_REGION": str(arguments.readings),
+        "SIMULATION_LATENCY": arguments.latency,
+        "SIMULATION_LATENCY_MEDIAN_MS": str(arguments.median_ms),
+        "SIMULATION_LATENCY_P99_MS": str(arguments.p99_ms),
+        "SIMULATION_ERROR_RATE": str(arguments.error_rate)
+    })
+    asyncio.run(run(arguments.requests, arguments.concurrency))
@@ -0,0 +1,55 @@
+"""
+Benchmark de la recherche des régions les plus proches : KD-tree contre balayage complet.
+
+Utilisation :
+    python -m backend.benchmarks.spatial_index_benchmark --regions 100000 --k 5
+"""
+
+import argparse
+import random
+import time
+
+from backend.benchmarks.region_catalog_benchmark import generate_regions
+from backend.indexes.spatial_index import RegionSpatialIndex
+
+
+def run(count: int, k: int, queries: int):
+    regions = generate_regions(count)
+
+    start = time.perf_counter()
+    index = RegionSpatialIndex(regions)
+    build_seconds = time.perf_counter() - start
+
+    rng = random.Random(3)
+    points = [(rng.uniform(41.0, 51.0), rng.uniform(-5.0, 9.5)) for _ in range(queries)]
+
+    # Les deux méthodes doivent retourner les mêmes régions
+    for latitude, longitude in points[:100]:
+        expected = [region_id for region_id, _ in index.nearest_brute_force(latitude, longitude, k)]
+        assert [region_id for region_id, _ in index.nearest(latitude, longitude, k)] == expected
+
+    start = time.perf_counter()
+    for latitude, longitude in points:
+        index.nearest(latitude, longitude, k)
+    kd_tree_us = (time.perf_counter() - start) / len(points) * 1e6
+
+    brute_force_points = points[:max(1, queries // 100)]
+    start = time.perf_counter()
+    for latitude, longitude in brute_force_points:
+        index.nearest_brute_force(latitude, longitude, k)
+    brute_force_us = (time.perf_counter() - start) / len(brute_force_points) * 1e6
+
+    print(f"Régions géolocalisées : {len(index)}")
+    print(f"Construction KD-tree  : {build_seconds:.2f} s")
+    print(f"KD-tree               : {kd_tree_us:.1f} µs/requête (k={k})")
+    print(f"Balayage complet      : {brute_force_us:.1f} µs/requête")
+    print(f"Accélération          : x{brute_force_us / kd_tree_us:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--regions", type=int, default=100_000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=5_000)
+    arguments = parser.parse_args()
+    run(arguments.regions, arguments.k, arguments.queries)
@@ -0,0 +1,177 @@
+"""
+Registre des instructions des lectures fréquentes (`database/statements.py`) comparé aux
+`select()` reconstruits à chaque appel, puis effet du cache d'instructions préparées
+d'asyncpg, sur une base PostgreSQL réelle (variables DB_* de l'application).
+
+Trois mesures par requête :
+- construction de l'instruction et calcul de sa clé de cache (Python seul, sans base) ;
+- temps CPU du processus client par exécution (surcoût Python : SQLAlchemy + asyncpg) ;
+- latence médiane d'une exécution, aller-retour avec le serveur compris.
+
+Quelques lignes sont insérées pour une région de test, puis supprimées.
+
+Utilisation :
+    DB_HOST=localhost python -m backend.benchmarks.statement_registry_benchmark --calls 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_, delete, desc, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.database.connection import db_config
+from backend.database.models import Region, WeatherData, WeatherForecast
+from backend.database.prepared_statements import PreparedStatementMonitor
+from backend.database.statements import REGION_BY_ID, WEATHER_BY_REGION, WEATHER_FORECAST
+
+REGION_NAME = "Benchmark-Registre"
+
+
+def _inline_weather_by_region(region_name: str):
+    return (select(WeatherData)
+            .where(and_(WeatherData.region_name.ilike(f"%{region_name}%"), WeatherData.is_forecast == False))
+            .order_by(desc(WeatherData.recorded_at))
+            .limit(1))
+
+
+def _inline_weather_forecast(region_name: str, days: int):
+    return (select(WeatherForecast)
+            .where(and_(
+                WeatherForecast.region_name == region_name,
+                WeatherForecast.forecast_date <= date.today() + timedelta(days=days),
+                WeatherForecast.forecast_date >= date.today()
+            ))
+            .order_by(WeatherForecast.forecast_date)
+            .limit(days))
+
+
+def _inline_region_by_id(region_id: int):
+    return select(Region).where(Region.id == region_id)
+
+
+def _queries(region_id: int):
+    """(nom, instruction reconstruite à chaque appel, instruction du registre et ses paramètres)"""
+    today = date.today()
+    return [
+        ("get_weather_by_region",
+         lambda: (_inline_weather_by_region(REGION_NAME), None),
+         lambda: (WEATHER_BY_REGION, {"pattern": f"%{REGION_NAME}%"})),
+        ("get_weather_forecast",
+         lambda: (_inline_weather_forecast(REGION_NAME, 7), None),
+         lambda: (WEATHER_FORECAST, {"region_name": REGION_NAME, "start_date": today,
+                                     "end_date": today + timedelta(days=7), "days": 7})),
+        ("get_region_info_by_id",
+         lambda: (_inline_region_by_id(region_id), None),
+         lambda: (REGION_BY_ID, {"region_id": region_id})),
+    ]
+
+
+def _build_us(build, calls: int) -> float:
+    """Construction de l'instruction + clé de cache (ce que fait `execute` avant la compilation)"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        stmt, _ = build()
+        stmt._generate_cache_key()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def _execute(factory, build, calls: int):
+    """Temps CPU du client par appel et latence médiane, sur une session (une connexion)"""
+    async with factory() as session:
+        for _ in range(20):
+            stmt, parameters = build()
+            (await session.execute(stmt, parameters)).scalars().all()
+        latencies = []
+        cpu_start = time.process_time()
+        for _ in range(calls):
+            start = time.perf_counter()
+            stmt, parameters = build()
+            (await session.execute(stmt, parameters)).scalars().all()
+            latencies.append((time.perf_counter() - start) * 1e6)
+        cpu = (time.process_time() - cpu_start) / calls * 1e6
+    return cpu, statistics.median(latencies)
+
+
+async def _seed(factory) -> int:
+    async with factory() as session:
+        await _cleanup(session)
+        region_id = (await session.execute(
+            insert(Region).values(name=REGION_NAME, nb_habitants=1000).returning(Region.id)
+        )).scalar_one()
+        now = datetime.now()
+        await session.execute(insert(WeatherData), [
+            {"region_name": REGION_NAME, "temperature": 10 + hour / 10, "condition": "Cloudy", "humidity": 70,
+             "pressure": 1012.5, "wind_speed": 8.0, "wind_direction": "W", "is_forecast": False,
+             "forecast_day": 0, "recorded_at": now - timedelta(hours=hour)}
+            for hour in range(48)
+        ])
+        await session.execute(insert(WeatherForecast), [
+            {"region_name": REGION_NAME, "forecast_date": date.today() + timedelta(days=day), "day_name": "Lundi",
+             "temperature_min": 8.0, "temperature_max": 16.0, "temperature_avg": 12.0, "condition": "Sunny",
+             "humidity": 60, "pressure": 1015.0, "wind_speed": 5.0, "wind_direction": "N",
+             "precipitation_probability": 10}
+            for day in range(10)
+        ])
+        await session.commit()
+        return region_id
+
+
+async def _cleanup(session: AsyncSession):
+    await session.execute(delete(WeatherData).where(WeatherData.region_name == REGION_NAME))
+    await session.execute(delete(WeatherForecast).where(WeatherForecast.region_name == REGION_NAME))
+    await session.execute(delete(Region).where(Region.name == REGION_NAME))
+    await session.commit()
+
+
+def _engine(cache_size: int):
+    options = db_config.get_engine_options()
+    options["connect_args"] = {**options["connect_args"], "prepared_statement_cache_size": cache_size}
+    return create_async_engine(db_config.get_database_url(), **options)
+
+
+async def run(calls: int):
+    logging.disable(logging.WARNING)
+    engine = _engine(db_config.prepared_statement_cache_size)
+    monitor = PreparedStatementMonitor()
+    monitor.attach(engine)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    uncached_engine = _engine(0)
+    uncached_factory = async_sessionmaker(uncached_engine, class_=AsyncSession, expire_on_commit=False)
+    region_id = await _seed(factory)
+    try:
+        print(f"Construction + clé de cache (Python seul, {calls} appels)")
+        for name, inline, registry in _queries(region_id):
+            print(f"  {name:<22}: reconstruite {_build_us(inline, calls):7.1f} µs ; registre {_build_us(registry, calls):5.2f} µs")
+
+        print(f"Exécution sur PostgreSQL ({calls} appels par mesure) : CPU client par appel / latence médiane")
+        for name, inline, registry in _queries(region_id):
+            row = []
+            for label, current_factory, build in (
+                ("reconstruite", factory, inline),
+                ("registre", factory, registry),
+                ("registre sans cache asyncpg", uncached_factory, registry),
+            ):
+                cpu, latency = await _execute(current_factory, build, calls)
+                row.append(f"{label} {cpu:6.1f} / {latency:6.1f} µs")
+            print(f"  {name:<22}: {' ; '.join(row)}")
+
+        print("Cache d'instructions préparées (moteur par défaut) :")
+        for key, value in monitor.metrics().items():
+            print(f"  {key}: {value}")
+    finally:
+        async with factory() as session:
+            await _cleanup(session)
+        await engine.dispose()
+        await uncached_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.calls))
@@ -0,0 +1,95 @@
+"""
+Formats des réponses tabulaires : historique météo d'une région en JSON (chemin actuel :
+dictionnaires, validation du modèle de réponse puis json.dumps), MessagePack et Arrow IPC
+(produits depuis les lignes). Mesure la taille, l'encodage côté serveur et le décodage
+côté client jusqu'aux colonnes.
+
+Par défaut sur le backend de simulation (une région, `--rows` mesures à une minute
+d'intervalle) ; avec `--backend postgresql --region Nom`, sur l'historique de cette région
+dans la base configurée par les variables DB_*, avec en plus la lecture du repository :
+entités ORM et `to_dict()` contre lignes.
+
+Utilisation :
+    python -m backend.benchmarks.tabular_formats_benchmark --rows 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+
+def _timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+async def run(backend: str, rows: int, region: str):
+    os.environ["DATABASE_BACKEND"] = backend
+    os.environ["SIMULATION_REGIONS"] = "1"
+    os.environ["SIMULATION_READINGS_PER_REGION"] = str(rows)
+    os.environ["SIMULATION_READING_INTERVAL_MINUTES"] = "1"
+    logging.disable(logging.CRITICAL)
+
+    import msgpack
+    import pyarrow.ipc
+
+    from backend.database.connection import close_database, engine
+    from backend.di import container
+    from backend.serialization.tabular import ARROW_STREAM, MSGPACK, encode
+    from backend.services.schemas.weather_resp_schema import MAX_HISTORY_DAYS, WeatherReadingResponse
+
+    engine.echo = False
+    repository_backend = container.get_repository_backend()
+    await repository_backend.initialize()
+    async with repository_backend.session_factory() as session:
+        if backend == "simulation":
+            region = (await container.get_region_repository(session).get_all_regions())[0]["name"]
+        repository = repository_backend.weather_repository(session)
+        start = time.perf_counter()
+        rowset = await repository.get_weather_history_rows(region, MAX_HISTORY_DAYS)
+        rows_ms = (time.perf_counter() - start) * 1000
+        if backend == "postgresql":
+            session.expunge_all()
+            start = time.perf_counter()
+            await repository.get_weather_history(region, MAX_HISTORY_DAYS)
+            dicts_ms = (time.perf_counter() - start) * 1000
+            print(f"Repository PostgreSQL, {len(rowset.rows):,} mesures : entités ORM + to_dict() {dicts_ms:7.0f} ms, "
+                  f"lignes {rows_ms:7.0f} ms")
+
+    print(f"Backend {backend}, historique de {len(rowset.rows):,} mesures")
+    adapter = TypeAdapter(List[WeatherReadingResponse])
+
+    def encode_json() -> bytes:
+        # Ce que fait FastAPI avec response_model : validation, sérialisation, json.dumps
+        validated = adapter.validate_python(rowset.records())
+        return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False,
+                          separators=(",", ":")).encode()
+
+    formats = [
+        ("JSON", encode_json, json.loads),
+        ("MessagePack", lambda: encode(rowset, MSGPACK), lambda body: msgpack.unpackb(body, timestamp=3)),
+        ("Arrow IPC", lambda: encode(rowset, ARROW_STREAM), lambda body: pyarrow.ipc.open_stream(body).read_all()),
+    ]
+    for label, encoder, decoder in formats:
+        body, encode_ms = _timed(encoder)
+        _, decode_ms = _timed(lambda: decoder(body))
+        print(f"  {label:<12}: {len(body) / 1e6:7.1f} Mo, encodage {encode_ms:7.0f} ms, décodage client {decode_ms:7.0f} ms")
+
+    await repository_backend.close()
+    await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=("simulation", "postgresql"), default="simulation")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--region", default="Paris")
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.backend, arguments.rows, arguments.region))
@@ -0,0 +1,150 @@
+"""
+Archive Parquet de l'historique météo (`archive/weather_archive.py`).
+
+Par défaut, sans base : les mesures de `--regions` régions simulées (une par heure sur
+`--days` jours) sont écrites dans une archive temporaire, un fichier par mois clos. Mesure
+la taille des fichiers, puis la lecture de l'historique d'une région : fichiers des seuls
+mois concernés et groupes de lignes filtrés par leurs statistiques (région, période), contre
+la lecture complète des fichiers filtrée ensuite en mémoire.
+
+Avec `--backend postgresql --region Nom`, mesure l'historique de cette région par le
+repository de la base configurée par les variables DB_* : la base seule, ou la base et
+l'archive si WEATHER_ARCHIVE_DIR est définie (lancer `python -m backend.archive.archiver`
+entre deux mesures).
+
+Utilisation :
+    python -m backend.benchmarks.weather_archive_benchmark --regions 200 --days 365
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def _median_ms(call, repeats: int) -> float:
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def run_archive(regions: int, days: int, row_group_size: int, repeats: int):
+    logging.disable(logging.CRITICAL)
+
+    import pyarrow.compute
+    import pyarrow.parquet
+
+    from backend.archive.weather_archive import WeatherArchive, add_months, month_start
+    from backend.simulation.dataset import SimulatedDataset, generate_regions
+
+    dataset = SimulatedDataset(region_count=regions, readings_per_region=days * 24, reading_interval_minutes=60)
+    names = [region["name"] for region in generate_regions(regions, dataset.seed)]
+    now = datetime.now(timezone.utc)
+    archive = WeatherArchive(tempfile.mkdtemp(prefix="weather-archive-"), hot_months=2, row_group_size=row_group_size)
+    cutoff = archive.cutoff(now)
+
+    # Lignes des mois clos, triées par (région, date) comme celles de l'archiveur
+    by_month = {}
+    next_id = 1
+    for name in sorted(names):
+        for row in reversed(dataset.reading_rows_since(name, now - timedelta(days=days + 1))):
+            if row[7] < cutoff:
+                by_month.setdefault(month_start(row[7]), []).append((next_id, *row))
+                next_id += 1
+    start = time.perf_counter()
+    for month, rows in sorted(by_month.items()):
+        temporary = archive.temporary_path(month)
+        with archive.writer(temporary) as writer:
+            for position in range(0, len(rows), archive.row_group_size):
+                writer.write_batch(archive.batch(rows[position:position + archive.row_group_size]),
+                                   row_group_size=archive.row_group_size)
+        archive.publish(temporary, month)
+    write_ms = (time.perf_counter() - start) * 1000
+    archived = sum(len(rows) for rows in by_month.values())
+    size = sum(os.path.getsize(archive.path(month)) for month in by_month)
+    groups = sum(pyarrow.parquet.ParquetFile(archive.path(month)).metadata.num_row_groups for month in by_month)
+    print(f"Archive : {regions} régions, groupes de {row_group_size} lignes, {archived:,} mesures en {len(by_month)} fichiers mensuels, "
+          f"{groups} groupes, {size / 1e6:.1f} Mo ({size / archived:.1f} octets par mesure), "
+          f"écriture {write_ms:.0f} ms")
+
+    boundary = archive.boundary()
+    region = names[len(names) // 2]
+
+    def full_scan(start: datetime, end: datetime):
+        # Sans filtrage à la lecture : tous les fichiers lus entièrement, filtrés ensuite
+        table = pyarrow.concat_tables(
+            pyarrow.parquet.read_table(archive.path(month), memory_map=True) for month in archive.months()
+        )
+        mask = pyarrow.compute.and_(
+            pyarrow.compute.equal(table["region_name"], region),
+            pyarrow.compute.and_(pyarrow.compute.greater_equal(table["recorded_at"], pyarrow.scalar(start)),
+                                 pyarrow.compute.less(table["recorded_at"], pyarrow.scalar(end)))
+        )
+        return table.filter(mask)
+
+    oldest = archive.months()[0]
+    windows = [
+        ("tout l'archivé", now - timedelta(days=days + 1), boundary),
+        ("un mois ancien", oldest, add_months(oldest, 1)),
+    ]
+    print(f"Historique de {region}, médiane sur {repeats} lectures")
+    for label, start, end in windows:
+        count = archive.read_history(region, start, end).num_rows
+        assert full_scan(start, end).num_rows == count
+        pushdown_ms = _median_ms(lambda: archive.read_history(region, start, end), repeats)
+        scan_ms = _median_ms(lambda: full_scan(start, end), repeats)
+        print(f"  {label:<16}: {count:>6,} mesures, filtrage à la lecture {pushdown_ms:7.2f} ms, "
+              f"lecture complète {scan_ms:7.2f} ms")
+
+
+async def run_postgresql(region: str, repeats: int):
+    os.environ["DATABASE_BACKEND"] = "postgresql"
+    os.environ["SECOND_LEVEL_CACHE_URL"] = "none"
+    logging.disable(logging.CRITICAL)
+
+    from backend.archive.weather_archive import get_weather_archive
+    from backend.database.connection import close_database, engine
+    from backend.di import container
+
+    engine.echo = False
+    archive = get_weather_archive()
+    repository_backend = container.get_repository_backend()
+    print(f"PostgreSQL, historique de {region}, "
+          + (f"archive {archive.directory} (limite {archive.boundary():%Y-%m-%d})" if archive else "sans archive")
+          + f", médiane sur {repeats} lectures")
+    async with repository_backend.session_factory() as session:
+        repository = repository_backend.weather_repository(session)
+        for days in (7, 90, 3660):
+            for label, read in (("lignes", repository.get_weather_history_rows),
+                                ("dictionnaires", repository.get_weather_history)):
+                durations = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    result = await read(region, days)
+                    durations.append((time.perf_counter() - start) * 1000)
+                    session.expunge_all()
+                count = len(result.rows) if label == "lignes" else len(result)
+                print(f"  {days:>5} jours, {label:<13}: {count:>7,} mesures, {statistics.median(durations):8.1f} ms")
+    await close_database()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=("archive", "postgresql"), default="archive")
+    parser.add_argument("--regions", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--row-group-size", type=int, default=16384)
+    parser.add_argument("--region", default="Bulk")
+    parser.add_argument("--repeats", type=int, default=20)
+    arguments = parser.parse_args()
+    if arguments.backend == "postgresql":
+        asyncio.run(run_postgresql(arguments.region, arguments.repeats))
+    else:
+        run_archive(arguments.regions, arguments.days, arguments.row_group_size, arguments.repeats)
@@ -0,0 +1,148 @@
+"""
+Stockages du cache de second niveau : en mémoire du processus (par défaut) ou dans un
+serveur Redis partagé par tous les workers (protocole RESP, voir `resilience/resp_client.py`).
+Les valeurs sont des octets déjà sérialisés ; l'expiration est gérée par le stockage.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.resilience.resp_client import RespClient
+
+
+class CacheBackend(ABC):
+    """Stockage clé → octets avec expiration"""
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """
+        Lit plusieurs clés en un aller-retour.
+
+        Returns:
+            Les valeurs, dans l'ordre des clés (None si absente ou expirée)
+        """
+        pass
+
+    @abstractmethod
+    async def set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        """Écrit plusieurs clés avec la même durée de vie"""
+        pass
+
+    @abstractmethod
+    async def delete(self, keys: Sequence[str]):
+        """Supprime des clés (absentes : sans effet)"""
+        pass
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> int:
+        """
+        Supprime toutes les clés qui commencent par `prefix` (parcours complet : opération rare).
+
+        Returns:
+            Nombre de clés supprimées
+        """
+        pass
+
+    async def close(self):
+        """Libère les ressources du stockage"""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Cache propre au processus (LRU borné) : un worker froid ne profite pas du travail des autres"""
+
+    def __init__(self, max_entries: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_entries: Nombre maximal de clés conservées (les moins récentes sont oubliées)
+            clock: Horloge monotone (remplaçable pour les mesures)
+        """
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        now = self.clock()
+        values = []
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                values.append(None)
+            elif entry[1] <= now:
+                del self._entries[key]
+                values.append(None)
+            else:
+                self._entries.move_to_end(key)
+                values.append(entry[0])
+        return values
+
+    async def set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        expires_at = self.clock() + ttl_seconds
+        for key, value in items.items():
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, keys: Sequence[str]):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RespCacheBackend(CacheBackend):
+    """
+    Cache partagé dans un serveur Redis (ou compatible) : MGET en lecture,
+    SET … PX en écriture (envoyées d'un bloc pour un lot), DEL pour l'invalidation
+    (SCAN … MATCH pour celle d'un namespace entier).
+    Les erreurs remontent à `SecondLevelCache`, qui les traite comme des absences.
+    """
+
+    def __init__(self, client: RespClient):
+        """
+        Args:
+            client: Client RESP vers le serveur partagé
+        """
+        self.client = client
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self.client.execute("MGET", *keys)
+
+    async def set_many(self, items: Dict[str, bytes], ttl_seconds: float):
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        if len(items) == 1:
+            key, value = next(iter(items.items()))
+            await self.client.execute("SET", key, value, "PX", ttl_ms)
+            return
+        # Pas de MSET avec expiration : une commande par clé, envoyées d'un bloc
+        commands = [("SET", key, value, "PX", ttl_ms) for key, value in items.items()]
+        await self.client.execute_pipeline(commands)
+
+    async def delete(self, keys: Sequence[str]):
+        if keys:
+            await self.client.execute("DEL", *keys)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        # Caractères spéciaux des motifs de MATCH échappés : le préfixe est pris littéralement
+        pattern = "".join("\\" + char if char in "*?[]\\" else char for char in prefix) + "*"
+        cursor, deleted = b"0", 0
+        while True:
+            cursor, keys = await self.client.execute("SCAN", cursor, "MATCH", pattern, "COUNT", 1000)
+            if keys:
+                deleted += await self.client.execute("DEL", *keys)
+            if cursor in (b"0", "0"):
+                return deleted
+
+    async def close(self):
+        await self.client.close()
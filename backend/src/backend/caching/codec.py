@@ -0,0 +1,372 @@
+"""
+Sérialisation binaire compacte des charges utiles du cache de second niveau.
+
+Les valeurs sont les dictionnaires renvoyés par les repositories (régions, mesures,
+prévisions) : JSON y répète chaque nom de champ et écrit les nombres et les dates en
+texte. Ici :
+- les noms de champs connus du namespace sont remplacés par leur position dans la table
+  des champs (un octet) ; un champ inconnu est écrit en clair, il n'est jamais perdu ;
+- les entiers sont des varints zigzag ; les flottants à deux ou six décimales exactes
+  (colonnes DECIMAL(5,2) / (6,2), coordonnées DECIMAL(9,6)) sont écrits en centièmes ou
+  en millionièmes entiers, les autres sur 8 octets ;
+- les dates et horodatages ISO 8601 sont écrits en jours / microsecondes depuis l'epoch,
+  uniquement si le décodage redonne exactement la même chaîne.
+
+Ce format valeur par valeur est interprété en Python : il convient aux petites charges
+utiles. Une longue liste d'enregistrements de mêmes champs (liste des régions) est écrite
+par colonnes, avec struct et des chaînes jointes, sans boucle par valeur ; au-delà de
+`COMPRESS_MIN_BYTES`, le résultat est compressé (zlib, niveau 1).
+"""
+
+import math
+import struct
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Version du format, incluse dans l'empreinte des clés
+FORMAT_VERSION = 2
+
+# Listes d'enregistrements écrites par colonnes à partir de ce nombre de lignes
+COLUMNAR_MIN_ROWS = 32
+# Charges utiles compressées au-delà de cette taille
+COMPRESS_MIN_BYTES = 4096
+
+# Premier octet : format de la suite
+_TAGGED, _COLUMNAR, _COMPRESSED = b"T", b"C", b"Z"
+# Type d'une colonne
+_COLUMN_INT, _COLUMN_FLOAT, _COLUMN_BOOL, _COLUMN_STR, _COLUMN_TAGGED = b"i", b"f", b"b", b"s", b"t"
+_INT64_RANGE = range(-(1 << 63), 1 << 63)
+
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _CENTS, _MICROS, _STR, _LIST, _DICT, _DATE, _DATETIME = range(12)
+
+_DOUBLE = struct.Struct("<d")
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_DATE = date(1970, 1, 1)
+# Horodatage sans fuseau : décalage réservé, hors des décalages UTC valides (± 24 h)
+_NAIVE_OFFSET = 24 * 60
+
+
+class CodecError(ValueError):
+    """Charge utile illisible (tronquée ou écrite par un autre format)"""
+
+
+class CompactCodec:
+    """
+    Codec d'un namespace : la table des champs est fixée à la construction et
+    son empreinte versionne les clés (une autre table ne relit jamais ces octets).
+    """
+
+    def __init__(self, fields: Sequence[str]):
+        """
+        Args:
+            fields: Noms de champs fréquents, dans un ordre stable (64 au plus : un octet par nom)
+        """
+        if len(fields) > 64:
+            raise ValueError("64 champs au plus par namespace")
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self._field_index = {field: position for position, field in enumerate(self.fields)}
+        self.fingerprint = format(zlib.crc32(f"{FORMAT_VERSION}|{','.join(self.fields)}".encode()), "08x")
+
+    def encode(self, value: Any) -> bytes:
+        """Sérialise un dictionnaire, une liste ou une valeur simple"""
+        out = bytearray()
+        keys = _record_keys(value)
+        if keys is not None:
+            out += _COLUMNAR
+            self._write_columns(out, value, keys)
+        else:
+            out += _TAGGED
+            self._write(out, value)
+        if len(out) > COMPRESS_MIN_BYTES:
+            return _COMPRESSED + zlib.compress(out, 1)
+        return bytes(out)
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Relit une valeur écrite par `encode`.
+
+        Raises:
+            CodecError: Octets tronqués ou invalides
+        """
+        try:
+            if data[:1] == _COMPRESSED:
+                data = zlib.decompress(data[1:])
+            mode = data[:1]
+            if mode == _COLUMNAR:
+                value, position = self._read_columns(data, 1)
+            elif mode == _TAGGED:
+                value, position = self._read(data, 1)
+            else:
+                raise CodecError(f"format inconnu: {mode!r}")
+        except (IndexError, struct.error, UnicodeDecodeError, OverflowError, ValueError, zlib.error) as e:
+            raise CodecError(f"charge utile illisible: {e}") from e
+        if position != len(data):
+            raise CodecError("octets en trop après la valeur")
+        return value
+
+    def _write_key(self, out: bytearray, key: str):
+        position = self._field_index.get(key)
+        if position is not None:
+            _write_varint(out, position << 1)
+        else:
+            # Champ hors table : bit de poids faible à 1, puis le nom en clair
+            encoded = str(key).encode()
+            _write_varint(out, (len(encoded) << 1) | 1)
+            out += encoded
+
+    def _read_key(self, data: bytes, position: int) -> Tuple[str, int]:
+        header, position = _read_varint(data, position)
+        if header & 1:
+            length = header >> 1
+            return data[position:position + length].decode(), position + length
+        return self.fields[header >> 1], position
+
+    def _write_columns(self, out: bytearray, records: List[Dict[str, Any]], keys: Tuple[str, ...]):
+        _write_varint(out, len(records))
+        _write_varint(out, len(keys))
+        for key in keys:
+            self._write_key(out, key)
+            column = [record[key] for record in records]
+            # Valeurs absentes : un octet par ligne, puis seulement les valeurs présentes
+            present = column
+            if None in column:
+                out.append(1)
+                out += bytes(value is None for value in column)
+                present = [value for value in column if value is not None]
+            else:
+                out.append(0)
+            kinds = set(map(type, present))
+            if kinds == {int} and min(present) in _INT64_RANGE and max(present) in _INT64_RANGE:
+                body, kind = struct.pack(f"<{len(present)}q", *present), _COLUMN_INT
+            elif kinds == {float}:
+                body, kind = struct.pack(f"<{len(present)}d", *present), _COLUMN_FLOAT
+            elif kinds == {bool}:
+                body, kind = bytes(present), _COLUMN_BOOL
+            elif kinds == {str} and not any("\x00" in value for value in present):
+                body, kind = "\x00".join(present).encode(), _COLUMN_STR
+            else:
+                # Colonne hétérogène (ou vide) : valeur par valeur
+                tagged = bytearray()
+                self._write(tagged, present)
+                body, kind = bytes(tagged), _COLUMN_TAGGED
+            out += kind
+            _write_varint(out, len(body))
+            out += body
+
+    def _read_columns(self, data: bytes, position: int) -> Tuple[List[Dict[str, Any]], int]:
+        count, position = _read_varint(data, position)
+        width, position = _read_varint(data, position)
+        keys, columns = [], []
+        for _ in range(width):
+            key, position = self._read_key(data, position)
+            nulls = None
+            if data[position]:
+                nulls = data[position + 1:position + 1 + count]
+                position += count
+            position += 1
+            kind = data[position:position + 1]
+            length, position = _read_varint(data, position + 1)
+            body = data[position:position + length]
+            position += length
+            present = count - sum(nulls) if nulls is not None else count
+            if kind == _COLUMN_INT:
+                values = struct.unpack(f"<{present}q", body)
+            elif kind == _COLUMN_FLOAT:
+                values = struct.unpack(f"<{present}d", body)
+            elif kind == _COLUMN_BOOL:
+                values = [bool(byte) for byte in body]
+            elif kind == _COLUMN_STR:
+                values = body.decode().split("\x00") if present else []
+            elif kind == _COLUMN_TAGGED:
+                values, end = self._read(body, 0)
+                if end != len(body):
+                    raise CodecError("colonne tronquée")
+            else:
+                raise CodecError(f"type de colonne inconnu: {kind!r}")
+            if len(values) != present:
+                raise CodecError("colonne tronquée")
+            if nulls is not None:
+                remaining = iter(values)
+                values = [None if null else next(remaining) for null in nulls]
+            keys.append(key)
+            columns.append(values)
+        return [dict(zip(keys, row)) for row in zip(*columns)] if keys else [{} for _ in range(count)], position
+
+    def _write(self, out: bytearray, value: Any):
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, _zigzag(value))
+        elif isinstance(value, float):
+            # Bornes : entiers exacts en double, infinis / NaN et -0.0 écrits tels quels
+            scalable = abs(value) < 1e9 and (value != 0 or math.copysign(1.0, value) > 0)
+            if scalable and round(value * 100) / 100 == value:
+                out.append(_CENTS)
+                _write_varint(out, _zigzag(round(value * 100)))
+            elif scalable and round(value * 1_000_000) / 1_000_000 == value:
+                out.append(_MICROS)
+                _write_varint(out, _zigzag(round(value * 1_000_000)))
+            else:
+                out.append(_FLOAT)
+                out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            if not _write_temporal(out, value):
+                out.append(_STR)
+                _write_text(out, value)
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                self._write_key(out, key)
+                self._write(out, item)
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self._write(out, item)
+        else:
+            raise TypeError(f"type non sérialisable: {type(value).__name__}")
+
+    def _read(self, data: bytes, position: int) -> Tuple[Any, int]:
+        tag = data[position]
+        position += 1
+        if tag == _NONE:
+            return None, position
+        if tag == _TRUE:
+            return True, position
+        if tag == _FALSE:
+            return False, position
+        if tag == _INT:
+            value, position = _read_varint(data, position)
+            return _unzigzag(value), position
+        if tag == _CENTS:
+            value, position = _read_varint(data, position)
+            return _unzigzag(value) / 100, position
+        if tag == _MICROS:
+            value, position = _read_varint(data, position)
+            return _unzigzag(value) / 1_000_000, position
+        if tag == _FLOAT:
+            return _DOUBLE.unpack_from(data, position)[0], position + 8
+        if tag == _STR:
+            return _read_text(data, position)
+        if tag == _DATE:
+            days, position = _read_varint(data, position)
+            return (_EPOCH_DATE + timedelta(days=_unzigzag(days))).isoformat(), position
+        if tag == _DATETIME:
+            return _read_datetime(data, position)
+        if tag == _LIST:
+            count, position = _read_varint(data, position)
+            items: List[Any] = []
+            for _ in range(count):
+                item, position = self._read(data, position)
+                items.append(item)
+            return items, position
+        if tag == _DICT:
+            count, position = _read_varint(data, position)
+            record: Dict[str, Any] = {}
+            for _ in range(count):
+                key, position = self._read_key(data, position)
+                record[key], position = self._read(data, position)
+            return record, position
+        raise CodecError(f"type inconnu: {tag}")
+
+
+def _record_keys(value: Any):
+    """Champs communs d'une longue liste de dictionnaires de mêmes clés (sinon None)"""
+    if not isinstance(value, list) or len(value) < COLUMNAR_MIN_ROWS or type(value[0]) is not dict:
+        return None
+    keys = tuple(value[0])
+    key_set = set(keys)
+    for record in value:
+        if type(record) is not dict or record.keys() != key_set:
+            return None
+    return keys
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _write_text(out: bytearray, value: str):
+    encoded = value.encode()
+    _write_varint(out, len(encoded))
+    out += encoded
+
+
+def _read_text(data: bytes, position: int) -> Tuple[str, int]:
+    length, position = _read_varint(data, position)
+    end = position + length
+    if end > len(data):
+        raise CodecError("chaîne tronquée")
+    return data[position:end].decode(), end
+
+
+def _write_temporal(out: bytearray, value: str) -> bool:
+    """Écrit une date ou un horodatage ISO 8601 en binaire si la conversion est exacte"""
+    if len(value) < 10 or value[4] != "-" or value[7] != "-":
+        return False
+    if len(value) == 10:
+        try:
+            parsed_date = date.fromisoformat(value)
+        except ValueError:
+            return False
+        out.append(_DATE)
+        _write_varint(out, _zigzag((parsed_date - _EPOCH_DATE).days))
+        return True
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    # isoformat() omet les microsecondes nulles : le relu doit être identique à l'original
+    if parsed.isoformat() != value:
+        return False
+    offset = parsed.utcoffset()
+    if offset is None:
+        offset_minutes = _NAIVE_OFFSET
+    elif offset % timedelta(minutes=1):
+        return False
+    else:
+        offset_minutes = offset // timedelta(minutes=1)
+    local = parsed.replace(tzinfo=None)
+    out.append(_DATETIME)
+    _write_varint(out, _zigzag((local - _EPOCH) // timedelta(microseconds=1)))
+    _write_varint(out, _zigzag(offset_minutes))
+    return True
+
+
+def _read_datetime(data: bytes, position: int) -> Tuple[str, int]:
+    micros, position = _read_varint(data, position)
+    offset_minutes, position = _read_varint(data, position)
+    offset_minutes = _unzigzag(offset_minutes)
+    local = _EPOCH + timedelta(microseconds=_unzigzag(micros))
+    if offset_minutes != _NAIVE_OFFSET:
+        local = local.replace(tzinfo=timezone(timedelta(minutes=offset_minutes)))
+    return local.isoformat(), position
@@ -0,0 +1,226 @@
+"""
+Cache de second niveau, derrière les repositories.
+
+Les caches du processus (catalogue des régions, stations de l'interpolation) repartent
+de zéro à chaque démarrage de worker. Ce cache conserve les lectures fréquentes
+(régions, météo actuelle, prévisions) dans un stockage interchangeable : en mémoire par
+défaut, ou dans un serveur Redis partagé par toute la flotte (SECOND_LEVEL_CACHE_URL).
+
+Les clés sont préfixées par le namespace, sa version et l'empreinte de son codec :
+`weather-app:forecasts:v1.3f2a9c1e:Paris:7`. Un déploiement qui change la forme d'une
+charge utile (version ou table des champs) lit et écrit d'autres clés ; les anciennes
+expirent d'elles-mêmes, sans vidage du cache partagé.
+
+Le cache n'est jamais indispensable : une erreur du stockage compte comme une absence.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Iterable, Optional, Sequence, Set
+
+from backend.caching.backends import CacheBackend, InMemoryCacheBackend, RespCacheBackend
+from backend.caching.codec import CodecError, CompactCodec
+from backend.resilience.resp_client import RespClient
+
+logger = logging.getLogger(__name__)
+
+
+class CacheNamespace:
+    """Famille de clés d'un même type de charge utile"""
+
+    def __init__(self, name: str, version: int, fields: Sequence[str], ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            name: Nom du namespace (premier segment de la clé)
+            version: À incrémenter quand le sens d'une charge utile change sans changer ses champs
+            fields: Champs fréquents des charges utiles (voir `CompactCodec`)
+            ttl_seconds: Durée de vie propre au namespace (sinon celle du cache)
+        """
+        self.name = name
+        self.version = version
+        self.codec = CompactCodec(fields)
+        self.ttl_seconds = ttl_seconds
+
+    def key(self, prefix: str, parts: Sequence[Any]) -> str:
+        """Clé complète : préfixe, namespace, version.empreinte, puis les segments"""
+        return self.key_prefix(prefix) + ":".join(map(str, parts))
+
+    def key_prefix(self, prefix: str) -> str:
+        """Début commun à toutes les clés du namespace (version et empreinte courantes)"""
+        return f"{prefix}:{self.name}:v{self.version}.{self.codec.fingerprint}:"
+
+
+class SecondLevelCache:
+    """
+    Cache de second niveau partagé par les repositories du processus.
+    Les gestionnaires d'invalidation synchrones (notifications PostgreSQL) passent
+    par `invalidate_soon`, qui planifie la suppression sans attendre le stockage.
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str = "weather-app", ttl_seconds: float = 30.0):
+        """
+        Args:
+            backend: Stockage des valeurs sérialisées
+            prefix: Préfixe commun des clés (une application ou un environnement par préfixe)
+            ttl_seconds: Durée de vie par défaut des entrées
+        """
+        self.backend = backend
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self._pending: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.invalidations = 0
+        self.errors = 0
+        self._failing = False
+
+    @classmethod
+    def from_env(cls) -> Optional["SecondLevelCache"]:
+        """
+        Construit le cache à partir de SECOND_LEVEL_CACHE_URL (memory par défaut,
+        redis://… pour un cache partagé, none pour le désactiver), SECOND_LEVEL_CACHE_TTL_SECONDS,
+        SECOND_LEVEL_CACHE_MAX_ENTRIES (stockage en mémoire), SECOND_LEVEL_CACHE_TIMEOUT_SECONDS
+        (stockage partagé) et SECOND_LEVEL_CACHE_PREFIX.
+
+        Returns:
+            SecondLevelCache, ou None si le cache est désactivé
+        """
+        url = os.getenv("SECOND_LEVEL_CACHE_URL", "memory")
+        if url == "none":
+            return None
+        if url == "memory":
+            backend = InMemoryCacheBackend(max_entries=int(os.getenv("SECOND_LEVEL_CACHE_MAX_ENTRIES", "100000")))
+        else:
+            timeout = float(os.getenv("SECOND_LEVEL_CACHE_TIMEOUT_SECONDS", "0.1"))
+            backend = RespCacheBackend(RespClient.from_url(url, timeout=timeout))
+        return cls(
+            backend,
+            prefix=os.getenv("SECOND_LEVEL_CACHE_PREFIX", "weather-app"),
+            ttl_seconds=float(os.getenv("SECOND_LEVEL_CACHE_TTL_SECONDS", "30"))
+        )
+
+    async def get(self, namespace: CacheNamespace, *parts: Any, offload: bool = False) -> Optional[Any]:
+        """
+        Args:
+            namespace: Namespace de la valeur
+            parts: Segments de la clé (identifiant, nom de région, paramètres…)
+            offload: Désérialiser hors de la boucle d'événements (grosses charges utiles)
+
+        Returns:
+            La valeur désérialisée, ou None si absente (ou stockage indisponible)
+        """
+        key = namespace.key(self.prefix, parts)
+        try:
+            data = (await self.backend.get_many([key]))[0]
+        except Exception as e:
+            self._failed("lecture", e)
+            return None
+        self._recovered()
+        if data is None:
+            self.misses += 1
+            return None
+        try:
+            value = await asyncio.to_thread(namespace.codec.decode, data) if offload else namespace.codec.decode(data)
+        except CodecError as e:
+            logger.warning(f"Cache de second niveau: entrée illisible ignorée ({key}): {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    async def set(self, namespace: CacheNamespace, parts: Sequence[Any], value: Any, offload: bool = False):
+        """Enregistre une valeur (sérialisée par le codec du namespace, hors de la boucle si `offload`)"""
+        key = namespace.key(self.prefix, parts)
+        try:
+            data = await asyncio.to_thread(namespace.codec.encode, value) if offload else namespace.codec.encode(value)
+        except TypeError as e:
+            # Valeur hors du format (Decimal, objet…) : simplement pas mise en cache
+            logger.debug(f"Cache de second niveau: valeur non sérialisable ({key}): {e}")
+            return
+        try:
+            await self.backend.set_many({key: data}, namespace.ttl_seconds or self.ttl_seconds)
+            self.writes += 1
+        except Exception as e:
+            self._failed("écriture", e)
+
+    async def invalidate(self, namespace: CacheNamespace, parts_list: Iterable[Sequence[Any]]):
+        """Supprime les clés données d'un namespace"""
+        keys = [namespace.key(self.prefix, parts) for parts in parts_list]
+        if not keys:
+            return
+        try:
+            await self.backend.delete(keys)
+            self.invalidations += len(keys)
+        except Exception as e:
+            self._failed("invalidation", e)
+
+    async def invalidate_namespace(self, namespace: CacheNamespace):
+        """Supprime toutes les clés d'un namespace (resynchronisation après des notifications perdues)"""
+        try:
+            self.invalidations += await self.backend.delete_prefix(namespace.key_prefix(self.prefix))
+        except Exception as e:
+            self._failed("invalidation", e)
+
+    def invalidate_soon(self, namespace: CacheNamespace, parts_list: Iterable[Sequence[Any]]):
+        """Planifie `invalidate` depuis un gestionnaire synchrone (boucle asyncio en cours)"""
+        self._schedule(self.invalidate(namespace, list(parts_list)))
+
+    def invalidate_namespace_soon(self, namespace: CacheNamespace):
+        """Planifie `invalidate_namespace` depuis un gestionnaire synchrone"""
+        self._schedule(self.invalidate_namespace(namespace))
+
+    def _schedule(self, invalidation):
+        task = asyncio.get_running_loop().create_task(invalidation)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Compteurs du cache"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "writes": self.writes,
+            "invalidations": self.invalidations,
+            "errors": self.errors
+        }
+
+    async def close(self):
+        """Attend les invalidations planifiées puis ferme le stockage"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.backend.close()
+
+    def _failed(self, operation: str, error: Exception):
+        self.errors += 1
+        # Un avertissement par panne, pas un par requête
+        if not self._failing:
+            self._failing = True
+            logger.warning(f"Cache de second niveau: {operation} impossible, poursuite sans cache: {error!r}")
+
+    def _recovered(self):
+        if self._failing:
+            self._failing = False
+            logger.info("Cache de second niveau: stockage de nouveau disponible")
+
+
+# Instance globale du cache (None : désactivé)
+_second_level_cache = None
+_second_level_cache_loaded = False
+
+def get_second_level_cache() -> Optional[SecondLevelCache]:
+    """
+    Retourne l'instance globale du cache de second niveau.
+
+    Returns:
+        SecondLevelCache partagé par tout le processus, ou None s'il est désactivé
+    """
+    global _second_level_cache, _second_level_cache_loaded
+    if not _second_level_cache_loaded:
+        _second_level_cache = SecondLevelCache.from_env()
+        _second_level_cache_loaded = True
+    return _second_level_cache
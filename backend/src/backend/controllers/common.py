@@ -0,0 +1,52 @@
+from fastapi import Depends, Header, HTTPException
+from fastapi.responses import Response
+from typing import Optional, Tuple
+
+from backend.serialization.tabular import NotAcceptableError, RowSet, encode, negotiate
+from backend.services.interfaces.Iregion_info_service import IRegionInformationService
+from backend.services.schemas.field_selection import FieldSelection, InvalidFieldsError
+from backend.database.connection import AsyncSession
+from backend.di import container
+
+# Dépendances et réponses communes aux controllers des régions et de la météo
+
+# Configuration des providers pour l'injection de dépendances
+def get_region_service(session: AsyncSession = Depends(container.get_request_session)) -> IRegionInformationService:
+    """
+    Crée et retourne une instance du service de régions avec injection de dépendances.
+    Utilise PostgreSQL si disponible, sinon se rabat sur les données mock.
+    Le graphe est résolu par l'injector du processus ; seule la session est propre à la requête.
+    Les lectures identiques concurrentes sont regroupées (REQUEST_COALESCING).
+    """
+    return container.get_coalescing_region_service(session)
+
+def parse_fields(selection: FieldSelection, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Valide le paramètre `fields` d'un endpoint contre la liste autorisée de son modèle
+
+    Raises:
+        HTTPException: 400 si un champ n'est pas autorisé
+    """
+    try:
+        return selection.parse(fields)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def get_response_format(response: Response, accept: Optional[str] = Header(None)) -> str:
+    """
+    Format d'une réponse tabulaire négocié sur l'en-tête Accept : JSON,
+    MessagePack (application/x-msgpack) ou Arrow IPC (application/vnd.apache.arrow.stream).
+    La réponse JSON porte aussi `Vary: Accept` pour que les caches HTTP distinguent les formats.
+
+    Raises:
+        HTTPException: 406 si seuls des formats non disponibles sont acceptés
+    """
+    response.headers["Vary"] = "Accept"
+    try:
+        return negotiate(accept)
+    except NotAcceptableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+def tabular_response(rows: RowSet, media_type: str) -> Response:
+    """Réponse binaire construite directement depuis les lignes"""
+    return Response(encode(rows, media_type), media_type=media_type, headers={"Vary": "Accept"})
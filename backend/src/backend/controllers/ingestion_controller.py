@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from typing import Any, Dict
+
+from backend.ingestion.pipeline import get_ingestion_pipeline
+
+router = APIRouter()
+
+
+# End points API
+@router.get("/ingestion/metrics")
+async def get_ingestion_metrics() -> Dict[str, Any]:
+    """
+    Métriques du pipeline d'ingestion (débit, retard, profondeur de file).
+    
+    Returns:
+        Dictionnaire des métriques, ou {"enabled": False} si aucune source n'est configurée
+    """
+    pipeline = get_ingestion_pipeline()
+    if pipeline is None:
+        return {"enabled": False}
+    return {"enabled": True, **pipeline.metrics.to_dict()}
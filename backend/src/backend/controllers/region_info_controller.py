@@ -1,29 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Any, Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from typing import Any, Dict, List, Optional
 import logging
+import os
 
+from backend.serialization.tabular import JSON
+from backend.services.implementation.region_overview_service import RegionOverviewService
 from backend.services.interfaces.Iregion_info_service import IRegionInformationService
-from backend.services.schemas.region_resp_schema import RegionResponse
-from backend.database.connection import get_database_session, AsyncSession
-from backend.services.implementation.region_info_service import RegionInformationService
+from backend.services.interfaces.Iregion_overview_service import IRegionOverviewService
+from backend.services.schemas.field_selection import REGION_RESPONSE_FIELDS
+from backend.services.schemas.overview_schema import RegionOverviewResponse
+from backend.services.schemas.region_resp_schema import RegionResponse, NearestRegionResponse
+from backend.services.schemas.weather_resp_schema import MAX_FORECAST_DAYS
+from backend.database.connection import AsyncSession
+from backend.di import container
+from backend.controllers.common import get_region_service, get_response_format, parse_fields, tabular_response
+from backend.indexes.prefix_index import MAX_RESULTS
+from backend.indexes.spatial_index import MAX_NEIGHBOURS
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Configuration des providers pour l'injection de dépendances
-async def get_region_service(session: AsyncSession = Depends(get_database_session)) -> IRegionInformationService:
+# Délai de chaque sous-requête de la vue d'ensemble d'une région
+OVERVIEW_SUBQUERY_TIMEOUT_SECONDS = float(os.getenv("OVERVIEW_SUBQUERY_TIMEOUT_SECONDS", "1"))
+
+def get_region_overview_service(session: AsyncSession = Depends(container.get_request_session)) -> IRegionOverviewService:
     """
-    Crée et retourne une instance du service de régions avec injection de dépendances.
-    Utilise PostgreSQL si disponible, sinon se rabat sur les données mock.
+    Crée le service de vue d'ensemble : la région est lue sur la session de la requête,
+    la météo et les prévisions chacune sur sa propre session (lectures concurrentes).
     """
-    return RegionInformationService()
+    return RegionOverviewService(
+        container.get_region_repository(session),
+        container.weather_service_scope,
+        timeout_seconds=OVERVIEW_SUBQUERY_TIMEOUT_SECONDS
+    )
 
 
 # End points API
 @router.get("/region/{region_id}", response_model=RegionResponse)
 async def get_region_info_by_id(
     region_id: int,
+    fields: Optional[str] = Query(None, description="Champs de la réponse, séparés par des virgules (tous par défaut)"),
     region_service: IRegionInformationService = Depends(get_region_service),
 ) -> RegionResponse:
     """
@@ -31,14 +49,16 @@ async def get_region_info_by_id(
     
     Args:
         region_id: L'ID de la région à récupérer
+        fields: Champs à retourner (`name,language`), validés contre ceux de RegionResponse
         region_service: Service des régions (injecté automatiquement)
         
     Returns:
-        RegionResponse: Informations de la région
+        RegionResponse: Informations de la région (réduites aux champs demandés)
         
     Raises:
-        HTTPException: Si la région n'est pas trouvée ou en cas d'erreur
+        HTTPException: Si la région n'est pas trouvée, si un champ est inconnu ou en cas d'erreur
     """
+    selected = parse_fields(REGION_RESPONSE_FIELDS, fields)
     try:
         logger.info(f"Demande d'informations pour la région ID: {region_id}")
         region_info = await region_service.get_region_info_by_id(region_id)
@@ -46,6 +66,8 @@ async def get_region_info_by_id(
         if not region_info or region_info.id == 0:
             raise HTTPException(status_code=404, detail=f"Région avec l'ID {region_id} non trouvée")
         
+        if selected is not None:
+            return JSONResponse(REGION_RESPONSE_FIELDS.project(region_info, selected))
         return region_info
     except HTTPException:
         raise
@@ -53,30 +75,128 @@ async def get_region_info_by_id(
         logger.error(f"Erreur lors de la récupération de la région {region_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erreur interne du serveur")
 
+@router.get("/region/{region_id}/overview", response_model=RegionOverviewResponse)
+async def get_region_overview(
+    region_id: int,
+    days: int = Query(7, ge=1, le=MAX_FORECAST_DAYS, description="Nombre de jours de prévision"),
+    overview_service: IRegionOverviewService = Depends(get_region_overview_service),
+) -> RegionOverviewResponse:
+    """
+    Vue d'ensemble d'une région en un appel : la région, sa météo actuelle et ses prévisions.
+    La météo et les prévisions sont lues en parallèle ; une lecture en échec ou trop lente
+    est omise (`partial`, raison dans `errors`) au lieu de faire échouer la réponse.
+    
+    Args:
+        region_id: L'ID de la région
+        days: Nombre de jours de prévisions
+        overview_service: Service de vue d'ensemble (injecté automatiquement)
+        
+    Returns:
+        RegionOverviewResponse: Région, météo actuelle et prévisions
+        
+    Raises:
+        HTTPException: 404 si la région n'existe pas, 504 si elle n'a pas pu être lue à temps
+    """
+    try:
+        overview = await overview_service.get_region_overview(region_id, days)
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Région {region_id}: lecture trop lente")
+    except Exception as e:
+        logger.error(f"Erreur lors de la vue d'ensemble de la région {region_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+    if overview is None:
+        raise HTTPException(status_code=404, detail=f"Région avec l'ID {region_id} non trouvée")
+    return overview
+
 @router.get("/regions", response_model=List[RegionResponse])
 async def get_all_regions(
+    fields: Optional[str] = Query(None, description="Champs de la réponse, séparés par des virgules (tous par défaut)"),
+    response_format: str = Depends(get_response_format),
     region_service: IRegionInformationService = Depends(get_region_service),
 ) -> List[RegionResponse]:
     """
     Récupère toutes les régions disponibles.
     
     Args:
+        fields: Champs à retourner pour chaque région (`id,name` pour une liste de choix)
+        response_format: Format négocié sur l'en-tête Accept (JSON, MessagePack ou Arrow)
         region_service: Service des régions (injecté automatiquement)
         
     Returns:
-        List[RegionResponse]: Liste de toutes les régions
+        List[RegionResponse]: Liste de toutes les régions (réduites aux champs demandés)
         
     Raises:
-        HTTPException: En cas d'erreur lors de la récupération
+        HTTPException: Si un champ est inconnu ou en cas d'erreur lors de la récupération
     """
+    selected = parse_fields(REGION_RESPONSE_FIELDS, fields)
     try:
         logger.info("Demande de toutes les régions")
+        if response_format != JSON:
+            rows = await region_service.get_all_regions_rows()
+            return tabular_response(rows.select(selected) if selected is not None else rows, response_format)
         regions = await region_service.get_all_regions()
+        if selected is not None:
+            return JSONResponse([REGION_RESPONSE_FIELDS.project(region, selected) for region in regions],
+                                headers={"Vary": "Accept"})
         return regions
     except Exception as e:
         logger.error(f"Erreur lors de la récupération de toutes les régions: {str(e)}")
         raise HTTPException(status_code=500, detail="Erreur interne du serveur")
 
+@router.get("/regions/search", response_model=List[RegionResponse])
+async def search_regions(
+    q: str = Query(..., min_length=1, max_length=100, description="Début du nom de la région"),
+    limit: int = Query(10, ge=1, le=MAX_RESULTS, description="Nombre maximal de résultats"),
+    fields: Optional[str] = Query(None, description="Champs de la réponse, séparés par des virgules (tous par défaut)"),
+    region_service: IRegionInformationService = Depends(get_region_service),
+) -> List[RegionResponse]:
+    """
+    Autocomplétion des noms de régions (insensible à la casse et aux accents).
+    
+    Args:
+        q: Texte saisi par l'utilisateur
+        limit: Nombre maximal de résultats
+        fields: Champs à retourner pour chaque région
+        region_service: Service des régions (injecté automatiquement)
+        
+    Returns:
+        List[RegionResponse]: Régions correspondantes, par population décroissante
+    """
+    selected = parse_fields(REGION_RESPONSE_FIELDS, fields)
+    try:
+        regions = await region_service.search_regions(q, limit)
+        if selected is not None:
+            return JSONResponse([REGION_RESPONSE_FIELDS.project(region, selected) for region in regions])
+        return regions
+    except Exception as e:
+        logger.error(f"Erreur lors de la recherche des régions '{q}': {str(e)}")
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
+@router.get("/regions/nearest", response_model=List[NearestRegionResponse])
+async def get_nearest_regions(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude du point"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude du point"),
+    k: int = Query(1, ge=1, le=MAX_NEIGHBOURS, description="Nombre de régions"),
+    region_service: IRegionInformationService = Depends(get_region_service),
+) -> List[NearestRegionResponse]:
+    """
+    Récupère les régions les plus proches d'un point (distance haversine).
+    
+    Args:
+        lat: Latitude du point
+        lon: Longitude du point
+        k: Nombre de régions à retourner
+        region_service: Service des régions (injecté automatiquement)
+        
+    Returns:
+        List[NearestRegionResponse]: Régions de la plus proche à la plus lointaine
+    """
+    try:
+        return await region_service.get_nearest_regions(lat, lon, k)
+    except Exception as e:
+        logger.error(f"Erreur lors de la recherche des régions proches de ({lat}, {lon}): {str(e)}")
+        raise HTTPException(status_code=500, detail="Erreur interne du serveur")
+
 @router.post("/region", response_model=RegionResponse)
 async def create_region(
     region_data: Dict[str, Any],
@@ -170,7 +290,7 @@ async def test_database_connection():
         }
 
 @router.get("/test/repository")
-async def test_repository_operations(session: AsyncSession = Depends(get_database_session)):
+async def test_repository_operations(session: AsyncSession = Depends(container.get_request_session)):
     """
     Teste les opérations du repository des régions.
     
@@ -178,7 +298,7 @@ async def test_repository_operations(session: AsyncSession = Depends(get_databas
         Résultats des tests du repository
     """
     try:
-        region_service = await get_region_service(session)
+        region_service = get_region_service(session)
         
         # Test de lecture de toutes les régions
         regions = await region_service.get_all_regions()
@@ -186,7 +306,7 @@ async def test_repository_operations(session: AsyncSession = Depends(get_databas
         # Test de lecture d'une région spécifique
         test_region = None
         if regions:
-            test_region = await region_service.get_region_info(regions[0].id)
+            test_region = await region_service.get_region_info_by_id(regions[0].id)
         
         return {
             "status": "success",
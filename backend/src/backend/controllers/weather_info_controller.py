@@ -1,24 +1,94 @@
+from fastapi.encoders import jsonable_encoder
 from fastapi.params import Depends
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Any, AsyncIterator, Dict, List, Optional
+import os
+from backend.database.connection import AsyncSession
 from backend.services.interfaces.Iweather_service import IWeatherService
-from backend.services.implementation.weather_service import WeatherService, WeatherService1
-from fastapi import APIRouter, Query
-from backend.services.schemas.weather_resp_schema import WeatherResponse, WeatherForecastResponse
+from backend.services.interfaces.Iweather_interpolation_service import IWeatherInterpolationService
+from backend.services.interfaces.Iregion_info_service import IRegionInformationService
+from backend.di import container
+from backend.controllers.common import get_region_service, get_response_format, parse_fields, tabular_response
+from fastapi import APIRouter, HTTPException, Query
+from backend.services.schemas.weather_resp_schema import (
+    MAX_FORECAST_DAYS, MAX_HISTORY_DAYS, NearbyWeatherResponse, WeatherForecastResponse, WeatherForecastSeriesResponse,
+    WeatherReadingResponse, WeatherResponse
+)
+from backend.serialization.tabular import JSON
+from backend.services.schemas.field_selection import WEATHER_READING_FIELDS, WEATHER_RESPONSE_FIELDS
+from backend.services.schemas.interpolation_schema import InterpolatedWeatherResponse, InterpolationBatchRequest
+from backend.streaming.weather_hub import TooManySubscribersError, WeatherSubscription, get_weather_hub
 
 router = APIRouter()
 
+# Commentaire SSE envoyé sans nouvelle mesure, pour que les proxys ne ferment pas le flux
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
 
-# Choix de l'implémentation du service météo pour cette route
-def get_weather_service() -> IWeatherService:
-    return WeatherService1()
+
+# Services résolus par l'injector du processus ; seule la session est propre à la requête.
+# Les lectures météo identiques concurrentes sont regroupées (REQUEST_COALESCING)
+def get_weather_service(session: AsyncSession = Depends(container.get_request_session)) -> IWeatherService:
+    return container.get_coalescing_weather_service(session)
+
+def get_weather_interpolation_service(session: AsyncSession = Depends(container.get_request_session)) -> IWeatherInterpolationService:
+    return container.get_weather_interpolation_service(session)
 
 # End points API
+# Déclaré avant /weather/{region_name} pour ne pas être capturé par le paramètre de chemin
+@router.get("/weather/nearest", response_model=NearbyWeatherResponse)
+async def get_weather_near_me(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude du client"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude du client"),
+    region_service: IRegionInformationService = Depends(get_region_service),
+    weather_service: IWeatherService = Depends(get_weather_service)
+) -> NearbyWeatherResponse:
+    """Météo actuelle de la région la plus proche des coordonnées du client"""
+    nearest = await region_service.get_nearest_regions(lat, lon, 1)
+    if not nearest:
+        raise HTTPException(status_code=404, detail="Aucune région géolocalisée disponible")
+    
+    weather = await weather_service.get_current_weather(nearest[0].name)
+    return NearbyWeatherResponse(
+        **weather.model_dump(),
+        region_id=nearest[0].id,
+        distance_km=nearest[0].distance_km
+    )
+
+@router.get("/weather/at", response_model=InterpolatedWeatherResponse)
+async def get_weather_at(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude du point"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude du point"),
+    interpolation_service: IWeatherInterpolationService = Depends(get_weather_interpolation_service)
+) -> InterpolatedWeatherResponse:
+    """Météo actuelle estimée en un point quelconque (IDW sur les stations voisines)"""
+    estimate = await interpolation_service.get_weather_at(lat, lon)
+    if not estimate.stations:
+        raise HTTPException(status_code=404, detail="Aucune station météo géolocalisée disponible")
+    return estimate
+
+@router.post("/weather/at/batch", response_model=List[InterpolatedWeatherResponse])
+async def get_weather_at_batch(
+    request: InterpolationBatchRequest,
+    interpolation_service: IWeatherInterpolationService = Depends(get_weather_interpolation_service)
+) -> List[InterpolatedWeatherResponse]:
+    """Météo actuelle estimée pour un lot de points (jusqu'à 10 000) en un seul appel"""
+    return await interpolation_service.get_weather_at_many([(point.lat, point.lon) for point in request.points])
+
 @router.get("/weather/{region_name}", response_model=WeatherResponse)
 async def get_weather_info(
     region_name: str,
+    fields: Optional[str] = Query(None, description="Champs de la réponse, séparés par des virgules (tous par défaut)"),
     weather_service: IWeatherService = Depends(get_weather_service)
 ) -> WeatherResponse:
-    
-    resp = await weather_service.get_current_weather(region_name)
+    """
+    Météo actuelle d'une région. Avec `fields` (`region,temperature` pour un widget mobile),
+    seules les colonnes correspondantes sont lues et seuls ces champs sont retournés.
+    """
+    selected = parse_fields(WEATHER_RESPONSE_FIELDS, fields)
+    resp = await weather_service.get_current_weather(region_name, selected)
+    if selected is not None:
+        return JSONResponse(WEATHER_RESPONSE_FIELDS.project(resp, selected))
     return resp
 
 @router.get("/weather/forecast/{region_name}", response_model=WeatherForecastResponse)
@@ -29,4 +99,90 @@ async def get_weather_forecast(
 ) -> WeatherForecastResponse:
     
     response = await weather_service.get_weather_forecast(region_name=region_name, days=day)
-    return response
\ No newline at end of file
+    return response
+
+@router.get("/weather/forecast/{region_name}/series", response_model=WeatherForecastSeriesResponse)
+async def get_weather_forecast_series(
+    region_name: str,
+    days: int = Query(7, ge=1, le=MAX_FORECAST_DAYS, description="Nombre de jours de prévision"),
+    weather_service: IWeatherService = Depends(get_weather_service)
+) -> WeatherForecastSeriesResponse:
+    """Série complète des prévisions (min/max/moyenne, précipitations, vent) sur `days` jours, en une requête"""
+    return await weather_service.get_weather_forecast_series(region_name=region_name, days=days)
+
+@router.get("/weather/{region_name}/history", response_model=List[WeatherReadingResponse])
+async def get_weather_history(
+    region_name: str,
+    days: int = Query(7, ge=1, le=MAX_HISTORY_DAYS, description="Nombre de jours d'historique"),
+    fields: Optional[str] = Query(None, description="Champs de la réponse, séparés par des virgules (tous par défaut)"),
+    response_format: str = Depends(get_response_format),
+    weather_service: IWeatherService = Depends(get_weather_service)
+) -> List[WeatherReadingResponse]:
+    """
+    Historique des mesures d'une région sur `days` jours, de la plus récente à la plus ancienne.
+    En JSON par défaut ; en MessagePack ou Arrow IPC selon l'en-tête Accept, produits
+    directement depuis les lignes de la base pour les chargements en dataframe.
+    Avec `fields`, les colonnes sont réduites après la lecture, dans tous les formats.
+    """
+    selected = parse_fields(WEATHER_READING_FIELDS, fields)
+    rows = await weather_service.get_weather_history_rows(region_name, days)
+    if selected is not None:
+        rows = rows.select(selected)
+    if response_format != JSON:
+        return tabular_response(rows, response_format)
+    if selected is not None:
+        return JSONResponse(jsonable_encoder(rows.records()), headers={"Vary": "Accept"})
+    return rows.records()
+
+
+def _weather_event(weather: WeatherResponse) -> str:
+    return f"event: weather\ndata: {weather.model_dump_json()}\n\n"
+
+def _reading_response(reading: Dict[str, Any]) -> WeatherResponse:
+    """Convertit une mesure diffusée par le hub (ligne de weather_data) en réponse de l'API"""
+    return WeatherResponse(
+        region=reading.get("region_name"),
+        temperature=reading.get("temperature") if reading.get("temperature") is not None else 20.0,
+        condition=reading.get("condition") or "Unknown",
+        humidity=reading.get("humidity") if reading.get("humidity") is not None else 50
+    )
+
+async def _weather_events(current: WeatherResponse, subscription: WeatherSubscription) -> AsyncIterator[str]:
+    with subscription:
+        yield "retry: 5000\n" + _weather_event(current)
+        while True:
+            reading = await subscription.next(timeout=STREAM_KEEPALIVE_SECONDS)
+            if reading is None:
+                yield ": keepalive\n\n"
+            else:
+                yield _weather_event(_reading_response(reading))
+
+@router.get("/weather/{region_name}/stream", response_class=StreamingResponse)
+async def stream_weather(
+    region_name: str,
+    session: AsyncSession = Depends(container.get_request_session),
+    weather_service: IWeatherService = Depends(get_weather_service)
+) -> StreamingResponse:
+    """
+    Flux SSE (text/event-stream) de la météo d'une région : la valeur actuelle, puis chaque
+    nouvelle mesure enregistrée (événements `weather`, même contenu que /weather/{region_name}).
+    """
+    try:
+        # Abonnement avant la lecture : aucune mesure écrite entre les deux n'est perdue
+        subscription = get_weather_hub().subscribe(region_name)
+    except TooManySubscribersError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    try:
+        current = await weather_service.get_current_weather(region_name)
+    except BaseException:
+        subscription.close()
+        raise
+    # Le flux peut durer des heures : la connexion de la session est rendue au pool dès maintenant
+    await session.close()
+    return StreamingResponse(
+        _weather_events(current, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Le générateur n'est jamais démarré si le client part avant la réponse
+        background=BackgroundTask(subscription.close)
+    )
@@ -1,8 +1,13 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import DeclarativeBase
 import os
+from typing import List
 from dotenv import load_dotenv
 
+from backend.database.prepared_statements import PreparedStatementMonitor
+from backend.database.routing import ReplicaRouter, Replica, RoutingSession
+
 # Charger les variables d'environnement
 load_dotenv()
 
@@ -23,9 +28,41 @@ class DatabaseConfig:
         
         # Construction de l'URL de connexion
         self.database_url = f"postgresql+asyncpg://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
+        
+        # Réplicas en lecture (URLs complètes séparées par des virgules) et leur routage
+        self.replica_urls = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+        self.replica_strategy = os.getenv("DB_REPLICA_STRATEGY", "round_robin")
+        self.replica_health_interval = float(os.getenv("DB_REPLICA_HEALTH_INTERVAL_SECONDS", "5"))
+        max_lag = os.getenv("DB_REPLICA_MAX_LAG_SECONDS")
+        self.replica_max_lag_seconds = float(max_lag) if max_lag else None
+        
+        # Délais : une base bloquée ne doit pas retenir les requêtes indéfiniment
+        self.statement_timeout_seconds = float(os.getenv("DB_STATEMENT_TIMEOUT_SECONDS", "3"))
+        self.pool_timeout_seconds = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "2"))
+        
+        # Instructions préparées gardées par connexion (0 : désactivé, pour pgbouncer en mode transaction)
+        self.prepared_statement_cache_size = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100"))
     
     def get_database_url(self) -> str:
         return self.database_url
+    
+    def get_replica_urls(self) -> List[str]:
+        return self.replica_urls
+    
+    def get_engine_options(self) -> dict:
+        """
+        Options des moteurs asyncpg : délai côté serveur (statement_timeout), côté client et du pool,
+        et taille du cache d'instructions préparées de chaque connexion
+        """
+        return {
+            "pool_timeout": self.pool_timeout_seconds,
+            "connect_args": {
+                "timeout": self.pool_timeout_seconds,
+                "prepared_statement_cache_size": self.prepared_statement_cache_size,
+                "command_timeout": self.statement_timeout_seconds + 1,
+                "server_settings": {"statement_timeout": str(int(self.statement_timeout_seconds * 1000))}
+            }
+        }
 
 # Instance globale de configuration
 db_config = DatabaseConfig()
@@ -34,13 +71,36 @@ db_config = DatabaseConfig()
 engine = create_async_engine(
     db_config.get_database_url(),
     echo=True,  # Log des requêtes SQL (désactiver en production)
-    future=True
+    future=True,
+    **db_config.get_engine_options()
 )
 
-# Factory pour créer des sessions
+# Réplicas en lecture : sans DB_REPLICA_URLS, le routeur renvoie toujours la primaire
+replica_router = ReplicaRouter(
+    engine,
+    [
+        Replica(
+            make_url(url).render_as_string(hide_password=True),
+            create_async_engine(url, future=True, **db_config.get_engine_options())
+        )
+        for url in db_config.get_replica_urls()
+    ],
+    strategy=db_config.replica_strategy,
+    max_lag_seconds=db_config.replica_max_lag_seconds
+)
+
+# Réutilisation des instructions préparées, vérifiée sur chaque connexion du pool
+prepared_statements = PreparedStatementMonitor()
+prepared_statements.attach(engine)
+for replica in replica_router.replicas:
+    prepared_statements.attach(replica.engine)
+
+# Factory pour créer des sessions (lectures routées vers les réplicas, écritures vers la primaire)
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    router=replica_router,
     expire_on_commit=False
 )
 
@@ -57,13 +117,19 @@ async def get_database_session() -> AsyncSession:
 
 async def init_database():
     """
-    Initialise la base de données en créant toutes les tables.
+    Initialise la base de données en créant toutes les tables
+    et les déclencheurs de notification (invalidation des caches des workers).
     """
+    from backend.database.notifications import install_change_notifications
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Le script de la migration gère sa propre transaction
+    async with engine.connect() as conn:
+        await install_change_notifications(conn)
 
 async def close_database():
     """
-    Ferme proprement la connexion à la base de données.
+    Ferme proprement la connexion à la base de données et à ses réplicas.
     """
+    await replica_router.close()
     await engine.dispose()
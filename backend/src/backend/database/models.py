@@ -1,8 +1,17 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Date, CheckConstraint
-from sqlalchemy.dialects.mysql import DECIMAL as Decimal
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Date, Double, Numeric, CheckConstraint, Index, UniqueConstraint, text
 from sqlalchemy.sql import func
 from backend.database.connection import Base
 
+# Nom de la contrainte unique (region_name, forecast_date) de weather_forecasts
+FORECAST_UNIQUE_CONSTRAINT = "uq_weather_forecasts_region_date"
+
+# Mesures (température, pression, vent) : double precision, décodée en float par asyncpg sans
+# passer par Decimal (migration 004). Sur une base pas encore migrée (NUMERIC), SQLAlchemy
+# convertit selon le type réel de la colonne : les valeurs restent des float dans les deux cas.
+Measure = Double
+# Coordonnées : NUMERIC(9, 6) conservé, lu en float
+Coordinate = Numeric(9, 6, asdecimal=False)
+
 class Region(Base):
     """Modèle pour la table des régions"""
     
@@ -13,8 +22,8 @@ class Region(Base):
     nb_habitants = Column(Integer, nullable=False, default=0)
     language = Column(String(50), nullable=False, default="français")
     country = Column(String(100), nullable=False, default="France")
-    latitude = Column(Decimal(9, 6), nullable=True)
-    longitude = Column(Decimal(9, 6), nullable=True)
+    latitude = Column(Coordinate, nullable=True)
+    longitude = Column(Coordinate, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
@@ -26,8 +35,8 @@ class Region(Base):
             "nb_habitants": self.nb_habitants,
             "language": self.language,
             "country": self.country,
-            "latitude": float(self.latitude) if self.latitude else None,
-            "longitude": float(self.longitude) if self.longitude else None,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
@@ -39,11 +48,11 @@ class WeatherData(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     region_name = Column(String(100), nullable=False, index=True)
-    temperature = Column(Decimal(5, 2), nullable=False)
+    temperature = Column(Measure, nullable=False)
     condition = Column(String(100), nullable=False)
     humidity = Column(Integer, nullable=False)
-    pressure = Column(Decimal(6, 2), nullable=True)
-    wind_speed = Column(Decimal(5, 2), nullable=True)
+    pressure = Column(Measure, nullable=True)
+    wind_speed = Column(Measure, nullable=True)
     wind_direction = Column(String(3), nullable=True)
     recorded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     is_forecast = Column(Boolean, default=False, nullable=False)
@@ -51,6 +60,11 @@ class WeatherData(Base):
     
     __table_args__ = (
         CheckConstraint('humidity >= 0 AND humidity <= 100', name='check_humidity_range'),
+        # Dernière mesure par région (DISTINCT ON / ORDER BY recorded_at DESC LIMIT 1) ;
+        # en SQLite, le prédicat reprend le littéral généré par SQLAlchemy (is_forecast = 0)
+        Index('idx_weather_data_region_recorded_at', 'region_name', recorded_at.desc(),
+              postgresql_where=text('is_forecast = FALSE'),
+              sqlite_where=text('is_forecast = 0')),
     )
     
     def to_dict(self):
@@ -58,11 +72,11 @@ class WeatherData(Base):
         return {
             "id": self.id,
             "region_name": self.region_name,
-            "temperature": float(self.temperature),
+            "temperature": self.temperature,
             "condition": self.condition,
             "humidity": self.humidity,
-            "pressure": float(self.pressure) if self.pressure else None,
-            "wind_speed": float(self.wind_speed) if self.wind_speed else None,
+            "pressure": self.pressure,
+            "wind_speed": self.wind_speed,
             "wind_direction": self.wind_direction,
             "recorded_at": self.recorded_at.isoformat() if self.recorded_at else None,
             "is_forecast": self.is_forecast,
@@ -78,13 +92,13 @@ class WeatherForecast(Base):
     region_name = Column(String(100), nullable=False, index=True)
     forecast_date = Column(Date, nullable=False, index=True)
     day_name = Column(String(20), nullable=False)
-    temperature_min = Column(Decimal(5, 2), nullable=True)
-    temperature_max = Column(Decimal(5, 2), nullable=True)
-    temperature_avg = Column(Decimal(5, 2), nullable=True)
+    temperature_min = Column(Measure, nullable=True)
+    temperature_max = Column(Measure, nullable=True)
+    temperature_avg = Column(Measure, nullable=True)
     condition = Column(String(100), nullable=False)
     humidity = Column(Integer, nullable=False)
-    pressure = Column(Decimal(6, 2), nullable=True)
-    wind_speed = Column(Decimal(5, 2), nullable=True)
+    pressure = Column(Measure, nullable=True)
+    wind_speed = Column(Measure, nullable=True)
     wind_direction = Column(String(3), nullable=True)
     precipitation_probability = Column(Integer, default=0, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -92,6 +106,8 @@ class WeatherForecast(Base):
     __table_args__ = (
         CheckConstraint('humidity >= 0 AND humidity <= 100', name='check_forecast_humidity_range'),
         CheckConstraint('precipitation_probability >= 0 AND precipitation_probability <= 100', name='check_precipitation_range'),
+        # Une seule prévision par région et par jour : cible des upserts ON CONFLICT
+        UniqueConstraint('region_name', 'forecast_date', name=FORECAST_UNIQUE_CONSTRAINT),
     )
     
     def to_dict(self):
@@ -101,13 +117,13 @@ class WeatherForecast(Base):
             "region_name": self.region_name,
             "forecast_date": self.forecast_date.isoformat() if self.forecast_date else None,
             "day": self.day_name,
-            "temperature_min": float(self.temperature_min) if self.temperature_min else None,
-            "temperature_max": float(self.temperature_max) if self.temperature_max else None,
-            "temperature": float(self.temperature_avg) if self.temperature_avg else None,
+            "temperature_min": self.temperature_min,
+            "temperature_max": self.temperature_max,
+            "temperature": self.temperature_avg,
             "condition": self.condition,
             "humidity": self.humidity,
-            "pressure": float(self.pressure) if self.pressure else None,
-            "wind_speed": float(self.wind_speed) if self.wind_speed else None,
+            "pressure": self.pressure,
+            "wind_speed": self.wind_speed,
             "wind_direction": self.wind_direction,
             "precipitation_probability": self.precipitation_probability,
             "created_at": self.created_at.isoformat() if self.created_at else None
@@ -0,0 +1,189 @@
+"""
+Bus d'invalidation des caches entre workers (PostgreSQL LISTEN/NOTIFY).
+
+Des déclencheurs par instruction sur `regions`, `weather_data` et `weather_forecasts`
+publient les clés modifiées sur le canal `cache_invalidation`, au COMMIT
+(voir `database/migrations/003_cache_invalidation_notify.sql`). Chaque worker ouvre une
+connexion dédiée, écoute le canal et appelle les gestionnaires enregistrés par table.
+
+Les notifications émises pendant une coupure de l'écoute sont perdues : à chaque
+reconnexion, les gestionnaires reçoivent un changement RESYNC (tout invalider).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+RESYNC = "RESYNC"
+
+# Script des fonctions et déclencheurs de notification, seule source du code SQL
+# (database/init_scripts/01_init_database.sql en contient une copie pour une base neuve)
+MIGRATION_FILE = "003_cache_invalidation_notify.sql"
+DEFAULT_MIGRATIONS_DIR = Path(__file__).resolve().parents[4] / "database" / "migrations"
+
+
+def migrations_directory() -> Path:
+    """Dossier des migrations SQL : DATABASE_MIGRATIONS_DIR, sinon `database/migrations` du dépôt"""
+    return Path(os.getenv("DATABASE_MIGRATIONS_DIR") or DEFAULT_MIGRATIONS_DIR)
+
+
+async def install_change_notifications(connection):
+    """
+    Installe les déclencheurs de notification (PostgreSQL uniquement) en exécutant la
+    migration 003, idempotente. Le script contient plusieurs instructions et gère sa propre
+    transaction : il passe par le protocole de requête simple d'asyncpg.
+
+    Args:
+        connection: Connexion SQLAlchemy async, hors transaction
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    path = migrations_directory() / MIGRATION_FILE
+    try:
+        script = path.read_text(encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"⚠️ Déclencheurs de notification non installés, migration introuvable ({path}): {e}")
+        return
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.execute(script)
+
+
+class TableChange(NamedTuple):
+    """Modification notifiée d'une table"""
+    table: str
+    operation: str
+    # Identifiants (regions) ou noms de régions (weather_data, weather_forecasts)
+    keys: List[Any]
+    # Dernière mesure de chaque région insérée (weather_data uniquement)
+    rows: List[Dict[str, Any]]
+    # Horodatage (epoch) de l'émission dans la base
+    sent_at: Optional[float]
+
+
+ChangeHandler = Callable[[TableChange], None]
+
+
+class ChangeListener:
+    """
+    Écoute du canal d'invalidation par un worker, sur une connexion asyncpg dédiée
+    (hors du pool SQLAlchemy). Les gestionnaires sont synchrones et doivent être rapides :
+    ils invalident ou planifient un rechargement, sans I/O.
+    """
+
+    def __init__(self, dsn: str, channel: str = CHANNEL, reconnect_seconds: float = 1.0,
+                 keepalive_seconds: float = 10.0):
+        """
+        Args:
+            dsn: URL PostgreSQL (postgresql://…)
+            channel: Canal écouté
+            reconnect_seconds: Délai initial entre deux tentatives de connexion (doublé jusqu'à 30 s)
+            keepalive_seconds: Intervalle de vérification de la connexion d'écoute
+        """
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self._handlers: Dict[str, List[ChangeHandler]] = defaultdict(list)
+        self._connected_once = False
+        self.connected = False
+        self.received = 0
+        self.resyncs = 0
+        self._latencies_ms: Deque[float] = deque(maxlen=1000)
+
+    @classmethod
+    def from_database_url(cls, database_url: str) -> "ChangeListener":
+        """
+        Args:
+            database_url: URL SQLAlchemy (postgresql+asyncpg://…) de la base primaire
+        """
+        dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        return cls(dsn, keepalive_seconds=float(os.getenv("CACHE_INVALIDATION_KEEPALIVE_SECONDS", "10")))
+
+    def register(self, table: str, handler: ChangeHandler):
+        """Appelle `handler` à chaque modification de `table` (et à chaque RESYNC)"""
+        self._handlers[table].append(handler)
+
+    def metrics(self) -> Dict[str, Any]:
+        """État de l'écoute et latence émission → réception"""
+        latencies = sorted(self._latencies_ms)
+        return {
+            "connected": self.connected,
+            "received": self.received,
+            "resyncs": self.resyncs,
+            "latency_p50_ms": round(latencies[len(latencies) // 2], 3) if latencies else None,
+            "latency_max_ms": round(latencies[-1], 3) if latencies else None
+        }
+
+    async def run(self):
+        """Boucle d'écoute à lancer en tâche de fond ; se reconnecte après une coupure"""
+        delay = self.reconnect_seconds
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn, timeout=5)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                logger.warning(
+                    f"Invalidation des caches: connexion d'écoute impossible ({e!r}), nouvel essai dans {delay:.0f} s"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+
+            delay = self.reconnect_seconds
+            try:
+                await connection.add_listener(self.channel, self._on_notification)
+                self.connected = True
+                if self._connected_once:
+                    # Des notifications ont pu être perdues pendant la coupure
+                    self._dispatch_resync()
+                self._connected_once = True
+                logger.info(f"🔔 Invalidation des caches: écoute du canal {self.channel}")
+                while not connection.is_closed():
+                    await asyncio.sleep(self.keepalive_seconds)
+                    await connection.fetchval("SELECT 1", timeout=self.keepalive_seconds)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning(f"Invalidation des caches: écoute interrompue ({e!r})")
+            finally:
+                self.connected = False
+                if not connection.is_closed():
+                    connection.terminate()
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str):
+        try:
+            message = json.loads(payload)
+            change = TableChange(
+                table=message["table"],
+                operation=message["op"],
+                keys=message.get("keys") or [],
+                rows=message.get("rows") or [],
+                sent_at=message.get("sent_at")
+            )
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Invalidation des caches: notification illisible ignorée: {e!r}")
+            return
+        self.received += 1
+        if change.sent_at is not None:
+            self._latencies_ms.append((time.time() - change.sent_at) * 1e3)
+        self._dispatch(change)
+
+    def _dispatch_resync(self):
+        self.resyncs += 1
+        for table in self._handlers:
+            self._dispatch(TableChange(table, RESYNC, [], [], None))
+
+    def _dispatch(self, change: TableChange):
+        for handler in self._handlers.get(change.table, ()):
+            try:
+                handler(change)
+            except Exception as e:
+                logger.error(f"Invalidation des caches: gestionnaire en échec pour {change.table}: {e!r}")
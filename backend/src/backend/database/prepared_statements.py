@@ -0,0 +1,86 @@
+"""
+Vérification du cache d'instructions préparées d'asyncpg sur les connexions du pool.
+
+Le dialecte asyncpg de SQLAlchemy prépare chaque instruction sur la connexion puis garde
+l'instruction préparée dans un cache LRU propre à la connexion, indexé par le texte SQL
+(`prepared_statement_cache_size`, 100 par défaut). Une nouvelle exécution du même texte
+saute alors l'aller-retour Parse/Describe avec le serveur. Ce cache peut être désactivé
+sans bruit (taille 0, nécessaire derrière pgbouncer en mode transaction) ou inefficace si
+le texte SQL varie d'un appel à l'autre (valeurs écrites en dur dans la requête).
+
+`PreparedStatementMonitor` s'abonne aux événements des moteurs et compte, pour chaque
+exécution, si l'instruction était déjà préparée sur sa connexion.
+"""
+
+import logging
+import weakref
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class PreparedStatementMonitor:
+    """
+    Compteurs du cache d'instructions préparées, tous moteurs (primaire et réplicas) confondus.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.connections_without_cache = 0
+        self.hits = 0
+        self.misses = 0
+        # Emplacements du pool (un emplacement garde sa connexion DBAPI courante, None si fermée)
+        self._records: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+    def attach(self, engine: AsyncEngine):
+        """Surveille les connexions d'un moteur asyncpg (sans effet pour un autre pilote)"""
+        if engine.dialect.driver != "asyncpg":
+            return
+        event.listen(engine.sync_engine, "connect", self._on_connect)
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.connections += 1
+        self._records.add(connection_record)
+        if getattr(dbapi_connection, "_prepared_statement_cache", None) is None:
+            # Un avertissement, pas un par connexion
+            if not self.connections_without_cache:
+                logger.warning(
+                    "⚠️ Cache d'instructions préparées désactivé sur les connexions asyncpg "
+                    "(DB_PREPARED_STATEMENT_CACHE_SIZE=0) : chaque requête est préparée à nouveau"
+                )
+            self.connections_without_cache += 1
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # executemany passe par asyncpg directement, hors du cache du dialecte
+        if executemany:
+            return
+        cache = getattr(conn.connection.dbapi_connection, "_prepared_statement_cache", None)
+        if cache is not None and statement in cache:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Connexions, instructions préparées par connexion et taux de réutilisation"""
+        connections = [record.dbapi_connection for record in list(self._records)]
+        connections = [connection for connection in connections if connection is not None]
+        sizes = [
+            len(connection._prepared_statement_cache)
+            for connection in connections
+            if getattr(connection, "_prepared_statement_cache", None) is not None
+        ]
+        executions = self.hits + self.misses
+        return {
+            "connections_opened": self.connections,
+            "connections_without_cache": self.connections_without_cache,
+            "open_connections": len(connections),
+            "prepared_per_connection_min": min(sizes) if sizes else 0,
+            "prepared_per_connection_max": max(sizes) if sizes else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / executions, 3) if executions else None
+        }
@@ -0,0 +1,198 @@
+"""
+Routage des requêtes entre la base primaire et ses réplicas en lecture.
+
+Le routage se fait dans la session SQLAlchemy (`RoutingSession.get_bind`) :
+les repositories n'en savent rien.
+
+- Les SELECT d'une session partent vers une réplica saine, choisie une fois par
+  session (round-robin ou la moins occupée) pour rester sur une seule connexion.
+- Les écritures (flush, INSERT / UPDATE / DELETE, SQL textuel) partent vers la primaire.
+- Une session qui a écrit, ou marquée par `use_primary`, lit ensuite aussi sur la
+  primaire (read-your-writes).
+- Sans réplica saine, tout part vers la primaire.
+
+Une tâche de fond (`ReplicaRouter.watch`) vérifie la santé des réplicas (connexion
+et, si `DB_REPLICA_MAX_LAG_SECONDS` est défini, retard de réplication). Une erreur de
+connexion sur une réplica la retire immédiatement jusqu'à la vérification suivante.
+"""
+
+import asyncio
+import logging
+from itertools import count
+from typing import List, Optional
+
+from sqlalchemy import Select, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round_robin"
+LEAST_BUSY = "least_busy"
+STRATEGIES = (ROUND_ROBIN, LEAST_BUSY)
+
+# Clé de `Session.info` qui colle une session à la primaire
+PRIMARY_INFO_KEY = "use_primary"
+
+# Retard de réplication en secondes (0 si tout le WAL reçu est rejoué, NULL hors réplica)
+REPLICATION_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    """
+    Réplica en lecture : moteur, état de santé et nombre de sessions en cours.
+    """
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        """
+        Args:
+            name: Nom affiché dans les journaux (hôte de la réplica)
+            engine: Moteur async de la réplica
+        """
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.sessions = 0
+        self.last_error: Optional[str] = None
+        event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        """Retire la réplica dès qu'une connexion échoue (la vérification suivante la réintègre)"""
+        if context.is_disconnect or isinstance(context.original_exception, OSError):
+            self.mark_unhealthy(str(context.original_exception))
+
+    def mark_unhealthy(self, reason: str):
+        if self.healthy:
+            logger.warning(f"⚠️ Réplica {self.name} retirée du routage: {reason}")
+        self.healthy = False
+        self.last_error = reason
+
+    def mark_healthy(self):
+        if not self.healthy:
+            logger.info(f"✅ Réplica {self.name} réintégrée au routage")
+        self.healthy = True
+        self.last_error = None
+
+
+class ReplicaRouter:
+    """
+    Choisit la base de chaque session : primaire ou une des réplicas saines.
+    """
+
+    def __init__(self, primary: AsyncEngine, replicas: Optional[List[Replica]] = None,
+                 strategy: str = ROUND_ROBIN, max_lag_seconds: Optional[float] = None,
+                 health_timeout: float = 2.0):
+        """
+        Args:
+            primary: Moteur de la base primaire
+            replicas: Réplicas en lecture (aucune : tout part vers la primaire)
+            strategy: round_robin ou least_busy (moins de sessions en cours)
+            max_lag_seconds: Retard de réplication toléré (None : non vérifié)
+            health_timeout: Délai maximal d'une vérification de santé, en secondes
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Stratégie de réplicas inconnue: {strategy} (attendu: {', '.join(STRATEGIES)})")
+        self.primary = primary
+        self.replicas = replicas or []
+        self.strategy = strategy
+        self.max_lag_seconds = max_lag_seconds
+        self.health_timeout = health_timeout
+        self._turns = count()
+
+    def select(self) -> Optional[Replica]:
+        """
+        Choisit une réplica saine pour une nouvelle session de lecture.
+
+        Returns:
+            La réplica, ou None s'il faut lire sur la primaire
+        """
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.strategy == LEAST_BUSY:
+            return min(healthy, key=lambda replica: replica.sessions)
+        return healthy[next(self._turns) % len(healthy)]
+
+    async def check_replica(self, replica: Replica):
+        """Vérifie la connexion (et le retard de réplication) d'une réplica"""
+        try:
+            async with asyncio.timeout(self.health_timeout):
+                async with replica.engine.connect() as conn:
+                    if self.max_lag_seconds is None:
+                        await conn.execute(text("SELECT 1"))
+                        lag = None
+                    else:
+                        lag = (await conn.execute(REPLICATION_LAG_QUERY)).scalar()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            replica.mark_unhealthy(str(e) or type(e).__name__)
+            return
+        if lag is not None and lag > self.max_lag_seconds:
+            replica.mark_unhealthy(f"retard de réplication {float(lag):.1f} s")
+        else:
+            replica.mark_healthy()
+
+    async def check_health(self):
+        """Vérifie toutes les réplicas en parallèle"""
+        await asyncio.gather(*(self.check_replica(replica) for replica in self.replicas))
+
+    async def watch(self, interval: float = 5.0):
+        """
+        Boucle de vérification à lancer en tâche de fond.
+
+        Args:
+            interval: Délai en secondes entre deux vérifications
+        """
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval)
+
+    async def close(self):
+        """Ferme les connexions des réplicas"""
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+class RoutingSession(Session):
+    """
+    Session synchrone (sous-jacente à AsyncSession) qui route chaque instruction
+    vers la primaire ou vers la réplica choisie pour la session.
+    """
+
+    def __init__(self, router: Optional[ReplicaRouter] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.router = router
+        self._replica: Optional[Replica] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.router is None or not self.router.replicas:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if self._flushing or not isinstance(clause, Select):
+            # Écriture (ou SQL inconnu) : la suite de la session lit ses propres écritures
+            self.info[PRIMARY_INFO_KEY] = True
+        if self.info.get(PRIMARY_INFO_KEY):
+            return self.router.primary.sync_engine
+        if self._replica is None:
+            self._replica = self.router.select()
+            if self._replica is None:
+                return self.router.primary.sync_engine
+            self._replica.sessions += 1
+        return self._replica.engine.sync_engine
+
+    def close(self):
+        if self._replica is not None:
+            self._replica.sessions -= 1
+            self._replica = None
+        super().close()
+
+
+def use_primary(session: AsyncSession):
+    """
+    Colle une session à la primaire (read-your-writes) : à appeler avant une lecture
+    qui doit voir une écriture récente, ou avant un cycle lecture-modification-écriture.
+    """
+    session.info[PRIMARY_INFO_KEY] = True
@@ -0,0 +1,93 @@
+"""
+Base SQLite embarquée (aiosqlite), alternative à PostgreSQL pour un poste de
+développement, une démo ou un déploiement mono-instance.
+
+Chaque connexion est réglée à l'ouverture :
+
+- `journal_mode=WAL` : les lectures ne bloquent plus l'écriture (et inversement) ;
+- `synchronous=NORMAL` : sûr en WAL, un fsync par checkpoint au lieu d'un par transaction ;
+- `busy_timeout` : une écriture concurrente attend le verrou au lieu d'échouer ;
+- `haversine_km(lat1, lon1, lat2, lon2)` : fonction SQL utilisée par la recherche
+  des régions les plus proches (SQLite n'a pas toujours les fonctions trigonométriques).
+
+Le schéma est créé à partir des modèles SQLAlchemy (`Base.metadata`) : mêmes tables,
+contraintes et index que `database/init_scripts/01_init_database.sql`.
+
+aiosqlite est facultatif (extra `sqlite` : `poetry install --extras sqlite`).
+"""
+
+import logging
+import os
+
+try:
+    import aiosqlite
+except ImportError:
+    aiosqlite = None
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.database.connection import Base
+from backend.database import models  # noqa: F401 (enregistre les tables dans Base.metadata)
+from backend.indexes.spatial_index import haversine_km
+
+logger = logging.getLogger(__name__)
+
+# Réglages appliqués à chaque nouvelle connexion du pool
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+
+def sqlite_available() -> bool:
+    """Le pilote aiosqlite est-il installé ?"""
+    return aiosqlite is not None
+
+
+def _configure_connection(dbapi_connection, connection_record):
+    """Applique les PRAGMA et enregistre les fonctions SQL sur une nouvelle connexion"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+    dbapi_connection.create_function("haversine_km", 4, haversine_km, deterministic=True)
+
+
+class SQLiteDatabase:
+    """
+    Moteur et fabrique de sessions d'une base SQLite.
+    """
+
+    def __init__(self, path: str, echo: bool = False):
+        """
+        Args:
+            path: Chemin du fichier de base (créé s'il n'existe pas)
+            echo: Journalise les requêtes SQL
+        """
+        self.path = path
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{path}", echo=echo)
+        event.listen(self.engine.sync_engine, "connect", _configure_connection)
+        self.session_factory = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+
+    @classmethod
+    def from_env(cls) -> "SQLiteDatabase":
+        """Construit la base à partir de SQLITE_PATH (weather_app.db par défaut) et SQLITE_ECHO"""
+        return cls(
+            os.getenv("SQLITE_PATH", "weather_app.db"),
+            echo=os.getenv("SQLITE_ECHO", "false").lower() == "true"
+        )
+
+    async def initialize(self):
+        """Crée les tables et les index manquants"""
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        logger.info(f"🗄️ Base SQLite prête: {self.path}")
+
+    async def close(self):
+        """Ferme les connexions du pool"""
+        await self.engine.dispose()
@@ -0,0 +1,134 @@
+"""
+Registre des instructions SQL des lectures fréquentes des repositories.
+
+Construire un `select()` à chaque appel coûte cher en Python : assemblage de l'arbre
+d'expressions, puis calcul de sa clé de cache pour retrouver la compilation. Ici chaque
+instruction est construite une seule fois, au chargement du module, avec uniquement des
+paramètres liés (`bindparam`) : sa clé de cache est calculée une fois puis mémorisée, sa
+compilation est servie par le cache du moteur, et le texte SQL ne varie jamais d'un appel
+à l'autre. asyncpg peut donc réutiliser, sur chaque connexion, l'instruction préparée
+correspondante (voir `database/prepared_statements.py`).
+
+Les valeurs sont passées à l'exécution :
+    await session.execute(WEATHER_BY_REGION, {"pattern": f"%{region_name}%"})
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+from sqlalchemy import Float, Integer, Select, and_, bindparam, cast, desc, func, select
+from sqlalchemy.dialects.postgresql import distinct_on
+
+from backend.database.models import Region, WeatherData, WeatherForecast
+
+# Caractère d'échappement des motifs LIKE construits par `like_prefix`
+LIKE_ESCAPE = "/"
+
+# Météo actuelle : dernière mesure (hors prévision) dont le nom contient le motif
+WEATHER_BY_REGION = (select(WeatherData)
+                     .where(and_(
+                         WeatherData.region_name.ilike(bindparam("pattern")),
+                         WeatherData.is_forecast == False
+                     ))
+                     .order_by(desc(WeatherData.recorded_at))
+                     .limit(1))
+
+
+
+@lru_cache(maxsize=64)
+def weather_by_region_projection(columns: Tuple[str, ...]) -> Select:
+    """
+    Météo actuelle réduite aux colonnes demandées (`?fields=`), mêmes paramètres que
+    WEATHER_BY_REGION. Une instruction par jeu de colonnes, construite au premier appel
+    puis réutilisée : son texte SQL reste stable pour le cache d'instructions préparées.
+    """
+    table = WeatherData.__table__
+    return (select(*(table.c[column] for column in columns))
+            .where(and_(
+                WeatherData.region_name.ilike(bindparam("pattern")),
+                WeatherData.is_forecast == False
+            ))
+            .order_by(desc(WeatherData.recorded_at))
+            .limit(1))
+
+# Prévisions d'une région entre deux dates (plage de l'index unique region_name, forecast_date)
+WEATHER_FORECAST = (select(WeatherForecast)
+                    .where(and_(
+                        WeatherForecast.region_name == bindparam("region_name"),
+                        WeatherForecast.forecast_date <= bindparam("end_date"),
+                        WeatherForecast.forecast_date >= bindparam("start_date")
+                    ))
+                    .order_by(WeatherForecast.forecast_date)
+                    .limit(bindparam("days", type_=Integer)))
+
+# Historique des mesures depuis une date, de la plus récente à la plus ancienne
+WEATHER_HISTORY = (select(WeatherData)
+                   .where(and_(
+                       WeatherData.region_name.ilike(bindparam("pattern")),
+                       WeatherData.recorded_at >= bindparam("start_date"),
+                       WeatherData.is_forecast == False
+                   ))
+                   .order_by(desc(WeatherData.recorded_at)))
+
+# Historique en lignes (réponses tabulaires) : colonnes nommées comme dans l'API, numériques
+# convertis en float8 par la base plutôt qu'en Decimal côté Python (sans effet une fois les
+# colonnes en double precision, migration 004)
+WEATHER_HISTORY_ROWS = (select(
+                            WeatherData.region_name.label("region"),
+                            cast(WeatherData.temperature, Float).label("temperature"),
+                            WeatherData.condition,
+                            WeatherData.humidity,
+                            cast(WeatherData.pressure, Float).label("pressure"),
+                            cast(WeatherData.wind_speed, Float).label("wind_speed"),
+                            WeatherData.wind_direction,
+                            WeatherData.recorded_at
+                        )
+                        .where(and_(
+                            WeatherData.region_name.ilike(bindparam("pattern")),
+                            WeatherData.recorded_at >= bindparam("start_date"),
+                            WeatherData.is_forecast == False
+                        ))
+                        .order_by(desc(WeatherData.recorded_at)))
+
+# Dernière mesure de chaque région avec ses coordonnées (DISTINCT ON : PostgreSQL)
+LATEST_WEATHER_BY_REGION = (select(WeatherData, Region.latitude, Region.longitude)
+                            .join(Region, Region.name == WeatherData.region_name)
+                            .where(WeatherData.is_forecast == False)
+                            .ext(distinct_on(WeatherData.region_name))
+                            .order_by(WeatherData.region_name, desc(WeatherData.recorded_at)))
+
+REGION_BY_ID = select(Region).where(Region.id == bindparam("region_id"))
+
+# Nom comparé en minuscules (la valeur liée est déjà en minuscules)
+REGION_BY_NAME = select(Region).where(func.lower(Region.name) == bindparam("name"))
+
+ALL_REGIONS = select(Region).order_by(Region.name)
+
+# Recherche par début de nom (motif produit par `like_prefix`)
+REGION_SEARCH = (select(Region)
+                 .where(Region.name.ilike(bindparam("pattern"), escape=LIKE_ESCAPE))
+                 .order_by(Region.nb_habitants.desc(), Region.id)
+                 .limit(bindparam("limit", type_=Integer)))
+
+REGIONS_WATERMARK = select(func.count(Region.id), func.max(Region.updated_at))
+
+# Instructions du registre par nom (mesures et vérifications)
+HOT_STATEMENTS = {
+    "weather_by_region": WEATHER_BY_REGION,
+    "weather_forecast": WEATHER_FORECAST,
+    "weather_history": WEATHER_HISTORY,
+    "weather_history_rows": WEATHER_HISTORY_ROWS,
+    "latest_weather_by_region": LATEST_WEATHER_BY_REGION,
+    "region_by_id": REGION_BY_ID,
+    "region_by_name": REGION_BY_NAME,
+    "all_regions": ALL_REGIONS,
+    "region_search": REGION_SEARCH,
+    "regions_watermark": REGIONS_WATERMARK,
+}
+
+
+def like_prefix(query: str) -> str:
+    """Motif LIKE « commence par `query` », les caractères spéciaux de `query` étant échappés"""
+    for special in (LIKE_ESCAPE, "%", "_"):
+        query = query.replace(special, LIKE_ESCAPE + special)
+    return query + "%"
@@ -0,0 +1,112 @@
+"""
+Cache de fabriques compilées pour la résolution par requête.
+
+`Injector.get` relit à chaque appel les signatures `@inject`, cherche les bindings
+dans la chaîne parent / enfant et passe par les scopes. Le graphe ne change
+pourtant pas pendant la vie du processus : seule la session diffère d'une requête
+à l'autre. On compile donc, une fois au démarrage, une fermeture par binding :
+
+- singleton (ou instance) : la valeur est résolue une fois et capturée ;
+- classe ou provider : appel direct du constructeur / de la méthode provider avec
+  les fabriques, elles aussi compilées, de ses dépendances ;
+- session : la fermeture retourne la session passée en argument.
+
+Résoudre un service revient alors à quelques appels de fonctions.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Type, TypeVar
+
+from injector import (
+    CallableProvider, ClassProvider, Injector, InstanceProvider, SingletonScope, get_bindings
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Fabrique compilée : session de la requête -> instance
+Factory = Callable[[AsyncSession], Any]
+
+
+class CompiledProviders:
+    """
+    Fabriques compilées à partir des bindings d'un injector.
+    Les bindings inconnus (provider personnalisé, scope autre que singleton)
+    retombent sur un injector enfant, comme sans compilation.
+    """
+
+    def __init__(self, injector: Injector, request_injector: Callable[[AsyncSession], Injector]):
+        """
+        Args:
+            injector: Injector du processus, déjà configuré
+            request_injector: Fabrique de l'injector enfant d'une requête (repli)
+        """
+        self.injector = injector
+        self.request_injector = request_injector
+        self._factories: Dict[type, Factory] = {}
+
+    def factory(self, interface: Type[T]) -> Callable[[AsyncSession], T]:
+        """
+        Retourne la fabrique compilée d'une interface (compilée au premier appel).
+
+        Args:
+            interface: Type demandé (ex. IWeatherService)
+
+        Returns:
+            Fonction session -> instance
+        """
+        factory = self._factories.get(interface)
+        if factory is None:
+            factory = self._factories[interface] = self._compile(interface)
+        return factory
+
+    def get(self, interface: Type[T], session: AsyncSession) -> T:
+        """Résout une interface pour la session d'une requête"""
+        return self.factory(interface)(session)
+
+    def warm_up(self, *interfaces: type):
+        """Compile d'avance les fabriques des interfaces données (au démarrage)"""
+        for interface in interfaces:
+            self.factory(interface)
+        logger.info(f"💉 {len(self._factories)} fabriques compilées")
+
+    def _compile(self, interface: type) -> Factory:
+        if interface is AsyncSession:
+            return _session_factory
+
+        binding, _ = self.injector.binder.get_binding(interface)
+        provider = binding.provider
+
+        if isinstance(provider, InstanceProvider) or issubclass(binding.scope, SingletonScope):
+            instance = self.injector.get(interface)
+            return lambda session: instance
+
+        if isinstance(provider, ClassProvider):
+            target = provider._cls
+            dependencies = get_bindings(target.__init__)
+        elif isinstance(provider, CallableProvider):
+            target = provider._callable
+            dependencies = get_bindings(target)
+        else:
+            logger.warning(f"Binding non compilable pour {interface.__name__}, résolution par l'injector")
+            return lambda session: self.request_injector(session).get(interface)
+
+        factories = {name: self.factory(dependency) for name, dependency in dependencies.items()}
+        return _call_with(target, factories)
+
+
+def _session_factory(session: AsyncSession) -> AsyncSession:
+    return session
+
+
+def _call_with(target: Callable[..., Any], factories: Dict[str, Factory]) -> Factory:
+    """Spécialise l'appel selon le nombre de dépendances pour éviter les boucles inutiles"""
+    if not factories:
+        return lambda session: target()
+    if len(factories) == 1:
+        (name, dependency), = factories.items()
+        return lambda session: target(**{name: dependency(session)})
+    items = tuple(factories.items())
+    return lambda session: target(**{name: dependency(session) for name, dependency in items})
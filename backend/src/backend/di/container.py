@@ -1,23 +1,41 @@
 """
 Configuration de l'injection de dépendances avec la bibliothèque injector.
 Ce module configure tous les bindings pour l'application.
+
+Le graphe d'objets est résolu une fois par processus (injector global :
+choix du backend, catalogue, moteur d'interpolation). Seule la session
+de base de données change à chaque requête ; `get_request_session` l'ouvre
+sur le moteur du backend choisi (PostgreSQL ou SQLite). Les helpers `get_*_service(session)`
+passent par des fabriques compilées une fois (`compiled_providers.py`) ;
+`get_request_injector` reste disponible pour résoudre n'importe quel type.
 """
 
 from injector import Module, provider, singleton, Injector
+from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator
 import os
 import logging
 
-from backend.database.connection import AsyncSessionLocal, db_config
+from backend.database.sqlite import sqlite_available
+from backend.di.compiled_providers import CompiledProviders
+from backend.indexes.region_catalog import RegionCatalog, get_region_catalog
+from backend.interpolation.idw import WeatherInterpolator, get_weather_interpolator
+from backend.repositories.backends import BACKENDS, MOCK, POSTGRESQL, SIMULATION, SQLITE, RepositoryBackend
 from backend.repositories.interfaces import IRegionRepository, IWeatherRepository
-from backend.repositories.region_repository import RegionRepository
-from backend.repositories.weather_repository import WeatherRepository
-from backend.repositories.implementations.postgresql_region_repository import PostgreSQLRegionRepository
-from backend.repositories.implementations.postgresql_weather_repository import PostgreSQLWeatherRepository
+from backend.repositories.implementations.cached_region_repository import CachedRegionRepository
+from backend.repositories.implementations.circuit_breaker_weather_repository import CircuitBreakerWeatherRepository
+from backend.resilience.circuit_breaker import CircuitBreaker
+from backend.resilience.coalescing import get_request_coalescer
+from backend.resilience.stale_cache import StaleCache
 from backend.services.interfaces.Iregion_info_service import IRegionInformationService
 from backend.services.interfaces.Iweather_service import IWeatherService
+from backend.services.interfaces.Iweather_interpolation_service import IWeatherInterpolationService
+from backend.services.implementation.coalescing_region_info_service import CoalescingRegionInformationService
+from backend.services.implementation.coalescing_weather_service import CoalescingWeatherService
 from backend.services.implementation.region_info_service import RegionInformationService
-from backend.services.implementation.weather_service import WeatherService
+from backend.services.implementation.weather_service_injector import WeatherService
+from backend.services.implementation.weather_interpolation_service import WeatherInterpolationService
 
 logger = logging.getLogger(__name__)
 
@@ -29,30 +47,90 @@ class DatabaseModule(Module):
     def configure(self, binder):
         """Configure les bindings de base"""
         # Configuration du type de repository selon l'environnement
-        use_postgresql = self._should_use_postgresql()
+        backend = self._select_backend()
         
-        if use_postgresql:
+        if backend == POSTGRESQL:
             logger.info("🔗 Configuration: Utilisation de PostgreSQL")
-            binder.bind(IRegionRepository, to=PostgreSQLRegionRepository)
-            binder.bind(IWeatherRepository, to=PostgreSQLWeatherRepository)
+        elif backend == SIMULATION:
+            logger.info("🧪 Configuration: Utilisation du backend de simulation")
+        elif backend == SQLITE:
+            logger.info("🗄️ Configuration: Utilisation de SQLite")
         else:
             logger.info("🔧 Configuration: Utilisation des repositories Mock")
-            binder.bind(IRegionRepository, to=RegionRepository)
-            binder.bind(IWeatherRepository, to=WeatherRepository)
+        self.backend = backend
+        self.use_postgresql = backend == POSTGRESQL
+    
+    @provider
+    @singleton
+    def provide_repository_backend(self) -> RepositoryBackend:
+        """Fournit la fabrique des repositories du backend choisi (jeu simulé généré une fois)"""
+        if self.backend == SIMULATION:
+            return RepositoryBackend.simulation_from_env()
+        if self.backend == SQLITE:
+            return RepositoryBackend.sqlite_from_env()
+        return RepositoryBackend(self.backend)
     
     @provider
     @singleton
-    def provide_database_session(self) -> AsyncSession:
+    def provide_circuit_breaker(self) -> CircuitBreaker:
+        """Fournit le disjoncteur de la base, partagé par toutes les requêtes du processus"""
+        return CircuitBreaker.from_env("database")
+    
+    @provider
+    @singleton
+    def provide_stale_cache(self) -> StaleCache:
+        """Fournit les dernières valeurs connues servies quand la base ne répond pas"""
+        return StaleCache(max_entries=int(os.getenv("STALE_CACHE_MAX_ENTRIES", "50000")))
+    
+    @provider
+    @singleton
+    def provide_region_catalog(self) -> RegionCatalog:
+        """Fournit le catalogue des régions partagé par le processus"""
+        return get_region_catalog()
+    
+    @provider
+    @singleton
+    def provide_weather_interpolator(self) -> WeatherInterpolator:
+        """Fournit le moteur d'interpolation partagé par le processus"""
+        return get_weather_interpolator()
+    
+    @provider
+    def provide_region_repository(self, session: AsyncSession, catalog: RegionCatalog,
+                                  backend: RepositoryBackend) -> IRegionRepository:
         """
-        Fournit une session de base de données.
-        Utilise un singleton pour réutiliser la même session.
+        Fournit le repository des régions : les lectures passent par le catalogue
+        en mémoire, les écritures par le backend choisi puis rechargent le catalogue.
         """
-        try:
-            return AsyncSessionLocal()
-        except Exception as e:
-            logger.error(f"Erreur lors de la création de la session DB: {e}")
-            # Retourner None pour forcer l'utilisation des mocks
-            return None
+        return CachedRegionRepository(backend.region_repository(session), catalog)
+    
+    @provider
+    def provide_weather_repository(self, session: AsyncSession, backend: RepositoryBackend,
+                                   breaker: CircuitBreaker, stale_cache: StaleCache) -> IWeatherRepository:
+        """
+        Fournit le repository météo du backend choisi, sur la session de la requête,
+        derrière le disjoncteur de la base (latence bornée, dernières valeurs connues en panne).
+        """
+        return CircuitBreakerWeatherRepository(backend.weather_repository(session), breaker, stale_cache)
+    
+    def _select_backend(self) -> str:
+        """
+        Choisit le backend des repositories.
+        DATABASE_BACKEND (postgresql | mock | simulation | sqlite) est prioritaire ;
+        sinon APP_ENV=simulation active la simulation, puis _should_use_postgresql tranche.
+        
+        Returns:
+            Nom du backend
+        """
+        backend = os.getenv("DATABASE_BACKEND", "").lower()
+        if backend:
+            if backend not in BACKENDS:
+                raise ValueError(f"DATABASE_BACKEND inconnu: {backend} (attendu: {', '.join(BACKENDS)})")
+            if backend == SQLITE and not sqlite_available():
+                raise ValueError("DATABASE_BACKEND=sqlite nécessite aiosqlite (extra sqlite : poetry install --extras sqlite)")
+            return backend
+        if os.getenv("APP_ENV", "development") == "simulation":
+            return SIMULATION
+        return POSTGRESQL if self._should_use_postgresql() else MOCK
     
     def _should_use_postgresql(self) -> bool:
         """
@@ -65,8 +143,8 @@ class DatabaseModule(Module):
         use_database = os.getenv("USE_DATABASE", "true").lower() == "true"
         app_env = os.getenv("APP_ENV", "development")
         
-        # En mode test, toujours utiliser les mocks
-        if app_env == "test":
+        # En mode test (mocks) ou simulation, jamais PostgreSQL
+        if app_env in ("test", "simulation"):
             return False
         
         # Si USE_DATABASE=false, utiliser les mocks
@@ -91,6 +169,21 @@ class ServiceModule(Module):
         """Configure les bindings des services"""
         binder.bind(IRegionInformationService, to=RegionInformationService)
         binder.bind(IWeatherService, to=WeatherService)
+        binder.bind(IWeatherInterpolationService, to=WeatherInterpolationService)
+
+class RequestModule(Module):
+    """
+    Module d'une requête : lie la session de base de données de la requête.
+    Installé dans un injector enfant, il ne masque que AsyncSession ; les
+    singletons restent portés par l'injector global.
+    """
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    def configure(self, binder):
+        """Lie la session de la requête en cours"""
+        binder.bind(AsyncSession, to=self.session)
 
 class ApplicationModule(Module):
     """
@@ -103,11 +196,19 @@ class ApplicationModule(Module):
     
     def configure(self, binder):
         """Configure tous les bindings de l'application"""
-        self.database_module.configure(binder)
-        self.service_module.configure(binder)
+        # install() enregistre aussi les méthodes @provider des sous-modules
+        binder.install(self.database_module)
+        binder.install(self.service_module)
 
-# Instance globale de l'injector
+# Instance globale de l'injector et de ses fabriques compilées
 _injector = None
+_compiled_providers = None
+
+# Types résolus à chaque requête : leurs fabriques sont compilées au démarrage
+REQUEST_SCOPED_INTERFACES = (
+    IRegionInformationService, IWeatherService, IWeatherInterpolationService,
+    IRegionRepository, IWeatherRepository
+)
 
 def get_injector() -> Injector:
     """
@@ -123,27 +224,105 @@ def get_injector() -> Injector:
         logger.info("💉 Injector initialisé avec succès")
     return _injector
 
+def get_compiled_providers() -> CompiledProviders:
+    """
+    Retourne les fabriques compilées à partir de l'injector global.
+    
+    Returns:
+        CompiledProviders partagé par le processus
+    """
+    global _compiled_providers
+    if _compiled_providers is None:
+        _compiled_providers = CompiledProviders(get_injector(), get_request_injector)
+    return _compiled_providers
+
+def compile_providers():
+    """Compile les fabriques des types résolus par requête (à appeler au démarrage)"""
+    get_compiled_providers().warm_up(*REQUEST_SCOPED_INTERFACES)
+
 def reset_injector():
     """
     Réinitialise l'injector (utile pour les tests).
     """
-    global _injector
+    global _injector, _compiled_providers
     _injector = None
+    _compiled_providers = None
     logger.info("🔄 Injector réinitialisé")
 
+def get_request_injector(session: AsyncSession) -> Injector:
+    """
+    Retourne un injector enfant de l'injector global, lié à la session d'une requête.
+    
+    Args:
+        session: Session de base de données de la requête
+        
+    Returns:
+        Injector dont seule la session diffère de l'injector global
+    """
+    return get_injector().create_child_injector([RequestModule(session)])
+
+def get_repository_backend() -> RepositoryBackend:
+    """Retourne le backend des repositories du processus (singleton capturé par sa fabrique compilée)"""
+    return get_compiled_providers().factory(RepositoryBackend)(None)
+
+async def get_request_session() -> AsyncIterator[AsyncSession]:
+    """
+    Ouvre la session d'une requête sur le moteur du backend choisi.
+    À utiliser avec FastAPI Depends.
+    """
+    async with get_repository_backend().session_factory() as session:
+        yield session
+
+@asynccontextmanager
+async def weather_service_scope() -> AsyncIterator[IWeatherService]:
+    """
+    Fournit un service météo sur une session dédiée, distincte de celle de la requête :
+    plusieurs lectures concurrentes d'une même requête prennent chacune leur connexion du pool
+    (une session ne peut exécuter qu'une instruction à la fois).
+    """
+    async with get_repository_backend().session_factory() as session:
+        yield get_weather_service(session)
+
+@asynccontextmanager
+async def region_service_scope() -> AsyncIterator[IRegionInformationService]:
+    """Fournit un service des régions sur une session dédiée, distincte de celle de la requête"""
+    async with get_repository_backend().session_factory() as session:
+        yield get_region_service(session)
+
 # Fonctions utilitaires pour obtenir les instances
-def get_region_service() -> IRegionInformationService:
-    """Obtient une instance du service de régions via l'injector"""
-    return get_injector().get(IRegionInformationService)
+def get_region_service(session: AsyncSession) -> IRegionInformationService:
+    """Obtient une instance du service de régions via les fabriques compilées"""
+    return get_compiled_providers().get(IRegionInformationService, session)
+
+def get_weather_service(session: AsyncSession) -> IWeatherService:
+    """Obtient une instance du service météo via les fabriques compilées"""
+    return get_compiled_providers().get(IWeatherService, session)
+
+def get_weather_interpolation_service(session: AsyncSession) -> IWeatherInterpolationService:
+    """Obtient une instance du service d'interpolation via les fabriques compilées"""
+    return get_compiled_providers().get(IWeatherInterpolationService, session)
+
+def get_coalescing_weather_service(session: AsyncSession) -> IWeatherService:
+    """
+    Obtient le service météo des endpoints HTTP : les lectures identiques concurrentes sont
+    regroupées (sur leur propre session) si REQUEST_COALESCING est actif
+    """
+    coalescer = get_request_coalescer()
+    if coalescer is None:
+        return get_weather_service(session)
+    return CoalescingWeatherService(weather_service_scope, coalescer)
 
-def get_weather_service() -> IWeatherService:
-    """Obtient une instance du service météo via l'injector"""
-    return get_injector().get(IWeatherService)
+def get_coalescing_region_service(session: AsyncSession) -> IRegionInformationService:
+    """Obtient le service des régions des endpoints HTTP, lectures identiques concurrentes regroupées"""
+    coalescer = get_request_coalescer()
+    if coalescer is None:
+        return get_region_service(session)
+    return CoalescingRegionInformationService(get_region_service(session), region_service_scope, coalescer)
 
-def get_region_repository() -> IRegionRepository:
-    """Obtient une instance du repository de régions via l'injector"""
-    return get_injector().get(IRegionRepository)
+def get_region_repository(session: AsyncSession) -> IRegionRepository:
+    """Obtient une instance du repository de régions via les fabriques compilées"""
+    return get_compiled_providers().get(IRegionRepository, session)
 
-def get_weather_repository() -> IWeatherRepository:
-    """Obtient une instance du repository météo via l'injector"""
-    return get_injector().get(IWeatherRepository)
+def get_weather_repository(session: AsyncSession) -> IWeatherRepository:
+    """Obtient une instance du repository météo via les fabriques compilées"""
+    return get_compiled_providers().get(IWeatherRepository, session)
@@ -5,7 +5,6 @@ Ce fichier montre les différentes façons d'utiliser l'injector dans votre appl
 
 import asyncio
 import logging
-from typing import List
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -20,11 +19,13 @@ def example_basic_usage():
     
     try:
         # Importer les fonctions utilitaires
+        from backend.database.connection import AsyncSessionLocal
         from backend.di.container import get_region_service, get_weather_service
         
-        # Obtenir des instances via l'injector
-        region_service = get_region_service()
-        weather_service = get_weather_service()
+        # Obtenir des instances via l'injector (la session est celle de la "requête")
+        session = AsyncSessionLocal()
+        region_service = get_region_service(session)
+        weather_service = get_weather_service(session)
         
         logger.info(f"Service régions: {type(region_service).__name__}")
         logger.info(f"Service météo: {type(weather_service).__name__}")
@@ -49,7 +50,7 @@ async def example_service_usage():
         try:
             # Test du service régions
             logger.info("Test du service régions...")
-            region = await region_service.get_region_info(1)
+            region = await region_service.get_region_info_by_id(1)
             logger.info(f"Région récupérée: {region.name}")
             
             # Test du service météo
@@ -74,14 +75,16 @@ def example_manual_injector():
     
     try:
         from injector import Injector
-        from backend.di.container import ApplicationModule
+        from backend.database.connection import AsyncSessionLocal
+        from backend.di.container import ApplicationModule, RequestModule
         from backend.services.interfaces.Iregion_info_service import IRegionInformationService
         
         # Créer un injector avec la configuration
         injector = Injector([ApplicationModule()])
         
-        # Obtenir une instance via l'injector
-        region_service = injector.get(IRegionInformationService)
+        # Lier une session dans un injector enfant, puis obtenir une instance
+        request_injector = injector.create_child_injector([RequestModule(AsyncSessionLocal())])
+        region_service = request_injector.get(IRegionInformationService)
         
         logger.info(f"Service créé manuellement: {type(region_service).__name__}")
         
@@ -100,7 +103,8 @@ def example_testing_configuration():
     
     try:
         import os
-        from backend.di.container import reset_injector, get_injector
+        from backend.database.connection import AsyncSessionLocal
+        from backend.di.container import reset_injector, get_request_injector
         
         # Configurer l'environnement pour les tests
         os.environ["APP_ENV"] = "test"
@@ -110,7 +114,7 @@ def example_testing_configuration():
         reset_injector()
         
         # Obtenir le nouvel injector configuré pour les tests
-        test_injector = get_injector()
+        test_injector = get_request_injector(AsyncSessionLocal())
         
         from backend.services.interfaces.Iregion_info_service import IRegionInformationService
         region_service = test_injector.get(IRegionInformationService)
@@ -141,11 +145,13 @@ def show_dependency_graph():
         
         # Informations sur les bindings
         logger.info("Bindings configurés:")
-        logger.info("- IRegionRepository -> PostgreSQLRegionRepository ou RegionRepository (mock)")
+        logger.info("- IRegionRepository -> CachedRegionRepository(PostgreSQLRegionRepository ou RegionRepository (mock))")
         logger.info("- IWeatherRepository -> PostgreSQLWeatherRepository ou WeatherRepository (mock)")
         logger.info("- IRegionInformationService -> RegionInformationService")
         logger.info("- IWeatherService -> WeatherService")
-        logger.info("- AsyncSession -> Session de base de données (singleton)")
+        logger.info("- IWeatherInterpolationService -> WeatherInterpolationService")
+        logger.info("- RegionCatalog, WeatherInterpolator -> singletons du processus")
+        logger.info("- AsyncSession -> Session de la requête (injector enfant, voir get_request_injector)")
         
         return True
         
@@ -0,0 +1,128 @@
+"""
+Index de préfixe pour l'autocomplétion des noms de régions.
+
+Chaque nom est indexé sous sa forme normalisée (casse et accents ignorés)
+ainsi qu'à partir de chacun de ses mots, de sorte que "azur" retrouve
+"Provence-Alpes-Côte d'Azur". Les résultats sont classés par `nb_habitants`.
+
+Structure :
+- un tableau trié des clés, parcouru par recherche dichotomique ;
+- pour les préfixes « lourds » (qui couvrent plus de HEAVY_PREFIX_RANGE clés),
+  le top-K par population est précalculé, ce qui évite de trier une grande
+  plage à chaque frappe. Toute autre recherche parcourt au plus
+  HEAVY_PREFIX_RANGE clés : le coût d'une requête est donc borné.
+"""
+
+import heapq
+from bisect import bisect_left
+from itertools import groupby
+from typing import Any, Dict, List, Mapping, Tuple
+
+from backend.indexes.text_normalization import normalize_region_name
+
+# Nombre maximal de résultats retournés par une recherche
+MAX_RESULTS = 50
+
+# Au-delà de ce nombre de clés couvertes, le top-K d'un préfixe est précalculé
+HEAVY_PREFIX_RANGE = 128
+
+
+class RegionPrefixIndex:
+    """
+    Index de préfixe immuable sur les noms de régions.
+    """
+
+    __slots__ = ("_keys", "_ids", "_population", "_top_by_prefix")
+
+    def __init__(self, regions: List[Mapping[str, Any]]):
+        """
+        Args:
+            regions: Régions à indexer (au minimum `id`, `name` et `nb_habitants`)
+        """
+        self._population: Dict[int, int] = {}
+        entries: List[Tuple[str, int]] = []
+        for region in regions:
+            region_id = region["id"]
+            self._population[region_id] = region.get("nb_habitants") or 0
+            for key in self._index_keys(region.get("name", "")):
+                entries.append((key, region_id))
+        entries.sort()
+
+        self._keys: Tuple[str, ...] = tuple(key for key, _ in entries)
+        self._ids: Tuple[int, ...] = tuple(region_id for _, region_id in entries)
+        self._top_by_prefix = self._precompute_top(entries)
+
+    @staticmethod
+    def _index_keys(name: str) -> List[str]:
+        """Clés indexées pour un nom : le nom complet puis la suite à partir de chaque mot"""
+        normalized = normalize_region_name(name)
+        if not normalized:
+            return []
+        words = normalized.split(" ")
+        return [" ".join(words[position:]) for position in range(len(words))]
+
+    def _rank_key(self, region_id: int) -> Tuple[int, int]:
+        """Clé de tri : population décroissante puis ID croissant (ordre stable)"""
+        return (-self._population[region_id], region_id)
+
+    def _heavy_prefixes(self) -> set:
+        """
+        Préfixes couvrant plus de HEAVY_PREFIX_RANGE clés.
+        Les clés étant triées, les clés d'un même préfixe sont contiguës ;
+        un préfixe léger n'a que des prolongements légers, d'où l'arrêt anticipé.
+        """
+        heavy = set()
+        length = 1
+        candidates = self._keys
+        while candidates:
+            next_candidates = []
+            for prefix, group in groupby(candidates, key=lambda key: key[:length]):
+                group = list(group)
+                if len(group) > HEAVY_PREFIX_RANGE:
+                    heavy.add(prefix)
+                    next_candidates.extend(key for key in group if len(key) > length)
+            candidates = next_candidates
+            length += 1
+        return heavy
+
+    def _precompute_top(self, entries: List[Tuple[str, int]]) -> Dict[str, Tuple[int, ...]]:
+        """Précalcule le top-K par population pour chaque préfixe lourd"""
+        heavy = self._heavy_prefixes()
+        top: Dict[str, List[int]] = {prefix: [] for prefix in heavy}
+        ranked = sorted(entries, key=lambda entry: self._rank_key(entry[1]))
+        for key, region_id in ranked:
+            for length in range(1, len(key) + 1):
+                bucket = top.get(key[:length])
+                if bucket is None:
+                    break
+                if len(bucket) < MAX_RESULTS and region_id not in bucket:
+                    bucket.append(region_id)
+        return {prefix: tuple(ids) for prefix, ids in top.items()}
+
+    def __len__(self) -> int:
+        return len(self._population)
+
+    def search(self, query: str, limit: int = 10) -> List[int]:
+        """
+        Recherche les régions dont un mot du nom commence par `query`.
+
+        Args:
+            query: Texte saisi (casse et accents ignorés)
+            limit: Nombre maximal de résultats (borné par MAX_RESULTS)
+
+        Returns:
+            IDs des régions, classés par population décroissante
+        """
+        key = normalize_region_name(query)
+        limit = max(0, min(limit, MAX_RESULTS))
+        if not key or not limit:
+            return []
+
+        precomputed = self._top_by_prefix.get(key)
+        if precomputed is not None:
+            return list(precomputed[:limit])
+
+        start = bisect_left(self._keys, key)
+        end = bisect_left(self._keys, key + "\uffff", lo=start)
+        candidates = set(self._ids[start:end])
+        return heapq.nsmallest(limit, candidates, key=self._rank_key)
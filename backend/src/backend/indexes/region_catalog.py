@@ -0,0 +1,225 @@
+"""
+Catalogue des régions préchargé en mémoire.
+
+La table `regions` est petite et quasiment en lecture seule : on la charge
+une fois au démarrage dans un instantané immuable (index par ID, par nom
+normalisé, par préfixe et spatial), puis on remplace cet instantané d'un seul bloc
+lorsqu'une écriture a lieu ou que `updated_at` évolue en base.
+"""
+
+import asyncio
+import logging
+from types import MappingProxyType
+from typing import Any, AsyncContextManager, Callable, Dict, List, Mapping, Optional, Tuple
+
+from backend.indexes.prefix_index import RegionPrefixIndex
+from backend.indexes.spatial_index import RegionSpatialIndex
+from backend.indexes.text_normalization import normalize_region_name
+from backend.repositories.interfaces import IRegionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class RegionCatalogSnapshot:
+    """
+    Instantané immuable des régions et de leurs index.
+    Un instantané n'est jamais modifié : un rafraîchissement en construit un nouveau.
+    """
+
+    __slots__ = ("_regions", "_by_id", "_by_name", "_prefix_index", "_spatial_index", "watermark")
+
+    def __init__(self, regions: List[Dict[str, Any]], watermark: Optional[Dict[str, Any]] = None):
+        """
+        Construit les index à partir des lignes de la table `regions`.
+
+        Args:
+            regions: Liste des régions telles que retournées par le repository
+            watermark: Empreinte de la table au moment du chargement (nombre de lignes, max(updated_at))
+        """
+        frozen = [MappingProxyType(dict(region)) for region in regions]
+        frozen.sort(key=lambda region: region.get("name") or "")
+
+        self._regions: Tuple[Mapping[str, Any], ...] = tuple(frozen)
+        self._by_id: Dict[int, Mapping[str, Any]] = {region["id"]: region for region in frozen}
+        self._by_name: Dict[str, Mapping[str, Any]] = {}
+        for region in frozen:
+            self._by_name.setdefault(normalize_region_name(region.get("name", "")), region)
+
+        self._prefix_index = RegionPrefixIndex(frozen)
+        self._spatial_index = RegionSpatialIndex(frozen)
+        self.watermark = watermark
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def get_by_id(self, region_id: int) -> Dict[str, Any]:
+        """Retourne une copie de la région d'ID donné, ou un dictionnaire vide"""
+        region = self._by_id.get(region_id)
+        return dict(region) if region else {}
+
+    def get_by_name(self, region_name: str) -> Dict[str, Any]:
+        """
+        Retourne la région dont le nom normalisé correspond exactement,
+        ou à défaut la région la plus peuplée dont un mot du nom commence par `region_name`.
+        """
+        key = normalize_region_name(region_name)
+        region = self._by_name.get(key)
+        if region is None:
+            matches = self.find_by_prefix(region_name, limit=1)
+            return matches[0] if matches else {}
+        return dict(region)
+
+    def find_by_prefix(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Retourne au plus `limit` régions dont un mot du nom commence par `prefix`.
+
+        Args:
+            prefix: Début du nom recherché (casse et accents ignorés)
+            limit: Nombre maximal de résultats (borné par prefix_index.MAX_RESULTS)
+
+        Returns:
+            Liste de régions classées par population décroissante
+        """
+        return [dict(self._by_id[region_id]) for region_id in self._prefix_index.search(prefix, limit)]
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> List[Dict[str, Any]]:
+        """
+        Retourne les `k` régions les plus proches d'un point, avec leur distance.
+
+        Args:
+            latitude: Latitude du point (degrés)
+            longitude: Longitude du point (degrés)
+            k: Nombre de régions (borné par spatial_index.MAX_NEIGHBOURS)
+
+        Returns:
+            Liste de régions complétées par `distance_km`, de la plus proche à la plus lointaine
+        """
+        return [
+            {**self._by_id[region_id], "distance_km": round(distance, 3)}
+            for region_id, distance in self._spatial_index.nearest(latitude, longitude, k)
+        ]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Retourne toutes les régions, triées par nom"""
+        return [dict(region) for region in self._regions]
+
+
+class RegionCatalog:
+    """
+    Détenteur de l'instantané courant.
+    Le remplacement est une simple affectation de référence : un lecteur voit
+    toujours soit l'ancien instantané complet, soit le nouveau.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[RegionCatalogSnapshot] = None
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_requested = asyncio.Event()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def snapshot(self) -> RegionCatalogSnapshot:
+        """Instantané courant (un instantané vide si le catalogue n'est pas encore chargé)"""
+        return self._snapshot if self._snapshot is not None else RegionCatalogSnapshot([])
+
+    async def refresh(self, repository: IRegionRepository) -> RegionCatalogSnapshot:
+        """
+        Recharge toutes les régions depuis le repository et remplace l'instantané.
+
+        Args:
+            repository: Repository source (PostgreSQL ou Mock)
+
+        Returns:
+            Le nouvel instantané
+        """
+        async with self._refresh_lock:
+            watermark = await repository.get_regions_watermark()
+            regions = await repository.get_all_regions()
+            if not regions and watermark and watermark.get("count") and self._snapshot is not None:
+                # Le repository masque ses erreurs par une liste vide : on garde l'instantané connu
+                logger.warning("Rechargement du catalogue ignoré: aucune région lue alors que la table n'est pas vide")
+                return self._snapshot
+            # La construction des index est coûteuse pour une grande table : hors de la boucle d'événements
+            self._snapshot = await asyncio.to_thread(RegionCatalogSnapshot, regions, watermark)
+            logger.info(f"Catalogue des régions rechargé: {len(self._snapshot)} régions")
+            return self._snapshot
+
+    async def ensure_loaded(self, repository: IRegionRepository) -> RegionCatalogSnapshot:
+        """Charge le catalogue au premier appel, puis retourne l'instantané courant"""
+        if self._snapshot is None:
+            return await self.refresh(repository)
+        return self._snapshot
+
+    async def refresh_if_stale(self, repository: IRegionRepository) -> bool:
+        """
+        Recharge le catalogue si l'empreinte de la table a changé
+        (nombre de lignes ou max(updated_at)), par exemple après une écriture
+        faite par un autre processus.
+
+        Returns:
+            True si un rechargement a eu lieu
+        """
+        watermark = await repository.get_regions_watermark()
+        if self._snapshot is not None and watermark == self._snapshot.watermark:
+            return False
+        await self.refresh(repository)
+        return True
+
+    async def watch(self, repository_scope: Callable[[], AsyncContextManager[IRegionRepository]], interval: float = 30.0):
+        """
+        Boucle de surveillance à lancer en tâche de fond : compare périodiquement
+        l'empreinte de la table et recharge le catalogue si elle a bougé, ou recharge
+        immédiatement après `request_refresh()`.
+
+        Args:
+            repository_scope: Fabrique d'un contexte async fournissant un repository (une session par vérification)
+            interval: Délai en secondes entre deux vérifications
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            requested = self._refresh_requested.is_set()
+            # Les demandes reçues pendant le rechargement en déclenchent un nouveau
+            self._refresh_requested.clear()
+            try:
+                async with repository_scope() as repository:
+                    if requested:
+                        await self.refresh(repository)
+                    else:
+                        await self.refresh_if_stale(repository)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Vérification du catalogue des régions impossible: {e}")
+
+    def invalidate(self):
+        """Oublie l'instantané courant ; le prochain accès rechargera le catalogue"""
+        self._snapshot = None
+
+    def request_refresh(self):
+        """
+        Demande un rechargement à la boucle `watch` (région modifiée par un autre worker).
+        L'instantané courant reste servi jusque-là ; les demandes rapprochées sont fusionnées.
+        """
+        self._refresh_requested.set()
+
+
+# Instance globale du catalogue
+_region_catalog = None
+
+def get_region_catalog() -> RegionCatalog:
+    """
+    Retourne l'instance globale du catalogue des régions.
+
+    Returns:
+        RegionCatalog partagé par tout le processus
+    """
+    global _region_catalog
+    if _region_catalog is None:
+        _region_catalog = RegionCatalog()
+    return _region_catalog
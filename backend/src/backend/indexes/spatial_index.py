@@ -0,0 +1,153 @@
+"""
+Index spatial des régions pour la recherche des plus proches voisins.
+
+Les coordonnées (latitude, longitude) sont projetées sur la sphère unité en
+3D : la distance euclidienne entre deux points (la corde) croît avec la
+distance orthodromique, ce qui permet d'utiliser un KD-tree classique sans
+erreur près des pôles ni au passage de l'antiméridien. La distance retournée
+est la distance haversine en kilomètres.
+"""
+
+import heapq
+import math
+from typing import Any, List, Mapping, Tuple
+
+# Rayon moyen de la Terre (IUGG)
+EARTH_RADIUS_KM = 6371.0088
+
+# Nombre maximal de voisins retournés par une recherche
+MAX_NEIGHBOURS = 50
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Distance orthodromique entre deux points, en kilomètres.
+
+    Args:
+        lat1, lon1: Coordonnées du premier point (degrés)
+        lat2, lon2: Coordonnées du second point (degrés)
+
+    Returns:
+        Distance en kilomètres
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    delta_phi = phi2 - phi1
+    delta_lambda = math.radians(lon2 - lon1)
+    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def to_unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    """Projette une coordonnée géographique sur la sphère unité"""
+    phi, lam = math.radians(lat), math.radians(lon)
+    cos_phi = math.cos(phi)
+    return (cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi))
+
+
+def chord_to_km(squared_chord: float) -> float:
+    """Convertit une corde au carré (sphère unité) en distance orthodromique"""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(squared_chord) / 2))
+
+
+class RegionSpatialIndex:
+    """
+    KD-tree statique sur les régions géolocalisées.
+    L'arbre est stocké dans des tableaux parallèles (un nœud = un point).
+    """
+
+    __slots__ = ("_vectors", "_ids", "_axis", "_left", "_right", "_root")
+
+    def __init__(self, regions: List[Mapping[str, Any]]):
+        """
+        Args:
+            regions: Régions à indexer ; celles sans latitude/longitude sont ignorées
+        """
+        self._vectors: List[Tuple[float, float, float]] = []
+        self._ids: List[int] = []
+        for region in regions:
+            latitude, longitude = region.get("latitude"), region.get("longitude")
+            if latitude is None or longitude is None:
+                continue
+            self._vectors.append(to_unit_vector(float(latitude), float(longitude)))
+            self._ids.append(region["id"])
+
+        count = len(self._vectors)
+        self._axis = [0] * count
+        self._left = [-1] * count
+        self._right = [-1] * count
+        self._root = self._build(list(range(count)))
+
+    def _build(self, points: List[int]) -> int:
+        """Construit récursivement le sous-arbre et retourne l'indice de sa racine"""
+        if not points:
+            return -1
+        vectors = self._vectors
+        # Découpe selon l'axe de plus grande étendue, estimée sur un échantillon régulier
+        sample = [vectors[point] for point in points[::max(1, len(points) // 64)]]
+        spreads = [max(vector[axis] for vector in sample) - min(vector[axis] for vector in sample) for axis in range(3)]
+        axis = spreads.index(max(spreads))
+        points.sort(key=lambda point: vectors[point][axis])
+        median = len(points) // 2
+        node = points[median]
+        self._axis[node] = axis
+        self._left[node] = self._build(points[:median])
+        self._right[node] = self._build(points[median + 1:])
+        return node
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> List[Tuple[int, float]]:
+        """
+        Retourne les `k` régions les plus proches d'un point.
+
+        Args:
+            latitude: Latitude du point (degrés)
+            longitude: Longitude du point (degrés)
+            k: Nombre de voisins (borné par MAX_NEIGHBOURS)
+
+        Returns:
+            Liste de couples (ID de région, distance en km), du plus proche au plus lointain
+        """
+        k = max(0, min(k, MAX_NEIGHBOURS))
+        if not k or self._root == -1:
+            return []
+
+        query = to_unit_vector(latitude, longitude)
+        vectors, axes, left, right = self._vectors, self._axis, self._left, self._right
+        # Tas max (distances négatives) des k meilleurs candidats
+        best: List[Tuple[float, int]] = []
+
+        def visit(node: int):
+            vector = vectors[node]
+            dx, dy, dz = query[0] - vector[0], query[1] - vector[1], query[2] - vector[2]
+            squared = dx * dx + dy * dy + dz * dz
+            if len(best) < k:
+                heapq.heappush(best, (-squared, node))
+            elif squared < -best[0][0]:
+                heapq.heapreplace(best, (-squared, node))
+
+            delta = query[axes[node]] - vector[axes[node]]
+            near, far = (left[node], right[node]) if delta < 0 else (right[node], left[node])
+            if near != -1:
+                visit(near)
+            if far != -1 and (len(best) < k or delta * delta < -best[0][0]):
+                visit(far)
+
+        visit(self._root)
+        return [(self._ids[node], chord_to_km(-negated)) for negated, node in sorted(best, reverse=True)]
+
+    def nearest_brute_force(self, latitude: float, longitude: float, k: int = 1) -> List[Tuple[int, float]]:
+        """
+        Version par balayage complet, utilisée comme référence par le benchmark.
+
+        Returns:
+            Même résultat que `nearest`
+        """
+        k = max(0, min(k, MAX_NEIGHBOURS))
+        query = to_unit_vector(latitude, longitude)
+        squared = (
+            ((query[0] - x) ** 2 + (query[1] - y) ** 2 + (query[2] - z) ** 2, index)
+            for index, (x, y, z) in enumerate(self._vectors)
+        )
+        return [(self._ids[index], chord_to_km(distance)) for distance, index in heapq.nsmallest(k, squared)]
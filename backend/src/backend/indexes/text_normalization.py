@@ -0,0 +1,26 @@
+"""
+Normalisation des noms de régions pour les index en mémoire.
+Les recherches deviennent insensibles à la casse et aux accents.
+"""
+
+import re
+import unicodedata
+
+_SEPARATORS = re.compile(r"[\s\-'’_.]+")
+
+
+def normalize_region_name(name: str) -> str:
+    """
+    Normalise un nom de région (casse, accents, séparateurs).
+
+    Args:
+        name: Le nom brut, ex. "Provence-Alpes-Côte d'Azur"
+
+    Returns:
+        Le nom normalisé, ex. "provence alpes cote d azur"
+    """
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", name)
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _SEPARATORS.sub(" ", without_accents.casefold()).strip()
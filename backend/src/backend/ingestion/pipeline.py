@@ -0,0 +1,428 @@
+"""
+Pipeline d'ingestion asynchrone des données météo.
+
+    source ──► file bornée ──► micro-lots (taille / délai) ──► écritures groupées
+
+- La file est bornée : quand l'écriture ne suit pas, `put()` bloque la source
+  (contre-pression) au lieu de laisser la mémoire grossir pendant une rafale.
+- Les enregistrements sont regroupés en lots de `batch_size` au plus, ou au
+  bout de `batch_timeout` secondes si le débit est faible.
+- Chaque lot est écrit en une transaction (`bulk_create_weather_data` /
+  `upsert_forecasts`) sur une session dédiée. Les prévisions sont des upserts :
+  rejouer un fichier ou une page du flux ne crée pas de doublon.
+- Chaque enregistrement est contrôlé et converti à la lecture (`validate_record`) :
+  un enregistrement illisible (pas un objet, type inconnu, colonne obligatoire
+  absente, date ou nombre invalide) est compté dans `rejected` et n'entre pas
+  dans la file.
+- Un lot en échec sur une erreur passagère (connexion, délai, disjoncteur ouvert)
+  n'est pas abandonné : il est réessayé avec un délai croissant, et l'écriture ne
+  prend rien d'autre dans la file pendant ce temps (la file se remplit et la source
+  est suspendue). Avec un fichier de lettres mortes, un lot qui échoue encore après
+  `max_attempts` tentatives y est écrit pour laisser passer la suite.
+- Une erreur de données (contrainte, valeur refusée par la base) se reproduirait à
+  chaque tentative : le lot est coupé en deux jusqu'à isoler les enregistrements
+  fautifs, qui sont mis en lettre morte (ou écartés, sans fichier) ; les autres
+  sont écrits.
+- Une unité de la source (fichier, page) n'est validée (`Checkpoint.commit`)
+  qu'une fois tous ses enregistrements écrits : après un arrêt, ce qui n'a pas
+  été écrit est relu.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from contextlib import suppress
+from datetime import date, datetime
+from typing import Any, AsyncContextManager, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from backend.ingestion.sources import Checkpoint, IWeatherSource
+from backend.repositories.interfaces import IWeatherRepository
+from backend.resilience.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# Colonnes par type d'enregistrement : obligatoires (NOT NULL sans valeur par défaut), réelles, entières
+_REQUIRED_COLUMNS = {
+    "observation": ("region_name", "temperature", "condition", "humidity"),
+    "forecast": ("region_name", "forecast_date", "condition", "humidity"),
+}
+_FLOAT_COLUMNS = {
+    "observation": ("temperature", "pressure", "wind_speed"),
+    "forecast": ("temperature_min", "temperature_max", "temperature_avg", "pressure", "wind_speed"),
+}
+_INTEGER_COLUMNS = {
+    "observation": ("humidity", "forecast_day"),
+    "forecast": ("humidity", "precipitation_probability"),
+}
+_TEXT_COLUMNS = ("region_name", "condition", "wind_direction", "day_name")
+
+
+class InvalidRecordError(ValueError):
+    """Enregistrement qu'aucune tentative d'écriture ne pourrait accepter"""
+
+
+def validate_record(record: Any) -> Dict[str, Any]:
+    """
+    Contrôle un enregistrement de la source et convertit ses valeurs
+    (nombres en texte, dates ISO 8601 normalisées)
+
+    Args:
+        record: Valeur lue (une ligne JSON, un élément d'une page du flux)
+
+    Returns:
+        Copie de l'enregistrement aux valeurs converties
+
+    Raises:
+        InvalidRecordError: L'enregistrement ne peut pas être écrit
+    """
+    if not isinstance(record, dict):
+        raise InvalidRecordError(f"objet JSON attendu, reçu {type(record).__name__}")
+    kind = record.get("type", "observation")
+    if kind not in _REQUIRED_COLUMNS:
+        raise InvalidRecordError(f"type inconnu: {kind!r}")
+    missing = [column for column in _REQUIRED_COLUMNS[kind] if record.get(column) is None]
+    if missing:
+        raise InvalidRecordError(f"colonnes obligatoires absentes: {', '.join(missing)}")
+
+    record = dict(record)
+    try:
+        for column in _FLOAT_COLUMNS[kind]:
+            if record.get(column) is not None:
+                record[column] = _number(record[column], float)
+        for column in _INTEGER_COLUMNS[kind]:
+            if record.get(column) is not None:
+                record[column] = _number(record[column], int)
+        if kind == "observation" and record.get("recorded_at"):
+            record["recorded_at"] = _timestamp(record["recorded_at"]).isoformat()
+        if kind == "forecast":
+            forecast_date = _timestamp(record["forecast_date"])
+            record["forecast_date"] = (forecast_date.date() if isinstance(forecast_date, datetime)
+                                       else forecast_date).isoformat()
+    except (TypeError, ValueError) as e:
+        raise InvalidRecordError(str(e)) from e
+    for column in _TEXT_COLUMNS:
+        if record.get(column) is not None and not isinstance(record[column], str):
+            raise InvalidRecordError(f"{column}: texte attendu")
+    if "is_forecast" in record and not isinstance(record["is_forecast"], bool):
+        raise InvalidRecordError("is_forecast: booléen attendu")
+    return record
+
+
+def _number(value: Any, kind: type) -> Union[int, float]:
+    # bool est un int pour Python, pas pour la base
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"nombre attendu, reçu {value!r}")
+    number = float(value)
+    if kind is int:
+        if not number.is_integer():
+            raise ValueError(f"entier attendu, reçu {value!r}")
+        return int(number)
+    return number
+
+
+def _timestamp(value: Any) -> Union[date, datetime]:
+    if isinstance(value, (date, datetime)):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"date ISO 8601 attendue, reçu {value!r}")
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"date ISO 8601 invalide: {value!r}") from None
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Erreur d'écriture qu'une nouvelle tentative peut corriger (base injoignable, délai,
+    disjoncteur ouvert) ; les autres (contrainte, valeur refusée) sont des erreurs de données
+    """
+    if isinstance(error, (OperationalError, InterfaceError, PoolTimeoutError, CircuitOpenError,
+                          ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+class IngestionMetrics:
+    """
+    Compteurs du pipeline, exposés par l'endpoint de supervision.
+    """
+
+    def __init__(self, throughput_window_seconds: float = 60.0):
+        self.received = 0
+        self.written = 0
+        self.rejected = 0
+        self.failed_batches = 0
+        self.dead_lettered = 0
+        self.retrying = False
+        self.batches = 0
+        self.last_batch_size = 0
+        self.last_batch_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.queue_depth = 0
+        self.queue_capacity = 0
+        self.throughput_window_seconds = throughput_window_seconds
+        self._written_history: Deque[Tuple[float, int]] = deque()
+
+    def record_batch(self, size: int, lag_seconds: float):
+        """Enregistre un lot écrit avec le retard du plus ancien enregistrement du lot"""
+        now = time.monotonic()
+        self.batches += 1
+        self.written += size
+        self.last_batch_size = size
+        self.last_batch_lag_seconds = lag_seconds
+        self.max_lag_seconds = max(self.max_lag_seconds, lag_seconds)
+        self._written_history.append((now, size))
+        while self._written_history and now - self._written_history[0][0] > self.throughput_window_seconds:
+            self._written_history.popleft()
+
+    @property
+    def records_per_second(self) -> float:
+        """Débit d'écriture moyen sur la fenêtre glissante"""
+        if not self._written_history:
+            return 0.0
+        elapsed = max(time.monotonic() - self._written_history[0][0], 1.0)
+        return sum(size for _, size in self._written_history) / elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "written": self.written,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "dead_lettered": self.dead_lettered,
+            "retrying": self.retrying,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_lag_seconds": round(self.last_batch_lag_seconds, 3),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+            "queue_depth": self.queue_depth,
+            "queue_capacity": self.queue_capacity,
+            "records_per_second": round(self.records_per_second, 1)
+        }
+
+
+class IngestionPipeline:
+    """
+    Relie une source à la base via une file bornée et des écritures par lots.
+    """
+
+    def __init__(self, source: IWeatherSource,
+                 repository_scope: Callable[[], AsyncContextManager[IWeatherRepository]],
+                 queue_size: int = 10_000, batch_size: int = 500, batch_timeout: float = 1.0,
+                 retry_base_seconds: float = 0.5, retry_max_seconds: float = 30.0,
+                 max_attempts: int = 5, dead_letter_path: Optional[str] = None):
+        """
+        Args:
+            source: Source des enregistrements
+            repository_scope: Fabrique d'un contexte async fournissant un repository (une session par lot)
+            queue_size: Capacité de la file ; au-delà, la source est mise en attente
+            batch_size: Taille maximale d'un lot
+            batch_timeout: Délai maximal d'attente avant d'écrire un lot incomplet
+            retry_base_seconds: Délai avant la deuxième tentative d'écriture d'un lot, doublé à chaque échec
+            retry_max_seconds: Délai maximal entre deux tentatives
+            max_attempts: Tentatives avant la mise en lettre morte (ignoré sans `dead_letter_path`)
+            dead_letter_path: Fichier JSONL des enregistrements abandonnés (None : réessayer indéfiniment
+                les erreurs passagères, écarter les enregistrements refusés par la base)
+        """
+        self.source = source
+        self.repository_scope = repository_scope
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.max_attempts = max_attempts
+        self.dead_letter_path = dead_letter_path
+        self._queue: "asyncio.Queue[Tuple[float, Union[Dict[str, Any], Checkpoint]]]" = asyncio.Queue(maxsize=queue_size)
+        self.metrics = IngestionMetrics()
+        self.metrics.queue_capacity = queue_size
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """Démarre les tâches de lecture et d'écriture"""
+        self._tasks = [
+            asyncio.create_task(self._produce(), name="ingestion-producer"),
+            asyncio.create_task(self._consume(), name="ingestion-consumer")
+        ]
+        for task in self._tasks:
+            task.add_done_callback(self._report_failure)
+        logger.info("🚚 Pipeline d'ingestion démarré")
+
+    @staticmethod
+    def _report_failure(task: asyncio.Task):
+        """Signale une tâche arrêtée sur une erreur dès son arrêt, pas seulement à la fermeture"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Ingestion: la tâche {task.get_name()} s'est arrêtée sur une erreur: "
+                         f"{task.exception()!r}")
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """
+        Arrête la lecture, écrit ce qui reste dans la file (dans la limite de
+        `drain_timeout`), puis arrête l'écriture.
+        """
+        if not self._tasks:
+            return
+        producer, consumer = self._tasks
+        producer.cancel()
+        # Une tâche déjà arrêtée sur une erreur a été signalée (`_report_failure`) : l'arrêt continue
+        with suppress(asyncio.CancelledError, Exception):
+            await producer
+        if not consumer.done():
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        consumer.cancel()
+        with suppress(asyncio.CancelledError, Exception):
+            await consumer
+        self._tasks = []
+        logger.info("🛑 Pipeline d'ingestion arrêté")
+
+    async def _produce(self):
+        async for record in self.source.records():
+            if isinstance(record, Checkpoint):
+                # Suit les enregistrements de son unité dans la file : validé après leur écriture
+                await self._queue.put((time.monotonic(), record))
+                continue
+            try:
+                record = validate_record(record)
+            except InvalidRecordError as e:
+                self.metrics.rejected += 1
+                logger.warning(f"Ingestion: enregistrement rejeté ({e})")
+                continue
+            # Bloque quand la file est pleine : c'est la contre-pression
+            await self._queue.put((time.monotonic(), record))
+            self.metrics.received += 1
+            self.metrics.queue_depth = self._queue.qsize()
+
+    async def _next_batch(self) -> List[Tuple[float, Union[Dict[str, Any], Checkpoint]]]:
+        """Attend un premier enregistrement puis complète le lot jusqu'à la taille ou au délai"""
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_timeout
+        while len(batch) < self.batch_size:
+            # Chemin rapide : vider ce qui est déjà en file sans créer de minuterie
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _consume(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                records = [(enqueued_at, entry) for enqueued_at, entry in batch if not isinstance(entry, Checkpoint)]
+                if records:
+                    await self._write(records)
+                # Les lots sont écrits dans l'ordre de la file : tout ce qui précède ces marqueurs est écrit
+                for _, entry in batch:
+                    if isinstance(entry, Checkpoint):
+                        self._commit(entry)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+                self.metrics.queue_depth = self._queue.qsize()
+
+    def _commit(self, checkpoint: Checkpoint):
+        try:
+            checkpoint.commit()
+        except Exception as e:
+            logger.error(f"Ingestion: échec de la validation de {checkpoint.label}: {e}")
+
+    async def _write(self, batch: List[Tuple[float, Dict[str, Any]]]):
+        """
+        Écrit un lot, en réessayant jusqu'au succès ou à la mise en lettre morte.
+        Mesures et prévisions sont deux transactions : seule la partie en échec est réessayée.
+        """
+        parts = [
+            (kind, [record for _, record in batch if record.get("type", "observation") == kind])
+            for kind in ("observation", "forecast")
+        ]
+        pending = [(kind, records) for kind, records in parts if records]
+        oldest_enqueued_at = min(enqueued_at for enqueued_at, _ in batch)
+        attempt = written = 0
+        while pending:
+            kind, records = pending[0]
+            try:
+                async with self.repository_scope() as repository:
+                    if kind == "observation":
+                        await repository.bulk_create_weather_data(records)
+                    else:
+                        await repository.upsert_forecasts(records)
+                pending.pop(0)
+                written += len(records)
+                continue
+            except Exception as e:
+                self.metrics.failed_batches += 1
+                error = e
+            if not is_transient(error):
+                # Erreur de données : réessayer ne changerait rien, on isole les enregistrements refusés
+                pending.pop(0)
+                if len(records) > 1:
+                    middle = len(records) // 2
+                    pending[0:0] = [(kind, records[:middle]), (kind, records[middle:])]
+                else:
+                    self._set_aside(records, error)
+                continue
+            attempt += 1
+            if (self.dead_letter_path and attempt >= self.max_attempts
+                    and self._dead_letter([record for _, part in pending for record in part],
+                                          f"après {attempt} tentatives: {error}")):
+                break
+            # Pendant l'attente, rien n'est pris dans la file : elle se remplit et la source est suspendue
+            self.metrics.retrying = True
+            delay = min(self.retry_base_seconds * 2 ** (attempt - 1), self.retry_max_seconds)
+            logger.warning(f"Ingestion: échec de l'écriture d'un lot de {len(records)} enregistrements "
+                           f"(tentative {attempt}), nouvel essai dans {delay:.1f} s: {error}")
+            await asyncio.sleep(delay)
+        self.metrics.retrying = False
+        if written:
+            self.metrics.record_batch(written, time.monotonic() - oldest_enqueued_at)
+
+    def _set_aside(self, records: List[Dict[str, Any]], error: Exception):
+        """Écarte des enregistrements refusés par la base : lettre morte si possible, sinon rejet"""
+        if self.dead_letter_path and self._dead_letter(records, f"refusés par la base: {error}"):
+            return
+        self.metrics.rejected += len(records)
+        logger.error(f"Ingestion: {len(records)} enregistrements refusés par la base et écartés: {error}")
+
+    def _dead_letter(self, records: List[Dict[str, Any]], reason: str) -> bool:
+        """
+        Ajoute des enregistrements non écrits au fichier de lettres mortes, une ligne JSON par
+        enregistrement : le fichier peut être redéposé tel quel dans le dossier surveillé.
+
+        Returns:
+            True si les enregistrements ont été mis à l'écart, False si le fichier n'a pas pu être écrit
+        """
+        try:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as handle:
+                for record in records:
+                    handle.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            logger.error(f"Ingestion: écriture impossible dans {self.dead_letter_path}: {e}")
+            return False
+        self.metrics.dead_lettered += len(records)
+        logger.error(f"Ingestion: {len(records)} enregistrements mis en lettre morte dans {self.dead_letter_path} "
+                     f"{reason}")
+        return True
+
+
+# Instance globale du pipeline (None tant qu'aucune source n'est configurée)
+_ingestion_pipeline: Optional[IngestionPipeline] = None
+
+def get_ingestion_pipeline() -> Optional[IngestionPipeline]:
+    """Retourne le pipeline d'ingestion démarré par l'application, s'il existe"""
+    return _ingestion_pipeline
+
+def set_ingestion_pipeline(pipeline: Optional[IngestionPipeline]):
+    """Enregistre (ou oublie) le pipeline d'ingestion de l'application"""
+    global _ingestion_pipeline
+    _ingestion_pipeline = pipeline
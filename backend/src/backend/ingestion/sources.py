@@ -0,0 +1,174 @@
+"""
+Sources de données pour le pipeline d'ingestion météo.
+
+Une source produit des enregistrements (dictionnaires) de façon asynchrone ; elle
+ne les contrôle pas, le pipeline écarte ceux qu'il ne peut pas écrire.
+Chaque enregistrement porte un champ `type` : "observation" (table `weather_data`)
+ou "forecast" (table `weather_forecasts`). Les sources lisent en flux : un gros
+fichier ou une grosse réponse n'est jamais chargé entièrement en mémoire au-delà
+d'une page, la mémoire restant bornée par la file du pipeline.
+
+Une source ne considère pas une unité (fichier, page) comme consommée quand elle
+l'a lue, mais quand le pipeline l'a écrite : après les enregistrements d'une unité,
+elle produit un `Checkpoint` que le pipeline valide une fois tous les
+enregistrements qui le précèdent écrits (ou mis à l'écart en lettre morte).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import urllib.request
+from urllib.parse import urlencode
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """
+    Marqueur produit par une source à la fin d'une unité (fichier, page du flux).
+    Le pipeline appelle `commit` quand tous les enregistrements produits avant
+    le marqueur ont été écrits.
+    """
+
+    def __init__(self, commit: Callable[[], None], label: str):
+        """
+        Args:
+            commit: Valide l'unité auprès de la source (déplacement du fichier, curseur)
+            label: Nom de l'unité, pour les logs
+        """
+        self.commit = commit
+        self.label = label
+
+
+class IWeatherSource(ABC):
+    @abstractmethod
+    def records(self) -> AsyncIterator[Union[Dict[str, Any], Checkpoint]]:
+        """Itérateur asynchrone (infini pour une source surveillée) des enregistrements et des points de validation"""
+        pass
+
+
+class DirectoryWatcherSource(IWeatherSource):
+    """
+    Surveille un dossier local et lit les fichiers `*.jsonl` qui y sont déposés
+    (un enregistrement JSON par ligne). Un fichier est déplacé dans le
+    sous-dossier `processed/` une fois tous ses enregistrements écrits ; d'ici là,
+    il reste dans le dossier (et serait relu après un redémarrage) sans être relu
+    par la scrutation suivante.
+    """
+
+    def __init__(self, directory: str, poll_interval: float = 2.0, pattern: str = "*.jsonl"):
+        """
+        Args:
+            directory: Dossier surveillé
+            poll_interval: Délai en secondes entre deux scrutations du dossier
+            pattern: Motif des fichiers à lire
+        """
+        self.directory = Path(directory)
+        self.processed_directory = self.directory / "processed"
+        self.poll_interval = poll_interval
+        self.pattern = pattern
+        # Fichiers lus dont les enregistrements ne sont pas encore tous écrits
+        self._pending: Set[str] = set()
+
+    async def records(self) -> AsyncIterator[Union[Dict[str, Any], Checkpoint]]:
+        self.processed_directory.mkdir(parents=True, exist_ok=True)
+        while True:
+            files = [path for path in sorted(self.directory.glob(self.pattern)) if path.name not in self._pending]
+            for path in files:
+                async for record in self._read_file(path):
+                    yield record
+                self._pending.add(path.name)
+                yield Checkpoint(lambda path=path: self._commit_file(path), path.name)
+            if not files:
+                await asyncio.sleep(self.poll_interval)
+
+    def _commit_file(self, path: Path):
+        """Déplace un fichier dont tous les enregistrements sont écrits dans `processed/`"""
+        path.rename(self.processed_directory / path.name)
+        self._pending.discard(path.name)
+        logger.info(f"Ingestion: fichier traité {path.name}")
+
+    async def _read_file(self, path: Path) -> AsyncIterator[Dict[str, Any]]:
+        with path.open("r", encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"Ingestion: ligne {line_number} invalide dans {path.name}: {e}")
+
+
+class HttpFeedSource(IWeatherSource):
+    """
+    Interroge périodiquement un flux HTTP local (bouchon d'un fournisseur externe)
+    qui retourne une page JSON : {"records": [...], "next_cursor": "..."}.
+    Le curseur est renvoyé au flux pour ne lire que les nouveaux enregistrements.
+
+    Le curseur de lecture avance page par page ; le curseur validé (`committed_cursor`),
+    lui, n'avance qu'une fois la page écrite. Avec `cursor_path`, il est enregistré
+    dans ce fichier et la lecture reprend de là au démarrage suivant.
+    """
+
+    def __init__(self, url: str, poll_interval: float = 5.0, timeout: float = 10.0,
+                 cursor_path: Optional[str] = None):
+        """
+        Args:
+            url: URL du flux (ex. http://localhost:9000/feed)
+            poll_interval: Délai en secondes entre deux appels quand le flux est épuisé
+            timeout: Délai maximal d'un appel HTTP
+            cursor_path: Fichier où enregistrer le curseur validé (None : curseur en mémoire)
+        """
+        self.url = url
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.cursor_path = Path(cursor_path) if cursor_path else None
+        self.committed_cursor = self._load_cursor()
+        self._cursor = self.committed_cursor
+
+    def _load_cursor(self) -> Optional[str]:
+        if self.cursor_path is None or not self.cursor_path.exists():
+            return None
+        return self.cursor_path.read_text(encoding="utf-8").strip() or None
+
+    def _commit_cursor(self, cursor: Optional[str]):
+        """Valide le curseur d'une page écrite (et l'enregistre si `cursor_path` est défini)"""
+        self.committed_cursor = cursor
+        if self.cursor_path is not None and cursor is not None:
+            temporary = self.cursor_path.with_name(self.cursor_path.name + ".tmp")
+            temporary.write_text(str(cursor), encoding="utf-8")
+            os.replace(temporary, self.cursor_path)
+
+    def _fetch_page(self) -> Dict[str, Any]:
+        url = self.url if self._cursor is None else f"{self.url}?{urlencode({'cursor': self._cursor})}"
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return json.load(response)
+
+    async def records(self) -> AsyncIterator[Union[Dict[str, Any], Checkpoint]]:
+        while True:
+            try:
+                # urllib est bloquant : l'appel est fait dans un thread
+                page = await asyncio.to_thread(self._fetch_page)
+            except Exception as e:
+                logger.warning(f"Ingestion: flux HTTP indisponible ({self.url}): {e}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            records = page.get("records", []) if isinstance(page, dict) else None
+            if not isinstance(records, list):
+                # Page hors contrat : le curseur n'avance pas, la page sera redemandée
+                logger.warning(f"Ingestion: page du flux HTTP illisible ({self.url}): liste 'records' attendue")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            for record in records:
+                yield record
+            self._cursor = page.get("next_cursor", self._cursor)
+            if records:
+                yield Checkpoint(lambda cursor=self._cursor: self._commit_cursor(cursor), f"page {self._cursor}")
+            else:
+                await asyncio.sleep(self.poll_interval)
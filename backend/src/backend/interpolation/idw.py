@@ -0,0 +1,241 @@
+"""
+Interpolation spatiale de la météo actuelle par pondération inverse à la distance (IDW).
+
+Les stations sont les régions disposant d'une mesure récente dans `weather_data`.
+Pour un point quelconque, on retient les k stations les plus proches (KD-tree
+de `indexes/spatial_index.py`) et on pondère leurs valeurs par 1 / distance^p.
+Les estimations sont mises en cache par cellule de grille : tous les points
+d'une même cellule reçoivent l'estimation calculée au centre de la cellule.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from backend.indexes.spatial_index import RegionSpatialIndex
+from backend.repositories.interfaces import IWeatherRepository
+
+logger = logging.getLogger(__name__)
+
+# Grandeurs numériques interpolées
+NUMERIC_FIELDS = ("temperature", "humidity", "pressure", "wind_speed")
+
+# Grandeurs catégorielles : valeur de plus fort poids cumulé
+CATEGORICAL_FIELDS = ("condition", "wind_direction")
+
+# En deçà de cette distance, la valeur de la station est reprise telle quelle
+_SAME_POINT_KM = 1e-3
+
+# Durée de validité d'un instantané de stations périmées (servies pendant une panne de la base)
+STALE_FIELD_TTL_SECONDS = 5.0
+
+
+class WeatherStationField:
+    """
+    Instantané immuable des dernières mesures, indexé spatialement.
+    """
+
+    __slots__ = ("_readings", "_index", "loaded_at", "stale")
+
+    def __init__(self, readings: List[Mapping[str, Any]]):
+        """
+        Args:
+            readings: Dernière mesure par région, avec `latitude` et `longitude`
+        """
+        self._readings = [
+            reading for reading in readings
+            if reading.get("latitude") is not None and reading.get("longitude") is not None
+        ]
+        self._index = RegionSpatialIndex([
+            {"id": position, "latitude": reading["latitude"], "longitude": reading["longitude"]}
+            for position, reading in enumerate(self._readings)
+        ])
+        self.loaded_at = time.monotonic()
+        # Mesures servies par le disjoncteur pendant une panne de la base
+        self.stale = any(reading.get("stale") for reading in self._readings)
+
+    def __len__(self) -> int:
+        return len(self._readings)
+
+    def estimate(self, latitude: float, longitude: float, k: int = 4, power: float = 2.0) -> Dict[str, Any]:
+        """
+        Estime la météo en un point.
+
+        Args:
+            latitude: Latitude du point (degrés)
+            longitude: Longitude du point (degrés)
+            k: Nombre de stations voisines utilisées
+            power: Exposant de la pondération 1 / distance^power
+
+        Returns:
+            Dictionnaire des grandeurs estimées, avec les stations utilisées
+        """
+        stations = self._index.nearest(latitude, longitude, k)
+        if not stations:
+            return {}
+
+        _, closest_distance = stations[0]
+        if closest_distance < _SAME_POINT_KM:
+            neighbours, weights = [stations[0]], [1.0]
+        else:
+            neighbours, weights = stations, [1.0 / distance ** power for _, distance in stations]
+
+        estimate: Dict[str, Any] = {}
+        for field in NUMERIC_FIELDS:
+            weighted_sum = weight_total = 0.0
+            for (position, _), weight in zip(neighbours, weights):
+                value = self._readings[position].get(field)
+                if value is not None:
+                    weighted_sum += weight * float(value)
+                    weight_total += weight
+            estimate[field] = round(weighted_sum / weight_total, 2) if weight_total else None
+
+        for field in CATEGORICAL_FIELDS:
+            votes: Dict[str, float] = {}
+            for (position, _), weight in zip(neighbours, weights):
+                value = self._readings[position].get(field)
+                if value:
+                    votes[value] = votes.get(value, 0.0) + weight
+            estimate[field] = max(votes, key=votes.get) if votes else None
+
+        estimate["stations"] = [
+            {"region_name": self._readings[position]["region_name"], "distance_km": round(distance, 3)}
+            for position, distance in stations
+        ]
+        if self.stale:
+            estimate["stale"] = True
+        return estimate
+
+
+class WeatherInterpolator:
+    """
+    Moteur d'interpolation partagé par le processus.
+    Recharge les stations lorsque l'instantané dépasse `ttl_seconds` et met
+    en cache les estimations par cellule de grille.
+    """
+
+    def __init__(self, cell_size_degrees: float = 0.05, ttl_seconds: float = 60.0,
+                 max_cached_cells: int = 100_000, k: int = 4, power: float = 2.0):
+        """
+        Args:
+            cell_size_degrees: Côté d'une cellule de grille (0,05° ≈ 5 km)
+            ttl_seconds: Durée de validité de l'instantané des stations
+            max_cached_cells: Nombre maximal de cellules en cache (éviction LRU)
+            k: Nombre de stations voisines
+            power: Exposant de la pondération
+        """
+        self.cell_size_degrees = cell_size_degrees
+        self.ttl_seconds = ttl_seconds
+        self.max_cached_cells = max_cached_cells
+        self.k = k
+        self.power = power
+        self._field: Optional[WeatherStationField] = None
+        self._cells: "OrderedDict[Tuple[int, int], Dict[str, Any]]" = OrderedDict()
+        self._refresh_lock = asyncio.Lock()
+
+    def _is_stale(self) -> bool:
+        if self._field is None:
+            return True
+        # Des stations périmées (base en panne) sont rechargées plus tôt pour reprendre dès le retour de la base
+        ttl = min(self.ttl_seconds, STALE_FIELD_TTL_SECONDS) if self._field.stale else self.ttl_seconds
+        return time.monotonic() - self._field.loaded_at > ttl
+
+    async def _load(self, repository: IWeatherRepository) -> WeatherStationField:
+        readings = await repository.get_latest_weather_by_region()
+        self._field = WeatherStationField(readings)
+        self._cells.clear()
+        logger.info(f"Interpolation: {len(self._field)} stations chargées")
+        return self._field
+
+    async def refresh(self, repository: IWeatherRepository) -> WeatherStationField:
+        """Recharge les dernières mesures et vide le cache de cellules"""
+        async with self._refresh_lock:
+            return await self._load(repository)
+
+    async def _ensure_fresh(self, repository: IWeatherRepository) -> WeatherStationField:
+        if self._is_stale():
+            async with self._refresh_lock:
+                # Un seul rechargement même si plusieurs requêtes constatent l'expiration
+                if self._is_stale():
+                    await self._load(repository)
+        return self._field
+
+    def invalidate(self):
+        """Oublie les stations et les cellules ; le prochain appel rechargera les mesures"""
+        self._field = None
+        self._cells.clear()
+
+    def expire(self):
+        """
+        Marque les stations comme expirées (nouvelle mesure écrite) : le prochain appel les recharge
+        une seule fois, quel que soit le nombre de notifications reçues entre-temps.
+        """
+        if self._field is not None:
+            self._field.loaded_at = float("-inf")
+
+    def _cell_of(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (int(latitude // self.cell_size_degrees), int(longitude // self.cell_size_degrees))
+
+    def _estimate_cell(self, field: WeatherStationField, cell: Tuple[int, int]) -> Dict[str, Any]:
+        cached = self._cells.get(cell)
+        if cached is not None:
+            self._cells.move_to_end(cell)
+            return cached
+        center_latitude = (cell[0] + 0.5) * self.cell_size_degrees
+        center_longitude = (cell[1] + 0.5) * self.cell_size_degrees
+        estimate = field.estimate(center_latitude, center_longitude, self.k, self.power)
+        self._cells[cell] = estimate
+        if len(self._cells) > self.max_cached_cells:
+            self._cells.popitem(last=False)
+        return estimate
+
+    async def estimate(self, repository: IWeatherRepository, latitude: float, longitude: float) -> Dict[str, Any]:
+        """
+        Estime la météo en un point (résultat mis en cache par cellule).
+
+        Args:
+            repository: Repository météo, utilisé si les stations doivent être rechargées
+            latitude: Latitude du point (degrés)
+            longitude: Longitude du point (degrés)
+
+        Returns:
+            Dictionnaire des grandeurs estimées (vide si aucune station n'est disponible)
+        """
+        field = await self._ensure_fresh(repository)
+        return self._estimate_cell(field, self._cell_of(latitude, longitude))
+
+    async def estimate_many(self, repository: IWeatherRepository,
+                            points: Iterable[Tuple[float, float]]) -> List[Dict[str, Any]]:
+        """
+        Variante par lot : chaque cellule distincte n'est calculée qu'une fois,
+        quel que soit le nombre de points qui y tombent.
+
+        Args:
+            repository: Repository météo
+            points: Couples (latitude, longitude)
+
+        Returns:
+            Estimations, dans l'ordre des points
+        """
+        field = await self._ensure_fresh(repository)
+        cells = [self._cell_of(latitude, longitude) for latitude, longitude in points]
+        estimates = {cell: self._estimate_cell(field, cell) for cell in dict.fromkeys(cells)}
+        return [estimates[cell] for cell in cells]
+
+
+# Instance globale du moteur d'interpolation
+_weather_interpolator = None
+
+def get_weather_interpolator() -> WeatherInterpolator:
+    """
+    Retourne l'instance globale du moteur d'interpolation.
+
+    Returns:
+        WeatherInterpolator partagé par tout le processus
+    """
+    global _weather_interpolator
+    if _weather_interpolator is None:
+        _weather_interpolator = WeatherInterpolator()
+    return _weather_interpolator
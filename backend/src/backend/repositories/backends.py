@@ -0,0 +1,160 @@
+"""
+Backends de stockage des repositories.
+
+- "postgresql" : repositories SQLAlchemy sur la session de la requête ;
+- "mock" : petites données fictives codées en dur, ou fixtures générées par
+  `python -m backend.simulation.seed --fixtures` (MOCK_FIXTURES_DIR) ;
+- "simulation" : jeu de données généré à grande échelle, avec latence et
+  erreurs injectées (voir `backend/simulation`) ;
+- "sqlite" : base embarquée (aiosqlite, WAL), voir `database/sqlite.py`.
+
+Le backend est choisi une fois par processus par `DatabaseModule` ; cette
+fabrique construit ensuite les repositories de chaque requête ou tâche de fond,
+et fournit la fabrique de sessions du moteur correspondant.
+"""
+
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.archive.weather_archive import get_weather_archive
+from backend.caching.second_level import get_second_level_cache
+from backend.database.connection import AsyncSessionLocal
+from backend.database.sqlite import SQLiteDatabase
+
+from backend.repositories.interfaces import IRegionRepository, IWeatherRepository
+from backend.repositories.implementations.region_repository import RegionRepository
+from backend.repositories.implementations.weather_repository import WeatherRepository
+from backend.repositories.implementations.postgresql_region_repository import PostgreSQLRegionRepository
+from backend.repositories.implementations.postgresql_weather_repository import PostgreSQLWeatherRepository
+from backend.repositories.implementations.simulated_region_repository import SimulatedRegionRepository
+from backend.repositories.implementations.simulated_weather_repository import SimulatedWeatherRepository
+from backend.repositories.implementations.sqlite_region_repository import SQLiteRegionRepository
+from backend.repositories.implementations.sqlite_weather_repository import SQLiteWeatherRepository
+from backend.repositories.implementations.archived_weather_repository import ArchivedWeatherRepository
+from backend.repositories.implementations.notifying_weather_repository import NotifyingWeatherRepository
+from backend.repositories.implementations.second_level_cached_region_repository import SecondLevelCachedRegionRepository
+from backend.repositories.implementations.second_level_cached_weather_repository import SecondLevelCachedWeatherRepository
+from backend.simulation.dataset import SimulatedDataset
+from backend.simulation.latency import LatencyModel
+from backend.streaming.weather_hub import get_weather_hub
+
+logger = logging.getLogger(__name__)
+
+POSTGRESQL = "postgresql"
+MOCK = "mock"
+SIMULATION = "simulation"
+SQLITE = "sqlite"
+BACKENDS = (POSTGRESQL, MOCK, SIMULATION, SQLITE)
+
+
+class RepositoryBackend:
+    """
+    Fabrique des repositories du backend choisi pour le processus.
+    """
+
+    def __init__(self, name: str, dataset: Optional[SimulatedDataset] = None,
+                 latency: Optional[LatencyModel] = None, sqlite: Optional[SQLiteDatabase] = None):
+        """
+        Args:
+            name: Nom du backend (voir BACKENDS)
+            dataset: Jeu de données partagé (backend "simulation")
+            latency: Modèle de latence et d'erreurs (backend "simulation")
+            sqlite: Base embarquée (backend "sqlite")
+        """
+        if name not in BACKENDS:
+            raise ValueError(f"Backend inconnu: {name} (attendu: {', '.join(BACKENDS)})")
+        self.name = name
+        self.dataset = dataset
+        self.latency = latency or LatencyModel()
+        self.sqlite = sqlite
+        # Les backends sans base gardent la fabrique PostgreSQL : leurs sessions ne se connectent jamais
+        self.session_factory: async_sessionmaker = sqlite.session_factory if sqlite else AsyncSessionLocal
+
+    @classmethod
+    def simulation_from_env(cls) -> "RepositoryBackend":
+        """
+        Construit le backend de simulation à partir des variables d'environnement :
+        SIMULATION_REGIONS, SIMULATION_READINGS_PER_REGION, SIMULATION_READING_INTERVAL_MINUTES,
+        SIMULATION_SEED, SIMULATION_LATENCY (none | constant | uniform | lognormal),
+        SIMULATION_LATENCY_MEDIAN_MS, SIMULATION_LATENCY_P99_MS et SIMULATION_ERROR_RATE.
+        """
+        seed = int(os.getenv("SIMULATION_SEED", "42"))
+        dataset = SimulatedDataset(
+            region_count=int(os.getenv("SIMULATION_REGIONS", "10000")),
+            readings_per_region=int(os.getenv("SIMULATION_READINGS_PER_REGION", "48")),
+            reading_interval_minutes=int(os.getenv("SIMULATION_READING_INTERVAL_MINUTES", "180")),
+            seed=seed
+        )
+        p99_ms = os.getenv("SIMULATION_LATENCY_P99_MS")
+        latency = LatencyModel(
+            distribution=os.getenv("SIMULATION_LATENCY", "none"),
+            median_ms=float(os.getenv("SIMULATION_LATENCY_MEDIAN_MS", "2")),
+            p99_ms=float(p99_ms) if p99_ms else None,
+            error_rate=float(os.getenv("SIMULATION_ERROR_RATE", "0")),
+            seed=seed
+        )
+        logger.info(
+            f"🧪 Simulation: {len(dataset)} régions, {dataset.reading_count} mesures, "
+            f"latence {latency.distribution} (médiane {latency.median_ms} ms), erreurs {latency.error_rate:.1%}"
+        )
+        return cls(SIMULATION, dataset, latency)
+
+    @classmethod
+    def sqlite_from_env(cls) -> "RepositoryBackend":
+        """Construit le backend SQLite à partir de SQLITE_PATH et SQLITE_ECHO"""
+        return cls(SQLITE, sqlite=SQLiteDatabase.from_env())
+
+    async def initialize(self):
+        """Prépare le stockage au démarrage (schéma de la base SQLite)"""
+        if self.sqlite is not None:
+            await self.sqlite.initialize()
+
+    async def close(self):
+        """Libère les connexions propres au backend à l'arrêt"""
+        if self.sqlite is not None:
+            await self.sqlite.close()
+
+    def region_repository(self, session: AsyncSession) -> IRegionRepository:
+        """
+        Repository des régions pour la session donnée, sans le catalogue en mémoire ;
+        la liste complète passe par le cache de second niveau (s'il est activé)
+        """
+        repository = self._storage_region_repository(session)
+        cache = get_second_level_cache()
+        return SecondLevelCachedRegionRepository(repository, cache) if cache is not None else repository
+
+    def _storage_region_repository(self, session: AsyncSession) -> IRegionRepository:
+        if self.name == POSTGRESQL:
+            return PostgreSQLRegionRepository(session)
+        if self.name == SIMULATION:
+            return SimulatedRegionRepository(self.dataset, self.latency)
+        if self.name == SQLITE:
+            return SQLiteRegionRepository(session)
+        return RegionRepository()
+
+    def weather_repository(self, session: AsyncSession) -> IWeatherRepository:
+        """
+        Repository météo pour la session donnée : historique étendu à l'archive Parquet des mois
+        clos (si elle est activée), météo actuelle et prévisions derrière le cache de second niveau
+        (s'il est activé) ; les mesures enregistrées sont diffusées aux flux ouverts
+        """
+        repository = self._storage_weather_repository(session)
+        archive = get_weather_archive()
+        if archive is not None:
+            repository = ArchivedWeatherRepository(repository, archive)
+        cache = get_second_level_cache()
+        if cache is not None:
+            repository = SecondLevelCachedWeatherRepository(repository, cache)
+        return NotifyingWeatherRepository(repository, get_weather_hub())
+
+    def _storage_weather_repository(self, session: AsyncSession) -> IWeatherRepository:
+        if self.name == POSTGRESQL:
+            return PostgreSQLWeatherRepository(session)
+        if self.name == SIMULATION:
+            return SimulatedWeatherRepository(self.dataset, self.latency)
+        if self.name == SQLITE:
+            return SQLiteWeatherRepository(session)
+        return WeatherRepository()
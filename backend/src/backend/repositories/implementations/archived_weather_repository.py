@@ -0,0 +1,106 @@
+from backend.archive.weather_archive import ARCHIVE_COLUMNS, WeatherArchive, as_utc, column_values
+from backend.repositories.interfaces import IWeatherRepository, WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS
+from backend.serialization.tabular import RowSet
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Colonnes lues dans l'archive pour l'historique en lignes (ordre de WEATHER_HISTORY_ROW_COLUMNS)
+ARCHIVE_ROW_COLUMNS = ("region_name",) + WEATHER_HISTORY_ROW_COLUMNS[1:]
+
+
+class ArchivedWeatherRepository(IWeatherRepository):
+    """
+    Repository météo dont l'historique s'étend à l'archive Parquet des mois clos.
+    Avant la limite de l'archive, les mesures sont lues dans les fichiers (région exacte et
+    période filtrées au niveau des groupes de lignes) ; à partir d'elle, dans la base. Les
+    lignes de la base antérieures à la limite (mois en cours d'archivage, mesures tardives)
+    sont ignorées : elles rejoignent leur fichier au prochain passage de l'archiveur.
+    L'historique ne garde, des deux côtés et quelle que soit la période, que le nom exact de
+    la région : la base cherche un nom partiel (`ILIKE`), que les statistiques des fichiers ne
+    permettent pas de filtrer. Le reste est simplement délégué.
+    """
+
+    def __init__(self, repository: IWeatherRepository, archive: WeatherArchive):
+        """
+        Args:
+            repository: Repository du backend choisi
+            archive: Archive Parquet du processus
+        """
+        self.repository = repository
+        self.archive = archive
+
+    def _archived_window(self, days: int):
+        # (début, limite) si la période demandée commence avant la limite de l'archive, sinon None
+        boundary = self.archive.boundary()
+        start = datetime.now(timezone.utc) - timedelta(days=days)
+        if boundary is None or start >= boundary:
+            return None
+        return start, boundary
+
+    def _archived_readings(self, region_name: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        # Mesures archivées au format de WeatherData.to_dict()
+        table = self.archive.read_history(region_name, start, end, ARCHIVE_COLUMNS)
+        columns = [column_values(column) for column in table.columns]
+        position = ARCHIVE_COLUMNS.index("recorded_at")
+        columns[position] = [moment.isoformat() for moment in columns[position]]
+        return [
+            {**dict(zip(ARCHIVE_COLUMNS, values)), "is_forecast": False, "forecast_day": 0}
+            for values in zip(*columns)
+        ]
+
+    def _archived_rows(self, region_name: str, start: datetime, end: datetime) -> List[tuple]:
+        table = self.archive.read_history(region_name, start, end, ARCHIVE_ROW_COLUMNS)
+        return list(zip(*(column_values(column) for column in table.columns)))
+
+    async def get_weather_by_region(self, region_name: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        return await self.repository.get_weather_by_region(region_name, columns)
+
+    async def get_weather_forecast(self, region_name: str, days: int) -> List[Dict[str, Any]]:
+        return await self.repository.get_weather_forecast(region_name, days)
+
+    async def get_weather_history(self, region_name: str, days: int = 7) -> List[Dict[str, Any]]:
+        """Historique : mesures de la base depuis la limite de l'archive, puis mesures archivées"""
+        recent = [reading for reading in await self.repository.get_weather_history(region_name, days)
+                  if reading["region_name"] == region_name]
+        window = self._archived_window(days)
+        if window is None:
+            return recent
+        start, boundary = window
+        # Lecture et conversion hors de la boucle d'événements
+        archived = await asyncio.to_thread(self._archived_readings, region_name, start, boundary)
+        logger.info(f"Historique météo de {region_name}: {len(archived)} mesures lues dans l'archive")
+        return [reading for reading in recent if as_utc(reading["recorded_at"]) >= boundary] + archived
+
+    async def get_weather_history_rows(self, region_name: str, days: int = 7) -> RowSet:
+        """Historique en lignes : lignes de la base depuis la limite de l'archive, puis lignes archivées"""
+        rows = await self.repository.get_weather_history_rows(region_name, days)
+        region = WEATHER_HISTORY_ROW_COLUMNS.index("region")
+        recent = [row for row in rows.rows if row[region] == region_name]
+        window = self._archived_window(days)
+        if window is None:
+            return RowSet(WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS, recent)
+        start, boundary = window
+        archived = await asyncio.to_thread(self._archived_rows, region_name, start, boundary)
+        logger.info(f"Historique météo (lignes) de {region_name}: {len(archived)} mesures lues dans l'archive")
+        position = WEATHER_HISTORY_ROW_COLUMNS.index("recorded_at")
+        return RowSet(WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS,
+                      [row for row in recent if as_utc(row[position]) >= boundary] + archived)
+
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        return await self.repository.get_latest_weather_by_region()
+
+    async def create_weather_data(self, weather_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.repository.create_weather_data(weather_data)
+
+    async def create_weather_forecast(self, forecast_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.repository.create_weather_forecast(forecast_data)
+
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        return await self.repository.bulk_create_weather_data(weather_records)
+
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        return await self.repository.upsert_forecasts(forecast_records, batch_size)
@@ -0,0 +1,72 @@
+from backend.repositories.interfaces import IRegionRepository
+from backend.indexes.region_catalog import RegionCatalog
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CachedRegionRepository(IRegionRepository):
+    """
+    Repository des régions servi par le catalogue en mémoire.
+    Les lectures ne font aucune I/O une fois le catalogue chargé ; les écritures
+    sont déléguées au repository sous-jacent puis rechargent le catalogue.
+    """
+
+    def __init__(self, repository: IRegionRepository, catalog: RegionCatalog):
+        """
+        Args:
+            repository: Repository source (PostgreSQL ou Mock)
+            catalog: Catalogue partagé par le processus
+        """
+        self.repository = repository
+        self.catalog = catalog
+
+    async def get_region_info_by_id(self, region_id: int) -> Dict[str, Any]:
+        """Récupère une région par son ID depuis le catalogue"""
+        snapshot = await self.catalog.ensure_loaded(self.repository)
+        return snapshot.get_by_id(region_id)
+
+    async def get_all_regions(self) -> List[Dict[str, Any]]:
+        """Récupère toutes les régions depuis le catalogue"""
+        snapshot = await self.catalog.ensure_loaded(self.repository)
+        return snapshot.all()
+
+    async def get_region_by_name(self, region_name: str) -> Dict[str, Any]:
+        """Récupère une région par son nom normalisé depuis le catalogue"""
+        snapshot = await self.catalog.ensure_loaded(self.repository)
+        return snapshot.get_by_name(region_name)
+
+    async def create_region(self, region_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Crée une région puis recharge le catalogue"""
+        created_region = await self.repository.create_region(region_data)
+        if created_region:
+            await self.catalog.refresh(self.repository)
+        return created_region
+
+    async def update_region(self, region_id: int, region_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Met à jour une région puis recharge le catalogue"""
+        updated_region = await self.repository.update_region(region_id, region_data)
+        if updated_region:
+            await self.catalog.refresh(self.repository)
+        return updated_region
+
+    async def delete_region(self, region_id: int) -> bool:
+        """Supprime une région puis recharge le catalogue"""
+        deleted = await self.repository.delete_region(region_id)
+        if deleted:
+            await self.catalog.refresh(self.repository)
+        return deleted
+
+    async def search_regions(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Autocomplétion servie par l'index de préfixe du catalogue"""
+        snapshot = await self.catalog.ensure_loaded(self.repository)
+        return snapshot.find_by_prefix(query, limit)
+
+    async def find_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> List[Dict[str, Any]]:
+        """Plus proches voisins servis par le KD-tree du catalogue"""
+        snapshot = await self.catalog.ensure_loaded(self.repository)
+        return snapshot.nearest(latitude, longitude, k)
+
+    async def get_regions_watermark(self) -> Dict[str, Any]:
+        """Délègue le calcul de l'empreinte au repository sous-jacent"""
+        return await self.repository.get_regions_watermark()
@@ -0,0 +1,101 @@
+from backend.repositories.interfaces import IWeatherRepository
+from backend.resilience.circuit_breaker import CircuitBreaker, CircuitOpenError, DatabaseUnavailableError
+from backend.resilience.stale_cache import StaleCache
+from backend.serialization.tabular import RowSet
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CircuitBreakerWeatherRepository(IWeatherRepository):
+    """
+    Repository météo protégé par le disjoncteur de la base.
+    Chaque appel est borné dans le temps ; quand la base échoue ou que le circuit
+    est ouvert, les lectures servent la dernière valeur connue marquée `stale`,
+    ou lèvent DatabaseUnavailableError s'il n'y en a pas. Les écritures échouent
+    immédiatement tant que le circuit est ouvert.
+    """
+
+    def __init__(self, repository: IWeatherRepository, breaker: CircuitBreaker, stale_cache: StaleCache):
+        """
+        Args:
+            repository: Repository du backend choisi
+            breaker: Disjoncteur partagé par le processus
+            stale_cache: Dernières valeurs connues, partagées par le processus
+        """
+        self.repository = repository
+        self.breaker = breaker
+        self.stale_cache = stale_cache
+
+    async def _read(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await self.breaker.call(function)
+        except Exception as e:
+            stale = self.stale_cache.get_stale(key)
+            if stale is None:
+                raise DatabaseUnavailableError(
+                    f"Base de données indisponible ({key[0]})", max(1.0, self.breaker.retry_after())
+                ) from e
+            if not isinstance(e, CircuitOpenError):
+                logger.warning(f"Lecture {key[0]} en échec, dernière valeur connue servie: {e!r}")
+            return stale
+        if result:
+            self.stale_cache.put(key, result)
+        return result
+
+    async def _write(self, function: Callable[[], Awaitable[Any]]) -> Any:
+        # Un lot volumineux peut être long sans que la base soit en cause : écritures non bornées
+        try:
+            return await self.breaker.call(function, bounded=False)
+        except CircuitOpenError as e:
+            raise DatabaseUnavailableError(str(e), max(1.0, e.retry_after)) from e
+
+    async def get_weather_by_region(self, region_name: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Dernière mesure d'une région, ou la dernière valeur connue si la base ne répond pas"""
+        columns = tuple(columns) if columns else None
+        return await self._read(("get_weather_by_region", region_name, columns),
+                                lambda: self.repository.get_weather_by_region(region_name, columns))
+
+    async def get_weather_forecast(self, region_name: str, days: int) -> List[Dict[str, Any]]:
+        """Prévisions d'une région, ou les dernières connues si la base ne répond pas"""
+        return await self._read(("get_weather_forecast", region_name, days),
+                                lambda: self.repository.get_weather_forecast(region_name, days))
+
+    async def get_weather_history(self, region_name: str, days: int = 7) -> List[Dict[str, Any]]:
+        """Historique d'une région, ou le dernier connu si la base ne répond pas"""
+        return await self._read(("get_weather_history", region_name, days),
+                                lambda: self.repository.get_weather_history(region_name, days))
+
+    async def get_weather_history_rows(self, region_name: str, days: int = 7) -> RowSet:
+        """
+        Historique en lignes pour les exports tabulaires. Refusé tant que le circuit est ouvert,
+        sans dernière valeur connue (trop volumineux pour la garder en mémoire) ni délai : un
+        long historique peut être lent sans que la base soit en cause.
+        """
+        try:
+            return await self.breaker.call(
+                lambda: self.repository.get_weather_history_rows(region_name, days), bounded=False
+            )
+        except CircuitOpenError as e:
+            raise DatabaseUnavailableError(str(e), max(1.0, e.retry_after)) from e
+
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        """Dernière mesure de chaque région, ou les dernières connues si la base ne répond pas"""
+        return await self._read(("get_latest_weather_by_region",),
+                                self.repository.get_latest_weather_by_region)
+
+    async def create_weather_data(self, weather_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Enregistre une mesure (refusée tant que le circuit est ouvert)"""
+        return await self._write(lambda: self.repository.create_weather_data(weather_data))
+
+    async def create_weather_forecast(self, forecast_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Enregistre une prévision (refusée tant que le circuit est ouvert)"""
+        return await self._write(lambda: self.repository.create_weather_forecast(forecast_data))
+
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        """Insère un lot de mesures (refusé tant que le circuit est ouvert)"""
+        return await self._write(lambda: self.repository.bulk_create_weather_data(weather_records))
+
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """Insère ou met à jour un lot de prévisions (refusé tant que le circuit est ouvert)"""
+        return await self._write(lambda: self.repository.upsert_forecasts(forecast_records, batch_size))
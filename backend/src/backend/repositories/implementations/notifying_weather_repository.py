@@ -0,0 +1,62 @@
+from backend.repositories.interfaces import IWeatherRepository
+from backend.serialization.tabular import RowSet
+from backend.streaming.weather_hub import WeatherHub
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NotifyingWeatherRepository(IWeatherRepository):
+    """
+    Repository météo qui signale au hub de diffusion chaque mesure enregistrée.
+    La publication a lieu après l'écriture (validée par le repository délégué) ;
+    les lectures et les prévisions sont simplement déléguées. Avec l'écoute des
+    notifications PostgreSQL, c'est la base qui diffuse la mesure à tous les workers.
+    """
+
+    def __init__(self, repository: IWeatherRepository, hub: WeatherHub):
+        """
+        Args:
+            repository: Repository du backend choisi
+            hub: Hub de diffusion du processus
+        """
+        self.repository = repository
+        self.hub = hub
+
+    async def get_weather_by_region(self, region_name: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        return await self.repository.get_weather_by_region(region_name, columns)
+
+    async def get_weather_forecast(self, region_name: str, days: int) -> List[Dict[str, Any]]:
+        return await self.repository.get_weather_forecast(region_name, days)
+
+    async def get_weather_history(self, region_name: str, days: int = 7) -> List[Dict[str, Any]]:
+        return await self.repository.get_weather_history(region_name, days)
+
+    async def get_weather_history_rows(self, region_name: str, days: int = 7) -> RowSet:
+        return await self.repository.get_weather_history_rows(region_name, days)
+
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        return await self.repository.get_latest_weather_by_region()
+
+    async def create_weather_data(self, weather_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Enregistre une mesure puis la diffuse aux abonnés de sa région"""
+        created = await self.repository.create_weather_data(weather_data)
+        # Dictionnaire vide : écriture en échec, rien à diffuser
+        if created and not created.get("is_forecast"):
+            self.hub.publish_local(created)
+        return created
+
+    async def create_weather_forecast(self, forecast_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.repository.create_weather_forecast(forecast_data)
+
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        """Insère un lot de mesures puis les diffuse (fusionnées par région dans le hub)"""
+        inserted = await self.repository.bulk_create_weather_data(weather_records)
+        if inserted:
+            for record in weather_records:
+                if not record.get("is_forecast"):
+                    self.hub.publish_local(record)
+        return inserted
+
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        return await self.repository.upsert_forecasts(forecast_records, batch_size)
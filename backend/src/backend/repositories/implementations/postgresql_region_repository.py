@@ -1,7 +1,12 @@
 from backend.repositories.interfaces import IRegionRepository
 from backend.database.models import Region
 from backend.database.connection import AsyncSession
-from sqlalchemy import select
+from backend.database.routing import use_primary
+from backend.database.statements import (
+    ALL_REGIONS, REGION_BY_ID, REGION_BY_NAME, REGION_SEARCH, REGIONS_WATERMARK, like_prefix
+)
+from backend.indexes.spatial_index import EARTH_RADIUS_KM
+from sqlalchemy import select, func
 from typing import Any, Dict, List
 import logging
 
@@ -27,9 +32,8 @@ class PostgreSQLRegionRepository(IRegionRepository):
             Dictionnaire contenant les informations de la région ou dictionnaire vide si non trouvée
         """
         try:
-            # Création de la requête SQL avec SQLAlchemy
-            stmt = select(Region).where(Region.id == region_id)
-            result = await self.session.execute(stmt)
+            # Instruction du registre, construite une seule fois (voir database/statements.py)
+            result = await self.session.execute(REGION_BY_ID, {"region_id": region_id})
             region = result.scalar_one_or_none()
             
             if region:
@@ -52,8 +56,7 @@ class PostgreSQLRegionRepository(IRegionRepository):
         """
         try:
             # Requête pour récupérer toutes les régions, triées par nom
-            stmt = select(Region).order_by(Region.name)
-            result = await self.session.execute(stmt)
+            result = await self.session.execute(ALL_REGIONS)
             regions = result.scalars().all()
             
             regions_list = [region.to_dict() for region in regions]
@@ -96,3 +99,158 @@ class PostgreSQLRegionRepository(IRegionRepository):
             await self.session.rollback()
             logger.error(f"Erreur lors de la création de la région: {str(e)}")
             return {}
+    
+    async def get_region_by_name(self, region_name: str) -> Dict[str, Any]:
+        """
+        Récupère une région par son nom (insensible à la casse) depuis PostgreSQL
+        
+        Args:
+            region_name: Le nom de la région
+            
+        Returns:
+            Dictionnaire contenant les informations de la région ou dictionnaire vide si non trouvée
+        """
+        try:
+            result = await self.session.execute(REGION_BY_NAME, {"name": region_name.lower()})
+            region = result.scalar_one_or_none()
+            
+            if region:
+                return region.to_dict()
+            logger.warning(f"Aucune région trouvée avec le nom: {region_name}")
+            return {}
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération de la région {region_name}: {str(e)}")
+            return {}
+    
+    async def update_region(self, region_id: int, region_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Met à jour une région existante dans PostgreSQL
+        
+        Args:
+            region_id: L'ID de la région à mettre à jour
+            region_data: Champs à mettre à jour (les valeurs None sont ignorées)
+            
+        Returns:
+            Dictionnaire contenant la région mise à jour ou dictionnaire vide si non trouvée
+        """
+        try:
+            # Lecture-modification-écriture : la ligne est lue sur la primaire
+            use_primary(self.session)
+            region = await self.session.get(Region, region_id)
+            if not region:
+                logger.warning(f"Aucune région à mettre à jour avec l'ID: {region_id}")
+                return {}
+            
+            for key in ("name", "nb_habitants", "language", "country", "latitude", "longitude"):
+                if region_data.get(key) is not None:
+                    setattr(region, key, region_data[key])
+            
+            await self.session.commit()
+            await self.session.refresh(region)
+            
+            logger.info(f"Région mise à jour: {region.name} (ID: {region_id})")
+            return region.to_dict()
+            
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Erreur lors de la mise à jour de la région {region_id}: {str(e)}")
+            return {}
+    
+    async def delete_region(self, region_id: int) -> bool:
+        """
+        Supprime une région de PostgreSQL
+        
+        Args:
+            region_id: L'ID de la région à supprimer
+            
+        Returns:
+            True si la région a été supprimée
+        """
+        try:
+            # Lecture-modification-écriture : la ligne est lue sur la primaire
+            use_primary(self.session)
+            region = await self.session.get(Region, region_id)
+            if not region:
+                return False
+            
+            await self.session.delete(region)
+            await self.session.commit()
+            
+            logger.info(f"Région supprimée (ID: {region_id})")
+            return True
+            
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Erreur lors de la suppression de la région {region_id}: {str(e)}")
+            return False
+    
+    async def search_regions(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Recherche les régions dont le nom commence par `query` dans PostgreSQL.
+        Chemin de secours : en fonctionnement normal, l'index en mémoire du catalogue répond.
+        
+        Args:
+            query: Début du nom recherché
+            limit: Nombre maximal de résultats
+            
+        Returns:
+            Liste des régions, par population décroissante
+        """
+        try:
+            result = await self.session.execute(REGION_SEARCH, {"pattern": like_prefix(query), "limit": limit})
+            return [region.to_dict() for region in result.scalars().all()]
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la recherche des régions {query}: {str(e)}")
+            return []
+    
+    async def find_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> List[Dict[str, Any]]:
+        """
+        Recherche les régions les plus proches d'un point (distance haversine calculée par PostgreSQL).
+        Chemin de secours en balayage complet : en fonctionnement normal, le KD-tree du catalogue répond.
+        
+        Args:
+            latitude: Latitude du point (degrés)
+            longitude: Longitude du point (degrés)
+            k: Nombre de régions
+            
+        Returns:
+            Liste des régions complétées par `distance_km`, de la plus proche à la plus lointaine
+        """
+        try:
+            half_delta_lat = func.radians(Region.latitude - latitude) / 2
+            half_delta_lon = func.radians(Region.longitude - longitude) / 2
+            distance = 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(
+                func.power(func.sin(half_delta_lat), 2)
+                + func.cos(func.radians(latitude)) * func.cos(func.radians(Region.latitude))
+                * func.power(func.sin(half_delta_lon), 2)
+            ))
+            stmt = (select(Region, distance.label("distance_km"))
+                   .where(Region.latitude.is_not(None), Region.longitude.is_not(None))
+                   .order_by(distance)
+                   .limit(k))
+            result = await self.session.execute(stmt)
+            return [
+                {**region.to_dict(), "distance_km": round(float(distance_km), 3)}
+                for region, distance_km in result.all()
+            ]
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la recherche des régions proches de ({latitude}, {longitude}): {str(e)}")
+            return []
+    
+    async def get_regions_watermark(self) -> Dict[str, Any]:
+        """
+        Calcule l'empreinte de la table des régions en une seule requête agrégée.
+        Utilisée par le catalogue en mémoire pour détecter une modification.
+        
+        Returns:
+            Dictionnaire {"count", "max_updated_at"}
+        """
+        result = await self.session.execute(REGIONS_WATERMARK)
+        count, max_updated_at = result.one()
+        return {
+            "count": count,
+            "max_updated_at": max_updated_at.isoformat() if max_updated_at else None
+        }
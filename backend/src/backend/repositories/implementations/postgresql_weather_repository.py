@@ -1,13 +1,54 @@
-from backend.repositories.interfaces import IWeatherRepository
-from backend.database.models import WeatherData, WeatherForecast
+from backend.repositories.interfaces import (
+    IWeatherRepository, PLACEHOLDER, WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS
+)
+from backend.database.models import WeatherData, WeatherForecast, FORECAST_UNIQUE_CONSTRAINT
 from backend.database.connection import AsyncSession
-from sqlalchemy import select, desc, and_
-from typing import Any, Dict, List
+from backend.database.statements import (
+    LATEST_WEATHER_BY_REGION, WEATHER_BY_REGION, WEATHER_FORECAST, WEATHER_HISTORY, WEATHER_HISTORY_ROWS,
+    weather_by_region_projection
+)
+from backend.serialization.tabular import RowSet
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Any, Dict, List, Optional, Sequence
 from datetime import datetime, date, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Colonnes remplacées lorsqu'une prévision existe déjà pour (region_name, forecast_date)
+FORECAST_VALUE_COLUMNS = (
+    "day_name", "temperature_min", "temperature_max", "temperature_avg", "condition",
+    "humidity", "pressure", "wind_speed", "wind_direction", "precipitation_probability"
+)
+
+# Insertion d'un lot en une seule instruction (une colonne = un tableau) : les déclencheurs
+# par instruction de la migration 003 ne s'exécutent qu'une fois par lot, pas une fois par ligne
+BULK_INSERT_WEATHER_DATA = text("""
+    INSERT INTO weather_data (region_name, temperature, condition, humidity, pressure, wind_speed,
+                              wind_direction, is_forecast, forecast_day, recorded_at)
+    SELECT region_name, temperature, condition, humidity, pressure, wind_speed,
+           wind_direction, is_forecast, forecast_day, coalesce(recorded_at, now())
+    FROM unnest(CAST(:region_name AS text[]), CAST(:temperature AS float8[]), CAST(:condition AS text[]),
+                CAST(:humidity AS int[]), CAST(:pressure AS float8[]), CAST(:wind_speed AS float8[]),
+                CAST(:wind_direction AS text[]), CAST(:is_forecast AS bool[]), CAST(:forecast_day AS int[]),
+                CAST(:recorded_at AS timestamptz[]))
+         AS batch(region_name, temperature, condition, humidity, pressure, wind_speed,
+                  wind_direction, is_forecast, forecast_day, recorded_at)
+""")
+BULK_INSERT_COLUMNS = (
+    "region_name", "temperature", "condition", "humidity", "pressure", "wind_speed",
+    "wind_direction", "is_forecast", "forecast_day", "recorded_at"
+)
+
+def _projected_row(row) -> Dict[str, Any]:
+    """Ligne réduite à quelques colonnes, convertie comme WeatherData.to_dict"""
+    values = row._asdict()
+    for column, value in values.items():
+        if isinstance(value, datetime):
+            values[column] = value.isoformat()
+    return values
+
 class PostgreSQLWeatherRepository(IWeatherRepository):
     """
     Implémentation PostgreSQL du repository météorologique.
@@ -17,28 +58,30 @@ class PostgreSQLWeatherRepository(IWeatherRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
     
-    async def get_weather_by_region(self, region_name: str) -> Dict[str, Any]:
+    async def get_weather_by_region(self, region_name: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Récupère les données météorologiques actuelles pour une région depuis PostgreSQL
         
         Args:
             region_name: Le nom de la région
+            columns: Colonnes à lire (None : la ligne complète)
             
         Returns:
             Dictionnaire contenant les données météo actuelles
         """
         try:
             # Récupérer la donnée météo la plus récente pour la région (non-forecast)
-            stmt = (select(WeatherData)
-                   .where(and_(
-                       WeatherData.region_name.ilike(f"%{region_name}%"),
-                       WeatherData.is_forecast == False
-                   ))
-                   .order_by(desc(WeatherData.recorded_at))
-                   .limit(1))
-            
-            result = await self.session.execute(stmt)
-            weather_data = result.scalar_one_or_none()
+            parameters = {"pattern": f"%{region_name}%"}
+            if columns:
+                # Projection réduite : ni entité ORM ni colonnes inutiles transférées
+                row = (await self.session.execute(weather_by_region_projection(tuple(columns)), parameters)).one_or_none()
+                if row is not None:
+                    logger.info(f"Données météo trouvées pour {region_name} ({', '.join(columns)})")
+                    return _projected_row(row)
+                weather_data = None
+            else:
+                result = await self.session.execute(WEATHER_BY_REGION, parameters)
+                weather_data = result.scalar_one_or_none()
             
             if weather_data:
                 logger.info(f"Données météo trouvées pour {region_name}")
@@ -59,7 +102,8 @@ class PostgreSQLWeatherRepository(IWeatherRepository):
                 
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des données météo pour {region_name}: {str(e)}")
-            return {}
+            # Relancée pour le disjoncteur : une panne ne doit pas passer pour une réponse
+            raise
     
     async def get_weather_forecast(self, region_name: str, days: int) -> List[Dict[str, Any]]:
         """
@@ -74,19 +118,14 @@ class PostgreSQLWeatherRepository(IWeatherRepository):
         """
         try:
             # Calculer la date limite pour les prévisions
-            end_date = date.today() + timedelta(days=days)
-            
-            # Récupérer les prévisions pour la région
-            stmt = (select(WeatherForecast)
-                   .where(and_(
-                       WeatherForecast.region_name.ilike(f"%{region_name}%"),
-                       WeatherForecast.forecast_date <= end_date,
-                       WeatherForecast.forecast_date >= date.today()
-                   ))
-                   .order_by(WeatherForecast.forecast_date)
-                   .limit(days))
-            
-            result = await self.session.execute(stmt)
+            today = date.today()
+            end_date = today + timedelta(days=days)
+            
+            # Récupérer les prévisions pour la région : égalité sur le nom pour parcourir
+            # une plage serrée de l'index unique (region_name, forecast_date)
+            result = await self.session.execute(WEATHER_FORECAST, {
+                "region_name": region_name, "start_date": today, "end_date": end_date, "days": days
+            })
             forecasts = result.scalars().all()
             
             if forecasts:
@@ -109,13 +148,14 @@ class PostgreSQLWeatherRepository(IWeatherRepository):
                         "pressure": 1013.25,
                         "wind_speed": 10.0,
                         "wind_direction": "NW",
-                        "precipitation_probability": 20
+                        "precipitation_probability": 20,
+                        PLACEHOLDER: True
                     })
                 return default_forecasts
                 
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des prévisions pour {region_name}: {str(e)}")
-            return []
+            raise
     
     def _get_day_name(self, forecast_date: date) -> str:
         """Retourne le nom du jour pour une date donnée"""
@@ -162,42 +202,149 @@ class PostgreSQLWeatherRepository(IWeatherRepository):
     
     async def create_weather_forecast(self, forecast_data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Crée une nouvelle prévision météorologique dans PostgreSQL
+        Crée ou remplace la prévision d'une région pour une date dans PostgreSQL.
+        Idempotent : rejouer la même prévision met à jour la ligne existante
+        au lieu d'ajouter un doublon (clé unique region_name, forecast_date).
         
         Args:
             forecast_data: Dictionnaire contenant les données de prévision
             
         Returns:
-            Dictionnaire contenant la prévision créée
+            Dictionnaire contenant la prévision enregistrée
         """
         try:
-            new_forecast = WeatherForecast(
-                region_name=forecast_data.get("region_name"),
-                forecast_date=forecast_data.get("forecast_date"),
-                day_name=forecast_data.get("day_name"),
-                temperature_min=forecast_data.get("temperature_min"),
-                temperature_max=forecast_data.get("temperature_max"),
-                temperature_avg=forecast_data.get("temperature_avg"),
-                condition=forecast_data.get("condition"),
-                humidity=forecast_data.get("humidity"),
-                pressure=forecast_data.get("pressure"),
-                wind_speed=forecast_data.get("wind_speed"),
-                wind_direction=forecast_data.get("wind_direction"),
-                precipitation_probability=forecast_data.get("precipitation_probability", 0)
-            )
-            
-            self.session.add(new_forecast)
+            stmt = self._forecast_upsert_statement().returning(WeatherForecast)
+            result = await self.session.execute(stmt, [self._forecast_row(forecast_data)])
+            forecast = result.scalar_one()
             await self.session.commit()
-            await self.session.refresh(new_forecast)
             
-            logger.info(f"Nouvelle prévision créée pour: {new_forecast.region_name}")
-            return new_forecast.to_dict()
+            logger.info(f"Prévision enregistrée pour: {forecast.region_name} ({forecast.forecast_date})")
+            return forecast.to_dict()
             
         except Exception as e:
             await self.session.rollback()
             logger.error(f"Erreur lors de la création de la prévision: {str(e)}")
             return {}
     
+    @staticmethod
+    def _parse_datetime(value: Any) -> Any:
+        """Accepte une date ISO 8601 (flux d'ingestion) ou un objet date/datetime"""
+        if isinstance(value, str):
+            return datetime.fromisoformat(value)
+        return value
+    
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        """
+        Insère un lot de mesures en une seule instruction (tableaux dépliés par unnest)
+        
+        Args:
+            weather_records: Liste de dictionnaires de mesures
+            
+        Returns:
+            Nombre de lignes insérées
+        """
+        if not weather_records:
+            return 0
+        columns = {column: [] for column in BULK_INSERT_COLUMNS}
+        for record in weather_records:
+            columns["region_name"].append(record.get("region_name"))
+            columns["temperature"].append(self._as_float(record.get("temperature")))
+            columns["condition"].append(record.get("condition"))
+            columns["humidity"].append(record.get("humidity"))
+            columns["pressure"].append(self._as_float(record.get("pressure")))
+            columns["wind_speed"].append(self._as_float(record.get("wind_speed")))
+            columns["wind_direction"].append(record.get("wind_direction"))
+            columns["is_forecast"].append(record.get("is_forecast", False))
+            columns["forecast_day"].append(record.get("forecast_day", 0))
+            # Sans horodatage fourni, la valeur par défaut du serveur (now()) s'applique
+            columns["recorded_at"].append(
+                self._parse_datetime(record["recorded_at"]) if record.get("recorded_at") else None
+            )
+        
+        try:
+            await self.session.execute(BULK_INSERT_WEATHER_DATA, columns)
+            await self.session.commit()
+            logger.info(f"{len(weather_records)} mesures insérées en lot")
+            return len(weather_records)
+            
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Erreur lors de l'insertion d'un lot de {len(weather_records)} mesures: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _as_float(value: Any) -> Any:
+        """Les tableaux float8[] n'acceptent que des flottants (ou NULL)"""
+        return float(value) if value is not None else None
+    
+    def _forecast_row(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Convertit un dictionnaire de prévision en ligne de la table weather_forecasts"""
+        forecast_date = self._parse_datetime(record.get("forecast_date"))
+        if isinstance(forecast_date, datetime):
+            forecast_date = forecast_date.date()
+        return {
+            "region_name": record.get("region_name"),
+            "forecast_date": forecast_date,
+            "day_name": record.get("day_name") or self._get_day_name(forecast_date),
+            "temperature_min": record.get("temperature_min"),
+            "temperature_max": record.get("temperature_max"),
+            "temperature_avg": record.get("temperature_avg"),
+            "condition": record.get("condition"),
+            "humidity": record.get("humidity"),
+            "pressure": record.get("pressure"),
+            "wind_speed": record.get("wind_speed"),
+            "wind_direction": record.get("wind_direction"),
+            "precipitation_probability": record.get("precipitation_probability", 0)
+        }
+    
+    @staticmethod
+    def _forecast_upsert_statement():
+        """INSERT … ON CONFLICT (region_name, forecast_date) DO UPDATE sur toutes les colonnes de valeur"""
+        stmt = pg_insert(WeatherForecast)
+        updated_columns = {
+            column: stmt.excluded[column]
+            for column in FORECAST_VALUE_COLUMNS
+        }
+        updated_columns["created_at"] = func.now()
+        return stmt.on_conflict_do_update(constraint=FORECAST_UNIQUE_CONSTRAINT, set_=updated_columns)
+    
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """
+        Insère ou met à jour un lot de prévisions, par paquets de `batch_size` lignes,
+        en une seule transaction. Rafraîchir 7 jours de prévisions toutes les heures
+        ne crée donc aucune ligne supplémentaire.
+        
+        Args:
+            forecast_records: Liste de dictionnaires de prévisions
+            batch_size: Nombre de lignes par instruction
+            
+        Returns:
+            Nombre de prévisions écrites (après dédoublonnage du lot)
+        """
+        if not forecast_records:
+            return 0
+        
+        # Une même instruction ON CONFLICT ne peut pas toucher deux fois la même ligne :
+        # on ne garde que la dernière version de chaque (region_name, forecast_date) du lot
+        rows_by_key = {}
+        for record in forecast_records:
+            row = self._forecast_row(record)
+            rows_by_key[(row["region_name"], row["forecast_date"])] = row
+        rows = list(rows_by_key.values())
+        
+        try:
+            stmt = self._forecast_upsert_statement()
+            for position in range(0, len(rows), batch_size):
+                await self.session.execute(stmt, rows[position:position + batch_size])
+            await self.session.commit()
+            logger.info(f"{len(rows)} prévisions insérées ou mises à jour")
+            return len(rows)
+            
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Erreur lors de l'upsert d'un lot de {len(rows)} prévisions: {str(e)}")
+            raise
+    
     async def get_weather_history(self, region_name: str, days: int = 7) -> List[Dict[str, Any]]:
         """
         Récupère l'historique des données météo pour une région
@@ -212,15 +359,9 @@ class PostgreSQLWeatherRepository(IWeatherRepository):
         try:
             start_date = datetime.now() - timedelta(days=days)
             
-            stmt = (select(WeatherData)
-                   .where(and_(
-                       WeatherData.region_name.ilike(f"%{region_name}%"),
-                       WeatherData.recorded_at >= start_date,
-                       WeatherData.is_forecast == False
-                   ))
-                   .order_by(desc(WeatherData.recorded_at)))
-            
-            result = await self.session.execute(stmt)
+            result = await self.session.execute(WEATHER_HISTORY, {
+                "pattern": f"%{region_name}%", "start_date": start_date
+            })
             weather_history = result.scalars().all()
             
             history_list = [weather.to_dict() for weather in weather_history]
@@ -230,4 +371,55 @@ class PostgreSQLWeatherRepository(IWeatherRepository):
             
         except Exception as e:
             logger.error(f"Erreur lors de la récupération de l'historique météo pour {region_name}: {str(e)}")
-            return []
+            raise
+    
+    async def get_weather_history_rows(self, region_name: str, days: int = 7) -> RowSet:
+        """
+        Récupère l'historique des données météo d'une région en lignes, sans entité ORM
+        
+        Args:
+            region_name: Le nom de la région
+            days: Nombre de jours d'historique (par défaut 7)
+            
+        Returns:
+            RowSet des mesures (WEATHER_HISTORY_ROW_COLUMNS), de la plus récente à la plus ancienne
+        """
+        try:
+            start_date = datetime.now() - timedelta(days=days)
+            
+            result = await self.session.execute(WEATHER_HISTORY_ROWS, {
+                "pattern": f"%{region_name}%", "start_date": start_date
+            })
+            rows = result.all()
+            logger.info(f"Historique météo (lignes) récupéré pour {region_name}: {len(rows)} entrées")
+            
+            return RowSet(WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS, rows)
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération de l'historique météo pour {region_name}: {str(e)}")
+            raise
+    
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        """
+        Récupère la dernière mesure de chaque région, jointe aux coordonnées de la région.
+        Une seule requête DISTINCT ON (region_name), servie par l'index (region_name, recorded_at).
+        
+        Returns:
+            Liste des dernières mesures, avec `latitude` et `longitude`
+        """
+        try:
+            result = await self.session.execute(LATEST_WEATHER_BY_REGION)
+            latest = [
+                {
+                    **weather.to_dict(),
+                    "latitude": latitude,
+                    "longitude": longitude
+                }
+                for weather, latitude, longitude in result.all()
+            ]
+            logger.info(f"Dernières mesures récupérées pour {len(latest)} régions")
+            return latest
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des dernières mesures: {str(e)}")
+            raise
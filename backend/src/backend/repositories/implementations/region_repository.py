@@ -1,4 +1,7 @@
 from backend.repositories.interfaces import IRegionRepository
+from backend.indexes.text_normalization import normalize_region_name
+from backend.indexes.spatial_index import haversine_km
+from backend.simulation.fixtures import get_mock_fixtures
 from typing import Any, Dict, List
 import logging
 
@@ -8,17 +11,24 @@ logger = logging.getLogger(__name__)
 class RegionRepository(IRegionRepository):
     """
     Implémentation mock du repository des régions.
-    Utilise des données fictives pour les tests et le développement.
+    Utilise des données fictives pour les tests et le développement, ou les régions des
+    fixtures de MOCK_FIXTURES_DIR si elle est définie.
     """
     
     def __init__(self):
+        fixtures = get_mock_fixtures()
+        if fixtures is not None:
+            # Copie des régions : update_region les modifie sur place
+            self._regions = [dict(region) for region in fixtures.regions]
+            self._next_id = max((region["id"] for region in self._regions), default=0) + 1
+            return
         self._regions = [
-            {"id": 1, "name": "Paris", "nb_habitants": 2165423, "language": "français", "country": "France"},
-            {"id": 2, "name": "Lyon", "nb_habitants": 515695, "language": "français", "country": "France"},
-            {"id": 3, "name": "Marseille", "nb_habitants": 863310, "language": "français", "country": "France"},
-            {"id": 4, "name": "Toulouse", "nb_habitants": 479553, "language": "français", "country": "France"},
-            {"id": 5, "name": "Nice", "nb_habitants": 342295, "language": "français", "country": "France"},
-            {"id": 10, "name": "Normandie", "nb_habitants": 3320000, "language": "français", "country": "France"},
+            {"id": 1, "name": "Paris", "nb_habitants": 2165423, "language": "français", "country": "France", "latitude": 48.856614, "longitude": 2.352222},
+            {"id": 2, "name": "Lyon", "nb_habitants": 515695, "language": "français", "country": "France", "latitude": 45.764043, "longitude": 4.835659},
+            {"id": 3, "name": "Marseille", "nb_habitants": 863310, "language": "français", "country": "France", "latitude": 43.296482, "longitude": 5.369780},
+            {"id": 4, "name": "Toulouse", "nb_habitants": 479553, "language": "français", "country": "France", "latitude": 43.604652, "longitude": 1.444209},
+            {"id": 5, "name": "Nice", "nb_habitants": 342295, "language": "français", "country": "France", "latitude": 43.710173, "longitude": 7.261953},
+            {"id": 10, "name": "Normandie", "nb_habitants": 3320000, "language": "français", "country": "France", "latitude": 49.182863, "longitude": -0.370679},
         ]
         self._next_id = max(region["id"] for region in self._regions) + 1
 
@@ -88,3 +98,38 @@ class RegionRepository(IRegionRepository):
                 return True
         
         return False
+    
+    async def get_regions_watermark(self) -> Dict[str, Any]:
+        """Retourne l'empreinte des données mock (version mock)"""
+        return {"count": len(self._regions), "max_updated_at": None, "next_id": self._next_id}
+    
+    async def search_regions(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Recherche les régions par préfixe de mot (version mock)"""
+        logger.info(f"Mock: Recherche des régions commençant par {query}")
+        
+        key = normalize_region_name(query)
+        if not key:
+            return []
+        matches = [
+            region for region in self._regions
+            if any(word.startswith(key) for word in self._word_suffixes(region["name"]))
+        ]
+        matches.sort(key=lambda region: -region.get("nb_habitants", 0))
+        return matches[:limit]
+    
+    @staticmethod
+    def _word_suffixes(name: str) -> List[str]:
+        words = normalize_region_name(name).split(" ")
+        return [" ".join(words[position:]) for position in range(len(words))]
+    
+    async def find_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> List[Dict[str, Any]]:
+        """Recherche les régions les plus proches par balayage complet (version mock)"""
+        logger.info(f"Mock: Recherche des {k} régions les plus proches de ({latitude}, {longitude})")
+        
+        located = [
+            {**region, "distance_km": round(haversine_km(latitude, longitude, region["latitude"], region["longitude"]), 3)}
+            for region in self._regions
+            if region.get("latitude") is not None and region.get("longitude") is not None
+        ]
+        located.sort(key=lambda region: region["distance_km"])
+        return located[:k]
@@ -0,0 +1,86 @@
+from backend.repositories.interfaces import IRegionRepository
+from backend.caching.second_level import CacheNamespace, SecondLevelCache
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+REGION_FIELDS = (
+    "id", "name", "nb_habitants", "language", "country", "latitude", "longitude", "created_at", "updated_at"
+)
+
+# Liste complète des régions par empreinte de la table : une entrée n'est jamais périmée,
+# elle cesse simplement d'être demandée quand l'empreinte change (durée de vie longue)
+ALL_REGIONS = CacheNamespace("all-regions", 1, REGION_FIELDS, ttl_seconds=3600.0)
+
+
+class SecondLevelCachedRegionRepository(IRegionRepository):
+    """
+    Repository des régions derrière le cache de second niveau : la liste complète, lue
+    par le catalogue en mémoire au démarrage de chaque worker, est partagée par empreinte
+    de la table (nombre de lignes, max(updated_at)). Un worker froid la relit du cache au
+    lieu de la base. Après une écriture par ce repository, la liste est relue de la base et
+    remplace l'entrée (utile aux backends dont l'empreinte ne voit pas toutes les modifications).
+    Les autres lectures sont servies par le catalogue et sont déléguées.
+    """
+
+    def __init__(self, repository: IRegionRepository, cache: SecondLevelCache):
+        """
+        Args:
+            repository: Repository du backend choisi
+            cache: Cache de second niveau du processus
+        """
+        self.repository = repository
+        self.cache = cache
+        # Empreinte lue juste avant `get_all_regions` (séquence de `RegionCatalog.refresh`)
+        self._watermark: Optional[Dict[str, Any]] = None
+        self._written = False
+
+    async def get_region_info_by_id(self, region_id: int) -> Dict[str, Any]:
+        return await self.repository.get_region_info_by_id(region_id)
+
+    async def get_all_regions(self) -> List[Dict[str, Any]]:
+        """Liste complète des régions, servie par le cache pour l'empreinte courante"""
+        watermark, self._watermark = self._watermark, None
+        if watermark is None:
+            watermark = await self.repository.get_regions_watermark()
+        parts = [value for _, value in sorted((watermark or {}).items())]
+        if not self._written:
+            cached = await self.cache.get(ALL_REGIONS, *parts, offload=True)
+            if cached is not None:
+                return cached
+        self._written = False
+        regions = await self.repository.get_all_regions()
+        # Liste vide : erreur masquée par le repository ou table vide, rien à partager
+        if regions:
+            await self.cache.set(ALL_REGIONS, parts, regions, offload=True)
+        return regions
+
+    async def get_region_by_name(self, region_name: str) -> Dict[str, Any]:
+        return await self.repository.get_region_by_name(region_name)
+
+    async def create_region(self, region_data: Dict[str, Any]) -> Dict[str, Any]:
+        result = await self.repository.create_region(region_data)
+        self._written = self._written or bool(result)
+        return result
+
+    async def update_region(self, region_id: int, region_data: Dict[str, Any]) -> Dict[str, Any]:
+        result = await self.repository.update_region(region_id, region_data)
+        self._written = self._written or bool(result)
+        return result
+
+    async def delete_region(self, region_id: int) -> bool:
+        result = await self.repository.delete_region(region_id)
+        self._written = self._written or bool(result)
+        return result
+
+    async def search_regions(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self.repository.search_regions(query, limit)
+
+    async def find_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> List[Dict[str, Any]]:
+        return await self.repository.find_nearest_regions(latitude, longitude, k)
+
+    async def get_regions_watermark(self) -> Dict[str, Any]:
+        """Délègue le calcul de l'empreinte et la retient pour le `get_all_regions` qui suit"""
+        self._watermark = await self.repository.get_regions_watermark()
+        return self._watermark
@@ -0,0 +1,133 @@
+from backend.repositories.interfaces import IWeatherRepository
+from backend.caching.second_level import CacheNamespace, SecondLevelCache
+from backend.serialization.tabular import RowSet
+from backend.services.schemas.field_selection import WEATHER_RESPONSE_FIELDS
+from backend.services.schemas.weather_resp_schema import MAX_FORECAST_DAYS
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+WEATHER_FIELDS = (
+    "id", "region_name", "temperature", "condition", "humidity", "pressure",
+    "wind_speed", "wind_direction", "recorded_at", "is_forecast", "forecast_day"
+)
+FORECAST_FIELDS = (
+    "id", "region_name", "forecast_date", "day", "temperature_min", "temperature_max", "temperature",
+    "condition", "humidity", "pressure", "wind_speed", "wind_direction", "precipitation_probability", "created_at"
+)
+
+# Météo actuelle par (nom de région, projection) ; prévisions par (nom de région, nombre de jours)
+CURRENT_WEATHER = CacheNamespace("current-weather", 2, WEATHER_FIELDS)
+FORECASTS = CacheNamespace("forecasts", 1, FORECAST_FIELDS)
+
+# Segment de clé de la ligne complète ; une projection (`fields=`) a pour segment ses colonnes
+FULL_ROW = "*"
+# Projections mises en cache : celles que produit `fields=` sur la météo actuelle (l'invalidation les énumère)
+CURRENT_WEATHER_PROJECTIONS = (FULL_ROW, *(",".join(columns) for columns in WEATHER_RESPONSE_FIELDS.projections()))
+
+
+def projection_key(columns: Optional[Sequence[str]]) -> str:
+    """Segment de clé d'une lecture de la météo actuelle"""
+    return FULL_ROW if not columns else ",".join(columns)
+
+
+def current_weather_keys(region_names: Iterable[str]) -> List[Tuple[str, str]]:
+    """Clés de météo actuelle à invalider après une écriture dans weather_data (toutes les projections)"""
+    return [
+        (region_name, projection) for region_name in set(region_names) for projection in CURRENT_WEATHER_PROJECTIONS
+    ]
+
+
+def forecast_keys(region_names: Iterable[str]) -> List[Tuple[str, int]]:
+    """Clés de prévisions à invalider après une écriture dans weather_forecasts (toutes les durées)"""
+    return [(region_name, days) for region_name in set(region_names) for days in range(1, MAX_FORECAST_DAYS + 1)]
+
+
+class SecondLevelCachedWeatherRepository(IWeatherRepository):
+    """
+    Repository météo derrière le cache de second niveau : météo actuelle et prévisions.
+    Seules les réponses dont toutes les lignes portent exactement le nom demandé sont
+    mises en cache (la recherche par nom partiel ne l'est pas) : une écriture sur une
+    région invalide alors toutes les entrées qui en dépendent. L'historique et la
+    dernière mesure de chaque région sont simplement délégués.
+    """
+
+    def __init__(self, repository: IWeatherRepository, cache: SecondLevelCache):
+        """
+        Args:
+            repository: Repository du backend choisi
+            cache: Cache de second niveau du processus
+        """
+        self.repository = repository
+        self.cache = cache
+
+    async def get_weather_by_region(self, region_name: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Météo actuelle, servie par le cache si possible. Chaque projection (`columns`) a son
+        entrée : en cas d'absence, seules ses colonnes sont lues. Une projection que `fields=`
+        ne produit pas n'est pas mise en cache (l'invalidation ne la connaîtrait pas).
+        """
+        projection = projection_key(columns)
+        if projection not in CURRENT_WEATHER_PROJECTIONS:
+            return await self.repository.get_weather_by_region(region_name, columns)
+        cached = await self.cache.get(CURRENT_WEATHER, region_name, projection)
+        if cached is not None:
+            return cached
+        weather = await self.repository.get_weather_by_region(region_name, columns)
+        if weather and weather.get("region_name") == region_name:
+            await self.cache.set(CURRENT_WEATHER, (region_name, projection), weather)
+        return weather
+
+    async def get_weather_forecast(self, region_name: str, days: int) -> List[Dict[str, Any]]:
+        """Prévisions, servies par le cache si possible (jusqu'à MAX_FORECAST_DAYS jours)"""
+        cacheable = 1 <= days <= MAX_FORECAST_DAYS
+        if cacheable:
+            cached = await self.cache.get(FORECASTS, region_name, days)
+            if cached is not None:
+                return cached
+        forecasts = await self.repository.get_weather_forecast(region_name, days)
+        if cacheable and forecasts and all(forecast.get("region_name") == region_name for forecast in forecasts):
+            await self.cache.set(FORECASTS, (region_name, days), forecasts)
+        return forecasts
+
+    async def get_weather_history(self, region_name: str, days: int = 7) -> List[Dict[str, Any]]:
+        return await self.repository.get_weather_history(region_name, days)
+
+    async def get_weather_history_rows(self, region_name: str, days: int = 7) -> RowSet:
+        return await self.repository.get_weather_history_rows(region_name, days)
+
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        return await self.repository.get_latest_weather_by_region()
+
+    async def create_weather_data(self, weather_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Enregistre une mesure puis invalide la météo actuelle de sa région"""
+        created = await self.repository.create_weather_data(weather_data)
+        if created:
+            await self.cache.invalidate(CURRENT_WEATHER, current_weather_keys([created.get("region_name")]))
+        return created
+
+    async def create_weather_forecast(self, forecast_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Enregistre une prévision puis invalide les prévisions de sa région"""
+        created = await self.repository.create_weather_forecast(forecast_data)
+        if created:
+            await self.cache.invalidate(FORECASTS, forecast_keys([forecast_data.get("region_name")]))
+        return created
+
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        """Insère un lot de mesures puis invalide la météo actuelle des régions concernées"""
+        inserted = await self.repository.bulk_create_weather_data(weather_records)
+        if inserted:
+            await self.cache.invalidate(
+                CURRENT_WEATHER, current_weather_keys(record.get("region_name") for record in weather_records)
+            )
+        return inserted
+
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """Écrit un lot de prévisions puis invalide les prévisions des régions concernées"""
+        written = await self.repository.upsert_forecasts(forecast_records, batch_size)
+        if written:
+            await self.cache.invalidate(
+                FORECASTS, forecast_keys(record.get("region_name") for record in forecast_records)
+            )
+        return written
@@ -0,0 +1,97 @@
+from backend.repositories.interfaces import IRegionRepository
+from backend.simulation.dataset import SimulatedDataset
+from backend.simulation.latency import LatencyModel, SimulatedDatabaseError
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SimulatedRegionRepository(IRegionRepository):
+    """
+    Implémentation simulée du repository des régions.
+    Sert un jeu de données généré (des milliers de régions) avec la latence et
+    le taux d'erreur configurés, pour tester la charge sans base de données.
+    Les erreurs injectées sont traitées comme les erreurs du pilote par le
+    repository PostgreSQL : lectures vides et journalisées, écritures relancées.
+    """
+
+    def __init__(self, dataset: SimulatedDataset, latency: LatencyModel):
+        self.dataset = dataset
+        self.latency = latency
+
+    async def get_region_info_by_id(self, region_id: int) -> Dict[str, Any]:
+        """Récupère une région par son ID (version simulée)"""
+        try:
+            await self.latency("get_region_info_by_id")
+            return self.dataset.snapshot().get_by_id(region_id)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la récupération de la région {region_id}: {str(e)}")
+            return {}
+
+    async def get_all_regions(self) -> List[Dict[str, Any]]:
+        """Récupère toutes les régions (version simulée)"""
+        try:
+            await self.latency("get_all_regions")
+            return self.dataset.snapshot().all()
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la récupération de toutes les régions: {str(e)}")
+            return []
+
+    async def get_region_by_name(self, region_name: str) -> Dict[str, Any]:
+        """Récupère une région par son nom (version simulée)"""
+        try:
+            await self.latency("get_region_by_name")
+            return self.dataset.snapshot().get_by_name(region_name)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la récupération de la région {region_name}: {str(e)}")
+            return {}
+
+    async def create_region(self, region_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Crée une nouvelle région (version simulée)"""
+        try:
+            await self.latency("create_region")
+            return self.dataset.create_region(region_data)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la création de la région: {str(e)}")
+            return {}
+
+    async def update_region(self, region_id: int, region_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Met à jour une région existante (version simulée)"""
+        try:
+            await self.latency("update_region")
+            return self.dataset.update_region(region_id, region_data)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la mise à jour de la région {region_id}: {str(e)}")
+            return {}
+
+    async def delete_region(self, region_id: int) -> bool:
+        """Supprime une région (version simulée)"""
+        try:
+            await self.latency("delete_region")
+            return self.dataset.delete_region(region_id)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la suppression de la région {region_id}: {str(e)}")
+            return False
+
+    async def search_regions(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Recherche les régions par début de mot du nom (version simulée)"""
+        try:
+            await self.latency("search_regions")
+            return self.dataset.snapshot().find_by_prefix(query, limit)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la recherche des régions {query}: {str(e)}")
+            return []
+
+    async def find_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> List[Dict[str, Any]]:
+        """Recherche les régions les plus proches d'un point (version simulée)"""
+        try:
+            await self.latency("find_nearest_regions")
+            return self.dataset.snapshot().nearest(latitude, longitude, k)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la recherche des régions proches de ({latitude}, {longitude}): {str(e)}")
+            return []
+
+    async def get_regions_watermark(self) -> Dict[str, Any]:
+        """Empreinte du jeu de régions (version simulée) ; les erreurs sont relancées comme en PostgreSQL"""
+        await self.latency("get_regions_watermark")
+        return self.dataset.watermark()
@@ -0,0 +1,108 @@
+from backend.repositories.interfaces import (
+    IWeatherRepository, WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS
+)
+from backend.serialization.tabular import RowSet
+from backend.simulation.dataset import SimulatedDataset
+from backend.simulation.latency import LatencyModel, SimulatedDatabaseError
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import date, datetime, timedelta, timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SimulatedWeatherRepository(IWeatherRepository):
+    """
+    Implémentation simulée du repository météorologique.
+    Sert les mesures et prévisions générées du jeu de données, avec la latence
+    et le taux d'erreur configurés. Comme le repository PostgreSQL, les lectures
+    en erreur relancent (le disjoncteur sert alors la dernière valeur connue),
+    les écritures unitaires retournent un résultat vide et les écritures groupées relancent.
+    """
+
+    def __init__(self, dataset: SimulatedDataset, latency: LatencyModel):
+        self.dataset = dataset
+        self.latency = latency
+
+    async def get_weather_by_region(self, region_name: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Récupère la dernière mesure d'une région (version simulée, ligne complète quelles que soient les colonnes)"""
+        try:
+            await self.latency("get_weather_by_region")
+            return self.dataset.latest_reading(region_name)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la récupération des données météo pour {region_name}: {str(e)}")
+            raise
+
+    async def get_weather_forecast(self, region_name: str, days: int) -> List[Dict[str, Any]]:
+        """Récupère les prévisions d'une région à partir d'aujourd'hui (version simulée)"""
+        try:
+            await self.latency("get_weather_forecast")
+            return self.dataset.forecasts(region_name, date.today(), days)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la récupération des prévisions pour {region_name}: {str(e)}")
+            raise
+
+    async def create_weather_data(self, weather_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Enregistre une mesure (version simulée)"""
+        try:
+            await self.latency("create_weather_data")
+            self.dataset.add_readings([weather_data])
+            return self.dataset.latest_reading(weather_data.get("region_name", ""))
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la création des données météo: {str(e)}")
+            return {}
+
+    async def create_weather_forecast(self, forecast_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Crée ou remplace la prévision d'une région pour une date (version simulée)"""
+        try:
+            await self.latency("create_weather_forecast")
+            return self.dataset.upsert_forecast(forecast_data)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la création de la prévision: {str(e)}")
+            return {}
+
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        """Insère un lot de mesures en un seul aller-retour simulé"""
+        if not weather_records:
+            return 0
+        await self.latency("bulk_create_weather_data")
+        return self.dataset.add_readings(weather_records)
+
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """Insère ou met à jour un lot de prévisions, un aller-retour simulé par paquet de `batch_size`"""
+        if not forecast_records:
+            return 0
+        for position in range(0, len(forecast_records), batch_size):
+            await self.latency("upsert_forecasts")
+        keys = set()
+        for record in forecast_records:
+            forecast = self.dataset.upsert_forecast(record)
+            keys.add((forecast["region_name"], forecast["forecast_date"]))
+        return len(keys)
+
+    async def get_weather_history(self, region_name: str, days: int = 7) -> List[Dict[str, Any]]:
+        """Récupère l'historique des mesures d'une région (version simulée)"""
+        try:
+            await self.latency("get_weather_history")
+            return self.dataset.readings_since(region_name, datetime.now(timezone.utc) - timedelta(days=days))
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la récupération de l'historique météo pour {region_name}: {str(e)}")
+            raise
+
+    async def get_weather_history_rows(self, region_name: str, days: int = 7) -> RowSet:
+        """Récupère l'historique en lignes, lues directement dans les colonnes du jeu simulé"""
+        try:
+            await self.latency("get_weather_history")
+            rows = self.dataset.reading_rows_since(region_name, datetime.now(timezone.utc) - timedelta(days=days))
+            return RowSet(WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS, rows)
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la récupération de l'historique météo pour {region_name}: {str(e)}")
+            raise
+
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        """Récupère la dernière mesure de chaque région avec ses coordonnées (version simulée)"""
+        try:
+            await self.latency("get_latest_weather_by_region")
+            return self.dataset.latest_readings()
+        except SimulatedDatabaseError as e:
+            logger.error(f"Erreur lors de la récupération des dernières mesures: {str(e)}")
+            raise
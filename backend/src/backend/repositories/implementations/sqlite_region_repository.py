@@ -0,0 +1,44 @@
+from backend.repositories.implementations.postgresql_region_repository import PostgreSQLRegionRepository
+from backend.database.models import Region
+from sqlalchemy import select, func
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SQLiteRegionRepository(PostgreSQLRegionRepository):
+    """
+    Implémentation SQLite du repository des régions.
+    Les requêtes SQLAlchemy portables sont héritées du repository PostgreSQL ;
+    seules les requêtes propres au dialecte sont redéfinies.
+    """
+
+    async def find_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> List[Dict[str, Any]]:
+        """
+        Recherche les régions les plus proches d'un point avec la fonction SQL `haversine_km`
+        enregistrée sur chaque connexion (voir `database/sqlite.py`).
+        Chemin de secours en balayage complet : en fonctionnement normal, le KD-tree du catalogue répond.
+
+        Args:
+            latitude: Latitude du point (degrés)
+            longitude: Longitude du point (degrés)
+            k: Nombre de régions
+
+        Returns:
+            Liste des régions complétées par `distance_km`, de la plus proche à la plus lointaine
+        """
+        try:
+            distance = func.haversine_km(latitude, longitude, Region.latitude, Region.longitude)
+            stmt = (select(Region, distance.label("distance_km"))
+                   .where(Region.latitude.is_not(None), Region.longitude.is_not(None))
+                   .order_by(distance)
+                   .limit(k))
+            result = await self.session.execute(stmt)
+            return [
+                {**region.to_dict(), "distance_km": round(float(distance_km), 3)}
+                for region, distance_km in result.all()
+            ]
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la recherche des régions proches de ({latitude}, {longitude}): {str(e)}")
+            return []
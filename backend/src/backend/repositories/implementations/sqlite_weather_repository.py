@@ -0,0 +1,113 @@
+from backend.repositories.implementations.postgresql_weather_repository import (
+    FORECAST_VALUE_COLUMNS, PostgreSQLWeatherRepository
+)
+from backend.database.models import Region, WeatherData, WeatherForecast
+from sqlalchemy import select, desc, func, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import aliased
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SQLiteWeatherRepository(PostgreSQLWeatherRepository):
+    """
+    Implémentation SQLite du repository météorologique.
+    Les requêtes SQLAlchemy portables sont héritées du repository PostgreSQL ;
+    seules les requêtes propres au dialecte sont redéfinies.
+    """
+
+    @staticmethod
+    def _forecast_upsert_statement():
+        """INSERT … ON CONFLICT (region_name, forecast_date) DO UPDATE, la cible étant l'index unique"""
+        stmt = sqlite_insert(WeatherForecast)
+        updated_columns = {
+            column: stmt.excluded[column]
+            for column in FORECAST_VALUE_COLUMNS
+        }
+        updated_columns["created_at"] = func.now()
+        return stmt.on_conflict_do_update(index_elements=["region_name", "forecast_date"], set_=updated_columns)
+
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        """
+        Insère un lot de mesures en une seule transaction (executemany) : SQLite n'a pas
+        unnest, et n'a pas non plus les déclencheurs de notification de PostgreSQL
+
+        Args:
+            weather_records: Liste de dictionnaires de mesures
+
+        Returns:
+            Nombre de lignes insérées
+        """
+        if not weather_records:
+            return 0
+        rows = []
+        for record in weather_records:
+            row = {
+                "region_name": record.get("region_name"),
+                "temperature": record.get("temperature"),
+                "condition": record.get("condition"),
+                "humidity": record.get("humidity"),
+                "pressure": record.get("pressure"),
+                "wind_speed": record.get("wind_speed"),
+                "wind_direction": record.get("wind_direction"),
+                "is_forecast": record.get("is_forecast", False),
+                "forecast_day": record.get("forecast_day", 0)
+            }
+            if record.get("recorded_at"):
+                row["recorded_at"] = self._parse_datetime(record["recorded_at"])
+            rows.append(row)
+
+        try:
+            # Les lignes avec et sans recorded_at n'ont pas les mêmes colonnes : deux insertions groupées
+            for group in ([row for row in rows if "recorded_at" in row], [row for row in rows if "recorded_at" not in row]):
+                if group:
+                    await self.session.execute(insert(WeatherData), group)
+            await self.session.commit()
+            logger.info(f"{len(rows)} mesures insérées en lot")
+            return len(rows)
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Erreur lors de l'insertion d'un lot de {len(rows)} mesures: {str(e)}")
+            raise
+
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        """
+        Récupère la dernière mesure de chaque région, jointe aux coordonnées de la région.
+        SQLite n'a pas DISTINCT ON : row_number() par région, servi par l'index partiel
+        (region_name, recorded_at DESC).
+
+        Returns:
+            Liste des dernières mesures, avec `latitude` et `longitude`
+        """
+        try:
+            ranked = (select(
+                        WeatherData,
+                        func.row_number().over(
+                            partition_by=WeatherData.region_name,
+                            order_by=desc(WeatherData.recorded_at)
+                        ).label("position"))
+                     .where(WeatherData.is_forecast == False)
+                     .subquery())
+            latest_weather = aliased(WeatherData, ranked)
+            stmt = (select(latest_weather, Region.latitude, Region.longitude)
+                   .join(Region, Region.name == latest_weather.region_name)
+                   .where(ranked.c.position == 1)
+                   .order_by(latest_weather.region_name))
+
+            result = await self.session.execute(stmt)
+            latest = [
+                {
+                    **weather.to_dict(),
+                    "latitude": latitude,
+                    "longitude": longitude
+                }
+                for weather, latitude, longitude in result.all()
+            ]
+            logger.info(f"Dernières mesures récupérées pour {len(latest)} régions")
+            return latest
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des dernières mesures: {str(e)}")
+            raise
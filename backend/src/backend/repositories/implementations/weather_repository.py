@@ -1,5 +1,7 @@
-from backend.repositories.interfaces import IWeatherRepository
-from typing import Any, Dict, List
+from backend.repositories.interfaces import IWeatherRepository, weather_history_rows
+from backend.serialization.tabular import RowSet
+from backend.simulation.fixtures import get_mock_fixtures
+from typing import Any, Dict, List, Optional, Sequence
 from datetime import datetime, date, timedelta
 import logging
 
@@ -8,10 +10,32 @@ logger = logging.getLogger(__name__)
 class WeatherRepository(IWeatherRepository):
     """
     Implémentation mock du repository météorologique.
-    Utilise des données fictives pour les tests et le développement.
+    Utilise des données fictives pour les tests et le développement, ou les mesures et
+    prévisions des fixtures de MOCK_FIXTURES_DIR si elle est définie.
     """
     
     def __init__(self):
+        # Historique par région (fixtures), de la mesure la plus récente à la plus ancienne
+        self._history: Dict[str, List[Dict[str, Any]]] = {}
+        
+        fixtures = get_mock_fixtures()
+        if fixtures is not None:
+            self._coordinates = fixtures.coordinates
+            self._forecasts = dict(fixtures.forecasts)
+            self._weather_data = dict(fixtures.latest)
+            self._history = fixtures.history
+            return
+        
+        # Coordonnées des régions mock (équivalent de la jointure avec la table regions)
+        self._coordinates = {
+            "Paris": {"latitude": 48.856614, "longitude": 2.352222},
+            "Lyon": {"latitude": 45.764043, "longitude": 4.835659},
+            "Marseille": {"latitude": 43.296482, "longitude": 5.369780}
+        }
+        
+        # Prévisions reçues, indexées par (region_name, forecast_date) comme la contrainte unique en base
+        self._forecasts: Dict[tuple, Dict[str, Any]] = {}
+        
         # Données météo fictives pour le développement/test
         self._weather_data = {
             "Paris": {
@@ -46,14 +70,13 @@ class WeatherRepository(IWeatherRepository):
             }
         }
 
-    async def get_weather_by_region(self, region_name: str) -> Dict[str, Any]:
-        """Récupère les données météo pour une région (version mock)"""
+    async def get_weather_by_region(self, region_name: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Récupère les données météo pour une région (version mock, ligne complète quelles que soient les colonnes)"""
         logger.info(f"Mock: Récupération des données météo pour {region_name}")
         
-        # Recherche case-insensitive
-        for key, weather in self._weather_data.items():
-            if key.lower() in region_name.lower() or region_name.lower() in key.lower():
-                return weather
+        key = self._matching_region(region_name)
+        if key is not None:
+            return self._weather_data[key]
         
         # Données par défaut si la région n'est pas trouvée
         return {
@@ -67,10 +90,28 @@ class WeatherRepository(IWeatherRepository):
             "recorded_at": datetime.now().isoformat()
         }
 
+    def _matching_region(self, region_name: str) -> Optional[str]:
+        # Nom exact, sinon recherche case-insensitive
+        if region_name in self._weather_data:
+            return region_name
+        for key in self._weather_data:
+            if key.lower() in region_name.lower() or region_name.lower() in key.lower():
+                return key
+        return None
+    
     async def get_weather_forecast(self, region_name: str, days: int) -> List[Dict[str, Any]]:
         """Récupère les prévisions météo pour une région (version mock)"""
         logger.info(f"Mock: Récupération des prévisions pour {region_name} sur {days} jours")
         
+        # Prévisions des fixtures ou reçues par upsert
+        key = self._matching_region(region_name)
+        stored = sorted(
+            (forecast for (name, _), forecast in self._forecasts.items() if name == key),
+            key=lambda forecast: forecast["forecast_date"]
+        )
+        if stored:
+            return stored[:days]
+        
         forecasts = []
         base_temp = 22.0
         conditions = ["Sunny", "Partly Cloudy", "Cloudy", "Rainy", "Stormy"]
@@ -116,10 +157,38 @@ class WeatherRepository(IWeatherRepository):
         
         return created_forecast
     
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        """Insère un lot de mesures (version mock : la dernière mesure remplace la précédente)"""
+        logger.info(f"Mock: Insertion d'un lot de {len(weather_records)} mesures")
+        
+        for record in weather_records:
+            created_data = record.copy()
+            created_data.setdefault("recorded_at", datetime.now().isoformat())
+            self._weather_data[record.get("region_name")] = created_data
+        
+        return len(weather_records)
+    
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """Insère ou met à jour un lot de prévisions (version mock : une entrée par région et par jour)"""
+        logger.info(f"Mock: Upsert d'un lot de {len(forecast_records)} prévisions")
+        
+        for record in forecast_records:
+            stored_forecast = record.copy()
+            stored_forecast["created_at"] = datetime.now().isoformat()
+            self._forecasts[(record.get("region_name"), record.get("forecast_date"))] = stored_forecast
+        
+        return len({(record.get("region_name"), record.get("forecast_date")) for record in forecast_records})
+    
     async def get_weather_history(self, region_name: str, days: int = 7) -> List[Dict[str, Any]]:
         """Récupère l'historique météo pour une région (version mock)"""
         logger.info(f"Mock: Récupération de l'historique météo pour {region_name} sur {days} jours")
         
+        fixture_history = self._history.get(self._matching_region(region_name))
+        if fixture_history:
+            # Période comptée depuis la mesure la plus récente : les fixtures ne vieillissent pas
+            start = (datetime.fromisoformat(fixture_history[0]["recorded_at"]) - timedelta(days=days)).isoformat()
+            return [reading for reading in fixture_history if reading["recorded_at"] >= start]
+        
         history = []
         base_temp = 20.0
         
@@ -138,3 +207,16 @@ class WeatherRepository(IWeatherRepository):
             })
         
         return history
+    
+    async def get_weather_history_rows(self, region_name: str, days: int = 7) -> RowSet:
+        """Récupère l'historique météo en lignes (version mock)"""
+        return weather_history_rows(await self.get_weather_history(region_name, days))
+    
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        """Récupère la dernière mesure de chaque région avec ses coordonnées (version mock)"""
+        logger.info(f"Mock: Récupération des dernières mesures ({len(self._weather_data)} régions)")
+        
+        return [
+            {**weather, **self._coordinates.get(region_name, {})}
+            for region_name, weather in self._weather_data.items()
+        ]
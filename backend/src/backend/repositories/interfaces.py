@@ -1,5 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence
+
+from backend.serialization.tabular import RowSet
+
+# Colonnes de l'historique en lignes (`get_weather_history_rows`), noms de la réponse de l'API
+WEATHER_HISTORY_ROW_COLUMNS = (
+    "region", "temperature", "condition", "humidity", "pressure", "wind_speed", "wind_direction", "recorded_at"
+)
+WEATHER_HISTORY_ROW_KINDS = "sfsiffst"
+
+# Clé (valeur True) des valeurs de repli inventées par un repository quand la base n'a aucune ligne :
+# les réponses qui ne doivent présenter que des données réelles les écartent
+PLACEHOLDER = "placeholder"
+
+
+def weather_history_rows(readings: List[Dict[str, Any]]) -> RowSet:
+    """Historique en lignes à partir de mesures déjà sous forme de dictionnaires (mock, mesures écrites)"""
+    return RowSet(WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS, [
+        (reading.get("region_name"), reading.get("temperature"), reading.get("condition"), reading.get("humidity"),
+         reading.get("pressure"), reading.get("wind_speed"), reading.get("wind_direction"), reading.get("recorded_at"))
+        for reading in readings
+    ])
 
 class IRegionRepository(ABC):
     @abstractmethod
@@ -27,9 +48,25 @@ class IRegionRepository(ABC):
     async def delete_region(self, region_id: int) -> bool:
         pass
 
+    @abstractmethod
+    async def search_regions(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Autocomplétion : régions dont un mot du nom commence par `query`, par population décroissante"""
+        pass
+
+    @abstractmethod
+    async def find_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> List[Dict[str, Any]]:
+        """Les `k` régions les plus proches d'un point, complétées par `distance_km`"""
+        pass
+
+    @abstractmethod
+    async def get_regions_watermark(self) -> Dict[str, Any]:
+        """Empreinte peu coûteuse de la table (nombre de lignes, max(updated_at))"""
+        pass
+
 class IWeatherRepository(ABC):
     @abstractmethod
-    async def get_weather_by_region(self, region_name: str) -> Dict[str, Any]:
+    async def get_weather_by_region(self, region_name: str, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Dernière mesure d'une région ; `columns` limite la lecture aux colonnes utiles (indicatif, None : toutes)"""
         pass
 
     @abstractmethod
@@ -45,6 +82,32 @@ class IWeatherRepository(ABC):
     async def create_weather_forecast(self, forecast_data: Dict[str, Any]) -> Dict[str, Any]:
         pass
     
+    @abstractmethod
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        """Insère un lot de mesures en une transaction ; retourne le nombre de lignes écrites"""
+        pass
+    
+    @abstractmethod
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """
+        Insère ou met à jour un lot de prévisions, idempotent sur (region_name, forecast_date) ;
+        retourne le nombre de prévisions distinctes écrites
+        """
+        pass
+    
     @abstractmethod
     async def get_weather_history(self, region_name: str, days: int = 7) -> List[Dict[str, Any]]:
         pass
+
+    @abstractmethod
+    async def get_weather_history_rows(self, region_name: str, days: int = 7) -> RowSet:
+        """
+        Historique en lignes (WEATHER_HISTORY_ROW_COLUMNS), de la plus récente à la plus ancienne,
+        pour les réponses tabulaires : une tuple par mesure, sans dictionnaire intermédiaire
+        """
+        pass
+
+    @abstractmethod
+    async def get_latest_weather_by_region(self) -> List[Dict[str, Any]]:
+        """Dernière mesure (hors prévision) de chaque région, complétée par sa `latitude`/`longitude`"""
+        pass
@@ -0,0 +1,253 @@
+"""
+Contrôle d'admission : nombre borné de requêtes traitées en même temps.
+
+Au-delà de `max_in_flight`, les requêtes attendent dans une file (au plus `queue_timeout`
+secondes, `max_queue` places) puis reçoivent un 503 avec `Retry-After`. Les places sont
+rendues par ordre de priorité de route :
+
+- CRITICAL (`/health`, `/`) : jamais limitées ni mises en file ;
+- HIGH (lectures servies par le catalogue en mémoire) : peuvent utiliser `reserved_slots`
+  places qui restent interdites aux autres requêtes ;
+- NORMAL, puis LOW (lots et endpoints de diagnostic) ;
+- STREAM (flux SSE) : limités par client, mais ne gardent pas de place pendant toute la durée
+  du flux (le hub borne lui-même le nombre d'abonnés).
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import re
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+from starlette.responses import JSONResponse
+
+from backend.resilience.rate_limit import RateLimiter
+
+CRITICAL = 0
+HIGH = 1
+NORMAL = 2
+LOW = 3
+STREAM = 4
+PRIORITY_NAMES = {CRITICAL: "critical", HIGH: "high", NORMAL: "normal", LOW: "low", STREAM: "stream"}
+
+# (méthode ou None pour toutes, motif du chemin, priorité) ; première règle correspondante
+DEFAULT_ROUTE_PRIORITIES: List[Tuple[Optional[str], str, int]] = [
+    (None, r"/health", CRITICAL),
+    (None, r"/", CRITICAL),
+    ("GET", r"/api/v1/weather/[^/]+/stream", STREAM),
+    ("GET", r"/api/v1/regions(/search|/nearest)?", HIGH),
+    ("GET", r"/api/v1/region/\d+", HIGH),
+    ("GET", r"/api/v1/(ingestion|admission)/metrics", HIGH),
+    (None, r"/api/v1/weather/at/batch", LOW),
+    (None, r"/api/v1/test/.*", LOW),
+]
+
+
+class AdmissionRejected(Exception):
+    """Requête refusée : file pleine ou attente plus longue que `queue_timeout`"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Sémaphore à priorités partagé par les requêtes du processus.
+    Une place libérée est donnée à la requête en attente la plus prioritaire (puis la plus ancienne).
+    """
+
+    def __init__(self, max_in_flight: int = 32, reserved_slots: int = 4, queue_timeout: float = 1.0,
+                 max_queue: int = 256):
+        """
+        Args:
+            max_in_flight: Requêtes traitées simultanément au maximum
+            reserved_slots: Places réservées aux requêtes HIGH
+            queue_timeout: Attente maximale dans la file, en secondes
+            max_queue: Requêtes en attente au maximum
+        """
+        self.max_in_flight = max_in_flight
+        self.reserved_slots = min(reserved_slots, max_in_flight - 1)
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.queued = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.peak_queued = 0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """
+        Construit le contrôleur à partir de ADMISSION_MAX_IN_FLIGHT, ADMISSION_RESERVED_SLOTS,
+        ADMISSION_QUEUE_TIMEOUT_SECONDS et ADMISSION_MAX_QUEUE.
+        """
+        return cls(
+            max_in_flight=int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "32")),
+            reserved_slots=int(os.getenv("ADMISSION_RESERVED_SLOTS", "4")),
+            queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "1.0")),
+            max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "256"))
+        )
+
+    def _limit(self, priority: int) -> int:
+        if priority <= HIGH:
+            return self.max_in_flight
+        return self.max_in_flight - self.reserved_slots
+
+    def _can_enter(self, priority: int) -> bool:
+        if self.in_flight >= self._limit(priority):
+            return False
+        # Pas de dépassement d'une requête en attente au moins aussi prioritaire
+        return not self._waiters or self._waiters[0][0] > priority
+
+    async def acquire(self, priority: int):
+        """
+        Attend une place de traitement (immédiate pour CRITICAL).
+
+        Raises:
+            AdmissionRejected: File pleine ou attente dépassée
+        """
+        if priority == CRITICAL:
+            self.admitted += 1
+            return
+        if self._can_enter(priority):
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if self.queued >= self.max_queue:
+            self.rejected[PRIORITY_NAMES[priority]] += 1
+            raise AdmissionRejected("File d'attente pleine", self.queue_timeout)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+        except asyncio.TimeoutError:
+            if not future.done() or future.cancelled():
+                self.rejected[PRIORITY_NAMES[priority]] += 1
+                raise AdmissionRejected(
+                    f"Serveur saturé : aucune place libérée en {self.queue_timeout:.1f} s", self.queue_timeout
+                ) from None
+            # Place accordée au moment même où le délai expirait : elle est conservée
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(priority)
+            raise
+        finally:
+            self.queued -= 1
+        self.admitted += 1
+
+    def release(self, priority: int):
+        """Rend la place d'une requête terminée et la donne aux requêtes en attente"""
+        if priority == CRITICAL:
+            return
+        self.in_flight -= 1
+        while self._waiters:
+            waiter_priority, _, future = self._waiters[0]
+            if future.done():
+                # Attente expirée ou annulée
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_flight >= self._limit(waiter_priority):
+                break
+            heapq.heappop(self._waiters)
+            self.in_flight += 1
+            future.set_result(None)
+
+    def metrics(self) -> Dict[str, object]:
+        """Occupation et compteurs du contrôleur"""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected)
+        }
+
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI : limite de débit par client (429), puis contrôle d'admission (503).
+    Les routes CRITICAL ne passent par aucune des deux, les routes STREAM seulement par la première.
+    """
+
+    def __init__(self, app, controller: AdmissionController, rate_limiter: Optional[RateLimiter] = None,
+                 route_priorities: Sequence[Tuple[Optional[str], str, int]] = DEFAULT_ROUTE_PRIORITIES,
+                 client_header: Optional[str] = None):
+        """
+        Args:
+            app: Application ASGI protégée
+            controller: Contrôleur d'admission partagé
+            rate_limiter: Limiteur de débit par client, optionnel
+            route_priorities: Règles (méthode, motif, priorité), NORMAL si aucune ne correspond
+            client_header: En-tête identifiant le client (ex. x-forwarded-for derrière un proxy) ;
+                sinon l'adresse IP de la connexion
+        """
+        self.app = app
+        self.controller = controller
+        self.rate_limiter = rate_limiter
+        self.route_priorities: List[Tuple[Optional[str], Pattern, int]] = [
+            (method, re.compile(pattern), priority) for method, pattern, priority in route_priorities
+        ]
+        self.client_header = client_header.lower().encode("latin-1") if client_header else None
+
+    def priority(self, method: str, path: str) -> int:
+        """Priorité de la route (première règle correspondante)"""
+        for rule_method, pattern, priority in self.route_priorities:
+            if (rule_method is None or rule_method == method) and pattern.fullmatch(path):
+                return priority
+        return NORMAL
+
+    def _client(self, scope) -> str:
+        if self.client_header is not None:
+            for name, value in scope["headers"]:
+                if name == self.client_header:
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        priority = self.priority(scope["method"], scope["path"])
+        if priority == CRITICAL:
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            wait = await self.rate_limiter.check(self._client(scope))
+            if wait > 0:
+                response = JSONResponse(
+                    status_code=429,
+                    content={"detail": "Trop de requêtes pour ce client"},
+                    headers={"Retry-After": str(math.ceil(wait))}
+                )
+                await response(scope, receive, send)
+                return
+
+        if priority == STREAM:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.acquire(priority)
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": str(e)},
+                headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(priority)
@@ -0,0 +1,206 @@
+"""
+Disjoncteur (circuit breaker) autour des appels à la base de données.
+
+Quand PostgreSQL ralentit ou tombe, chaque requête attendrait le délai complet
+de sa requête SQL : la boucle d'événements accumule des milliers d'attentes.
+Le disjoncteur borne cette latence :
+
+- fermé : les appels passent, chacun borné par `call_timeout` ; les derniers
+  `window_size` résultats sont conservés (erreur, délai dépassé ou appel plus lent
+  que `slow_call_seconds` comptent comme des échecs) ;
+- ouvert : dès que la part d'échecs atteint `failure_rate` (sur au moins `min_calls`
+  appels), les appels échouent immédiatement (`CircuitOpenError`) pendant `open_seconds` ;
+- semi-ouvert : ensuite, `half_open_probes` appels de sonde passent ; s'ils
+  réussissent le circuit se referme, sinon il se rouvre pour `open_seconds`.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Appel refusé sans attendre : le circuit est ouvert"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit {name} ouvert, nouvel essai dans {retry_after:.1f} s")
+        self.retry_after = retry_after
+
+
+class DatabaseUnavailableError(Exception):
+    """La base ne répond pas et aucune valeur connue ne peut être servie à la place"""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à fenêtre glissante, partagé par toutes les requêtes du processus.
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, window_size: int = 20, min_calls: int = 5,
+                 slow_call_seconds: float = 1.0, call_timeout: float = 3.0, open_seconds: float = 10.0,
+                 half_open_probes: int = 1, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            name: Nom affiché dans les journaux
+            failure_rate: Part d'échecs de la fenêtre qui ouvre le circuit
+            window_size: Nombre de derniers appels pris en compte
+            min_calls: Nombre minimal d'appels dans la fenêtre avant de pouvoir ouvrir
+            slow_call_seconds: Durée au-delà de laquelle un appel réussi compte comme un échec
+            call_timeout: Durée maximale d'un appel (None : pas de limite)
+            open_seconds: Durée pendant laquelle le circuit reste ouvert
+            half_open_probes: Appels de sonde autorisés en semi-ouvert
+            clock: Horloge monotone (remplaçable pour les mesures)
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.call_timeout = call_timeout
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.transitions = 0
+
+    @classmethod
+    def from_env(cls, name: str) -> "CircuitBreaker":
+        """
+        Construit le disjoncteur à partir de CIRCUIT_FAILURE_RATE, CIRCUIT_WINDOW_SIZE,
+        CIRCUIT_MIN_CALLS, CIRCUIT_SLOW_CALL_SECONDS, CIRCUIT_CALL_TIMEOUT_SECONDS,
+        CIRCUIT_OPEN_SECONDS et CIRCUIT_HALF_OPEN_PROBES.
+        """
+        return cls(
+            name,
+            failure_rate=float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5")),
+            window_size=int(os.getenv("CIRCUIT_WINDOW_SIZE", "20")),
+            min_calls=int(os.getenv("CIRCUIT_MIN_CALLS", "5")),
+            slow_call_seconds=float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "1.0")),
+            call_timeout=float(os.getenv("CIRCUIT_CALL_TIMEOUT_SECONDS", "3.0")),
+            open_seconds=float(os.getenv("CIRCUIT_OPEN_SECONDS", "10")),
+            half_open_probes=int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "1"))
+        )
+
+    @property
+    def state(self) -> str:
+        """État courant ; un circuit ouvert passe en semi-ouvert une fois `open_seconds` écoulé"""
+        if self._state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def retry_after(self) -> float:
+        """Secondes avant le prochain appel de sonde (0 si le circuit laisse passer)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (self.clock() - self._opened_at))
+
+    def metrics(self) -> Dict[str, object]:
+        """État et compteurs du disjoncteur"""
+        failures = self._outcomes.count(False)
+        return {
+            "state": self.state,
+            "window_calls": len(self._outcomes),
+            "window_failures": failures,
+            "rejected": self.rejected,
+            "transitions": self.transitions,
+            "retry_after_seconds": round(self.retry_after(), 3)
+        }
+
+    async def call(self, function: Callable[[], Awaitable[T]], bounded: bool = True) -> T:
+        """
+        Exécute un appel sous la protection du disjoncteur.
+
+        Args:
+            function: Fabrique de la coroutine à exécuter (appelée seulement si le circuit laisse passer)
+            bounded: Applique `call_timeout` et `slow_call_seconds` (False pour les écritures en lot)
+
+        Returns:
+            Le résultat de l'appel
+
+        Raises:
+            CircuitOpenError: Circuit ouvert, ou semi-ouvert avec toutes les sondes déjà en cours
+            asyncio.TimeoutError: Appel plus long que `call_timeout`
+        """
+        state = self.state
+        probe = state == HALF_OPEN
+        if state == OPEN or (probe and self._probes_in_flight >= self.half_open_probes):
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after())
+
+        if probe:
+            self._probes_in_flight += 1
+        start = self.clock()
+        try:
+            if self.call_timeout is None or not bounded:
+                result = await function()
+            else:
+                async with asyncio.timeout(self.call_timeout):
+                    result = await function()
+        except asyncio.CancelledError:
+            # Requête abandonnée par le client : ni succès ni échec de la base
+            if probe:
+                self._probes_in_flight -= 1
+            raise
+        except Exception:
+            self._record(False, probe)
+            raise
+        self._record(not bounded or self.clock() - start <= self.slow_call_seconds, probe)
+        return result
+
+    def _record(self, success: bool, probe: bool):
+        if probe:
+            self._probes_in_flight -= 1
+            if self._state != HALF_OPEN:
+                return
+            if not success:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._outcomes.clear()
+                self._transition(CLOSED)
+            return
+
+        if self._state != CLOSED:
+            # Appel lancé avant l'ouverture : son résultat ne change plus l'état
+            return
+        self._outcomes.append(success)
+        if len(self._outcomes) >= self.min_calls:
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    def _open(self):
+        self._opened_at = self.clock()
+        self._transition(OPEN)
+
+    def _transition(self, state: str):
+        if state == self._state:
+            return
+        previous, self._state = self._state, state
+        self._probe_successes = 0
+        self.transitions += 1
+        if state == OPEN:
+            logger.warning(f"🔌 Circuit {self.name} ouvert ({previous} → {state}) pour {self.open_seconds:.0f} s")
+        else:
+            logger.info(f"🔌 Circuit {self.name}: {previous} → {state}")
+
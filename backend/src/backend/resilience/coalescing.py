@@ -0,0 +1,110 @@
+"""
+Regroupement des appels identiques concurrents (single-flight).
+
+Pendant une alerte météo, des milliers de clients demandent au même instant la météo de
+la même région : sans regroupement, chacun lance sa propre lecture. Ici, le premier appel
+d'une clé lance le travail dans une tâche ; les appels identiques qui arrivent pendant son
+exécution attendent cette même tâche, puis la clé est libérée. Rien n'est mis en cache :
+un appel arrivé après la fin du travail relance une lecture.
+
+Le travail partagé ne dépend d'aucun client : chaque appelant l'attend derrière
+`asyncio.shield`. Un client qui se déconnecte (requête annulée) n'annule que son
+attente, jamais le travail des autres.
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RequestCoalescer:
+    """
+    Exécutions en cours par clé. La clé commence par le nom de l'opération
+    (`("weather.current", "Paris")`) : les compteurs sont tenus par opération.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.executions: Counter = Counter()
+        self.joined: Counter = Counter()
+
+    @classmethod
+    def from_env(cls) -> Optional["RequestCoalescer"]:
+        """
+        Construit le regroupement si REQUEST_COALESCING vaut true (par défaut).
+
+        Returns:
+            RequestCoalescer, ou None s'il est désactivé
+        """
+        if os.getenv("REQUEST_COALESCING", "true").lower() != "true":
+            return None
+        return cls()
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Exécute `call`, ou rejoint l'exécution en cours pour la même clé.
+
+        Args:
+            key: Clé normalisée de l'appel (nom de l'opération puis arguments)
+            call: Fabrique du travail, appelée seulement si aucune exécution n'est en cours
+
+        Returns:
+            Le résultat de l'exécution (le même objet pour tous les appelants regroupés)
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            self.executions[key[0]] += 1
+        else:
+            self.joined[key[0]] += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Tous les appelants ont pu partir : l'erreur est lue ici pour ne pas être signalée comme perdue
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Appel regroupé {key!r} en échec: {task.exception()!r}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Exécutions et appels regroupés, par opération"""
+        operations = sorted(set(self.executions) | set(self.joined))
+        return {
+            "in_flight": len(self._in_flight),
+            "operations": {
+                operation: {
+                    "executions": self.executions[operation],
+                    "joined": self.joined[operation],
+                    "calls_per_execution": round(
+                        (self.executions[operation] + self.joined[operation]) / self.executions[operation], 2
+                    ) if self.executions[operation] else None
+                }
+                for operation in operations
+            }
+        }
+
+
+# Instance globale du regroupement (None : désactivé)
+_request_coalescer = None
+_request_coalescer_loaded = False
+
+def get_request_coalescer() -> Optional[RequestCoalescer]:
+    """
+    Retourne l'instance globale du regroupement des appels.
+
+    Returns:
+        RequestCoalescer partagé par tout le processus, ou None s'il est désactivé
+    """
+    global _request_coalescer, _request_coalescer_loaded
+    if not _request_coalescer_loaded:
+        _request_coalescer = RequestCoalescer.from_env()
+        _request_coalescer_loaded = True
+    return _request_coalescer
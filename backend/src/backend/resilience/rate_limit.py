@@ -0,0 +1,168 @@
+"""
+Limitation de débit par client (seau à jetons).
+
+Chaque client dispose d'un seau de `burst` jetons, rempli à `rate` jetons par seconde ;
+une requête consomme un jeton. L'état est conservé en mémoire du processus, ou dans un
+serveur Redis partagé par les workers (`RATE_LIMIT_STORE_URL`).
+"""
+
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from backend.resilience.resp_client import RespClient, RespError
+
+logger = logging.getLogger(__name__)
+
+# Seau à jetons atomique côté serveur ; l'horloge du serveur est commune à tous les workers
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RateLimitStore(ABC):
+    """Stockage des seaux à jetons"""
+
+    @abstractmethod
+    async def take(self, key: str, rate: float, burst: float) -> float:
+        """
+        Consomme un jeton du seau `key`.
+
+        Args:
+            key: Identifiant du client
+            rate: Jetons ajoutés par seconde
+            burst: Capacité du seau
+
+        Returns:
+            0 si la requête est acceptée, sinon le délai en secondes avant le prochain jeton
+        """
+        pass
+
+    async def close(self):
+        """Libère les ressources du stockage"""
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Seaux conservés dans le processus (LRU borné) : chaque worker a ses propres limites"""
+
+    def __init__(self, max_clients: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_clients: Nombre maximal de seaux conservés (les moins récents sont oubliés)
+            clock: Horloge monotone (remplaçable pour les mesures)
+        """
+        self.max_clients = max_clients
+        self.clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: float) -> float:
+        now = self.clock()
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class RespRateLimitStore(RateLimitStore):
+    """
+    Seaux partagés par tous les workers dans un serveur Redis (script Lua atomique).
+    Si le serveur ne répond pas, les requêtes sont acceptées : la limitation de débit
+    ne doit pas rendre l'API indisponible.
+    """
+
+    def __init__(self, client: RespClient, prefix: str = "ratelimit:"):
+        """
+        Args:
+            client: Client RESP vers le serveur partagé
+            prefix: Préfixe des clés des seaux
+        """
+        self.client = client
+        self.prefix = prefix
+        self._script_sha: Optional[str] = None
+
+    async def take(self, key: str, rate: float, burst: float) -> float:
+        try:
+            if self._script_sha is None:
+                self._script_sha = await self.client.execute("SCRIPT", "LOAD", TOKEN_BUCKET_SCRIPT)
+            try:
+                wait = await self.client.execute("EVALSHA", self._script_sha, 1, self.prefix + key, rate, burst)
+            except RespError as e:
+                if not str(e).startswith("NOSCRIPT"):
+                    raise
+                # Serveur redémarré : le script est rechargé au prochain appel
+                self._script_sha = None
+                wait = await self.client.execute("EVAL", TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, rate, burst)
+            return float(wait)
+        except Exception as e:
+            logger.warning(f"Limitation de débit: store partagé indisponible, requête acceptée: {e!r}")
+            return 0.0
+
+    async def close(self):
+        await self.client.close()
+
+
+class RateLimiter:
+    """Limite de débit identique pour tous les clients"""
+
+    def __init__(self, store: RateLimitStore, rate: float, burst: float):
+        """
+        Args:
+            store: Stockage des seaux
+            rate: Requêtes par seconde autorisées en régime établi, par client
+            burst: Requêtes autorisées d'affilée (capacité du seau)
+        """
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+        self.limited = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["RateLimiter"]:
+        """
+        Construit le limiteur à partir de RATE_LIMIT_PER_SECOND (0 : désactivé), RATE_LIMIT_BURST
+        et RATE_LIMIT_STORE_URL (redis://…, sinon état en mémoire du processus).
+        """
+        rate = float(os.getenv("RATE_LIMIT_PER_SECOND", "20"))
+        if rate <= 0:
+            return None
+        burst = float(os.getenv("RATE_LIMIT_BURST", "60"))
+        store_url = os.getenv("RATE_LIMIT_STORE_URL")
+        store = RespRateLimitStore(RespClient.from_url(store_url)) if store_url else InMemoryRateLimitStore()
+        return cls(store, rate, burst)
+
+    async def check(self, client: str) -> float:
+        """
+        Returns:
+            0 si la requête du client est acceptée, sinon le délai conseillé avant de réessayer
+        """
+        wait = await self.store.take(client, self.rate, self.burst)
+        if wait > 0:
+            self.limited += 1
+        return wait
@@ -0,0 +1,166 @@
+"""
+Client minimal du protocole Redis (RESP2) sur asyncio, sans dépendance externe.
+Suffisant pour les quelques commandes des stores partagés (EVAL / EVALSHA, GET, SET…) ;
+fonctionne avec Redis, Valkey, KeyDB ou Dragonfly.
+"""
+
+import asyncio
+from typing import Any, List, Optional, Sequence
+from urllib.parse import unquote, urlparse
+
+
+class RespError(Exception):
+    """Erreur renvoyée par le serveur (réponse `-ERR …`)"""
+
+
+class RespClient:
+    """
+    Une connexion TCP partagée ; les commandes sont sérialisées par un verrou et la
+    connexion est rouverte après une erreur réseau.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 0.5):
+        """
+        Args:
+            host: Hôte du serveur
+            port: Port du serveur
+            db: Numéro de base (SELECT)
+            password: Mot de passe (AUTH), optionnel
+            timeout: Délai maximal d'une commande, connexion comprise
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 0.5) -> "RespClient":
+        """
+        Args:
+            url: redis://[:mot_de_passe@]hôte[:port][/base]
+            timeout: Délai maximal d'une commande
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"URL non supportée (redis:// attendu): {url}")
+        db = parsed.path.lstrip("/")
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            timeout=timeout
+        )
+
+    async def execute(self, *args: Any) -> Any:
+        """
+        Envoie une commande et retourne sa réponse décodée.
+
+        Raises:
+            RespError: Réponse d'erreur du serveur
+            OSError, asyncio.TimeoutError: Serveur injoignable ou trop lent
+        """
+        async with self._lock:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    if self._writer is None:
+                        await self._connect()
+                    return await self._command(args)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.CancelledError):
+                # Réponse peut-être encore en transit : la connexion n'est plus synchronisée
+                await self._disconnect()
+                raise
+
+    async def execute_pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """
+        Envoie plusieurs commandes d'un bloc (un seul aller-retour) et retourne leurs réponses.
+
+        Raises:
+            RespError: Première réponse d'erreur, une fois toutes les réponses lues
+            OSError, asyncio.TimeoutError: Serveur injoignable ou trop lent
+        """
+        async with self._lock:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    if self._writer is None:
+                        await self._connect()
+                    self._writer.write(b"".join(_encode(command) for command in commands))
+                    await self._writer.drain()
+                    replies = []
+                    for _ in commands:
+                        try:
+                            replies.append(await self._read_reply())
+                        except RespError as e:
+                            replies.append(e)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.CancelledError):
+                await self._disconnect()
+                raise
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def close(self):
+        """Ferme la connexion"""
+        async with self._lock:
+            await self._disconnect()
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._command(("AUTH", self.password))
+        if self.db:
+            await self._command(("SELECT", self.db))
+
+    async def _disconnect(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _command(self, args) -> Any:
+        self._writer.write(_encode(args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readuntil(b"\r\n")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RespError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RespError(f"Réponse RESP inattendue: {line!r}")
+
+
+def _encode(args) -> bytes:
+    parts: List[bytes] = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode()
+        else:
+            data = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
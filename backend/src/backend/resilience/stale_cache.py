@@ -0,0 +1,58 @@
+"""
+Dernières valeurs connues des lectures, servies (marquées périmées) quand la base
+ne répond pas ou que le disjoncteur est ouvert.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Hashable, Optional, Tuple
+
+
+class StaleCache:
+    """
+    Cache LRU borné des derniers résultats de lecture réussis.
+    Il n'est jamais lu tant que la base répond : ce n'est pas un cache de performance.
+    """
+
+    def __init__(self, max_entries: int = 50_000):
+        """
+        Args:
+            max_entries: Nombre maximal de résultats conservés (éviction LRU)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.served = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, key: Hashable, value: Any):
+        """Mémorise le dernier résultat d'une lecture"""
+        self._entries[key] = (value, time.time())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """
+        Retourne le dernier résultat connu, marqué périmé (`stale`, `stale_since`).
+
+        Returns:
+            Copie marquée du résultat (dict ou liste de dicts), ou None s'il n'y en a pas
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        self.served += 1
+        stale_since = datetime.fromtimestamp(stored_at, timezone.utc).isoformat()
+        if isinstance(value, list):
+            return [_mark_stale(item, stale_since) for item in value]
+        return _mark_stale(value, stale_since)
+
+
+def _mark_stale(value: Any, stale_since: str) -> Any:
+    if isinstance(value, dict):
+        return {**value, "stale": True, "stale_since": stale_since}
+    return value
@@ -0,0 +1,183 @@
+"""
+Formats binaires des réponses tabulaires (liste des régions, historique météo).
+
+Les consommateurs internes chargent ces réponses dans des dataframes. Elles sont produites
+directement depuis les lignes du stockage (`RowSet` : une tuple par ligne), colonne par
+colonne, sans dictionnaire par ligne :
+
+- MessagePack (`application/x-msgpack`) : une table {colonne: [valeurs]}, horodatages en
+  extension Timestamp ; `pandas.DataFrame(msgpack.unpackb(body, timestamp=3))`.
+- Apache Arrow, flux IPC (`application/vnd.apache.arrow.stream`) : un lot typé (int64,
+  float64, bool, utf8, timestamp[us, UTC]) ; `pyarrow.ipc.open_stream(body).read_all()`
+  relit les colonnes sans copie.
+
+msgpack et pyarrow sont facultatifs (extra `formats` : `poetry install --extras formats` sur
+les instances qui servent ces consommateurs) : un format dont le paquet n'est pas installé
+n'est pas proposé, JSON reste toujours disponible.
+"""
+
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+JSON = "application/json"
+MSGPACK = "application/x-msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Types acceptés dans l'en-tête Accept pour chaque format
+_MEDIA_TYPES = {
+    "application/x-msgpack": MSGPACK,
+    "application/msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    ARROW_STREAM: ARROW_STREAM,
+}
+
+
+class NotAcceptableError(ValueError):
+    """Seuls des formats non disponibles (paquet absent) sont acceptés par le client"""
+
+
+class RowSet(NamedTuple):
+    """Résultat tabulaire : noms et types des colonnes, puis une tuple par ligne"""
+    columns: Tuple[str, ...]
+    # Un caractère par colonne : i (entier), f (réel), b (booléen), s (texte), t (horodatage)
+    kinds: str
+    rows: List[tuple]
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Lignes en dictionnaires (réponse JSON)"""
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+    def select(self, columns: Sequence[str]) -> "RowSet":
+        """Réduit le résultat aux colonnes données, dans l'ordre du résultat"""
+        positions = [position for position, name in enumerate(self.columns) if name in columns]
+        return RowSet(
+            tuple(self.columns[position] for position in positions),
+            "".join(self.kinds[position] for position in positions),
+            [tuple(row[position] for position in positions) for row in self.rows]
+        )
+
+
+def available_formats() -> Tuple[str, ...]:
+    """Formats binaires utilisables dans ce processus (selon les paquets installés)"""
+    formats = []
+    if msgpack is not None:
+        formats.append(MSGPACK)
+    if pyarrow is not None:
+        formats.append(ARROW_STREAM)
+    return tuple(formats)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Choisit le format de la réponse d'après l'en-tête Accept (poids `q` respectés)
+
+    Args:
+        accept: Valeur de l'en-tête, None si absent
+
+    Returns:
+        JSON, MSGPACK ou ARROW_STREAM ; JSON si aucun type connu n'est demandé
+
+    Raises:
+        NotAcceptableError: Le client n'accepte que des formats binaires non disponibles
+    """
+    if not accept:
+        return JSON
+    ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *parameters = [item.strip() for item in part.split(";")]
+        weight = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if media_type and weight > 0:
+            ranges.append((-weight, position, media_type.lower()))
+
+    available = available_formats()
+    unavailable = []
+    for _, _, media_type in sorted(ranges):
+        if media_type in ("*/*", "application/*", JSON):
+            return JSON
+        wanted = _MEDIA_TYPES.get(media_type)
+        if wanted in available:
+            return wanted
+        if wanted is not None:
+            unavailable.append(wanted)
+    if unavailable:
+        raise NotAcceptableError(
+            f"Format non disponible: {', '.join(dict.fromkeys(unavailable))} "
+            f"(disponibles: {', '.join((JSON, *available))})"
+        )
+    # Types inconnus (text/html…) : JSON, comme avant la négociation
+    return JSON
+
+
+def encode(rowset: RowSet, media_type: str) -> bytes:
+    """
+    Sérialise un résultat tabulaire dans un format binaire
+
+    Args:
+        rowset: Lignes à sérialiser
+        media_type: MSGPACK ou ARROW_STREAM (voir `negotiate`)
+
+    Returns:
+        Corps de la réponse
+    """
+    columns = _transpose(rowset)
+    if media_type == MSGPACK:
+        return msgpack.packb(dict(zip(rowset.columns, columns)), datetime=True)
+    if media_type == ARROW_STREAM:
+        return _encode_arrow(rowset, columns)
+    raise ValueError(f"Format binaire inconnu: {media_type}")
+
+
+def _transpose(rowset: RowSet) -> List[Sequence[Any]]:
+    """Colonnes du résultat, horodatages convertis en datetime UTC"""
+    # Une passe par colonne : zip(*rows) dépliait un argument par ligne (4 fois plus lent à 1M lignes)
+    columns = [list(map(itemgetter(position), rowset.rows)) for position in range(len(rowset.columns))]
+    return [
+        [_utc(value) for value in column] if kind == "t" else column
+        for kind, column in zip(rowset.kinds, columns)
+    ]
+
+
+def _utc(value: Any) -> Optional[datetime]:
+    # Sans fuseau (SQLite, chaînes ISO naïves) : UTC
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _encode_arrow(rowset: RowSet, columns: List[Sequence[Any]]) -> bytes:
+    types = {
+        "i": pyarrow.int64(),
+        "f": pyarrow.float64(),
+        "b": pyarrow.bool_(),
+        "s": pyarrow.string(),
+        "t": pyarrow.timestamp("us", tz="UTC"),
+    }
+    batch = pyarrow.RecordBatch.from_arrays(
+        [pyarrow.array(column, type=types[kind]) for kind, column in zip(rowset.kinds, columns)],
+        names=list(rowset.columns)
+    )
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
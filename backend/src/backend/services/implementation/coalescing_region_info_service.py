@@ -0,0 +1,68 @@
+from typing import Any, Awaitable, Callable, Dict
+import logging
+
+from backend.indexes.text_normalization import normalize_region_name
+from backend.resilience.coalescing import RequestCoalescer
+from backend.serialization.tabular import RowSet
+from backend.services.interfaces.Iregion_info_service import IRegionInformationService, RegionServiceScope
+from backend.services.schemas.region_resp_schema import NearestRegionResponse, RegionResponse
+
+logger = logging.getLogger(__name__)
+
+class CoalescingRegionInformationService(IRegionInformationService):
+    """
+    Service des régions qui regroupe les lectures identiques concurrentes (voir `RequestCoalescer`).
+    Les lectures partagées s'exécutent sur une session dédiée (`region_service_scope`) ;
+    les écritures ne sont jamais regroupées et passent par le service de la requête.
+    """
+    
+    def __init__(self, region_service: IRegionInformationService, region_service_scope: RegionServiceScope,
+                 coalescer: RequestCoalescer):
+        """
+        Args:
+            region_service: Service des régions sur la session de la requête (écritures)
+            region_service_scope: Fabrique d'un service des régions sur une session dédiée
+            coalescer: Regroupement des appels du processus
+        """
+        self.region_service = region_service
+        self.region_service_scope = region_service_scope
+        self.coalescer = coalescer
+    
+    async def get_region_info_by_id(self, region_id: int) -> RegionResponse:
+        return await self.coalescer.run(
+            ("regions.by_id", int(region_id)),
+            lambda: self._call(lambda service: service.get_region_info_by_id(region_id))
+        )
+    
+    async def get_all_regions(self) -> list[RegionResponse]:
+        return await self.coalescer.run(
+            ("regions.all",),
+            lambda: self._call(lambda service: service.get_all_regions())
+        )
+    
+    async def get_all_regions_rows(self) -> RowSet:
+        return await self.coalescer.run(
+            ("regions.all_rows",),
+            lambda: self._call(lambda service: service.get_all_regions_rows())
+        )
+    
+    async def create_region(self, region_data: Dict[str, Any]) -> RegionResponse:
+        return await self.region_service.create_region(region_data)
+    
+    async def search_regions(self, query: str, limit: int = 10) -> list[RegionResponse]:
+        # L'index de préfixe ne voit que le nom normalisé (casse, accents, séparateurs)
+        return await self.coalescer.run(
+            ("regions.search", normalize_region_name(query), int(limit)),
+            lambda: self._call(lambda service: service.search_regions(query, limit))
+        )
+    
+    async def get_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> list[NearestRegionResponse]:
+        return await self.coalescer.run(
+            ("regions.nearest", float(latitude), float(longitude), int(k)),
+            lambda: self._call(lambda service: service.get_nearest_regions(latitude, longitude, k))
+        )
+    
+    async def _call(self, call: Callable[[IRegionInformationService], Awaitable[Any]]) -> Any:
+        """Exécute la lecture partagée sur sa propre session"""
+        async with self.region_service_scope() as service:
+            return await call(service)
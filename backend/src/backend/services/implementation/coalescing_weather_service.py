@@ -0,0 +1,59 @@
+from typing import Any, Awaitable, Callable, Optional, Sequence
+import logging
+
+from backend.resilience.coalescing import RequestCoalescer
+from backend.serialization.tabular import RowSet
+from backend.services.interfaces.Iweather_service import IWeatherService, WeatherServiceScope
+from backend.services.schemas.weather_resp_schema import (
+    WeatherForecastResponse, WeatherForecastSeriesResponse, WeatherResponse
+)
+
+logger = logging.getLogger(__name__)
+
+class CoalescingWeatherService(IWeatherService):
+    """
+    Service météo qui regroupe les lectures identiques concurrentes (voir `RequestCoalescer`).
+    Le travail partagé peut survivre à la requête qui l'a lancé : il s'exécute donc sur une
+    session dédiée, ouverte par `weather_service_scope`, et non sur la session de la requête.
+    Les arguments sont repris tels quels dans la clé : le nom de la région est renvoyé dans
+    la réponse : deux orthographes d'un même nom ne partagent donc pas leur résultat.
+    """
+    
+    def __init__(self, weather_service_scope: WeatherServiceScope, coalescer: RequestCoalescer):
+        """
+        Args:
+            weather_service_scope: Fabrique d'un service météo sur une session dédiée
+            coalescer: Regroupement des appels du processus
+        """
+        self.weather_service_scope = weather_service_scope
+        self.coalescer = coalescer
+    
+    async def get_current_weather(self, region_name: str, fields: Optional[Sequence[str]] = None) -> WeatherResponse:
+        fields = tuple(fields) if fields else None
+        return await self.coalescer.run(
+            ("weather.current", region_name, fields),
+            lambda: self._call(lambda service: service.get_current_weather(region_name, fields))
+        )
+    
+    async def get_weather_forecast(self, region_name: str, days: int) -> WeatherForecastResponse:
+        return await self.coalescer.run(
+            ("weather.forecast", region_name, int(days)),
+            lambda: self._call(lambda service: service.get_weather_forecast(region_name, days))
+        )
+    
+    async def get_weather_forecast_series(self, region_name: str, days: int) -> WeatherForecastSeriesResponse:
+        return await self.coalescer.run(
+            ("weather.forecast_series", region_name, int(days)),
+            lambda: self._call(lambda service: service.get_weather_forecast_series(region_name, days))
+        )
+    
+    async def get_weather_history_rows(self, region_name: str, days: int) -> RowSet:
+        return await self.coalescer.run(
+            ("weather.history", region_name, int(days)),
+            lambda: self._call(lambda service: service.get_weather_history_rows(region_name, days))
+        )
+    
+    async def _call(self, call: Callable[[IWeatherService], Awaitable[Any]]) -> Any:
+        """Exécute la lecture partagée sur sa propre session"""
+        async with self.weather_service_scope() as service:
+            return await call(service)
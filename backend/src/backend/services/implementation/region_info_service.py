@@ -2,8 +2,11 @@ from typing import Dict, Any
 import logging
 from injector import inject
 
-from backend.services.schemas.region_resp_schema import RegionResponse
-from backend.services.interfaces.Iregion_info_service import IRegionInformationService
+from backend.services.schemas.region_resp_schema import RegionResponse, NearestRegionResponse
+from backend.serialization.tabular import RowSet
+from backend.services.interfaces.Iregion_info_service import (
+    IRegionInformationService, REGION_ROW_COLUMNS, REGION_ROW_KINDS
+)
 from backend.repositories.interfaces import IRegionRepository
 
 logger = logging.getLogger(__name__)
@@ -23,7 +26,7 @@ class RegionInformationService(IRegionInformationService):
             region_repository: Repository des régions (injecté automatiquement)
         """
         self.region_repository = region_repository
-        logger.info(f"RegionInformationService initialisé avec {type(region_repository).__name__}")
+        logger.debug(f"RegionInformationService initialisé avec {type(region_repository).__name__}")
     
     async def get_region_info_by_id(self, region_id: int) -> RegionResponse:
         """
@@ -39,7 +42,7 @@ class RegionInformationService(IRegionInformationService):
             logger.info(f"Récupération des informations pour la région ID: {region_id}")
             
             # Utilisation du repository injecté
-            region_data = await self.region_repository.get_region_by_id(region_id)
+            region_data = await self.region_repository.get_region_info_by_id(region_id)
 
             if not region_data:
                 logger.warning(f"Aucune région trouvée avec l'ID: {region_id}")
@@ -81,6 +84,21 @@ class RegionInformationService(IRegionInformationService):
             logger.error(f"Erreur lors de la récupération de toutes les régions: {str(e)}")
             return []
     
+    async def get_all_regions_rows(self) -> RowSet:
+        """
+        Récupère toutes les régions en lignes, sans construire de RegionResponse.
+        Contrairement à `get_all_regions`, une erreur est relancée : un export vide
+        passerait pour une table vide.
+        
+        Returns:
+            RowSet des régions (REGION_ROW_COLUMNS)
+        """
+        regions_data = await self.region_repository.get_all_regions()
+        return RowSet(REGION_ROW_COLUMNS, REGION_ROW_KINDS, [
+            (region["id"], region["name"], region["nb_habitants"], region["language"])
+            for region in regions_data
+        ])
+    
     async def create_region(self, region_data: Dict[str, Any]) -> RegionResponse:
         """
         Crée une nouvelle région
@@ -103,4 +121,43 @@ class RegionInformationService(IRegionInformationService):
             
         except Exception as e:
             logger.error(f"Erreur lors de la création de la région: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e
+    
+    async def search_regions(self, query: str, limit: int = 10) -> list[RegionResponse]:
+        """
+        Recherche les régions dont un mot du nom commence par `query`
+        
+        Args:
+            query: Texte saisi par l'utilisateur (casse et accents ignorés)
+            limit: Nombre maximal de résultats
+            
+        Returns:
+            Liste de RegionResponse, par population décroissante
+        """
+        try:
+            regions_data = await self.region_repository.search_regions(query, limit)
+            return [RegionResponse(**region_data) for region_data in regions_data]
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la recherche des régions '{query}': {str(e)}")
+            return []
+    
+    async def get_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> list[NearestRegionResponse]:
+        """
+        Récupère les régions les plus proches d'un point
+        
+        Args:
+            latitude: Latitude du point (degrés)
+            longitude: Longitude du point (degrés)
+            k: Nombre de régions
+            
+        Returns:
+            Liste de NearestRegionResponse, de la plus proche à la plus lointaine
+        """
+        try:
+            regions_data = await self.region_repository.find_nearest_regions(latitude, longitude, k)
+            return [NearestRegionResponse(**region_data) for region_data in regions_data]
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la recherche des régions proches de ({latitude}, {longitude}): {str(e)}")
+            return []
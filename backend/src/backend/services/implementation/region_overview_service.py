@@ -0,0 +1,93 @@
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import logging
+import time
+
+from backend.repositories.interfaces import IRegionRepository
+from backend.services.interfaces.Iregion_overview_service import IRegionOverviewService
+from backend.services.interfaces.Iweather_service import IWeatherService, WeatherServiceScope
+from backend.services.schemas.overview_schema import RegionOverviewResponse
+from backend.services.schemas.region_resp_schema import RegionResponse
+
+logger = logging.getLogger(__name__)
+
+
+class RegionOverviewService(IRegionOverviewService):
+    """
+    Vue d'ensemble d'une page région : la région, sa météo actuelle et ses prévisions.
+    La région vient du catalogue en mémoire (son nom est la clé des deux autres lectures) ;
+    la météo et les prévisions sont ensuite lues en parallèle, chacune sur sa propre session,
+    donc sur sa propre connexion : la latence totale est celle de la plus lente, pas la somme.
+    Chaque sous-requête a son délai ; celle qui échoue ou le dépasse est absente de la
+    réponse (`partial`, raison dans `errors`) sans empêcher les autres.
+    """
+
+    def __init__(self, region_repository: IRegionRepository, weather_service_scope: WeatherServiceScope,
+                 timeout_seconds: float = 1.0):
+        """
+        Args:
+            region_repository: Repository des régions (catalogue en mémoire)
+            weather_service_scope: Fabrique d'un service météo sur une session dédiée
+            timeout_seconds: Délai maximal de chaque sous-requête
+        """
+        self.region_repository = region_repository
+        self.weather_service_scope = weather_service_scope
+        self.timeout_seconds = timeout_seconds
+
+    async def get_region_overview(self, region_id: int, days: int) -> Optional[RegionOverviewResponse]:
+        """
+        Récupère la vue d'ensemble d'une région
+
+        Args:
+            region_id: L'ID de la région
+            days: Nombre de jours de prévisions
+
+        Returns:
+            RegionOverviewResponse, ou None si la région n'existe pas
+
+        Raises:
+            TimeoutError: La région elle-même n'a pas pu être lue dans le délai
+        """
+        async with asyncio.timeout(self.timeout_seconds):
+            region_data = await self.region_repository.get_region_info_by_id(region_id)
+        if not region_data:
+            logger.warning(f"Vue d'ensemble: aucune région trouvée avec l'ID: {region_id}")
+            return None
+        region = RegionResponse(**region_data)
+
+        # gather annule les deux sous-requêtes si la requête HTTP est abandonnée
+        results = await asyncio.gather(
+            self._subquery("weather", lambda service: service.get_current_weather(region.name)),
+            self._subquery("forecast", lambda service: service.get_weather_forecast_series(region.name, days))
+        )
+        values = {name: value for name, value, _ in results}
+        errors = {name: error for name, _, error in results if error is not None}
+        return RegionOverviewResponse(
+            region=region,
+            weather=values["weather"],
+            forecast=values["forecast"],
+            partial=bool(errors),
+            errors=errors
+        )
+
+    async def _subquery(self, name: str, call: Callable[[IWeatherService], Awaitable[Any]]):
+        """
+        Exécute une sous-requête sur sa propre session, dans le délai imparti
+
+        Returns:
+            (nom, valeur ou None, raison de l'échec ou None)
+        """
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout_seconds):
+                async with self.weather_service_scope() as service:
+                    return name, await call(service), None
+        except TimeoutError:
+            logger.warning(f"Vue d'ensemble: sous-requête {name} abandonnée après {self.timeout_seconds:.2f} s")
+            return name, None, "timeout"
+        except Exception as e:
+            logger.warning(
+                f"Vue d'ensemble: sous-requête {name} en échec après "
+                f"{(time.perf_counter() - start) * 1000:.0f} ms: {e!r}"
+            )
+            return name, None, "error"
@@ -0,0 +1,60 @@
+from typing import List, Tuple
+import logging
+from injector import inject
+
+from backend.interpolation.idw import WeatherInterpolator
+from backend.repositories.interfaces import IWeatherRepository
+from backend.services.interfaces.Iweather_interpolation_service import IWeatherInterpolationService
+from backend.services.schemas.interpolation_schema import InterpolatedWeatherResponse
+
+logger = logging.getLogger(__name__)
+
+class WeatherInterpolationService(IWeatherInterpolationService):
+    """
+    Service d'estimation de la météo en un point quelconque.
+    Les dernières mesures par région sont lues via le repository injecté,
+    puis interpolées par le moteur IDW partagé par le processus.
+    """
+    
+    @inject
+    def __init__(self, weather_repository: IWeatherRepository, interpolator: WeatherInterpolator):
+        """
+        Initialise le service avec injection de dépendances.
+        
+        Args:
+            weather_repository: Repository météorologique (injecté automatiquement)
+            interpolator: Moteur d'interpolation partagé (injecté automatiquement)
+        """
+        self.weather_repository = weather_repository
+        self.interpolator = interpolator
+    
+    async def get_weather_at(self, latitude: float, longitude: float) -> InterpolatedWeatherResponse:
+        """
+        Estime la météo actuelle en un point
+        
+        Args:
+            latitude: Latitude du point (degrés)
+            longitude: Longitude du point (degrés)
+            
+        Returns:
+            InterpolatedWeatherResponse (grandeurs à None si aucune station n'est disponible)
+        """
+        estimate = await self.interpolator.estimate(self.weather_repository, latitude, longitude)
+        return InterpolatedWeatherResponse(latitude=latitude, longitude=longitude, **estimate)
+    
+    async def get_weather_at_many(self, points: List[Tuple[float, float]]) -> List[InterpolatedWeatherResponse]:
+        """
+        Estime la météo actuelle pour un lot de points en un seul appel
+        
+        Args:
+            points: Couples (latitude, longitude)
+            
+        Returns:
+            Liste d'InterpolatedWeatherResponse, dans l'ordre des points
+        """
+        logger.info(f"Interpolation par lot de {len(points)} points")
+        estimates = await self.interpolator.estimate_many(self.weather_repository, points)
+        return [
+            InterpolatedWeatherResponse(latitude=latitude, longitude=longitude, **estimate)
+            for (latitude, longitude), estimate in zip(points, estimates)
+        ]
@@ -1,11 +1,14 @@
-from typing import Dict, Any
+from typing import Optional, Sequence
+from datetime import date, datetime, timedelta, timezone
+from backend.repositories.interfaces import WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS
+from backend.serialization.tabular import RowSet
 from backend.services.interfaces.Iweather_service import IWeatherService
 
-from backend.services.schemas.weather_resp_schema import WeatherForecastResponse, WeatherResponse
+from backend.services.schemas.weather_resp_schema import WeatherForecastResponse, WeatherForecastSeriesResponse, WeatherResponse
 
 
 class WeatherService(IWeatherService):
-    async def get_current_weather(self, region_name: str) -> WeatherResponse:
+    async def get_current_weather(self, region_name: str, fields: Optional[Sequence[str]] = None) -> WeatherResponse:
         weather_data = {
             "region": region_name,
             "temperature": 22,
@@ -16,7 +19,7 @@ class WeatherService(IWeatherService):
 
 
 class WeatherService1(IWeatherService):
-    async def get_current_weather(self, region_name: str) -> WeatherResponse:
+    async def get_current_weather(self, region_name: str, fields: Optional[Sequence[str]] = None) -> WeatherResponse:
         response = {
         "region": "le nom que j'ai choisit",
         "temperature": 1000,
@@ -31,6 +34,26 @@ class WeatherService1(IWeatherService):
             "temperature": 0,
             "condition": "ça va dans les prochains jours",
             "humidity": 20,
-            "day": days
+            "day": "Demain"
         }
-        return WeatherForecastResponse(**response)
\ No newline at end of file
+        return WeatherForecastResponse(**response)
+    
+    async def get_weather_forecast_series(self, region_name, days) -> WeatherForecastSeriesResponse:
+        forecasts = [
+            {
+                "forecast_date": date.today() + timedelta(days=offset + 1),
+                "day": "Demain" if offset == 0 else f"J+{offset + 1}",
+                "temperature_avg": 0,
+                "condition": "ça va dans les prochains jours",
+                "humidity": 20
+            }
+            for offset in range(days)
+        ]
+        return WeatherForecastSeriesResponse(region=region_name, days=len(forecasts), forecasts=forecasts)
+    
+    async def get_weather_history_rows(self, region_name, days) -> RowSet:
+        rows = [
+            (region_name, 1000.0, "ça va", 20, None, None, None, datetime.now(timezone.utc) - timedelta(days=offset))
+            for offset in range(days)
+        ]
+        return RowSet(WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS, rows)
\ No newline at end of file
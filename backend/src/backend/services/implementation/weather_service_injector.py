@@ -1,10 +1,15 @@
-from typing import Dict, Any, List
+from typing import Optional, Sequence
 import logging
 from injector import inject
 
 from backend.services.interfaces.Iweather_service import IWeatherService
-from backend.services.schemas.weather_resp_schema import WeatherResponse, WeatherForecastResponse
-from backend.repositories.interfaces import IWeatherRepository
+from backend.services.schemas.field_selection import WEATHER_RESPONSE_FIELDS
+from backend.services.schemas.weather_resp_schema import (
+    ForecastDayResponse, WeatherForecastResponse, WeatherForecastSeriesResponse, WeatherResponse
+)
+from backend.repositories.interfaces import IWeatherRepository, PLACEHOLDER
+from backend.serialization.tabular import RowSet
+from backend.resilience.circuit_breaker import DatabaseUnavailableError
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +28,16 @@ class WeatherService(IWeatherService):
             weather_repository: Repository météorologique (injecté automatiquement)
         """
         self.weather_repository = weather_repository
-        logger.info(f"WeatherService initialisé avec {type(weather_repository).__name__}")
+        logger.debug(f"WeatherService initialisé avec {type(weather_repository).__name__}")
     
-    async def get_current_weather(self, region_name: str) -> WeatherResponse:
+    async def get_current_weather(self, region_name: str, fields: Optional[Sequence[str]] = None) -> WeatherResponse:
         """
         Récupère les données météorologiques actuelles pour une région
         
         Args:
             region_name: Le nom de la région
+            fields: Champs de la réponse utilisés par l'appelant (None : tous) ; seules
+                leurs colonnes sont lues, les autres champs gardent leur valeur par défaut
             
         Returns:
             WeatherResponse contenant les données météo actuelles
@@ -38,7 +45,9 @@ class WeatherService(IWeatherService):
         try:
             logger.info(f"Récupération de la météo pour: {region_name}")
             
-            weather_data = await self.weather_repository.get_weather_by_region(region_name)
+            weather_data = await self.weather_repository.get_weather_by_region(
+                region_name, WEATHER_RESPONSE_FIELDS.columns(fields)
+            )
             
             if not weather_data:
                 logger.warning(f"Aucune donnée météo trouvée pour: {region_name}")
@@ -55,11 +64,15 @@ class WeatherService(IWeatherService):
                     "region": weather_data.get("region_name", region_name),
                     "temperature": weather_data.get("temperature", 20.0),
                     "condition": weather_data.get("condition", "Unknown"),
-                    "humidity": weather_data.get("humidity", 50)
+                    "humidity": weather_data.get("humidity", 50),
+                    "stale": weather_data.get("stale", False)
                 }
             
             return WeatherResponse(**weather_data)
             
+        except DatabaseUnavailableError:
+            # Base en panne sans valeur connue : 503 plutôt qu'une fausse météo
+            raise
         except Exception as e:
             logger.error(f"Erreur lors de la récupération de la météo pour {region_name}: {str(e)}")
             # Retourner des données par défaut en cas d'erreur
@@ -104,11 +117,14 @@ class WeatherService(IWeatherService):
                     "temperature": first_forecast.get("temperature", 22.0),
                     "condition": first_forecast.get("condition", "Partly Cloudy"),
                     "humidity": first_forecast.get("humidity", 60),
-                    "day": first_forecast.get("day", "Demain")
+                    "day": first_forecast.get("day", "Demain"),
+                    "stale": first_forecast.get("stale", False)
                 }
             
             return WeatherForecastResponse(**forecast_data)
             
+        except DatabaseUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des prévisions pour {region_name}: {str(e)}")
             # Retourner des données par défaut en cas d'erreur
@@ -120,6 +136,62 @@ class WeatherService(IWeatherService):
                 day="Erreur"
             )
 
+    async def get_weather_forecast_series(self, region_name: str, days: int) -> WeatherForecastSeriesResponse:
+        """
+        Récupère toutes les prévisions d'une région sur `days` jours.
+        Une seule requête au repository, quel que soit le nombre de jours :
+        le client n'a plus à appeler l'API une fois par jour.
+        
+        Args:
+            region_name: Le nom de la région
+            days: Nombre de jours de prévisions
+            
+        Returns:
+            WeatherForecastSeriesResponse contenant une entrée par jour, dans l'ordre des dates ;
+            série vide si la base n'a aucune prévision pour la région
+        """
+        logger.info(f"Récupération de la série de prévisions pour: {region_name} sur {days} jours")
+        
+        # Les prévisions de repli du repository (aucune ligne en base) ne sont pas présentées comme réelles
+        forecasts = [
+            forecast for forecast in await self.weather_repository.get_weather_forecast(region_name, days)
+            if not forecast.get(PLACEHOLDER)
+        ]
+        series = [
+            ForecastDayResponse(
+                forecast_date=forecast["forecast_date"],
+                day=forecast.get("day") or "Inconnu",
+                temperature_min=forecast.get("temperature_min"),
+                temperature_max=forecast.get("temperature_max"),
+                temperature_avg=forecast.get("temperature"),
+                condition=forecast.get("condition") or "Unknown",
+                humidity=forecast.get("humidity", 0),
+                pressure=forecast.get("pressure"),
+                wind_speed=forecast.get("wind_speed"),
+                wind_direction=forecast.get("wind_direction"),
+                precipitation_probability=forecast.get("precipitation_probability") or 0
+            )
+            for forecast in forecasts[:days]
+        ]
+        region = forecasts[0].get("region_name", region_name) if forecasts else region_name
+        stale = any(forecast.get("stale", False) for forecast in forecasts)
+        return WeatherForecastSeriesResponse(region=region, days=len(series), forecasts=series, stale=stale)
+
+    async def get_weather_history_rows(self, region_name: str, days: int) -> RowSet:
+        """
+        Récupère l'historique des mesures d'une région en lignes (une tuple par mesure),
+        pour les réponses tabulaires : aucun dictionnaire ni modèle par mesure
+        
+        Args:
+            region_name: Le nom de la région
+            days: Nombre de jours d'historique
+            
+        Returns:
+            RowSet des mesures, de la plus récente à la plus ancienne
+        """
+        logger.info(f"Récupération de l'historique en lignes pour: {region_name} sur {days} jours")
+        return await self.weather_repository.get_weather_history_rows(region_name, days)
+
 # Classes supplémentaires pour maintenir la compatibilité avec l'existant
 class WeatherService1(WeatherService):
     """Alias pour maintenir la compatibilité"""
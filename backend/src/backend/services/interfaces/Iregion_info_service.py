@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from contextlib import AbstractAsyncContextManager
+from typing import Callable, Dict, Any
 
-from backend.services.schemas.region_resp_schema import RegionResponse
+from backend.serialization.tabular import RowSet
+from backend.services.schemas.region_resp_schema import RegionResponse, NearestRegionResponse
+
+# Colonnes des régions en lignes (`get_all_regions_rows`), celles de RegionResponse
+REGION_ROW_COLUMNS = ("id", "name", "nb_habitants", "language")
+REGION_ROW_KINDS = "isis"
 
 class IRegionInformationService(ABC):
     @abstractmethod
@@ -14,7 +20,25 @@ class IRegionInformationService(ABC):
         """Récupère toutes les régions"""
         pass
     
+    @abstractmethod
+    async def get_all_regions_rows(self) -> RowSet:
+        """Récupère toutes les régions en lignes (REGION_ROW_COLUMNS), pour les réponses tabulaires"""
+        pass
+    
     @abstractmethod
     async def create_region(self, region_data: Dict[str, Any]) -> RegionResponse:
         """Crée une nouvelle région"""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def search_regions(self, query: str, limit: int = 10) -> list[RegionResponse]:
+        """Autocomplétion des noms de régions, par population décroissante"""
+        pass
+    
+    @abstractmethod
+    async def get_nearest_regions(self, latitude: float, longitude: float, k: int = 1) -> list[NearestRegionResponse]:
+        """Récupère les régions les plus proches d'un point"""
+        pass
+
+# Ouvre un service des régions sur une session dédiée (sa propre connexion du pool)
+RegionServiceScope = Callable[[], AbstractAsyncContextManager[IRegionInformationService]]
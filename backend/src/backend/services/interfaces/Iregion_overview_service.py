@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from backend.services.schemas.overview_schema import RegionOverviewResponse
+
+class IRegionOverviewService(ABC):
+    @abstractmethod
+    async def get_region_overview(self, region_id: int, days: int) -> Optional[RegionOverviewResponse]:
+        """Récupère la région, sa météo actuelle et ses prévisions sur `days` jours (None si la région n'existe pas)"""
+        pass
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+from backend.services.schemas.interpolation_schema import InterpolatedWeatherResponse
+
+class IWeatherInterpolationService(ABC):
+    @abstractmethod
+    async def get_weather_at(self, latitude: float, longitude: float) -> InterpolatedWeatherResponse:
+        """Estime la météo actuelle en un point quelconque"""
+        pass
+
+    @abstractmethod
+    async def get_weather_at_many(self, points: List[Tuple[float, float]]) -> List[InterpolatedWeatherResponse]:
+        """Estime la météo actuelle pour un lot de points"""
+        pass
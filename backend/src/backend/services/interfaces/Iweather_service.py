@@ -1,16 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from contextlib import AbstractAsyncContextManager
+from typing import Callable, Optional, Sequence
 
+from backend.serialization.tabular import RowSet
 from backend.services.schemas.region_resp_schema import RegionResponse
-from backend.services.schemas.weather_resp_schema import WeatherResponse
+from backend.services.schemas.weather_resp_schema import WeatherResponse, WeatherForecastSeriesResponse
 
 class IWeatherService(ABC):
     @abstractmethod
-    async def get_current_weather(self, region_name: str) -> RegionResponse:
-        """Récupère la météo actuelle pour une région donnée"""
+    async def get_current_weather(self, region_name: str, fields: Optional[Sequence[str]] = None) -> RegionResponse:
+        """Récupère la météo actuelle pour une région donnée ; seuls `fields` sont garantis s'ils sont précisés"""
         pass
 
     @abstractmethod
     async def get_weather_forecast(self, region_name: str, days: int) -> WeatherResponse:
         """Récupère les prévisions météo pour une région donnée et un nombre de jours"""
         pass
+
+    @abstractmethod
+    async def get_weather_forecast_series(self, region_name: str, days: int) -> WeatherForecastSeriesResponse:
+        """Récupère la série complète des prévisions d'une région sur `days` jours, en une seule requête"""
+        pass
+
+    @abstractmethod
+    async def get_weather_history_rows(self, region_name: str, days: int) -> RowSet:
+        """Récupère l'historique des mesures d'une région sur `days` jours, en lignes"""
+        pass
+
+# Ouvre un service météo sur une session dédiée (sa propre connexion du pool)
+WeatherServiceScope = Callable[[], AbstractAsyncContextManager[IWeatherService]]
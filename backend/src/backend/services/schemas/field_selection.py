@@ -0,0 +1,113 @@
+"""
+Sélection des champs des réponses (`?fields=name,temperature`).
+
+Chaque modèle de réponse a sa liste de champs autorisés (ceux du modèle) et la colonne
+de la table qui alimente chacun d'eux. Les champs demandés sont validés contre cette
+liste, traduits en colonnes pour réduire la projection SQL, puis seuls ces champs sont
+sérialisés dans la réponse.
+"""
+
+from itertools import combinations
+from typing import Any, Dict, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+
+from backend.services.schemas.region_resp_schema import RegionResponse
+from backend.services.schemas.weather_resp_schema import WeatherReadingResponse, WeatherResponse
+
+
+class InvalidFieldsError(ValueError):
+    """Champs demandés absents de la liste autorisée du modèle"""
+
+    def __init__(self, unknown: Sequence[str], allowed: Sequence[str]):
+        self.unknown = tuple(unknown)
+        self.allowed = tuple(allowed)
+        super().__init__(
+            f"Champs inconnus: {', '.join(self.unknown)} (autorisés: {', '.join(self.allowed)})"
+        )
+
+
+class FieldSelection:
+    """
+    Champs sélectionnables d'un modèle de réponse et colonnes SQL correspondantes.
+    Les champs sans colonne (`stale`) sont calculés ; les colonnes clés sont toujours lues.
+    """
+
+    def __init__(self, model: Type[BaseModel], columns: Dict[str, str], key_columns: Sequence[str] = ()):
+        """
+        Args:
+            model: Modèle de réponse (ses champs forment la liste autorisée)
+            columns: Colonne de la table pour chaque champ qui en a une
+            key_columns: Colonnes lues quels que soient les champs demandés
+        """
+        self.model = model
+        self.allowed: Tuple[str, ...] = tuple(model.model_fields)
+        self.field_columns = columns
+        self.key_columns = tuple(key_columns)
+
+    def parse(self, raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Valide le paramètre `fields` (noms séparés par des virgules)
+
+        Args:
+            raw: Valeur du paramètre, None ou vide pour tous les champs
+
+        Returns:
+            Les champs demandés dans l'ordre du modèle, ou None pour tous les champs
+
+        Raises:
+            InvalidFieldsError: Un champ n'est pas dans la liste autorisée
+        """
+        if raw is None:
+            return None
+        requested = {name.strip() for name in raw.split(",") if name.strip()}
+        if not requested:
+            return None
+        unknown = sorted(requested.difference(self.allowed))
+        if unknown:
+            raise InvalidFieldsError(unknown, self.allowed)
+        # Ordre canonique : une même sélection donne toujours la même instruction SQL
+        return tuple(name for name in self.allowed if name in requested)
+
+    def columns(self, fields: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+        """Colonnes à lire pour les champs demandés (None : toutes)"""
+        if fields is None:
+            return None
+        wanted = set(self.key_columns)
+        wanted.update(self.field_columns[name] for name in fields if name in self.field_columns)
+        return tuple(column for column in dict.fromkeys([*self.key_columns, *self.field_columns.values()])
+                     if column in wanted)
+
+    def projections(self) -> Tuple[Tuple[str, ...], ...]:
+        """Tous les jeux de colonnes que `columns` peut retourner (un par sélection distincte)"""
+        return tuple(dict.fromkeys(
+            self.columns(fields)
+            for size in range(1, len(self.allowed) + 1)
+            for fields in combinations(self.allowed, size)
+        ))
+
+    def project(self, response: BaseModel, fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+        """Sérialise la réponse réduite aux champs demandés (tous si None)"""
+        return response.model_dump(mode="json", include=set(fields) if fields is not None else None)
+
+
+REGION_RESPONSE_FIELDS = FieldSelection(
+    RegionResponse,
+    {"id": "id", "name": "name", "nb_habitants": "nb_habitants", "language": "language"},
+    key_columns=("id",)
+)
+
+WEATHER_RESPONSE_FIELDS = FieldSelection(
+    WeatherResponse,
+    {"region": "region_name", "temperature": "temperature", "condition": "condition", "humidity": "humidity"},
+    key_columns=("region_name",)
+)
+
+# Historique : les champs de la réponse sont les colonnes de `get_weather_history_rows`
+WEATHER_READING_FIELDS = FieldSelection(
+    WeatherReadingResponse,
+    {"region": "region_name", "temperature": "temperature", "condition": "condition", "humidity": "humidity",
+     "pressure": "pressure", "wind_speed": "wind_speed", "wind_direction": "wind_direction",
+     "recorded_at": "recorded_at"},
+    key_columns=("region_name",)
+)
@@ -0,0 +1,27 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+MAX_BATCH_POINTS = 10_000
+
+class Coordinate(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+
+class InterpolationBatchRequest(BaseModel):
+    points: List[Coordinate] = Field(..., min_length=1, max_length=MAX_BATCH_POINTS)
+
+class StationContribution(BaseModel):
+    region_name: str
+    distance_km: float
+
+class InterpolatedWeatherResponse(BaseModel):
+    latitude: float
+    longitude: float
+    temperature: Optional[float] = None
+    humidity: Optional[float] = None
+    pressure: Optional[float] = None
+    wind_speed: Optional[float] = None
+    condition: Optional[str] = None
+    wind_direction: Optional[str] = None
+    stations: List[StationContribution] = []
+    stale: bool = False
@@ -0,0 +1,13 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+from backend.services.schemas.region_resp_schema import RegionResponse
+from backend.services.schemas.weather_resp_schema import WeatherForecastSeriesResponse, WeatherResponse
+
+class RegionOverviewResponse(BaseModel):
+    region: RegionResponse
+    # None si la sous-requête a échoué ou dépassé son délai (raison dans `errors`)
+    weather: Optional[WeatherResponse] = None
+    forecast: Optional[WeatherForecastSeriesResponse] = None
+    partial: bool = False
+    errors: Dict[str, str] = {}
@@ -4,4 +4,9 @@ class RegionResponse(BaseModel):
     id: int
     name: str
     nb_habitants: int
-    language: str
\ No newline at end of file
+    language: str
+
+class NearestRegionResponse(RegionResponse):
+    latitude: float
+    longitude: float
+    distance_km: float
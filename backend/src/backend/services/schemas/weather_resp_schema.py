@@ -1,14 +1,58 @@
+from datetime import date, datetime
+from typing import List, Optional
 from pydantic import BaseModel
 
+# Nombre maximal de jours d'une série de prévisions
+MAX_FORECAST_DAYS = 16
+
+# Nombre maximal de jours d'un historique de mesures
+MAX_HISTORY_DAYS = 3660
+
 class WeatherResponse(BaseModel):
     region: str
-    temperature: int
+    temperature: float
     condition: str
     humidity: int
+    # Dernière valeur connue servie pendant une panne de la base
+    stale: bool = False
     
 class WeatherForecastResponse(BaseModel):
     region: str
-    temperature: int
+    temperature: float
+    condition: str
+    humidity: int
+    day: str
+    stale: bool = False
+
+class ForecastDayResponse(BaseModel):
+    forecast_date: date
+    day: str
+    temperature_min: Optional[float] = None
+    temperature_max: Optional[float] = None
+    temperature_avg: Optional[float] = None
+    condition: str
+    humidity: int
+    pressure: Optional[float] = None
+    wind_speed: Optional[float] = None
+    wind_direction: Optional[str] = None
+    precipitation_probability: int = 0
+
+class WeatherForecastSeriesResponse(BaseModel):
+    region: str
+    days: int
+    forecasts: List[ForecastDayResponse]
+    stale: bool = False
+
+class WeatherReadingResponse(BaseModel):
+    region: str
+    temperature: float
     condition: str
     humidity: int
-    day: int
\ No newline at end of file
+    pressure: Optional[float] = None
+    wind_speed: Optional[float] = None
+    wind_direction: Optional[str] = None
+    recorded_at: datetime
+
+class NearbyWeatherResponse(WeatherResponse):
+    region_id: int
+    distance_km: float
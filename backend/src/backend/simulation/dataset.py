@@ -0,0 +1,368 @@
+"""
+Jeu de données du backend de simulation.
+
+N régions et M mesures par région sont générées de façon déterministe à partir
+d'une graine, puis indexées en mémoire :
+
+- régions : dictionnaire par id et instantané du catalogue (index par nom,
+  préfixes et KD-tree), reconstruit paresseusement après une écriture ;
+- mesures : tableaux colonne (`array`) de N × M cases, la case 0 de chaque
+  région étant la plus récente ; les mesures écrites ensuite sont ajoutées
+  à part, par région ;
+- prévisions : calculées à la demande depuis (graine, région, date), les
+  prévisions écrites par upsert les remplaçant.
+
+La mémoire reste ainsi de l'ordre de 25 octets par mesure générée.
+"""
+
+import math
+import random
+import time
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.indexes.region_catalog import RegionCatalogSnapshot
+
+CONDITIONS = ("Sunny", "Partly Cloudy", "Cloudy", "Rainy", "Stormy")
+WIND_DIRECTIONS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+DAY_NAMES = ("Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche")
+
+
+def generate_regions(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Génère des régions fictives ayant la même forme que `Region.to_dict()`.
+
+    Args:
+        count: Nombre de régions à générer
+        seed: Graine du générateur aléatoire (résultats reproductibles)
+
+    Returns:
+        Liste de dictionnaires de régions
+    """
+    rng = random.Random(seed)
+    syllables = ["ba", "ri", "lo", "mon", "ta", "ne", "sur", "vil", "le", "é", "ço", "pel", "gar", "don"]
+    now = datetime.now(timezone.utc).isoformat()
+    regions = []
+    for region_id in range(1, count + 1):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).capitalize()
+        regions.append({
+            "id": region_id,
+            "name": f"{name}-{region_id}",
+            "nb_habitants": rng.randint(100, 3_000_000),
+            "language": "français",
+            "country": "France",
+            "latitude": round(rng.uniform(41.0, 51.0), 6),
+            "longitude": round(rng.uniform(-5.0, 9.5), 6),
+            "created_at": now,
+            "updated_at": now
+        })
+    return regions
+
+
+def _base_temperature(latitude: Optional[float]) -> float:
+    """Température moyenne d'une région : plus froide vers le nord"""
+    return 24.0 - 1.1 * ((latitude or 46.0) - 41.0)
+
+
+def _condition_index(humidity: int, rng: random.Random) -> int:
+    """Condition cohérente avec l'humidité, avec un peu de hasard"""
+    return max(0, min(len(CONDITIONS) - 1, (humidity - 35) // 13 + rng.randint(-1, 1)))
+
+
+class SimulatedDataset:
+    """
+    Données en mémoire partagées par les repositories simulés du processus.
+    """
+
+    def __init__(self, region_count: int = 10_000, readings_per_region: int = 48,
+                 reading_interval_minutes: int = 180, seed: int = 42):
+        """
+        Args:
+            region_count: Nombre de régions générées
+            readings_per_region: Nombre de mesures générées par région
+            reading_interval_minutes: Intervalle entre deux mesures d'une région
+            seed: Graine de la génération
+        """
+        self.seed = seed
+        self.readings_per_region = readings_per_region
+        self.reading_interval_seconds = reading_interval_minutes * 60
+        # Dernière mesure alignée sur l'intervalle : même jeu de données pour une même graine
+        self.generated_at = time.time() // self.reading_interval_seconds * self.reading_interval_seconds
+
+        regions = generate_regions(region_count, seed)
+        self._regions: Dict[int, Dict[str, Any]] = {region["id"]: region for region in regions}
+        self._next_id = region_count + 1
+        self._max_updated_at = regions[-1]["updated_at"] if regions else None
+        self._snapshot: Optional[RegionCatalogSnapshot] = None
+
+        # Mesures générées, en colonnes : case position * M + offset
+        self._region_names: List[str] = [region["name"] for region in regions]
+        self._positions: Dict[str, int] = {name: position for position, name in enumerate(self._region_names)}
+        self._latitudes: List[Optional[float]] = [region.get("latitude") for region in regions]
+        self._temperature = array("f")
+        self._humidity = array("b")
+        self._pressure = array("f")
+        self._wind_speed = array("f")
+        self._condition = array("B")
+        self._wind_direction = array("B")
+        self._generate_readings(regions, random.Random(seed + 1))
+
+        # Écritures postérieures à la génération
+        self._written_readings: Dict[str, List[Dict[str, Any]]] = {}
+        self._written_forecasts: Dict[Tuple[str, date], Dict[str, Any]] = {}
+        self._next_reading_id = region_count * readings_per_region + 1
+
+    def _generate_readings(self, regions: List[Dict[str, Any]], rng: random.Random):
+        for region in regions:
+            base = _base_temperature(region.get("latitude"))
+            for offset in range(self.readings_per_region):
+                hour = (self.generated_at - offset * self.reading_interval_seconds) / 3600 % 24
+                humidity = max(5, min(100, int(rng.gauss(65, 12))))
+                self._temperature.append(base + 6 * math.sin((hour - 9) * math.pi / 12) + rng.gauss(0, 1.5))
+                self._humidity.append(humidity)
+                self._pressure.append(rng.gauss(1013.0, 6.0))
+                self._wind_speed.append(abs(rng.gauss(12.0, 6.0)))
+                self._condition.append(_condition_index(humidity, rng))
+                self._wind_direction.append(rng.randrange(len(WIND_DIRECTIONS)))
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    @property
+    def reading_count(self) -> int:
+        """Nombre total de mesures (générées et écrites)"""
+        return len(self._temperature) + sum(len(readings) for readings in self._written_readings.values())
+
+    # Régions
+
+    def snapshot(self) -> RegionCatalogSnapshot:
+        """Instantané indexé des régions, reconstruit après une écriture"""
+        if self._snapshot is None:
+            self._snapshot = RegionCatalogSnapshot(list(self._regions.values()), self.watermark())
+        return self._snapshot
+
+    def watermark(self) -> Dict[str, Any]:
+        return {"count": len(self._regions), "max_updated_at": self._max_updated_at}
+
+    def _touch(self) -> str:
+        self._snapshot = None
+        self._max_updated_at = datetime.now(timezone.utc).isoformat()
+        return self._max_updated_at
+
+    def create_region(self, region_data: Dict[str, Any]) -> Dict[str, Any]:
+        now = self._touch()
+        region = {
+            "id": self._next_id,
+            "name": region_data.get("name", "Unknown"),
+            "nb_habitants": region_data.get("nb_habitants", 0),
+            "language": region_data.get("language", "français"),
+            "country": region_data.get("country", "France"),
+            "latitude": region_data.get("latitude"),
+            "longitude": region_data.get("longitude"),
+            "created_at": now,
+            "updated_at": now
+        }
+        self._regions[region["id"]] = region
+        self._next_id += 1
+        return dict(region)
+
+    def update_region(self, region_id: int, region_data: Dict[str, Any]) -> Dict[str, Any]:
+        region = self._regions.get(region_id)
+        if region is None:
+            return {}
+        # Copie : l'instantané courant garde l'ancienne version jusqu'à sa reconstruction
+        region = {**region, **{key: value for key, value in region_data.items() if key in region and value is not None}}
+        region["updated_at"] = self._touch()
+        self._regions[region_id] = region
+        return dict(region)
+
+    def delete_region(self, region_id: int) -> bool:
+        if self._regions.pop(region_id, None) is None:
+            return False
+        self._touch()
+        return True
+
+    # Mesures
+
+    def _position_of(self, region_name: str) -> Optional[int]:
+        position = self._positions.get(region_name)
+        if position is None:
+            region = self.snapshot().get_by_name(region_name)
+            position = self._positions.get(region.get("name")) if region else None
+        return position
+
+    def _canonical_name(self, region_name: str) -> str:
+        position = self._position_of(region_name)
+        return self._region_names[position] if position is not None else region_name
+
+    def _generated_reading(self, position: int, offset: int) -> Dict[str, Any]:
+        cell = position * self.readings_per_region + offset
+        recorded_at = self.generated_at - offset * self.reading_interval_seconds
+        return {
+            "id": cell + 1,
+            "region_name": self._region_names[position],
+            "temperature": round(self._temperature[cell], 2),
+            "condition": CONDITIONS[self._condition[cell]],
+            "humidity": self._humidity[cell],
+            "pressure": round(self._pressure[cell], 2),
+            "wind_speed": round(self._wind_speed[cell], 2),
+            "wind_direction": WIND_DIRECTIONS[self._wind_direction[cell]],
+            "recorded_at": datetime.fromtimestamp(recorded_at, timezone.utc).isoformat(),
+            "is_forecast": False,
+            "forecast_day": 0
+        }
+
+    def latest_reading(self, region_name: str) -> Dict[str, Any]:
+        """Dernière mesure d'une région, ou {} si elle n'en a aucune"""
+        name = self._canonical_name(region_name)
+        written = self._written_readings.get(name)
+        if written:
+            return dict(written[-1])
+        position = self._positions.get(name)
+        if position is None or not self.readings_per_region:
+            return {}
+        return self._generated_reading(position, 0)
+
+    def latest_readings(self) -> List[Dict[str, Any]]:
+        """Dernière mesure de chaque région, avec ses coordonnées"""
+        latest = []
+        for region in self._regions.values():
+            reading = self.latest_reading(region["name"])
+            if reading:
+                reading["latitude"] = region.get("latitude")
+                reading["longitude"] = region.get("longitude")
+                latest.append(reading)
+        return latest
+
+    def readings_since(self, region_name: str, since: datetime) -> List[Dict[str, Any]]:
+        """Mesures d'une région depuis `since`, de la plus récente à la plus ancienne"""
+        name = self._canonical_name(region_name)
+        since_iso = since.astimezone(timezone.utc).isoformat()
+        readings = [
+            dict(reading) for reading in reversed(self._written_readings.get(name, []))
+            if reading["recorded_at"] >= since_iso
+        ]
+        position = self._positions.get(name)
+        if position is not None:
+            span = int((self.generated_at - since.timestamp()) // self.reading_interval_seconds) + 1
+            readings.extend(
+                self._generated_reading(position, offset)
+                for offset in range(min(max(span, 0), self.readings_per_region))
+            )
+        return readings
+
+    def reading_rows_since(self, region_name: str, since: datetime) -> List[tuple]:
+        """
+        Mesures d'une région depuis `since` en tuples (région, température, condition, humidité,
+        pression, vent, direction, horodatage UTC), lues directement dans les tableaux colonne
+        """
+        name = self._canonical_name(region_name)
+        since_iso = since.astimezone(timezone.utc).isoformat()
+        rows = [
+            (reading["region_name"], reading["temperature"], reading["condition"], reading["humidity"],
+             reading["pressure"], reading["wind_speed"], reading["wind_direction"],
+             datetime.fromisoformat(reading["recorded_at"]))
+            for reading in reversed(self._written_readings.get(name, []))
+            if reading["recorded_at"] >= since_iso
+        ]
+        position = self._positions.get(name)
+        if position is not None:
+            span = int((self.generated_at - since.timestamp()) // self.reading_interval_seconds) + 1
+            first = position * self.readings_per_region
+            for offset in range(min(max(span, 0), self.readings_per_region)):
+                cell = first + offset
+                rows.append((
+                    name, round(self._temperature[cell], 2), CONDITIONS[self._condition[cell]], self._humidity[cell],
+                    round(self._pressure[cell], 2), round(self._wind_speed[cell], 2),
+                    WIND_DIRECTIONS[self._wind_direction[cell]],
+                    datetime.fromtimestamp(self.generated_at - offset * self.reading_interval_seconds, timezone.utc)
+                ))
+        return rows
+
+    def add_readings(self, records: List[Dict[str, Any]]) -> int:
+        for record in records:
+            recorded_at = record.get("recorded_at") or datetime.now(timezone.utc)
+            if isinstance(recorded_at, datetime):
+                recorded_at = recorded_at.isoformat()
+            reading = {
+                "id": self._next_reading_id,
+                "region_name": record.get("region_name"),
+                "temperature": record.get("temperature"),
+                "condition": record.get("condition"),
+                "humidity": record.get("humidity"),
+                "pressure": record.get("pressure"),
+                "wind_speed": record.get("wind_speed"),
+                "wind_direction": record.get("wind_direction"),
+                "recorded_at": recorded_at,
+                "is_forecast": record.get("is_forecast", False),
+                "forecast_day": record.get("forecast_day", 0)
+            }
+            self._next_reading_id += 1
+            self._written_readings.setdefault(reading["region_name"], []).append(reading)
+        return len(records)
+
+    # Prévisions
+
+    def _generated_forecast(self, position: int, forecast_date: date) -> Dict[str, Any]:
+        # Graine dérivée d'entiers uniquement : indépendante de PYTHONHASHSEED
+        rng = random.Random((self.seed * 1_000_003 + position) * 1_000_033 + forecast_date.toordinal())
+        region_name = self._region_names[position]
+        average = _base_temperature(self._latitudes[position]) + rng.gauss(0, 3)
+        spread = rng.uniform(3, 8)
+        humidity = max(5, min(100, int(rng.gauss(65, 12))))
+        return {
+            "id": None,
+            "region_name": region_name,
+            "forecast_date": forecast_date.isoformat(),
+            "day": DAY_NAMES[forecast_date.weekday()],
+            "temperature_min": round(average - spread, 2),
+            "temperature_max": round(average + spread, 2),
+            "temperature": round(average, 2),
+            "condition": CONDITIONS[_condition_index(humidity, rng)],
+            "humidity": humidity,
+            "pressure": round(rng.gauss(1013.0, 6.0), 2),
+            "wind_speed": round(abs(rng.gauss(12.0, 6.0)), 2),
+            "wind_direction": rng.choice(WIND_DIRECTIONS),
+            "precipitation_probability": max(0, min(100, humidity - 30 + rng.randint(-10, 10))),
+            "created_at": None
+        }
+
+    def forecasts(self, region_name: str, start: date, days: int) -> List[Dict[str, Any]]:
+        """Prévisions d'une région pour les `days` jours à partir de `start`"""
+        name = self._canonical_name(region_name)
+        position = self._positions.get(name)
+        forecasts = []
+        for offset in range(days):
+            forecast_date = start + timedelta(days=offset)
+            written = self._written_forecasts.get((name, forecast_date))
+            if written is not None:
+                forecasts.append(dict(written))
+            elif position is not None:
+                forecasts.append(self._generated_forecast(position, forecast_date))
+        return forecasts
+
+    def upsert_forecast(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        forecast_date = record.get("forecast_date")
+        if isinstance(forecast_date, str):
+            forecast_date = date.fromisoformat(forecast_date[:10])
+        elif isinstance(forecast_date, datetime):
+            forecast_date = forecast_date.date()
+        forecast = {
+            "id": None,
+            "region_name": record.get("region_name"),
+            "forecast_date": forecast_date.isoformat(),
+            "day": record.get("day_name") or DAY_NAMES[forecast_date.weekday()],
+            "temperature_min": record.get("temperature_min"),
+            "temperature_max": record.get("temperature_max"),
+            "temperature": record.get("temperature_avg"),
+            "condition": record.get("condition"),
+            "humidity": record.get("humidity"),
+            "pressure": record.get("pressure"),
+            "wind_speed": record.get("wind_speed"),
+            "wind_direction": record.get("wind_direction"),
+            "precipitation_probability": record.get("precipitation_probability", 0),
+            "created_at": datetime.now(timezone.utc).isoformat()
+        }
+        self._written_forecasts[(forecast["region_name"], forecast_date)] = forecast
+        return dict(forecast)
@@ -0,0 +1,161 @@
+"""
+Fixtures JSON des repositories mock, écrites par `python -m backend.simulation.seed --fixtures`.
+
+Un dossier de fixtures contient trois fichiers, nommés d'après les tables :
+
+- `regions.json` : régions, au format de `Region.to_dict()` ;
+- `weather_data.json` : mesures des derniers jours, au format de `WeatherData.to_dict()` ;
+- `weather_forecasts.json` : prévisions, au format de `WeatherForecast.to_dict()`.
+
+Avec MOCK_FIXTURES_DIR, les repositories mock servent ces données à la place de leurs
+quelques régions codées en dur. Le dossier est lu une fois par processus.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+REGIONS_FILE = "regions.json"
+WEATHER_DATA_FILE = "weather_data.json"
+WEATHER_FORECASTS_FILE = "weather_forecasts.json"
+
+
+def reading_fixture(reading_id: int, row: Sequence[Any]) -> Dict[str, Any]:
+    """Mesure générée (ordre de READING_COLUMNS) au format de `WeatherData.to_dict()`"""
+    (region_name, temperature, condition, humidity, pressure, wind_speed, wind_direction, recorded_at,
+     is_forecast, forecast_day) = row
+    return {
+        "id": reading_id,
+        "region_name": region_name,
+        "temperature": temperature,
+        "condition": condition,
+        "humidity": humidity,
+        "pressure": pressure,
+        "wind_speed": wind_speed,
+        "wind_direction": wind_direction,
+        "recorded_at": recorded_at.isoformat(),
+        "is_forecast": is_forecast,
+        "forecast_day": forecast_day
+    }
+
+
+def forecast_fixture(forecast_id: int, row: Sequence[Any]) -> Dict[str, Any]:
+    """Prévision générée (ordre de FORECAST_COLUMNS) au format de `WeatherForecast.to_dict()`"""
+    (region_name, forecast_date, day_name, temperature_min, temperature_max, temperature_avg, condition,
+     humidity, pressure, wind_speed, wind_direction, precipitation_probability) = row
+    return {
+        "id": forecast_id,
+        "region_name": region_name,
+        "forecast_date": forecast_date.isoformat(),
+        "day": day_name,
+        "temperature_min": temperature_min,
+        "temperature_max": temperature_max,
+        "temperature": temperature_avg,
+        "condition": condition,
+        "humidity": humidity,
+        "pressure": pressure,
+        "wind_speed": wind_speed,
+        "wind_direction": wind_direction,
+        "precipitation_probability": precipitation_probability,
+        "created_at": None
+    }
+
+
+def write_fixtures(directory: str, regions: List[Dict[str, Any]], readings: Iterable[Sequence[Any]],
+                   forecasts: Iterable[Sequence[Any]]) -> Dict[str, int]:
+    """
+    Écrit un dossier de fixtures
+
+    Args:
+        directory: Dossier de destination (créé au besoin)
+        regions: Régions au format de `Region.to_dict()`
+        readings: Mesures générées (ordre de READING_COLUMNS)
+        forecasts: Prévisions générées (ordre de FORECAST_COLUMNS)
+
+    Returns:
+        Nombre d'entrées écrites par fichier
+    """
+    os.makedirs(directory, exist_ok=True)
+    contents = {
+        REGIONS_FILE: regions,
+        WEATHER_DATA_FILE: [reading_fixture(position, row) for position, row in enumerate(readings, start=1)],
+        WEATHER_FORECASTS_FILE: [forecast_fixture(position, row) for position, row in enumerate(forecasts, start=1)],
+    }
+    for name, entries in contents.items():
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as file:
+            json.dump(entries, file, ensure_ascii=False)
+    return {name: len(entries) for name, entries in contents.items()}
+
+
+class MockFixtures:
+    """
+    Contenu d'un dossier de fixtures, indexé comme les repositories mock l'utilisent.
+    Partagé par tout le processus : les repositories copient ce qu'ils modifient.
+    """
+
+    def __init__(self, regions: List[Dict[str, Any]], readings: List[Dict[str, Any]],
+                 forecasts: List[Dict[str, Any]]):
+        """
+        Args:
+            regions: Régions au format de `Region.to_dict()`
+            readings: Mesures au format de `WeatherData.to_dict()`
+            forecasts: Prévisions au format de `WeatherForecast.to_dict()`
+        """
+        self.regions = regions
+        self.coordinates = {
+            region["name"]: {"latitude": region.get("latitude"), "longitude": region.get("longitude")}
+            for region in regions
+        }
+        # Historique par région, de la mesure la plus récente à la plus ancienne
+        self.history: Dict[str, List[Dict[str, Any]]] = {}
+        for reading in readings:
+            self.history.setdefault(reading["region_name"], []).append(reading)
+        for region_history in self.history.values():
+            region_history.sort(key=lambda reading: reading["recorded_at"], reverse=True)
+        self.latest = {region_name: region_history[0] for region_name, region_history in self.history.items()}
+        # Indexées par (region_name, forecast_date) comme la contrainte unique en base
+        self.forecasts = {(forecast["region_name"], forecast["forecast_date"]): forecast for forecast in forecasts}
+
+    @classmethod
+    def load(cls, directory: str) -> "MockFixtures":
+        """Lit un dossier écrit par `write_fixtures`"""
+        contents = []
+        for name in (REGIONS_FILE, WEATHER_DATA_FILE, WEATHER_FORECASTS_FILE):
+            with open(os.path.join(directory, name), encoding="utf-8") as file:
+                contents.append(json.load(file))
+        fixtures = cls(*contents)
+        logger.info(f"📂 Fixtures mock chargées depuis {directory}: {len(fixtures.regions)} régions, "
+                    f"{len(contents[1])} mesures, {len(fixtures.forecasts)} prévisions")
+        return fixtures
+
+    @classmethod
+    def from_env(cls) -> Optional["MockFixtures"]:
+        """
+        Charge le dossier MOCK_FIXTURES_DIR (non définie : données codées en dur des mocks)
+
+        Returns:
+            MockFixtures, ou None si aucun dossier n'est configuré
+        """
+        directory = os.getenv("MOCK_FIXTURES_DIR")
+        return cls.load(directory) if directory else None
+
+
+# Instance globale des fixtures (None : données codées en dur)
+_mock_fixtures = None
+_mock_fixtures_loaded = False
+
+def get_mock_fixtures() -> Optional[MockFixtures]:
+    """
+    Retourne les fixtures des repositories mock.
+
+    Returns:
+        MockFixtures partagées par tout le processus, ou None si MOCK_FIXTURES_DIR n'est pas définie
+    """
+    global _mock_fixtures, _mock_fixtures_loaded
+    if not _mock_fixtures_loaded:
+        _mock_fixtures = MockFixtures.from_env()
+        _mock_fixtures_loaded = True
+    return _mock_fixtures
@@ -0,0 +1,77 @@
+"""
+Injection de latence et d'erreurs pour le backend de simulation.
+
+Chaque appel de repository attend une durée tirée d'une distribution
+(constante, uniforme ou log-normale) puis échoue avec une probabilité donnée,
+pour reproduire le comportement d'une base distante sous charge.
+"""
+
+import asyncio
+import math
+import random
+from typing import Optional
+
+# Distributions disponibles
+DISTRIBUTIONS = ("none", "constant", "uniform", "lognormal")
+
+# Quantile 0,99 de la loi normale centrée réduite
+_Z_99 = 2.3263478740408408
+
+
+class SimulatedDatabaseError(Exception):
+    """Erreur injectée par la simulation (équivalent d'une erreur du pilote de base)"""
+
+
+class LatencyModel:
+    """
+    Modèle de latence et d'erreurs d'un appel à la base simulée.
+    """
+
+    def __init__(self, distribution: str = "none", median_ms: float = 0.0,
+                 p99_ms: Optional[float] = None, error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Args:
+            distribution: "none", "constant", "uniform" (entre 0 et 2 × médiane) ou "lognormal"
+            median_ms: Latence médiane en millisecondes
+            p99_ms: 99e centile en millisecondes (loi log-normale ; 4 × médiane par défaut)
+            error_rate: Probabilité d'échec d'un appel, entre 0 et 1
+            seed: Graine du générateur (tirages reproductibles)
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribution de latence inconnue: {distribution} (attendu: {', '.join(DISTRIBUTIONS)})")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"Taux d'erreur hors de [0, 1]: {error_rate}")
+        self.distribution = distribution
+        self.median_ms = median_ms
+        self.p99_ms = p99_ms if p99_ms is not None else 4 * median_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._mu = math.log(median_ms) if median_ms > 0 else 0.0
+        self._sigma = (math.log(self.p99_ms) - self._mu) / _Z_99 if median_ms > 0 and self.p99_ms > median_ms else 0.0
+        self.calls = 0
+        self.errors = 0
+
+    def sample_ms(self) -> float:
+        """Tire une latence en millisecondes"""
+        if self.distribution == "none" or self.median_ms <= 0:
+            return 0.0
+        if self.distribution == "constant":
+            return self.median_ms
+        if self.distribution == "uniform":
+            return self._rng.uniform(0.0, 2 * self.median_ms)
+        return self._rng.lognormvariate(self._mu, self._sigma)
+
+    async def __call__(self, operation: str):
+        """
+        Simule un aller-retour vers la base pour `operation`.
+
+        Raises:
+            SimulatedDatabaseError: Avec la probabilité `error_rate`
+        """
+        self.calls += 1
+        delay_ms = self.sample_ms()
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise SimulatedDatabaseError(f"Erreur simulée pendant {operation}")
@@ -0,0 +1,324 @@
+"""
+Chargement d'un jeu de données synthétique (`simulation/synthetic.py`) à l'échelle de la
+production : dans PostgreSQL par COPY, en parallèle, et/ou en fixtures JSON des repositories
+mock (`simulation/fixtures.py`).
+
+Les régions sont réparties entre `--workers` processus. Chacun génère les mesures de ses
+régions et les envoie par `COPY ... FROM STDIN` (format binaire d'asyncpg) sur sa propre
+connexion, une instruction par jour de mesures : pas d'INSERT ligne à ligne, pas de tampon
+de tout l'historique en mémoire. Dans chaque jour, les stations sont entrelacées pas à pas,
+comme à l'ingestion : l'ordre physique de la table suit le temps, et les lectures d'une
+région dispersées sur les pages donnent les mêmes plans qu'en production. Le jeu de données
+ne dépend pas du nombre de processus.
+
+- `--truncate` vide regions, weather_data et weather_forecasts avant le chargement ;
+  sinon les régions existantes (même nom) sont conservées et les mesures s'ajoutent.
+- `--defer-indexes` supprime les index secondaires de weather_data pendant le chargement
+  et les reconstruit ensuite, en parallèle (une construction par index et par connexion,
+  plus rapide que leur mise à jour ligne à ligne). Ils sont reconstruits même si le
+  chargement échoue.
+- `--no-notify` suspend le déclencheur de notification des insertions de weather_data
+  (migration 003) : chaque COPY y paierait une table de transition et un DISTINCT ON.
+  Les caches des workers en cours d'exécution ne sont alors pas invalidés.
+- Les prévisions passent par une table temporaire puis un upsert sur (region_name,
+  forecast_date) ; les statistiques des tables sont recalculées (ANALYZE) à la fin.
+
+Exemple (50 M de mesures : 1 000 régions, 1 an à 10 minutes, 14 jours de prévisions) :
+    python -m backend.simulation.seed --postgresql --regions 1000 --years 1 --interval-minutes 10 \\
+        --truncate --defer-indexes --no-notify --fixtures /tmp/weather-fixtures
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+from backend.simulation.fixtures import write_fixtures
+from backend.simulation.synthetic import FORECAST_COLUMNS, READING_COLUMNS, SyntheticDataset
+
+logger = logging.getLogger(__name__)
+
+REGION_COLUMNS = ("name", "nb_habitants", "language", "country", "latitude", "longitude")
+
+# Régions et prévisions : COPY dans une table temporaire, puis une seule instruction
+# (conflits résolus, une seule notification d'invalidation par lot)
+REGION_STAGING = "CREATE TEMPORARY TABLE seed_regions (LIKE regions INCLUDING DEFAULTS) ON COMMIT DROP"
+
+REGION_INSERT = f"""
+INSERT INTO regions ({", ".join(REGION_COLUMNS)})
+SELECT {", ".join(REGION_COLUMNS)} FROM seed_regions
+ON CONFLICT (name) DO NOTHING
+"""
+
+# Index de weather_data reconstructibles : ni la clé primaire ni les contraintes d'unicité
+SECONDARY_INDEXES = """
+SELECT index_class.relname, pg_get_indexdef(index_class.oid)
+FROM pg_index
+JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+WHERE pg_index.indrelid = 'weather_data'::regclass
+  AND NOT pg_index.indisprimary AND NOT pg_index.indisunique
+"""
+
+# Déclencheur des insertions de weather_data (voir `database/notifications.py`)
+NOTIFY_TRIGGER = "weather_data_notify_insert"
+
+TRIGGER_EXISTS = "SELECT EXISTS (SELECT 1 FROM pg_trigger WHERE tgrelid = 'weather_data'::regclass AND tgname = $1)"
+
+FORECAST_STAGING = "CREATE TEMPORARY TABLE seed_forecasts (LIKE weather_forecasts INCLUDING DEFAULTS) ON COMMIT DROP"
+
+FORECAST_UPSERT = f"""
+INSERT INTO weather_forecasts ({", ".join(FORECAST_COLUMNS)})
+SELECT {", ".join(FORECAST_COLUMNS)} FROM seed_forecasts
+ON CONFLICT (region_name, forecast_date) DO UPDATE SET
+    {", ".join(f"{column} = EXCLUDED.{column}" for column in FORECAST_COLUMNS[2:])},
+    created_at = CURRENT_TIMESTAMP
+"""
+
+
+RECORDED_AT = READING_COLUMNS.index("recorded_at")
+
+
+def _interleaved(streams: List[Iterator[Tuple]], steps: int) -> Iterator[Tuple]:
+    # `steps` mesures de chaque station, une station après l'autre à chaque pas de temps
+    for rows in zip(*(islice(stream, steps) for stream in streams)):
+        yield from rows
+
+
+def _recent(rows: Iterator[Tuple], start: datetime, kept: List[Tuple]) -> Iterator[Tuple]:
+    # Laisse passer les mesures en gardant celles postérieures à `start` (fixtures)
+    for row in rows:
+        if row[RECORDED_AT] >= start:
+            kept.append(row)
+        yield row
+
+
+async def _load_readings(dsn: Optional[str], dataset: SyntheticDataset, regions: List[Dict[str, Any]],
+                         fixture_start: Optional[datetime]) -> Tuple[int, List[Tuple]]:
+    connection = await asyncpg.connect(dsn) if dsn else None
+    kept: List[Tuple] = []
+    streams = [dataset.readings(region, station) for region in regions for station in range(dataset.stations)]
+    if fixture_start is not None:
+        streams = [_recent(stream, fixture_start, kept) for stream in streams]
+    steps_per_day = dataset.readings_per_station // dataset.days
+    try:
+        for day in range(dataset.days):
+            rows = _interleaved(streams, steps_per_day)
+            if connection is None:
+                for _ in rows:
+                    pass
+            else:
+                await connection.copy_records_to_table("weather_data", records=rows, columns=READING_COLUMNS)
+    finally:
+        if connection is not None:
+            await connection.close()
+    return len(streams) * dataset.readings_per_station, kept
+
+
+def load_readings(dsn: Optional[str], dataset: SyntheticDataset, regions: List[Dict[str, Any]],
+                  fixture_start: Optional[datetime] = None) -> Tuple[int, List[Tuple]]:
+    """
+    Génère les mesures d'un lot de régions et les charge par COPY (point d'entrée d'un processus)
+
+    Args:
+        dsn: DSN PostgreSQL, ou None pour générer sans charger (fixtures seules)
+        dataset: Jeu de données
+        regions: Régions du lot
+        fixture_start: Début des mesures gardées pour les fixtures (None : aucune)
+
+    Returns:
+        (nombre de mesures générées, mesures gardées pour les fixtures)
+    """
+    return asyncio.run(_load_readings(dsn, dataset, regions, fixture_start))
+
+
+class DatasetSeeder:
+    """
+    Charge un jeu de données synthétique dans PostgreSQL et/ou en fixtures mock.
+    """
+
+    def __init__(self, dataset: SyntheticDataset, dsn: Optional[str] = None, workers: int = 1,
+                 truncate: bool = False, defer_indexes: bool = False, notify: bool = True):
+        """
+        Args:
+            dataset: Jeu de données à charger
+            dsn: DSN PostgreSQL (None : pas de chargement en base)
+            workers: Processus de génération et de COPY
+            truncate: Vider les tables avant le chargement
+            defer_indexes: Reconstruire les index secondaires de weather_data après le chargement
+            notify: Garder le déclencheur de notification des insertions de weather_data
+        """
+        self.dataset = dataset
+        self.dsn = dsn
+        self.workers = max(1, workers)
+        self.truncate = truncate
+        self.defer_indexes = defer_indexes
+        self.notify = notify
+        self.timings: Dict[str, float] = {}
+
+    def _timed(self, phase: str, started: float):
+        self.timings[phase] = time.perf_counter() - started
+
+    async def seed(self, fixtures_directory: Optional[str] = None, fixture_days: float = 1.0) -> Dict[str, int]:
+        """
+        Charge le jeu de données
+
+        Args:
+            fixtures_directory: Dossier des fixtures mock à écrire (None : aucune)
+            fixture_days: Jours de mesures (les plus récents) gardés dans les fixtures
+
+        Returns:
+            Nombre de régions, mesures et prévisions générées
+        """
+        regions = self.dataset.regions()
+        forecasts = [forecast for region in regions for forecast in self.dataset.forecasts(region)]
+        # Mesures des derniers jours pour les fixtures
+        fixture_start = None
+        if fixtures_directory:
+            fixture_start = self.dataset.start + timedelta(days=self.dataset.days - fixture_days)
+
+        connection = await asyncpg.connect(self.dsn) if self.dsn else None
+        deferred: List[Tuple[str, str]] = []
+        suspended = False
+        try:
+            if connection is not None:
+                started = time.perf_counter()
+                if self.truncate:
+                    await connection.execute("TRUNCATE weather_data, weather_forecasts, regions RESTART IDENTITY")
+                async with connection.transaction():
+                    await connection.execute(REGION_STAGING)
+                    await connection.copy_records_to_table(
+                        "seed_regions", records=[tuple(region[column] for column in REGION_COLUMNS) for region in regions],
+                        columns=REGION_COLUMNS
+                    )
+                    await connection.execute(REGION_INSERT)
+                self._timed("regions", started)
+                if self.defer_indexes:
+                    deferred = [tuple(index) for index in await connection.fetch(SECONDARY_INDEXES)]
+                    for name, _ in deferred:
+                        await connection.execute(f'DROP INDEX "{name}"')
+                    logger.info(f"Index différés: {', '.join(name for name, _ in deferred)}")
+                if not self.notify and await connection.fetchval(TRIGGER_EXISTS, NOTIFY_TRIGGER):
+                    await connection.execute(f"ALTER TABLE weather_data DISABLE TRIGGER {NOTIFY_TRIGGER}")
+                    suspended = True
+
+            started = time.perf_counter()
+            readings, recent = await self._load_readings(regions, fixture_start)
+            self._timed("readings", started)
+
+            if connection is not None:
+                started = time.perf_counter()
+                async with connection.transaction():
+                    await connection.execute(FORECAST_STAGING)
+                    await connection.copy_records_to_table("seed_forecasts", records=forecasts,
+                                                           columns=FORECAST_COLUMNS)
+                    await connection.execute(FORECAST_UPSERT)
+                self._timed("forecasts", started)
+        finally:
+            if suspended:
+                await connection.execute(f"ALTER TABLE weather_data ENABLE TRIGGER {NOTIFY_TRIGGER}")
+            if deferred:
+                started = time.perf_counter()
+                await self._create_indexes([definition for _, definition in deferred])
+                self._timed("indexes", started)
+            if connection is not None:
+                started = time.perf_counter()
+                await connection.execute("ANALYZE regions, weather_data, weather_forecasts")
+                self._timed("analyze", started)
+                await connection.close()
+
+        if fixtures_directory:
+            started = time.perf_counter()
+            recent.sort(key=lambda row: (row[RECORDED_AT], row[0]))
+            written = write_fixtures(fixtures_directory, regions, recent, forecasts)
+            self._timed("fixtures", started)
+            logger.info(f"📂 Fixtures écrites dans {fixtures_directory}: {written}")
+        return {"regions": len(regions), "readings": readings, "forecasts": len(forecasts)}
+
+    async def _load_readings(self, regions: List[Dict[str, Any]],
+                             fixture_start: Optional[datetime]) -> Tuple[int, List[Tuple]]:
+        # Lots entrelacés : chaque processus reçoit des régions de toute la liste
+        parts = [regions[position::self.workers] for position in range(self.workers)]
+        parts = [part for part in parts if part]
+        if len(parts) == 1:
+            return await _load_readings(self.dsn, self.dataset, parts[0], fixture_start)
+        loop = asyncio.get_running_loop()
+        # spawn : processus neufs, sans la boucle d'événements ni les connexions du parent
+        with ProcessPoolExecutor(len(parts), mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(executor, load_readings, self.dsn, self.dataset, part, fixture_start)
+                for part in parts
+            ))
+        return sum(count for count, _ in results), [row for _, kept in results for row in kept]
+
+    async def _create_indexes(self, definitions: Sequence[str]):
+        async def create(definition: str):
+            connection = await asyncpg.connect(self.dsn)
+            try:
+                await connection.execute("SET maintenance_work_mem TO '256MB'")
+                await connection.execute(definition)
+            finally:
+                await connection.close()
+
+        await asyncio.gather(*(create(definition) for definition in definitions))
+        logger.info(f"{len(definitions)} index de weather_data reconstruits")
+
+
+async def main(arguments: argparse.Namespace):
+    """Charge le jeu de données décrit par les arguments de la ligne de commande"""
+    dataset = SyntheticDataset(
+        regions=arguments.regions, stations=arguments.stations, years=arguments.years,
+        interval_minutes=arguments.interval_minutes, forecast_days=arguments.forecast_days,
+        end=arguments.end, seed=arguments.seed
+    )
+    dsn = None
+    if arguments.postgresql:
+        from sqlalchemy.engine import make_url
+
+        from backend.database.connection import db_config
+
+        dsn = make_url(db_config.get_database_url()).set(drivername="postgresql").render_as_string(hide_password=False)
+    seeder = DatasetSeeder(dataset, dsn, workers=arguments.workers, truncate=arguments.truncate,
+                           defer_indexes=arguments.defer_indexes, notify=arguments.notify)
+    print(f"{dataset.region_count} régions × {dataset.stations} stations × {dataset.readings_per_station:,} mesures "
+          f"({dataset.start:%Y-%m-%d} → {dataset.end:%Y-%m-%d}, toutes les {dataset.interval_minutes} min) "
+          f"= {dataset.reading_count:,} mesures, {arguments.workers} processus")
+    started = time.perf_counter()
+    counts = await seeder.seed(arguments.fixtures, arguments.fixture_days)
+    elapsed = time.perf_counter() - started
+    for phase, seconds in seeder.timings.items():
+        print(f"  {phase:<10}: {seconds:8.1f} s")
+    print(f"{counts['readings']:,} mesures, {counts['forecasts']:,} prévisions en {elapsed:.1f} s "
+          f"({counts['readings'] / elapsed:,.0f} mesures/s)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--regions", type=int, default=1000)
+    parser.add_argument("--stations", type=int, default=1, help="Stations par région")
+    parser.add_argument("--years", type=float, default=1.0, help="Profondeur de l'historique")
+    parser.add_argument("--interval-minutes", type=int, default=10, help="Intervalle des mesures d'une station")
+    parser.add_argument("--forecast-days", type=int, default=14)
+    parser.add_argument("--end", type=date.fromisoformat, default=None,
+                        help="Premier jour sans mesures, AAAA-MM-JJ (par défaut : aujourd'hui)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--postgresql", action="store_true", help="Charger dans la base configurée par DB_*")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--truncate", action="store_true")
+    parser.add_argument("--defer-indexes", action="store_true")
+    parser.add_argument("--no-notify", dest="notify", action="store_false",
+                        help="Suspendre la notification des insertions de weather_data pendant le chargement")
+    parser.add_argument("--fixtures", default=None, help="Dossier des fixtures mock à écrire")
+    parser.add_argument("--fixture-days", type=float, default=1.0)
+    arguments = parser.parse_args()
+    if not arguments.postgresql and not arguments.fixtures:
+        parser.error("au moins une destination : --postgresql et/ou --fixtures DOSSIER")
+    asyncio.run(main(arguments))
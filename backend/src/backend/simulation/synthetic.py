@@ -0,0 +1,224 @@
+"""
+Jeux de données synthétiques réalistes, à l'échelle de la production.
+
+Les mesures suivent un petit modèle climatique : cycle saisonnier (plus ample vers l'est),
+cycle diurne, anomalies de température et de pression persistantes sur quelques jours
+(processus AR(1)), vent en rafales et direction qui tourne lentement. L'humidité et la
+condition découlent de la température et de la pression : les épisodes pluvieux suivent
+les dépressions.
+
+Chaque région a `stations` stations dont les mesures sont décalées dans l'intervalle : la
+résolution de la région est `interval_minutes / stations`. weather_data n'a pas de colonne
+station : les mesures d'une station sont enregistrées sous le nom de sa région, avec le
+biais propre à la station.
+
+Tout est déterministe : les générateurs aléatoires sont dérivés de (graine, région,
+station) par des entiers (indépendants de PYTHONHASHSEED), de sorte que les mesures d'une
+région ne dépendent ni de l'ordre de génération ni du nombre de processus.
+"""
+
+import math
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.simulation.dataset import CONDITIONS, DAY_NAMES, WIND_DIRECTIONS, generate_regions
+
+# Colonnes des mesures générées, dans l'ordre des tuples de `readings`
+READING_COLUMNS = (
+    "region_name", "temperature", "condition", "humidity", "pressure", "wind_speed", "wind_direction",
+    "recorded_at", "is_forecast", "forecast_day"
+)
+
+# Colonnes des prévisions générées, dans l'ordre des tuples de `forecasts`
+FORECAST_COLUMNS = (
+    "region_name", "forecast_date", "day_name", "temperature_min", "temperature_max", "temperature_avg",
+    "condition", "humidity", "pressure", "wind_speed", "wind_direction", "precipitation_probability"
+)
+
+_MINUTES_PER_DAY = 24 * 60
+_FORECAST_STREAM = 1_000_000
+
+
+def _stream_seed(seed: int, region_id: int, stream: int) -> int:
+    # Graine dérivée d'entiers uniquement : indépendante de PYTHONHASHSEED
+    return (seed * 1_000_003 + region_id) * 1_000_033 + stream
+
+
+def _seasonal(day: date, amplitude: float) -> float:
+    """Écart saisonnier à la moyenne annuelle : minimum vers le 20 janvier"""
+    return -amplitude * math.cos(2 * math.pi * (day.timetuple().tm_yday - 20) / 365.25)
+
+
+def _condition(humidity: int, pressure: float) -> str:
+    """Condition déduite de l'humidité, assombrie par les basses pressions"""
+    index = (humidity - 40) // 12 + (1 if pressure < 1005.0 else 0) - (1 if pressure > 1022.0 else 0)
+    return CONDITIONS[max(0, min(len(CONDITIONS) - 1, index))]
+
+
+class SyntheticDataset:
+    """
+    Paramètres d'un jeu de données synthétique et générateurs de ses régions, mesures et
+    prévisions. Les mesures couvrent [end - years, end), les prévisions les `forecast_days`
+    jours qui commencent à `end`.
+    """
+
+    def __init__(self, regions: int = 1000, stations: int = 1, years: float = 1.0, interval_minutes: int = 10,
+                 forecast_days: int = 14, end: Optional[date] = None, seed: int = 42):
+        """
+        Args:
+            regions: Nombre de régions
+            stations: Stations par région
+            years: Profondeur de l'historique (années de 365 jours)
+            interval_minutes: Intervalle entre deux mesures d'une station (diviseur de 1440)
+            forecast_days: Jours de prévisions par région
+            end: Premier jour non couvert par les mesures (par défaut : aujourd'hui, UTC)
+            seed: Graine de la génération
+
+        Raises:
+            ValueError: Si un paramètre est hors bornes
+        """
+        if regions < 1 or stations < 1 or years <= 0 or forecast_days < 0:
+            raise ValueError("regions, stations et years doivent être positifs, forecast_days positif ou nul")
+        if interval_minutes < 1 or _MINUTES_PER_DAY % interval_minutes:
+            raise ValueError(f"interval_minutes doit diviser {_MINUTES_PER_DAY} (reçu: {interval_minutes})")
+        self.region_count = regions
+        self.stations = stations
+        self.years = years
+        self.interval_minutes = interval_minutes
+        self.forecast_days = forecast_days
+        self.end = end or datetime.now(timezone.utc).date()
+        self.seed = seed
+        self.days = max(1, round(years * 365))
+        self.start = datetime(self.end.year, self.end.month, self.end.day, tzinfo=timezone.utc) - timedelta(days=self.days)
+        self.readings_per_station = self.days * _MINUTES_PER_DAY // interval_minutes
+
+    @property
+    def reading_count(self) -> int:
+        """Nombre total de mesures du jeu de données"""
+        return self.region_count * self.stations * self.readings_per_station
+
+    def regions(self) -> List[Dict[str, Any]]:
+        """Régions du jeu de données (même forme que `Region.to_dict()`), créées au début de l'historique"""
+        created_at = self.start.isoformat()
+        return [
+            {**region, "created_at": created_at, "updated_at": created_at}
+            for region in generate_regions(self.region_count, self.seed)
+        ]
+
+    def readings(self, region: Dict[str, Any], station: int) -> Iterator[Tuple]:
+        """
+        Mesures d'une station, de la plus ancienne à la plus récente
+
+        Args:
+            region: Région (voir `regions`)
+            station: Numéro de la station (0 à stations - 1)
+
+        Returns:
+            Itérateur de tuples dans l'ordre de READING_COLUMNS
+        """
+        rng = random.Random(_stream_seed(self.seed, region["id"], station))
+        gauss, uniform = rng.gauss, rng.random
+        latitude = region.get("latitude") or 46.0
+        longitude = region.get("longitude") or 2.0
+        name = region["name"]
+
+        # Climat de la station : plus froid vers le nord, saisons plus marquées vers l'est
+        mean = 24.0 - 1.1 * (latitude - 41.0) + gauss(0, 0.8)
+        amplitude = 6.0 + 0.3 * (longitude + 5.0)
+        diurnal_amplitude = rng.uniform(3.5, 6.5)
+        pressure_mean = 1013.0 + gauss(0, 1.5)
+        wind_mean = rng.uniform(6.0, 18.0)
+
+        # Tables par jour et par créneau : le décalage de la station dans l'intervalle compris
+        step = timedelta(minutes=self.interval_minutes)
+        offset = step * station / self.stations
+        per_day = _MINUTES_PER_DAY // self.interval_minutes
+        diurnal = [
+            diurnal_amplitude * math.sin(((slot * step + offset).total_seconds() / 3600 - 9) * math.pi / 12)
+            for slot in range(per_day)
+        ]
+        first_day = self.start.date()
+        seasonal = [mean + _seasonal(first_day + timedelta(days=day), amplitude) for day in range(self.days)]
+
+        # Persistance des anomalies par pas de temps (quelques jours pour la météo, une heure pour le vent).
+        # Innovations uniformes centrées de variance 1 : trois fois moins chères que gauss(), et les
+        # anomalies, qui en cumulent des dizaines, restent quasi gaussiennes
+        hours = self.interval_minutes / 60
+        weather_keep, pressure_keep, gust_keep = math.exp(-hours / 60), math.exp(-hours / 48), math.exp(-hours / 1.5)
+        spread = math.sqrt(12)
+        weather_noise = 3.0 * math.sqrt(1 - weather_keep ** 2) * spread
+        pressure_noise = 7.0 * math.sqrt(1 - pressure_keep ** 2) * spread
+        gust_noise = math.sqrt(1 - gust_keep ** 2) * spread
+        turn = 0.7 * math.sqrt(hours)
+        conditions = [[_condition(humidity, pressure) for humidity in range(101)] for pressure in (1000.0, 1013.0, 1030.0)]
+        floor = math.floor
+
+        weather, pressure_anomaly, gust = gauss(0, 3.0), gauss(0, 7.0), gauss(0, 1.0)
+        heading = uniform() * len(WIND_DIRECTIONS)
+        moment = self.start + offset
+        for day in range(self.days):
+            season = seasonal[day]
+            for cycle in diurnal:
+                weather = weather_keep * weather + weather_noise * (uniform() - 0.5)
+                pressure_anomaly = pressure_keep * pressure_anomaly + pressure_noise * (uniform() - 0.5)
+                gust = gust_keep * gust + gust_noise * (uniform() - 0.5)
+                heading = (heading + turn * (uniform() - 0.5)) % len(WIND_DIRECTIONS)
+                pressure = pressure_mean + pressure_anomaly
+                humidity = int(68 - 2.2 * cycle - 1.2 * pressure_anomaly + 4 * gust)
+                humidity = 5 if humidity < 5 else 100 if humidity > 100 else humidity
+                wind_speed = wind_mean * (1 + 0.45 * gust) - 0.4 * pressure_anomaly
+                # Arrondis au dixième (floor(x + 0.5) : quatre fois plus rapide que round())
+                yield (
+                    name,
+                    floor((season + cycle + weather) * 10 + 0.5) / 10,
+                    conditions[0 if pressure < 1005.0 else 2 if pressure > 1022.0 else 1][humidity],
+                    humidity,
+                    floor(pressure * 10 + 0.5) / 10,
+                    floor(abs(wind_speed) * 10 + 0.5) / 10,
+                    WIND_DIRECTIONS[int(heading)],
+                    moment,
+                    False,
+                    0
+                )
+                moment += step
+
+    def forecasts(self, region: Dict[str, Any]) -> List[Tuple]:
+        """
+        Prévisions d'une région pour les `forecast_days` jours qui commencent à `end`
+
+        Args:
+            region: Région (voir `regions`)
+
+        Returns:
+            Tuples dans l'ordre de FORECAST_COLUMNS
+        """
+        rng = random.Random(_stream_seed(self.seed, region["id"], _FORECAST_STREAM))
+        latitude = region.get("latitude") or 46.0
+        longitude = region.get("longitude") or 2.0
+        mean = 24.0 - 1.1 * (latitude - 41.0)
+        amplitude = 6.0 + 0.3 * (longitude + 5.0)
+        forecasts = []
+        for offset in range(self.forecast_days):
+            forecast_date = self.end + timedelta(days=offset)
+            # L'incertitude croît avec l'échéance
+            average = mean + _seasonal(forecast_date, amplitude) + rng.gauss(0, 2.0 + 0.2 * offset)
+            spread = rng.uniform(3.0, 7.0)
+            pressure = rng.gauss(1013.0, 7.0)
+            humidity = max(5, min(100, int(rng.gauss(68 - 1.2 * (pressure - 1013.0), 8))))
+            condition = _condition(humidity, pressure)
+            forecasts.append((
+                region["name"],
+                forecast_date,
+                DAY_NAMES[forecast_date.weekday()],
+                round(average - spread, 1),
+                round(average + spread, 1),
+                round(average, 1),
+                condition,
+                humidity,
+                round(pressure, 1),
+                round(abs(rng.gauss(12.0, 5.0)), 1),
+                rng.choice(WIND_DIRECTIONS),
+                max(0, min(100, 15 * CONDITIONS.index(condition) + rng.randint(-10, 10)))
+            ))
+        return forecasts
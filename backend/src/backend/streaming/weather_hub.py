@@ -0,0 +1,194 @@
+"""
+Diffusion des nouvelles mesures météo aux abonnés (flux SSE).
+
+Les écritures publient chaque mesure dans le hub sans jamais attendre : les mesures d'une
+même région reçues pendant `coalesce_seconds` sont fusionnées (seule la plus récente est
+diffusée), puis copiées dans le tampon borné de chaque abonné de la région. Un abonné
+trop lent perd ses plus anciennes mesures en attente plutôt que de ralentir le hub.
+"""
+
+import asyncio
+import logging
+import os
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+from backend.indexes.text_normalization import normalize_region_name
+
+logger = logging.getLogger(__name__)
+
+
+class TooManySubscribersError(Exception):
+    """Nombre maximal d'abonnés du hub atteint"""
+
+
+class WeatherSubscription:
+    """
+    Abonnement aux mesures d'une région.
+    Le tampon borné ne conserve que les `buffer_size` dernières mesures non lues.
+    """
+
+    def __init__(self, hub: "WeatherHub", region_key: str, buffer_size: int):
+        self.hub = hub
+        self.region_key = region_key
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def offer(self, reading: Dict[str, Any]):
+        """Dépose une mesure sans bloquer (la plus ancienne est perdue si le tampon est plein)"""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(reading)
+        self._ready.set()
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Attend la prochaine mesure.
+
+        Args:
+            timeout: Attente maximale en secondes
+
+        Returns:
+            La mesure, ou None si aucune n'est arrivée dans le délai
+        """
+        if not self._buffer:
+            self._ready.clear()
+            try:
+                async with asyncio.timeout(timeout):
+                    await self._ready.wait()
+            except asyncio.TimeoutError:
+                return None
+        return self._buffer.popleft()
+
+    def close(self):
+        """Se désabonne du hub"""
+        self.hub.unsubscribe(self)
+
+    def __enter__(self) -> "WeatherSubscription":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class WeatherHub:
+    """
+    Hub de diffusion du processus : un abonnement par flux ouvert, indexé par région normalisée.
+    """
+
+    def __init__(self, coalesce_seconds: float = 0.25, buffer_size: int = 8, max_subscribers: int = 10_000):
+        """
+        Args:
+            coalesce_seconds: Fenêtre de fusion des mesures rapprochées d'une même région
+            buffer_size: Mesures non lues conservées par abonné
+            max_subscribers: Nombre maximal de flux ouverts dans le processus
+        """
+        self.coalesce_seconds = coalesce_seconds
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Dict[str, Set[WeatherSubscription]] = defaultdict(set)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._shared_feed: Optional[Callable[[], bool]] = None
+        self.subscriber_count = 0
+        self.published = 0
+        self.coalesced = 0
+        self.delivered = 0
+
+    @classmethod
+    def from_env(cls) -> "WeatherHub":
+        """Construit le hub à partir de STREAM_COALESCE_SECONDS, STREAM_BUFFER_SIZE et STREAM_MAX_SUBSCRIBERS"""
+        return cls(
+            coalesce_seconds=float(os.getenv("STREAM_COALESCE_SECONDS", "0.25")),
+            buffer_size=int(os.getenv("STREAM_BUFFER_SIZE", "8")),
+            max_subscribers=int(os.getenv("STREAM_MAX_SUBSCRIBERS", "10000"))
+        )
+
+    def subscribe(self, region_name: str) -> WeatherSubscription:
+        """
+        Ouvre un abonnement aux mesures d'une région.
+
+        Raises:
+            TooManySubscribersError: `max_subscribers` flux déjà ouverts
+        """
+        if self.subscriber_count >= self.max_subscribers:
+            raise TooManySubscribersError(f"{self.max_subscribers} flux déjà ouverts")
+        subscription = WeatherSubscription(self, normalize_region_name(region_name), self.buffer_size)
+        self._subscribers[subscription.region_key].add(subscription)
+        self.subscriber_count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: WeatherSubscription):
+        """Ferme un abonnement (sans effet s'il est déjà fermé)"""
+        subscribers = self._subscribers.get(subscription.region_key)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        self.subscriber_count -= 1
+        if not subscribers:
+            del self._subscribers[subscription.region_key]
+
+    def publish(self, reading: Dict[str, Any]):
+        """
+        Signale une nouvelle mesure (appelé après l'écriture en base, ne bloque jamais).
+
+        Args:
+            reading: Mesure avec au moins `region_name`
+        """
+        region_key = normalize_region_name(reading.get("region_name", ""))
+        if region_key not in self._subscribers:
+            return
+        self.published += 1
+        if region_key in self._pending:
+            self.coalesced += 1
+        self._pending[region_key] = reading
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.coalesce_seconds, self._flush)
+
+    def attach_shared_feed(self, is_active: Callable[[], bool]):
+        """
+        Déclare une source de mesures commune à tous les workers (notifications de la base) :
+        tant que `is_active()` est vrai, `publish_local` est ignoré pour ne pas diffuser deux fois.
+        """
+        self._shared_feed = is_active
+
+    def publish_local(self, reading: Dict[str, Any]):
+        """Signale une mesure écrite par ce worker, sauf si la source commune la diffusera"""
+        if self._shared_feed is not None and self._shared_feed():
+            return
+        self.publish(reading)
+
+    def _flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for region_key, reading in pending.items():
+            for subscription in self._subscribers.get(region_key, ()):
+                subscription.offer(reading)
+                self.delivered += 1
+
+    def metrics(self) -> Dict[str, int]:
+        """Abonnés et compteurs de diffusion"""
+        return {
+            "subscribers": self.subscriber_count,
+            "regions": len(self._subscribers),
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "delivered": self.delivered
+        }
+
+
+# Instance globale du hub
+_weather_hub = None
+
+def get_weather_hub() -> WeatherHub:
+    """
+    Retourne l'instance globale du hub de diffusion.
+
+    Returns:
+        WeatherHub partagé par tout le processus
+    """
+    global _weather_hub
+    if _weather_hub is None:
+        _weather_hub = WeatherHub.from_env()
+    return _weather_hub
@@ -0,0 +1,150 @@
+"""
+Tests du contrôle d'admission (file à priorités, places réservées, refus) et de la
+limitation de débit par client.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.resilience.admission import (
+    CRITICAL, HIGH, LOW, NORMAL, STREAM, AdmissionController, AdmissionMiddleware, AdmissionRejected
+)
+from backend.resilience.rate_limit import InMemoryRateLimitStore, RateLimiter, RateLimitStore
+
+
+class _Clock:
+    """Horloge manuelle"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_released_slot_goes_to_highest_priority_waiter():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, reserved_slots=0, queue_timeout=1.0)
+        await controller.acquire(NORMAL)
+        order = []
+
+        async def request(priority: int, name: str):
+            await controller.acquire(priority)
+            order.append(name)
+            controller.release(priority)
+
+        waiters = [asyncio.create_task(request(LOW, "low")), asyncio.create_task(request(NORMAL, "normal")),
+                   asyncio.create_task(request(HIGH, "high"))]
+        await asyncio.sleep(0)
+        assert controller.queued == 3
+        controller.release(NORMAL)
+        await asyncio.gather(*waiters)
+        return order, controller
+
+    order, controller = asyncio.run(scenario())
+    assert order == ["high", "normal", "low"]
+    assert controller.in_flight == 0
+    assert controller.admitted == 4
+
+
+def test_reserved_slots_are_kept_for_high_priority():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=2, reserved_slots=1, queue_timeout=0.01)
+        await controller.acquire(NORMAL)
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire(NORMAL)
+        await controller.acquire(HIGH)
+        await controller.acquire(CRITICAL)
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.in_flight == 2
+    assert controller.rejected["normal"] == 1
+
+
+def test_full_queue_rejects_immediately():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, reserved_slots=0, queue_timeout=1.0, max_queue=1)
+        await controller.acquire(NORMAL)
+        waiting = asyncio.create_task(controller.acquire(NORMAL))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as error:
+            await controller.acquire(LOW)
+        controller.release(NORMAL)
+        await waiting
+        return error.value, controller
+
+    error, controller = asyncio.run(scenario())
+    assert str(error) == "File d'attente pleine"
+    assert controller.rejected["low"] == 1
+    assert controller.queued == 0
+
+
+def test_in_memory_token_bucket_refills_at_rate():
+    clock = _Clock()
+    limiter = RateLimiter(InMemoryRateLimitStore(clock=clock), rate=2.0, burst=2.0)
+
+    async def scenario():
+        first = [await limiter.check("client") for _ in range(3)]
+        other = await limiter.check("autre")
+        clock.now = 0.5
+        refilled = await limiter.check("client")
+        return first, other, refilled
+
+    first, other, refilled = asyncio.run(scenario())
+    assert first[:2] == [0.0, 0.0]
+    assert first[2] == pytest.approx(0.5)
+    assert other == 0.0
+    assert refilled == 0.0
+    assert limiter.limited == 1
+
+
+def test_rate_limit_store_is_abstract():
+    with pytest.raises(TypeError):
+        RateLimitStore()
+
+
+def _call(middleware: AdmissionMiddleware, path: str, client: str = "10.0.0.1"):
+    """Appelle le middleware avec une requête GET et retourne (statut, en-têtes)"""
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [], "client": (client, 1234),
+             "query_string": b""}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    start = messages[0]
+    return start["status"], {name.decode(): value.decode() for name, value in start.get("headers", [])}
+
+
+async def _ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def test_middleware_rate_limits_then_skips_critical_routes():
+    limiter = RateLimiter(InMemoryRateLimitStore(clock=_Clock()), rate=1.0, burst=1.0)
+    middleware = AdmissionMiddleware(_ok_app, AdmissionController(), rate_limiter=limiter)
+
+    assert _call(middleware, "/api/v1/weather/Paris")[0] == 200
+    status, headers = _call(middleware, "/api/v1/weather/Paris")
+    assert status == 429
+    assert headers["retry-after"] == "1"
+    assert _call(middleware, "/health")[0] == 200
+    assert middleware.priority("GET", "/api/v1/weather/Paris/stream") == STREAM
+
+
+def test_middleware_returns_503_when_saturated():
+    controller = AdmissionController(max_in_flight=1, reserved_slots=0, queue_timeout=0.01)
+    controller.in_flight = 1
+    middleware = AdmissionMiddleware(_ok_app, controller)
+
+    status, headers = _call(middleware, "/api/v1/weather/Paris")
+    assert status == 503
+    assert headers["retry-after"] == "1"
+    assert controller.rejected["normal"] == 1
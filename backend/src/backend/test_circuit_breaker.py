@@ -0,0 +1,125 @@
+"""
+Tests du disjoncteur de la base : ouverture sur la part d'échecs, refus immédiat,
+sondes en semi-ouvert, et valeurs périmées servies par le cache de secours.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.resilience.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from backend.resilience.stale_cache import StaleCache
+
+
+class _Clock:
+    """Horloge manuelle"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _succeed():
+    return "ok"
+
+
+async def _fail():
+    raise ConnectionError("base indisponible")
+
+
+def _breaker(clock: _Clock, **options) -> CircuitBreaker:
+    settings = dict(failure_rate=0.5, window_size=4, min_calls=4, slow_call_seconds=1.0,
+                    call_timeout=None, open_seconds=10.0, half_open_probes=1)
+    settings.update(options)
+    return CircuitBreaker("test", clock=clock, **settings)
+
+
+def _run(breaker: CircuitBreaker, function):
+    return asyncio.run(breaker.call(function))
+
+
+def test_opens_when_failure_rate_is_reached():
+    breaker = _breaker(_Clock())
+    _run(breaker, _succeed)
+    _run(breaker, _succeed)
+    with pytest.raises(ConnectionError):
+        _run(breaker, _fail)
+    assert breaker.state == CLOSED
+
+    with pytest.raises(ConnectionError):
+        _run(breaker, _fail)
+    assert breaker.state == OPEN
+
+
+def test_open_circuit_rejects_without_calling():
+    clock = _Clock()
+    breaker = _breaker(clock, min_calls=1, window_size=1)
+    with pytest.raises(ConnectionError):
+        _run(breaker, _fail)
+
+    calls = []
+
+    async def tracked():
+        calls.append(1)
+
+    clock.now = 4.0
+    with pytest.raises(CircuitOpenError) as error:
+        _run(breaker, tracked)
+    assert calls == []
+    assert error.value.retry_after == pytest.approx(6.0)
+    assert breaker.rejected == 1
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = _Clock()
+    breaker = _breaker(clock, min_calls=1, window_size=1)
+    with pytest.raises(ConnectionError):
+        _run(breaker, _fail)
+
+    clock.now = 10.0
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(ConnectionError):
+        _run(breaker, _fail)
+    assert breaker.state == OPEN
+
+    clock.now = 20.0
+    assert _run(breaker, _succeed) == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_slow_call_counts_as_failure():
+    clock = _Clock()
+    breaker = _breaker(clock, min_calls=1, window_size=1)
+
+    async def slow():
+        clock.now += 2.0
+        return "lent"
+
+    assert _run(breaker, slow) == "lent"
+    assert breaker.state == OPEN
+
+
+def test_call_timeout_counts_as_failure():
+    breaker = CircuitBreaker("test", failure_rate=1.0, window_size=1, min_calls=1, call_timeout=0.01)
+
+    async def hanging():
+        await asyncio.sleep(1.0)
+
+    with pytest.raises(TimeoutError):
+        _run(breaker, hanging)
+    assert breaker.state == OPEN
+
+
+def test_stale_cache_marks_last_known_value():
+    cache = StaleCache(max_entries=1)
+    cache.put("Paris", {"temperature": 21.0})
+    cache.put("Lyon", {"temperature": 18.0})
+
+    assert cache.get_stale("Paris") is None
+    stale = cache.get_stale("Lyon")
+    assert stale["temperature"] == 18.0
+    assert stale["stale"] is True
+    assert cache.served == 1
+
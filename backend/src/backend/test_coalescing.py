@@ -0,0 +1,96 @@
+"""
+Tests du regroupement des appels identiques concurrents (single-flight).
+"""
+
+import asyncio
+
+import pytest
+
+from backend.resilience.coalescing import RequestCoalescer
+
+
+class _SlowRead:
+    """Lecture qui attend d'être libérée, et compte ses exécutions"""
+
+    def __init__(self, result="Paris"):
+        self.result = result
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return {"region_name": self.result}
+
+
+def test_identical_concurrent_calls_share_one_execution():
+    async def scenario():
+        coalescer = RequestCoalescer()
+        read = _SlowRead()
+        callers = [asyncio.create_task(coalescer.run(("weather.current", "Paris"), read)) for _ in range(50)]
+        await asyncio.sleep(0)
+        in_flight = coalescer.metrics()["in_flight"]
+        read.release.set()
+        results = await asyncio.gather(*callers)
+        return coalescer, read, results, in_flight
+
+    coalescer, read, results, in_flight = asyncio.run(scenario())
+    assert read.calls == 1
+    assert in_flight == 1
+    assert all(result is results[0] for result in results)
+    operation = coalescer.metrics()["operations"]["weather.current"]
+    assert operation == {"executions": 1, "joined": 49, "calls_per_execution": 50.0}
+    assert coalescer.metrics()["in_flight"] == 0
+
+
+def test_different_keys_and_later_calls_run_again():
+    async def scenario():
+        coalescer = RequestCoalescer()
+        paris, lyon = _SlowRead("Paris"), _SlowRead("Lyon")
+        paris.release.set()
+        lyon.release.set()
+        first = await asyncio.gather(coalescer.run(("weather.current", "Paris"), paris),
+                                     coalescer.run(("weather.current", "Lyon"), lyon))
+        # Rien n'est mis en cache : un appel après la fin du travail relance une lecture
+        again = await coalescer.run(("weather.current", "Paris"), paris)
+        return first, again, paris, lyon
+
+    first, again, paris, lyon = asyncio.run(scenario())
+    assert [result["region_name"] for result in first] == ["Paris", "Lyon"]
+    assert again == {"region_name": "Paris"}
+    assert paris.calls == 2 and lyon.calls == 1
+
+
+def test_error_reaches_every_caller():
+    async def scenario():
+        coalescer = RequestCoalescer()
+        read = _SlowRead(ConnectionError("base indisponible"))
+        callers = [asyncio.create_task(coalescer.run(("weather.current", "Paris"), read)) for _ in range(3)]
+        await asyncio.sleep(0)
+        read.release.set()
+        return await asyncio.gather(*callers, return_exceptions=True), read
+
+    results, read = asyncio.run(scenario())
+    assert read.calls == 1
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    async def scenario():
+        coalescer = RequestCoalescer()
+        read = _SlowRead()
+        leaving = asyncio.create_task(coalescer.run(("weather.current", "Paris"), read))
+        staying = asyncio.create_task(coalescer.run(("weather.current", "Paris"), read))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        await asyncio.sleep(0)
+        read.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        return await staying, read
+
+    result, read = asyncio.run(scenario())
+    assert result == {"region_name": "Paris"}
+    assert read.calls == 1
@@ -0,0 +1,313 @@
+"""
+Tests du pipeline d'ingestion : un lot en échec est réessayé puis mis en lettre morte,
+une unité de la source n'est validée qu'une fois ses enregistrements écrits, et un
+enregistrement invalide est écarté sans bloquer les autres.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List
+
+import pytest
+
+from backend.ingestion.pipeline import IngestionPipeline, InvalidRecordError, validate_record
+from backend.ingestion.sources import Checkpoint, DirectoryWatcherSource, HttpFeedSource, IWeatherSource
+
+
+class _FlakyRepository:
+    """Échoue sur les `failures` premières écritures, puis écrit normalement"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.attempts = 0
+        self.rows: List[Dict[str, Any]] = []
+
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError("base indisponible")
+        self.rows.extend(weather_records)
+        return len(weather_records)
+
+    async def upsert_forecasts(self, forecast_records: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        return await self.bulk_create_weather_data(forecast_records)
+
+
+class _StrictRepository(_FlakyRepository):
+    """Refuse tout lot qui contient une région `poison`, comme une contrainte de la base"""
+
+    def __init__(self):
+        super().__init__(failures=0)
+
+    async def bulk_create_weather_data(self, weather_records: List[Dict[str, Any]]) -> int:
+        self.attempts += 1
+        if any(record["region_name"] == "poison" for record in weather_records):
+            raise ValueError("valeur refusée par la base")
+        self.rows.extend(weather_records)
+        return len(weather_records)
+
+
+class _ListSource(IWeatherSource):
+    """Produit des enregistrements suivis d'un point de validation, puis attend"""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.items = records
+        self.committed = False
+
+    async def records(self):
+        for record in self.items:
+            yield record
+        yield Checkpoint(self._commit, "liste")
+        await asyncio.Event().wait()
+
+    def _commit(self):
+        self.committed = True
+
+
+def _observations(count: int) -> List[Dict[str, Any]]:
+    return [{"type": "observation", "region_name": "Paris", "temperature": float(position), "condition": "Sunny",
+             "humidity": 50} for position in range(count)]
+
+
+def _pipeline(source: IWeatherSource, repository: _FlakyRepository, **options) -> IngestionPipeline:
+    @asynccontextmanager
+    async def repository_scope():
+        yield repository
+
+    return IngestionPipeline(source, repository_scope, batch_size=10, batch_timeout=0.01,
+                             retry_base_seconds=0.01, retry_max_seconds=0.02, **options)
+
+
+async def _wait_until(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition non atteinte dans le délai"
+        await asyncio.sleep(0.005)
+
+
+def test_failed_batch_is_retried_before_commit():
+    async def scenario():
+        source = _ListSource(_observations(5))
+        repository = _FlakyRepository(failures=3)
+        pipeline = _pipeline(source, repository)
+        await pipeline.start()
+        await _wait_until(lambda: source.committed)
+        await pipeline.stop()
+        return source, repository, pipeline
+
+    source, repository, pipeline = asyncio.run(scenario())
+    assert len(repository.rows) == 5
+    assert pipeline.metrics.failed_batches == 3
+    assert pipeline.metrics.written == 5
+    assert pipeline.metrics.dead_lettered == 0
+
+
+def test_checkpoint_waits_for_the_write():
+    async def scenario():
+        source = _ListSource(_observations(5))
+        repository = _FlakyRepository(failures=10_000)
+        pipeline = _pipeline(source, repository)
+        await pipeline.start()
+        await _wait_until(lambda: pipeline.metrics.failed_batches >= 5)
+        committed, retrying = source.committed, pipeline.metrics.retrying
+        await pipeline.stop(drain_timeout=0.05)
+        return committed, retrying, repository
+
+    committed, retrying, repository = asyncio.run(scenario())
+    assert not committed
+    assert retrying
+    assert repository.rows == []
+
+
+def test_retrying_stops_consuming_the_queue():
+    async def scenario():
+        source = _ListSource(_observations(200))
+        repository = _FlakyRepository(failures=10_000)
+
+        @asynccontextmanager
+        async def repository_scope():
+            yield repository
+
+        pipeline = IngestionPipeline(source, repository_scope, queue_size=20, batch_size=10, batch_timeout=0.01,
+                                     retry_base_seconds=0.01, retry_max_seconds=0.02)
+        await pipeline.start()
+        await _wait_until(lambda: pipeline.metrics.failed_batches >= 5)
+        received = pipeline.metrics.received
+        await pipeline.stop(drain_timeout=0.05)
+        return received
+
+    # Un lot en cours de réessai et une file pleine : la source est suspendue
+    assert asyncio.run(scenario()) <= 30
+
+
+def test_batch_is_dead_lettered_after_max_attempts(tmp_path):
+    dead_letter_path = tmp_path / "dead_letter.jsonl"
+
+    async def scenario():
+        source = _ListSource(_observations(3))
+        repository = _FlakyRepository(failures=10_000)
+        pipeline = _pipeline(source, repository, max_attempts=3, dead_letter_path=str(dead_letter_path))
+        await pipeline.start()
+        await _wait_until(lambda: source.committed)
+        await pipeline.stop()
+        return repository, pipeline
+
+    repository, pipeline = asyncio.run(scenario())
+    assert repository.attempts == 3
+    assert pipeline.metrics.dead_lettered == 3
+    assert pipeline.metrics.written == 0
+    lines = dead_letter_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["temperature"] for line in lines] == [0.0, 1.0, 2.0]
+
+
+def test_directory_file_is_moved_only_after_write(tmp_path):
+    (tmp_path / "batch.jsonl").write_text("\n".join(json.dumps(record) for record in _observations(4)), encoding="utf-8")
+
+    async def scenario():
+        source = DirectoryWatcherSource(str(tmp_path), poll_interval=0.01)
+        repository = _FlakyRepository(failures=3)
+        pipeline = _pipeline(source, repository)
+        await pipeline.start()
+        await _wait_until(lambda: repository.attempts >= 1)
+        still_pending = (tmp_path / "batch.jsonl").exists()
+        await _wait_until(lambda: (tmp_path / "processed" / "batch.jsonl").exists())
+        await pipeline.stop()
+        return still_pending, repository
+
+    still_pending, repository = asyncio.run(scenario())
+    assert still_pending
+    assert not (tmp_path / "batch.jsonl").exists()
+    assert len(repository.rows) == 4
+
+
+def test_records_are_validated_and_converted():
+    record = validate_record({"region_name": "Paris", "temperature": "21.5", "condition": "Sunny",
+                              "humidity": 55.0, "recorded_at": "2025-07-01T12:00:00Z"})
+    assert record["temperature"] == 21.5
+    assert record["humidity"] == 55
+    assert record["recorded_at"] == "2025-07-01T12:00:00+00:00"
+    forecast = validate_record({"type": "forecast", "region_name": "Paris", "forecast_date": "2025-07-02T00:00:00",
+                                "condition": "Cloudy", "humidity": 60})
+    assert forecast["forecast_date"] == "2025-07-02"
+
+    for invalid in (42, [1], {"type": "alert", "region_name": "Paris"},
+                    {"region_name": "Paris", "temperature": 20.0, "condition": "Sunny"},
+                    {**_observations(1)[0], "recorded_at": "yesterday"},
+                    {**_observations(1)[0], "humidity": 55.5},
+                    {**_observations(1)[0], "temperature": True}):
+        with pytest.raises(InvalidRecordError):
+            validate_record(invalid)
+
+
+def test_poison_record_does_not_block_the_batch():
+    async def scenario():
+        records = _observations(4)
+        records.insert(2, {**records[0], "recorded_at": "yesterday"})
+        source = _ListSource(records)
+        repository = _FlakyRepository(failures=0)
+        pipeline = _pipeline(source, repository)
+        await pipeline.start()
+        await _wait_until(lambda: source.committed)
+        await pipeline.stop()
+        return repository, pipeline
+
+    repository, pipeline = asyncio.run(scenario())
+    assert [row["temperature"] for row in repository.rows] == [0.0, 1.0, 2.0, 3.0]
+    assert pipeline.metrics.rejected == 1
+    assert pipeline.metrics.failed_batches == 0
+
+
+def test_record_refused_by_the_database_is_isolated_without_retrying():
+    async def scenario():
+        records = _observations(7)
+        records[5] = {**records[5], "region_name": "poison"}
+        source = _ListSource(records)
+        repository = _StrictRepository()
+        pipeline = _pipeline(source, repository)
+        await pipeline.start()
+        await _wait_until(lambda: source.committed)
+        await pipeline.stop()
+        return repository, pipeline
+
+    repository, pipeline = asyncio.run(scenario())
+    # Sans fichier de lettres mortes, l'enregistrement refusé est écarté, pas réessayé indéfiniment
+    assert sorted(row["temperature"] for row in repository.rows) == [0.0, 1.0, 2.0, 3.0, 4.0, 6.0]
+    assert pipeline.metrics.rejected == 1
+    assert pipeline.metrics.written == 6
+    assert repository.attempts < 10
+
+
+def test_refused_record_goes_to_the_dead_letter_file(tmp_path):
+    dead_letter_path = tmp_path / "dead_letter.jsonl"
+
+    async def scenario():
+        source = _ListSource([{**_observations(1)[0], "region_name": "poison"}, *_observations(2)])
+        pipeline = _pipeline(source, _StrictRepository(), dead_letter_path=str(dead_letter_path))
+        await pipeline.start()
+        await _wait_until(lambda: source.committed)
+        await pipeline.stop()
+        return pipeline
+
+    pipeline = asyncio.run(scenario())
+    assert pipeline.metrics.dead_lettered == 1
+    assert pipeline.metrics.written == 2
+    lines = dead_letter_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["region_name"] for line in lines] == ["poison"]
+
+
+def test_lines_that_are_not_objects_are_rejected(tmp_path):
+    lines = ["42", "[1]", *(json.dumps(record) for record in _observations(2))]
+    (tmp_path / "batch.jsonl").write_text("\n".join(lines), encoding="utf-8")
+
+    async def scenario():
+        source = DirectoryWatcherSource(str(tmp_path), poll_interval=0.01)
+        repository = _FlakyRepository(failures=0)
+        pipeline = _pipeline(source, repository)
+        await pipeline.start()
+        await _wait_until(lambda: (tmp_path / "processed" / "batch.jsonl").exists())
+        producer_alive = not pipeline._tasks[0].done()
+        await pipeline.stop()
+        return producer_alive, repository, pipeline
+
+    producer_alive, repository, pipeline = asyncio.run(scenario())
+    assert producer_alive
+    assert len(repository.rows) == 2
+    assert pipeline.metrics.rejected == 2
+
+
+def test_stop_survives_a_failed_source():
+    class _BrokenSource(IWeatherSource):
+        async def records(self):
+            yield _observations(1)[0]
+            raise OSError("dossier illisible")
+
+    async def scenario():
+        repository = _FlakyRepository(failures=0)
+        pipeline = _pipeline(_BrokenSource(), repository)
+        await pipeline.start()
+        await _wait_until(lambda: pipeline._tasks[0].done())
+        await pipeline.stop()
+        return repository
+
+    assert len(asyncio.run(scenario()).rows) == 1
+
+
+def test_feed_page_without_a_record_list_is_skipped():
+    pages = [{"records": {"region_name": "Paris"}, "next_cursor": "1"}, [1, 2],
+             {"records": _observations(2), "next_cursor": "2"}]
+
+    async def scenario():
+        source = HttpFeedSource("http://localhost/feed", poll_interval=0.0)
+        source._fetch_page = lambda: pages.pop(0) if pages else {"records": []}
+        received = []
+        async for item in source.records():
+            received.append(item)
+            if isinstance(item, Checkpoint):
+                break
+        return source, received
+
+    source, received = asyncio.run(scenario())
+    assert [record["temperature"] for record in received[:-1]] == [0.0, 1.0]
+    # Le curseur n'a pas avancé sur les pages illisibles
+    assert received[-1].label == "page 2"
@@ -0,0 +1,239 @@
+"""
+Tests du bus d'invalidation des caches (LISTEN/NOTIFY) : lecture des notifications,
+RESYNC, branchement des caches du worker, puis, si une base PostgreSQL est joignable
+(DB_HOST, DB_PORT…), livraison d'un worker à l'autre et découpage des charges utiles.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from types import SimpleNamespace
+
+import asyncpg
+import pytest
+
+import backend.app as application
+from backend.caching.backends import InMemoryCacheBackend
+from backend.caching.second_level import SecondLevelCache
+from backend.database.connection import db_config
+from backend.database.notifications import (
+    CHANNEL, MIGRATION_FILE, RESYNC, ChangeListener, TableChange, migrations_directory
+)
+from backend.repositories.backends import POSTGRESQL
+from backend.repositories.implementations.second_level_cached_region_repository import ALL_REGIONS
+from backend.repositories.implementations.second_level_cached_weather_repository import CURRENT_WEATHER, FORECASTS
+
+# Délai maximal entre le COMMIT d'une écriture et sa réception par un autre worker
+DELIVERY_BOUND_SECONDS = 2.0
+
+
+def _listener() -> ChangeListener:
+    return ChangeListener.from_database_url(db_config.get_database_url())
+
+
+async def _wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition non atteinte dans le délai"
+        await asyncio.sleep(0.01)
+
+
+def test_notification_payload_is_parsed():
+    listener = ChangeListener("postgresql://localhost/unused")
+    received = []
+    listener.register("weather_data", received.append)
+    payload = json.dumps({
+        "table": "weather_data", "op": "INSERT", "sent_at": time.time(), "keys": ["Paris", "Lyon"],
+        "rows": [{"region_name": "Paris", "temperature": 21.5}]
+    })
+
+    listener._on_notification(None, 1, CHANNEL, payload)
+
+    assert received == [TableChange("weather_data", "INSERT", ["Paris", "Lyon"],
+                                    [{"region_name": "Paris", "temperature": 21.5}], received[0].sent_at)]
+    assert listener.metrics()["received"] == 1
+    assert listener.metrics()["latency_max_ms"] is not None
+
+
+def test_unreadable_payload_is_ignored():
+    listener = ChangeListener("postgresql://localhost/unused")
+    received = []
+    listener.register("regions", received.append)
+
+    listener._on_notification(None, 1, CHANNEL, "pas du JSON")
+    listener._on_notification(None, 1, CHANNEL, json.dumps({"op": "INSERT", "keys": [1]}))
+    listener._on_notification(None, 1, CHANNEL, json.dumps({"table": "regions", "op": "DELETE"}))
+
+    assert received == [TableChange("regions", "DELETE", [], [], None)]
+    assert listener.received == 1
+
+
+def test_failing_handler_does_not_stop_dispatch():
+    listener = ChangeListener("postgresql://localhost/unused")
+    received = []
+
+    def failing(change: TableChange):
+        raise RuntimeError("gestionnaire en échec")
+
+    listener.register("regions", failing)
+    listener.register("regions", received.append)
+    listener._on_notification(None, 1, CHANNEL, json.dumps({"table": "regions", "op": "UPDATE", "keys": [7]}))
+
+    assert [change.keys for change in received] == [[7]]
+
+
+def test_resync_reaches_every_registered_table():
+    listener = ChangeListener("postgresql://localhost/unused")
+    received = []
+    for table in ("regions", "weather_data", "weather_forecasts"):
+        listener.register(table, received.append)
+
+    listener._dispatch_resync()
+
+    assert sorted(change.table for change in received) == ["regions", "weather_data", "weather_forecasts"]
+    assert all(change.operation == RESYNC and change.keys == [] for change in received)
+    assert listener.resyncs == 1
+
+
+def test_resync_clears_worker_caches(monkeypatch):
+    cache = SecondLevelCache(InMemoryCacheBackend())
+    calls = []
+    monkeypatch.setattr(application, "get_repository_backend", lambda: SimpleNamespace(name=POSTGRESQL))
+    monkeypatch.setattr(application, "get_region_catalog",
+                        lambda: SimpleNamespace(request_refresh=lambda: calls.append("catalog")))
+    monkeypatch.setattr(application, "get_weather_interpolator",
+                        lambda: SimpleNamespace(expire=lambda: calls.append("interpolator")))
+    monkeypatch.setattr(application, "get_weather_hub",
+                        lambda: SimpleNamespace(publish=lambda reading: calls.append("publish"),
+                                                attach_shared_feed=lambda connected: None))
+    monkeypatch.setattr(application, "get_second_level_cache", lambda: cache)
+
+    async def scenario():
+        await cache.set(CURRENT_WEATHER, ("Paris",), {"region_name": "Paris"})
+        await cache.set(CURRENT_WEATHER, ("Lyon",), {"region_name": "Lyon"})
+        await cache.set(FORECASTS, ("Paris", 3), [{"region_name": "Paris"}])
+        await cache.set(ALL_REGIONS, ("watermark",), [{"name": "Paris"}])
+
+        listener = application.build_change_listener()
+        listener._dispatch_resync()
+        await asyncio.gather(*list(cache._pending))
+        return [
+            await cache.get(CURRENT_WEATHER, "Paris"), await cache.get(CURRENT_WEATHER, "Lyon"),
+            await cache.get(FORECASTS, "Paris", 3), await cache.get(ALL_REGIONS, "watermark")
+        ]
+
+    current_paris, current_lyon, forecasts, regions = asyncio.run(scenario())
+    assert current_paris is None and current_lyon is None and forecasts is None
+    # La liste des régions est indexée par l'empreinte de la table : le catalogue la recharge
+    assert regions == [{"name": "Paris"}]
+    assert sorted(calls) == ["catalog", "interpolator"]
+
+
+@pytest.fixture(scope="module")
+def database_dsn():
+    """DSN de la base de test, déclencheurs installés ; test ignoré si la base est injoignable"""
+    dsn = _listener().dsn
+
+    async def prepare():
+        connection = await asyncpg.connect(dsn, timeout=2)
+        try:
+            await connection.execute((migrations_directory() / MIGRATION_FILE).read_text(encoding="utf-8"))
+        finally:
+            await connection.close()
+
+    try:
+        asyncio.run(prepare())
+    except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL injoignable: {e!r}")
+    return dsn
+
+
+async def _listening(*listeners: ChangeListener):
+    """Démarre les écoutes et attend qu'elles soient connectées"""
+    tasks = [asyncio.create_task(listener.run()) for listener in listeners]
+    await _wait_until(lambda: all(listener.connected for listener in listeners))
+    return tasks
+
+
+async def _stop(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_write_reaches_another_worker(database_dsn):
+    region_name = f"test-notify-{uuid.uuid4().hex[:12]}"
+
+    async def scenario():
+        writer, other = _listener(), _listener()
+        delivered = asyncio.Event()
+        other.register("weather_forecasts",
+                       lambda change: delivered.set() if region_name in change.keys else None)
+        tasks = await _listening(writer, other)
+        connection = await asyncpg.connect(database_dsn)
+        try:
+            start = time.perf_counter()
+            await connection.execute(
+                "INSERT INTO weather_forecasts "
+                "(region_name, forecast_date, day_name, condition, humidity, precipitation_probability) "
+                "VALUES ($1, CURRENT_DATE, 'Lundi', 'Sunny', 50, 0)", region_name
+            )
+            await asyncio.wait_for(delivered.wait(), DELIVERY_BOUND_SECONDS)
+            return time.perf_counter() - start
+        finally:
+            await connection.execute("DELETE FROM weather_forecasts WHERE region_name = $1", region_name)
+            await connection.close()
+            await _stop(tasks)
+
+    assert asyncio.run(scenario()) < DELIVERY_BOUND_SECONDS
+
+
+# Colonnes obligatoires toutes renseignées : le schéma des modèles a moins de valeurs par défaut
+# que le script d'initialisation
+PAGING_CASES = [
+    # (table, instruction d'insertion de $2 lignes préfixées par $1, colonne de nettoyage, taille de page)
+    ("regions",
+     "INSERT INTO regions (name, nb_habitants, language, country) "
+     "SELECT $1 || n, 0, 'français', 'France' FROM generate_series(1, $2) n", "name", 500),
+    ("weather_data",
+     "INSERT INTO weather_data (region_name, temperature, condition, humidity, is_forecast, forecast_day) "
+     "SELECT $1 || n, 20, 'Sunny', 50, false, 0 FROM generate_series(1, $2) n", "region_name", 15),
+    ("weather_forecasts",
+     "INSERT INTO weather_forecasts "
+     "(region_name, forecast_date, day_name, condition, humidity, precipitation_probability) "
+     "SELECT $1 || n, CURRENT_DATE, 'Lundi', 'Sunny', 50, 0 FROM generate_series(1, $2) n", "region_name", 50),
+]
+
+
+@pytest.mark.parametrize("table, insert, column, page_size", PAGING_CASES)
+def test_statement_notifications_are_paged(database_dsn, table, insert, column, page_size):
+    prefix = f"test-page-{uuid.uuid4().hex[:8]}-"
+    count = 2 * page_size + 3
+
+    async def scenario():
+        listener = _listener()
+        pages = []
+        listener.register(table, lambda change: pages.append(change) if change.operation == "INSERT" else None)
+        tasks = await _listening(listener)
+        connection = await asyncpg.connect(database_dsn)
+        try:
+            await connection.execute(insert, prefix, count)
+            await _wait_until(lambda: sum(len(change.keys) for change in pages) >= count)
+            if table == "regions":
+                names = await connection.fetch("SELECT id FROM regions WHERE name LIKE $1 || '%'", prefix)
+                expected = {row["id"] for row in names}
+            else:
+                expected = {f"{prefix}{position}" for position in range(1, count + 1)}
+            return pages, expected
+        finally:
+            await connection.execute(f"DELETE FROM {table} WHERE {column} LIKE $1 || '%'", prefix)
+            await connection.close()
+            await _stop(tasks)
+
+    pages, expected = asyncio.run(scenario())
+    assert sorted(len(change.keys) for change in pages) == [3, page_size, page_size]
+    assert {key for change in pages for key in change.keys} == expected
+    if table == "weather_data":
+        # Une ligne (la dernière mesure) par région de la page
+        assert all(len(change.rows) == len(change.keys) for change in pages)
@@ -0,0 +1,78 @@
+"""
+Tests des formats des réponses tabulaires : négociation sur l'en-tête Accept, puis
+relecture des corps MessagePack et Arrow IPC comme le font les consommateurs.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.serialization import tabular
+from backend.serialization.tabular import ARROW_STREAM, JSON, MSGPACK, NotAcceptableError, RowSet, encode, negotiate
+
+ROWSET = RowSet(
+    ("region", "temperature", "humidity", "is_forecast", "recorded_at"),
+    "sfibt",
+    [
+        ("Paris", 21.5, 55, False, datetime(2025, 7, 1, 12, 0, tzinfo=timezone.utc)),
+        ("Lyon", None, 60, True, "2025-07-01T13:30:00"),
+    ]
+)
+
+
+def test_negotiation_respects_weights_and_falls_back_to_json():
+    assert negotiate(None) == JSON
+    assert negotiate("text/html") == JSON
+    assert negotiate("application/json, application/x-msgpack") == JSON
+    assert negotiate("application/json;q=0.5, application/vnd.apache.arrow.stream") == ARROW_STREAM
+    assert negotiate("application/msgpack;q=0.9, */*;q=0.1") == MSGPACK
+    assert negotiate("application/x-msgpack;q=0, application/json") == JSON
+
+
+def test_unavailable_binary_format_is_not_acceptable(monkeypatch):
+    monkeypatch.setattr(tabular, "pyarrow", None)
+
+    with pytest.raises(NotAcceptableError):
+        negotiate(ARROW_STREAM)
+    # Un format de repli accepté par le client reste servi
+    assert negotiate(f"{ARROW_STREAM}, application/json;q=0.1") == JSON
+
+
+def test_select_keeps_result_order():
+    selected = ROWSET.select(["recorded_at", "region"])
+
+    assert selected.columns == ("region", "recorded_at")
+    assert selected.kinds == "st"
+    assert selected.records()[0] == {"region": "Paris", "recorded_at": ROWSET.rows[0][4]}
+
+
+def test_msgpack_body_reads_back_as_columns():
+    msgpack = pytest.importorskip("msgpack")
+
+    table = msgpack.unpackb(encode(ROWSET, MSGPACK), timestamp=3)
+
+    assert table["region"] == ["Paris", "Lyon"]
+    assert table["temperature"] == [21.5, None]
+    assert table["is_forecast"] == [False, True]
+    # Horodatages en extension Timestamp, UTC (les valeurs naïves sont supposées UTC)
+    assert table["recorded_at"] == [
+        datetime(2025, 7, 1, 12, 0, tzinfo=timezone.utc), datetime(2025, 7, 1, 13, 30, tzinfo=timezone.utc)
+    ]
+
+
+def test_arrow_stream_reads_back_typed():
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    table = pyarrow.ipc.open_stream(encode(ROWSET, ARROW_STREAM)).read_all()
+
+    assert table.schema.types == [
+        pyarrow.string(), pyarrow.float64(), pyarrow.int64(), pyarrow.bool_(), pyarrow.timestamp("us", tz="UTC")
+    ]
+    assert table.column("temperature").to_pylist() == [21.5, None]
+    assert table.column("recorded_at").to_pylist()[1] == datetime(2025, 7, 1, 13, 30, tzinfo=timezone.utc)
+
+
+def test_unknown_binary_format_is_rejected():
+    with pytest.raises(ValueError):
+        encode(ROWSET, "application/xml")
@@ -0,0 +1,18 @@
+"""
+Fixtures partagées des tests : base SQLite embarquée vierge, un fichier par test.
+"""
+
+import pytest
+
+from backend.database.sqlite import SQLiteDatabase, sqlite_available
+
+
+@pytest.fixture
+def sqlite_database(tmp_path) -> SQLiteDatabase:
+    """
+    Base SQLite vide dans le dossier temporaire du test (tables créées par `initialize`,
+    à appeler dans la boucle du test) ; test ignoré sans aiosqlite (extra sqlite)
+    """
+    if not sqlite_available():
+        pytest.skip("aiosqlite n'est pas installé (extra sqlite)")
+    return SQLiteDatabase(str(tmp_path / "weather.db"))
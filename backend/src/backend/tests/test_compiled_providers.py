@@ -0,0 +1,102 @@
+"""
+Tests des fabriques compilées : même graphe que l'injector, session de la requête
+transmise, singletons capturés, repli sur l'injector pour les bindings non compilables.
+"""
+
+import pytest
+from injector import Injector, Module, Provider, inject, provider, singleton
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.di import container
+from backend.di.compiled_providers import CompiledProviders
+from backend.services.interfaces.Iweather_service import IWeatherService
+
+
+class Settings:
+    pass
+
+
+class Repository:
+    @inject
+    def __init__(self, session: AsyncSession, settings: Settings):
+        self.session = session
+        self.settings = settings
+
+
+class Service:
+    @inject
+    def __init__(self, repository: Repository):
+        self.repository = repository
+
+
+class Clock:
+    def __init__(self, session=None):
+        self.session = session
+
+
+class _ClockProvider(Provider):
+    """Provider personnalisé : non compilable"""
+
+    def get(self, injector):
+        return Clock(injector.get(AsyncSession))
+
+
+class _Module(Module):
+    def configure(self, binder):
+        binder.bind(Settings, to=Settings, scope=singleton)
+        binder.bind(Clock, to=_ClockProvider())
+
+    @provider
+    def provide_repository(self, session: AsyncSession, settings: Settings) -> Repository:
+        return Repository(session, settings)
+
+
+def _compiled():
+    injector = Injector([_Module()])
+
+    def request_injector(session):
+        return injector.create_child_injector([lambda binder: binder.bind(AsyncSession, to=session)])
+
+    return injector, CompiledProviders(injector, request_injector)
+
+
+def test_factories_pass_the_request_session_and_share_singletons():
+    injector, compiled = _compiled()
+
+    first, second = compiled.get(Service, "session-1"), compiled.get(Service, "session-2")
+
+    assert (first.repository.session, second.repository.session) == ("session-1", "session-2")
+    assert first.repository is not second.repository
+    assert first.repository.settings is second.repository.settings is injector.get(Settings)
+    # Compilée une seule fois
+    assert compiled.factory(Service) is compiled.factory(Service)
+
+
+def test_custom_provider_falls_back_to_the_request_injector():
+    _, compiled = _compiled()
+
+    assert compiled.get(Clock, "session-1").session == "session-1"
+    assert compiled.get(Clock, "session-2").session == "session-2"
+
+
+@pytest.fixture
+def mock_injector(monkeypatch):
+    monkeypatch.setenv("DATABASE_BACKEND", "mock")
+    container.reset_injector()
+    yield container
+    container.reset_injector()
+
+
+def test_compiled_graph_matches_the_injector(mock_injector):
+    mock_injector.compile_providers()
+
+    compiled = mock_injector.get_weather_service("session")
+    resolved = mock_injector.get_request_injector("session").get(IWeatherService)
+
+    assert type(compiled) is type(resolved)
+    assert type(compiled.weather_repository) is type(resolved.weather_repository)
+    assert type(compiled.weather_repository.repository) is type(resolved.weather_repository.repository)
+    assert compiled.weather_repository.breaker is resolved.weather_repository.breaker
+    assert mock_injector.get_repository_backend() is mock_injector.get_injector().get(
+        type(mock_injector.get_repository_backend())
+    )
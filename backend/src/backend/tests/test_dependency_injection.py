@@ -0,0 +1,60 @@
+"""
+Tests de l'injection de dépendances : services résolus par l'injector sur la session de la
+requête, singletons partagés par le processus, choix du backend par l'environnement.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.di import container
+from backend.indexes.region_catalog import get_region_catalog
+from backend.repositories.implementations.cached_region_repository import CachedRegionRepository
+from backend.repositories.implementations.circuit_breaker_weather_repository import CircuitBreakerWeatherRepository
+from backend.services.implementation.region_info_service import RegionInformationService
+from backend.services.implementation.weather_service_injector import WeatherService
+from backend.services.interfaces.Iregion_info_service import IRegionInformationService
+from backend.services.interfaces.Iweather_service import IWeatherService
+
+
+@pytest.fixture
+def mock_injector(monkeypatch):
+    """Injector global reconstruit sur le backend mock, remis à zéro après le test"""
+    monkeypatch.setenv("DATABASE_BACKEND", "mock")
+    container.reset_injector()
+    yield container
+    container.reset_injector()
+
+
+def test_services_are_built_per_request_on_shared_singletons(mock_injector):
+    first = mock_injector.get_request_injector("session-1").get(IWeatherService)
+    second = mock_injector.get_request_injector("session-2").get(IWeatherService)
+    regions = mock_injector.get_request_injector("session-1").get(IRegionInformationService)
+
+    assert isinstance(first, WeatherService) and first is not second
+    assert isinstance(first.weather_repository, CircuitBreakerWeatherRepository)
+    assert first.weather_repository is not second.weather_repository
+    assert first.weather_repository.breaker is second.weather_repository.breaker
+    assert first.weather_repository.stale_cache is second.weather_repository.stale_cache
+    assert isinstance(regions, RegionInformationService)
+    assert isinstance(regions.region_repository, CachedRegionRepository)
+    assert regions.region_repository.catalog is get_region_catalog()
+
+
+def test_resolved_service_answers_on_the_mock_backend(mock_injector):
+    service = mock_injector.get_request_injector("session").get(IWeatherService)
+
+    weather = asyncio.run(service.get_current_weather("Paris"))
+
+    assert weather.region == "Paris"
+    assert weather.temperature == 22.5
+
+
+def test_unknown_backend_is_refused(monkeypatch):
+    monkeypatch.setenv("DATABASE_BACKEND", "oracle")
+    container.reset_injector()
+    try:
+        with pytest.raises(ValueError, match="DATABASE_BACKEND inconnu"):
+            container.get_injector()
+    finally:
+        container.reset_injector()
@@ -0,0 +1,148 @@
+"""
+Tests de la sélection des champs (`fields=`) : validation, colonnes lues jusqu'au SQL,
+entrées du cache de second niveau par projection, et historique réduit.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.caching.backends import InMemoryCacheBackend
+from backend.caching.second_level import SecondLevelCache
+from backend.controllers import weather_info_controller
+from backend.repositories.implementations.second_level_cached_weather_repository import (
+    CURRENT_WEATHER_PROJECTIONS, SecondLevelCachedWeatherRepository
+)
+from backend.repositories.implementations.sqlite_weather_repository import SQLiteWeatherRepository
+from backend.repositories.interfaces import WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS
+from backend.serialization.tabular import RowSet
+from backend.services.schemas.field_selection import (
+    WEATHER_READING_FIELDS, WEATHER_RESPONSE_FIELDS, InvalidFieldsError
+)
+
+PARIS = {"region_name": "Paris", "temperature": 21.5, "condition": "Sunny", "humidity": 55, "pressure": 1012.0}
+
+
+class _RecordingRepository:
+    """Repository météo qui note les colonnes demandées à chaque lecture"""
+
+    def __init__(self):
+        self.reads = []
+
+    async def get_weather_by_region(self, region_name, columns=None):
+        self.reads.append(columns)
+        return {column: PARIS[column] for column in columns} if columns else dict(PARIS)
+
+    async def bulk_create_weather_data(self, weather_records):
+        return len(weather_records)
+
+
+def test_fields_are_validated_and_mapped_to_columns():
+    assert WEATHER_RESPONSE_FIELDS.parse("temperature, region") == ("region", "temperature")
+    assert WEATHER_RESPONSE_FIELDS.parse(" , ") is None
+    assert WEATHER_RESPONSE_FIELDS.columns(("temperature", "stale")) == ("region_name", "temperature")
+    with pytest.raises(InvalidFieldsError) as error:
+        WEATHER_RESPONSE_FIELDS.parse("region,pressure")
+    assert error.value.unknown == ("pressure",)
+    # Chaque sélection possible a une entrée de cache, la ligne complète comprise
+    assert len(CURRENT_WEATHER_PROJECTIONS) == 9
+    assert "region_name,temperature" in CURRENT_WEATHER_PROJECTIONS
+
+
+def test_cache_keeps_one_entry_per_projection():
+    async def scenario():
+        source = _RecordingRepository()
+        cache = SecondLevelCache(InMemoryCacheBackend())
+        repository = SecondLevelCachedWeatherRepository(source, cache)
+        narrow = ("region_name", "temperature")
+        results = [
+            await repository.get_weather_by_region("Paris", narrow),
+            await repository.get_weather_by_region("Paris", narrow),
+            await repository.get_weather_by_region("Paris"),
+            await repository.get_weather_by_region("Paris"),
+        ]
+        await repository.bulk_create_weather_data([{"region_name": "Paris"}])
+        await repository.get_weather_by_region("Paris", narrow)
+        return source.reads, results, cache
+
+    reads, results, cache = asyncio.run(scenario())
+    # Une absence par projection, la colonne réduite transmise au repository ; l'écriture invalide les deux
+    assert reads == [("region_name", "temperature"), None, ("region_name", "temperature")]
+    assert results[1] == {"region_name": "Paris", "temperature": 21.5}
+    assert results[3] == PARIS
+    assert cache.hits == 2
+
+
+def test_unknown_projection_is_not_cached():
+    async def scenario():
+        source = _RecordingRepository()
+        repository = SecondLevelCachedWeatherRepository(source, SecondLevelCache(InMemoryCacheBackend()))
+        for _ in range(2):
+            await repository.get_weather_by_region("Paris", ("region_name", "pressure"))
+        return source.reads
+
+    assert asyncio.run(scenario()) == [("region_name", "pressure")] * 2
+
+
+def test_sqlite_reads_only_the_selected_columns(sqlite_database):
+    async def scenario():
+        await sqlite_database.initialize()
+        try:
+            async with sqlite_database.session_factory() as session:
+                repository = SQLiteWeatherRepository(session)
+                await repository.bulk_create_weather_data([PARIS])
+                return (await repository.get_weather_by_region("Paris", ("region_name", "temperature")),
+                        await repository.get_weather_by_region("Paris"))
+        finally:
+            await sqlite_database.close()
+
+    narrow, full = asyncio.run(scenario())
+    assert narrow == {"region_name": "Paris", "temperature": 21.5}
+    assert full["pressure"] == 1012.0 and "recorded_at" in full
+
+
+class _HistoryService:
+    async def get_weather_history_rows(self, region_name, days):
+        now = datetime(2025, 7, 1, 12, 0, tzinfo=timezone.utc)
+        return RowSet(WEATHER_HISTORY_ROW_COLUMNS, WEATHER_HISTORY_ROW_KINDS, [
+            (region_name, 21.5 - offset, "Sunny", 55, 1012.0, 10.0, "N", now - timedelta(hours=offset))
+            for offset in range(2)
+        ])
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(weather_info_controller.router, prefix="/api/v1")
+    app.dependency_overrides[weather_info_controller.get_weather_service] = _HistoryService
+    return TestClient(app)
+
+
+def test_history_returns_only_the_selected_fields(client):
+    response = client.get("/api/v1/weather/Paris/history", params={"fields": "recorded_at,temperature"})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"temperature": 21.5, "recorded_at": "2025-07-01T12:00:00+00:00"},
+        {"temperature": 20.5, "recorded_at": "2025-07-01T11:00:00+00:00"},
+    ]
+    assert len(client.get("/api/v1/weather/Paris/history").json()[0]) == len(WEATHER_READING_FIELDS.allowed)
+
+
+def test_history_rejects_unknown_fields(client):
+    response = client.get("/api/v1/weather/Paris/history", params={"fields": "temperature,stale"})
+
+    assert response.status_code == 400
+    assert "stale" in response.json()["detail"]
+
+
+def test_history_selection_applies_to_binary_formats(client):
+    msgpack = pytest.importorskip("msgpack")
+
+    response = client.get("/api/v1/weather/Paris/history", params={"fields": "temperature"},
+                          headers={"Accept": "application/x-msgpack"})
+
+    assert msgpack.unpackb(response.content, timestamp=3) == {"temperature": [21.5, 20.5]}
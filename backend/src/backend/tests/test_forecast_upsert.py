@@ -0,0 +1,72 @@
+"""
+Tests de l'upsert des prévisions : une ligne par (région, jour) quel que soit le nombre
+de rafraîchissements, dernière version gagnante, instruction ON CONFLICT sur PostgreSQL.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+from backend.database.models import WeatherForecast
+from backend.repositories.implementations.postgresql_weather_repository import PostgreSQLWeatherRepository
+from backend.repositories.implementations.sqlite_weather_repository import SQLiteWeatherRepository
+
+TOMORROW = date.today() + timedelta(days=1)
+
+
+def _forecasts(region_name, temperature, days=3):
+    return [
+        {"region_name": region_name, "forecast_date": (TOMORROW + timedelta(days=offset)).isoformat(),
+         "temperature_min": temperature, "temperature_max": temperature + 10, "condition": "Sunny", "humidity": 50}
+        for offset in range(days)
+    ]
+
+
+def test_repeated_refreshes_keep_one_row_per_day(sqlite_database):
+    async def scenario():
+        await sqlite_database.initialize()
+        try:
+            async with sqlite_database.session_factory() as session:
+                repository = SQLiteWeatherRepository(session)
+                written = [await repository.upsert_forecasts(_forecasts("Paris", 10.0 + refresh), batch_size=2)
+                           for refresh in range(3)]
+                written.append(await repository.upsert_forecasts(_forecasts("Lyon", 5.0, days=2)))
+                count = (await session.execute(select(func.count()).select_from(WeatherForecast))).scalar_one()
+                return written, count, await repository.get_weather_forecast("Paris", 7)
+        finally:
+            await sqlite_database.close()
+
+    written, count, paris = asyncio.run(scenario())
+    assert written == [3, 3, 3, 2]
+    assert count == 5
+    assert [forecast["temperature_min"] for forecast in paris] == [12.0, 12.0, 12.0]
+
+
+def test_last_version_in_a_batch_wins(sqlite_database):
+    async def scenario():
+        await sqlite_database.initialize()
+        try:
+            async with sqlite_database.session_factory() as session:
+                repository = SQLiteWeatherRepository(session)
+                written = await repository.upsert_forecasts(
+                    _forecasts("Paris", 10.0, days=1) + _forecasts("Paris", 20.0, days=1)
+                )
+                return written, await repository.get_weather_forecast("Paris", 7)
+        finally:
+            await sqlite_database.close()
+
+    written, paris = asyncio.run(scenario())
+    assert written == 1
+    assert [(forecast["forecast_date"], forecast["temperature_min"]) for forecast in paris] == [
+        (TOMORROW.isoformat(), 20.0)
+    ]
+
+
+def test_postgresql_statement_updates_on_the_unique_key():
+    sql = str(PostgreSQLWeatherRepository._forecast_upsert_statement().compile(dialect=postgresql.dialect()))
+
+    assert "ON CONFLICT ON CONSTRAINT uq_weather_forecasts_region_date DO UPDATE SET" in sql
+    assert "temperature_min = excluded.temperature_min" in sql
+    assert "created_at = now()" in sql
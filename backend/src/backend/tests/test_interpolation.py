@@ -0,0 +1,82 @@
+"""
+Tests de l'interpolation IDW : reprise exacte d'une station, pondération par la distance,
+puis cache par cellule de grille et rechargement des stations.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.indexes.spatial_index import haversine_km
+from backend.interpolation.idw import WeatherInterpolator, WeatherStationField
+
+STATIONS = [
+    {"region_name": "Ouest", "latitude": 0.0, "longitude": -1.0, "temperature": 10.0, "humidity": 40,
+     "pressure": 1000.0, "wind_speed": None, "condition": "Sunny", "wind_direction": "N"},
+    {"region_name": "Est", "latitude": 0.0, "longitude": 2.0, "temperature": 40.0, "humidity": 70,
+     "pressure": 1030.0, "wind_speed": 12.0, "condition": "Rainy", "wind_direction": "S"},
+    {"region_name": "Sans coordonnées", "latitude": None, "longitude": None, "temperature": -50.0},
+]
+
+
+def test_exact_hit_returns_the_station_values():
+    field = WeatherStationField(STATIONS)
+
+    estimate = field.estimate(0.0, 2.0, k=2)
+
+    assert len(field) == 2
+    assert (estimate["temperature"], estimate["humidity"], estimate["condition"]) == (40.0, 70.0, "Rainy")
+    assert [station["region_name"] for station in estimate["stations"]] == ["Est", "Ouest"]
+    assert "stale" not in estimate
+
+
+def test_weights_follow_inverse_distance():
+    field = WeatherStationField(STATIONS)
+
+    estimate = field.estimate(0.0, 0.0, k=2, power=2.0)
+
+    west, east = 1 / haversine_km(0, 0, 0, -1) ** 2, 1 / haversine_km(0, 0, 0, 2) ** 2
+    assert estimate["temperature"] == pytest.approx((10 * west + 40 * east) / (west + east), abs=0.01)
+    # Station la plus proche : quatre fois le poids de l'autre, elle l'emporte sur les catégories
+    assert estimate["condition"] == "Sunny" and estimate["wind_direction"] == "N"
+    # Valeur absente d'une station : seule l'autre compte
+    assert estimate["wind_speed"] == 12.0
+    assert field.estimate(0.0, 0.0, k=2, power=0.0)["temperature"] == 25.0
+    assert WeatherStationField([]).estimate(0.0, 0.0) == {}
+
+
+class _LatestWeather:
+    def __init__(self, readings):
+        self.readings = readings
+        self.reads = 0
+
+    async def get_latest_weather_by_region(self):
+        self.reads += 1
+        return [dict(reading) for reading in self.readings]
+
+
+def test_points_of_a_cell_share_one_estimate_until_expiry():
+    async def scenario():
+        source = _LatestWeather(STATIONS)
+        interpolator = WeatherInterpolator(cell_size_degrees=0.5, ttl_seconds=3600)
+        first = await interpolator.estimate(source, 0.1, 0.1)
+        same_cell = await interpolator.estimate(source, 0.4, 0.4)
+        batch = await interpolator.estimate_many(source, [(0.2, 0.2), (0.3, 0.3), (-0.2, 0.2)])
+        source.readings = [{**reading, "temperature": 0.0} for reading in STATIONS]
+        before_expiry = await interpolator.estimate(source, 0.1, 0.1)
+        interpolator.expire()
+        after_expiry = await interpolator.estimate(source, 0.1, 0.1)
+        return source.reads, first, same_cell, batch, before_expiry, after_expiry
+
+    reads, first, same_cell, batch, before_expiry, after_expiry = asyncio.run(scenario())
+    assert same_cell is first and batch[0] is first and batch[1] is first
+    assert batch[2] is not first
+    assert before_expiry is first
+    assert after_expiry["temperature"] == 0.0
+    assert reads == 2
+
+
+def test_stale_stations_are_flagged():
+    field = WeatherStationField([{**reading, "stale": True} for reading in STATIONS[:2]])
+
+    assert field.stale and field.estimate(0.0, 0.0)["stale"] is True
@@ -0,0 +1,79 @@
+"""
+Tests des types des mesures : colonnes double precision dans les modèles, le script
+d'initialisation et la migration 004, valeurs lues en float (zéro compris) avant comme
+après la migration.
+"""
+
+import asyncio
+import re
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import Double
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from backend.database.models import Region, WeatherData, WeatherForecast
+from backend.repositories.implementations.sqlite_region_repository import SQLiteRegionRepository
+from backend.repositories.implementations.sqlite_weather_repository import SQLiteWeatherRepository
+
+DATABASE_DIR = Path(__file__).resolve().parents[4] / "database"
+
+# OID PostgreSQL des colonnes NUMERIC (schéma pas encore migré)
+NUMERIC_OID = 1700
+
+
+def _double_columns(model):
+    return {column.name for column in model.__table__.columns if isinstance(column.type, Double)}
+
+
+def test_migration_and_init_script_cover_every_measure_column():
+    migration = (DATABASE_DIR / "migrations" / "004_weather_measures_double_precision.sql").read_text()
+    init_script = (DATABASE_DIR / "init_scripts" / "01_init_database.sql").read_text()
+
+    for model in (WeatherData, WeatherForecast):
+        table = model.__tablename__
+        statement = re.search(rf"ALTER TABLE {table}\b(.*?);", migration, re.S).group(1)
+        assert set(re.findall(r"ALTER COLUMN (\w+) TYPE double precision", statement)) == _double_columns(model)
+        create = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \((.*?)\n\);", init_script, re.S).group(1)
+        assert set(re.findall(r"^\s+(\w+) DOUBLE PRECISION", create, re.M)) == _double_columns(model)
+
+
+def test_numeric_columns_of_an_unmigrated_schema_are_read_as_floats():
+    dialect = asyncpg_dialect()
+
+    for column in (WeatherData.__table__.c.temperature, Region.__table__.c.latitude):
+        processor = column.type.dialect_impl(dialect).result_processor(dialect, NUMERIC_OID)
+        value = processor(Decimal("20.35"))
+        assert type(value) is float and value == 20.35
+
+
+def test_zero_measures_are_not_turned_into_none():
+    reading = WeatherData(region_name="Pôle", temperature=0.0, condition="Snow", humidity=0, pressure=0.0,
+                          wind_speed=0.0).to_dict()
+    region = Region(id=1, name="Null Island", latitude=0.0, longitude=0.0).to_dict()
+
+    assert (reading["temperature"], reading["pressure"], reading["wind_speed"]) == (0.0, 0.0, 0.0)
+    assert (region["latitude"], region["longitude"]) == (0.0, 0.0)
+
+
+def test_measures_read_back_as_floats(sqlite_database):
+    async def scenario():
+        await sqlite_database.initialize()
+        try:
+            async with sqlite_database.session_factory() as session:
+                region = await SQLiteRegionRepository(session).create_region(
+                    {"name": "Null Island", "nb_habitants": 0, "latitude": 0.0, "longitude": 10.5}
+                )
+                repository = SQLiteWeatherRepository(session)
+                await repository.bulk_create_weather_data([
+                    {"region_name": "Null Island", "temperature": 20.35, "condition": "Sunny", "humidity": 40,
+                     "pressure": 0.0, "wind_speed": 3.1}
+                ])
+                return region, await repository.get_weather_by_region("Null Island")
+        finally:
+            await sqlite_database.close()
+
+    region, reading = asyncio.run(scenario())
+    assert (region["latitude"], region["longitude"]) == (0.0, 10.5)
+    assert [type(reading[field]) for field in ("temperature", "pressure", "wind_speed")] == [float] * 3
+    assert (reading["temperature"], reading["pressure"]) == (20.35, 0.0)
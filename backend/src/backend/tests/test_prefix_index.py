@@ -0,0 +1,66 @@
+"""
+Tests de l'index de préfixe : normalisation des saisies, correspondance par mot, classement
+par population, et préfixes lourds précalculés comparés à un balayage complet.
+"""
+
+import random
+
+from backend.indexes.prefix_index import HEAVY_PREFIX_RANGE, MAX_RESULTS, RegionPrefixIndex
+from backend.indexes.text_normalization import normalize_region_name
+
+REGIONS = [
+    {"id": 1, "name": "Provence-Alpes-Côte d'Azur", "nb_habitants": 5_000_000},
+    {"id": 2, "name": "Pays de la Loire", "nb_habitants": 3_800_000},
+    {"id": 3, "name": "Île-de-France", "nb_habitants": 12_000_000},
+    {"id": 4, "name": "Paris", "nb_habitants": 2_100_000},
+    {"id": 5, "name": "Parisis", "nb_habitants": None},
+    {"id": 6, "name": "", "nb_habitants": 10},
+]
+
+
+def _brute_force(regions, query, limit):
+    key = normalize_region_name(query)
+    matches = [
+        region for region in regions
+        if any(word_start.startswith(key) for word_start in RegionPrefixIndex._index_keys(region["name"]))
+    ]
+    matches.sort(key=lambda region: (-(region["nb_habitants"] or 0), region["id"]))
+    return [region["id"] for region in matches[:min(limit, MAX_RESULTS)]]
+
+
+def test_normalization_ignores_case_accents_and_separators():
+    assert normalize_region_name("  Provence-Alpes-Côte d'Azur ") == "provence alpes cote d azur"
+    assert normalize_region_name("ÎLE_de.France") == "ile de france"
+    assert normalize_region_name("") == ""
+
+
+def test_search_matches_any_word_by_population():
+    index = RegionPrefixIndex(REGIONS)
+
+    assert len(index) == 6
+    assert index.search("azur") == [1]
+    assert index.search("COTE D") == [1]
+    assert index.search("p") == [1, 2, 4, 5]
+    assert index.search("pari") == [4, 5]
+    assert index.search("île-de-fr") == [3]
+    assert index.search("de", limit=1) == [3]
+    assert index.search("pari", limit=0) == [] and index.search("   ") == [] and index.search("lyon") == []
+
+
+def test_heavy_prefixes_match_a_full_scan():
+    generator = random.Random(7)
+    syllables = ["sa", "sai", "saint", "se", "so", "ma", "mar", "mo", "la", "le"]
+    regions = [
+        {"id": region_id,
+         "name": " ".join(generator.choice(syllables) + generator.choice(syllables) for _ in range(2)),
+         "nb_habitants": generator.choice([None, generator.randrange(10 ** 6)])}
+        for region_id in range(1, 2001)
+    ]
+    index = RegionPrefixIndex(regions)
+    # Le jeu couvre bien des préfixes précalculés
+    assert len(index.search("s", limit=MAX_RESULTS)) == MAX_RESULTS
+    assert sum(1 for region in regions if normalize_region_name(region["name"]).startswith("s")) > HEAVY_PREFIX_RANGE
+
+    for query in ("s", "sa", "sai", "saint", "saint m", "m", "ma", "mar", "l", "lele", "x"):
+        for limit in (1, 10, MAX_RESULTS, MAX_RESULTS + 10):
+            assert index.search(query, limit) == _brute_force(regions, query, limit), (query, limit)
@@ -0,0 +1,76 @@
+"""
+Tests du catalogue des régions : index de l'instantané, copies rendues aux appelants,
+puis rechargement sur changement d'empreinte.
+"""
+
+import asyncio
+
+from backend.indexes.region_catalog import RegionCatalog, RegionCatalogSnapshot
+
+REGIONS = [
+    {"id": 1, "name": "Île-de-France", "nb_habitants": 12_000_000, "latitude": 48.85, "longitude": 2.35},
+    {"id": 2, "name": "Provence-Alpes-Côte d'Azur", "nb_habitants": 5_000_000, "latitude": 43.3, "longitude": 5.37},
+    {"id": 3, "name": "Bretagne", "nb_habitants": 3_300_000, "latitude": 48.11, "longitude": -1.68},
+    {"id": 4, "name": "Corse", "nb_habitants": 340_000, "latitude": None, "longitude": None},
+]
+
+
+def test_snapshot_indexes_regions():
+    snapshot = RegionCatalogSnapshot(REGIONS, {"count": 4})
+
+    assert len(snapshot) == 4
+    assert [region["name"] for region in snapshot.all()] == ["Bretagne", "Corse", "Provence-Alpes-Côte d'Azur",
+                                                               "Île-de-France"]
+    assert snapshot.get_by_id(3)["name"] == "Bretagne" and snapshot.get_by_id(99) == {}
+    assert snapshot.get_by_name("ile de france")["id"] == 1
+    # Pas de nom exact : la région la plus peuplée dont un mot commence par la saisie
+    assert snapshot.get_by_name("cote")["id"] == 2
+    assert snapshot.get_by_name("Normandie") == {}
+    # Régions sans coordonnées absentes de l'index spatial
+    assert [region["id"] for region in snapshot.nearest(48.0, -1.0, k=5)] == [3, 1, 2]
+
+
+def test_snapshot_hands_out_copies():
+    source = [dict(region) for region in REGIONS]
+    snapshot = RegionCatalogSnapshot(source)
+    source[0]["name"] = "Modifiée"
+    snapshot.get_by_id(1)["name"] = "Modifiée"
+    snapshot.all()[0]["name"] = "Modifiée"
+
+    assert snapshot.get_by_id(1)["name"] == "Île-de-France"
+    assert snapshot.all()[0]["name"] == "Bretagne"
+
+
+class _RegionSource:
+    def __init__(self):
+        self.regions = [dict(region) for region in REGIONS]
+        self.reads = 0
+        self.failing = False
+
+    async def get_regions_watermark(self):
+        return {"count": len(self.regions), "max_updated_at": None}
+
+    async def get_all_regions(self):
+        self.reads += 1
+        # Le repository PostgreSQL masque ses erreurs par une liste vide
+        return [] if self.failing else list(self.regions)
+
+
+def test_catalog_reloads_on_watermark_change_only():
+    async def scenario():
+        source, catalog = _RegionSource(), RegionCatalog()
+        empty = len(catalog.snapshot)
+        first = await catalog.ensure_loaded(source)
+        unchanged = await catalog.refresh_if_stale(source)
+        source.regions.append({"id": 5, "name": "Normandie", "nb_habitants": 3_300_000})
+        changed = await catalog.refresh_if_stale(source)
+        source.failing = True
+        kept = await catalog.refresh(source)
+        return empty, first, unchanged, changed, kept, catalog, source.reads
+
+    empty, first, unchanged, changed, kept, catalog, reads = asyncio.run(scenario())
+    assert empty == 0 and len(first) == 4
+    assert (unchanged, changed) == (False, True)
+    # Lecture vide alors que la table ne l'est pas : l'instantané connu est gardé
+    assert kept is catalog.snapshot and len(kept) == 5
+    assert reads == 3
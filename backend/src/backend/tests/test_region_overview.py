@@ -0,0 +1,91 @@
+"""
+Tests de la vue d'ensemble d'une région : sous-requêtes en parallèle sur des sessions
+distinctes, réponse partielle en cas d'échec ou de dépassement du délai.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+
+from backend.services.implementation.region_overview_service import RegionOverviewService
+from backend.services.schemas.weather_resp_schema import WeatherForecastSeriesResponse, WeatherResponse
+
+PARIS = {"id": 1, "name": "Paris", "nb_habitants": 2_100_000, "language": "français"}
+
+
+class _Regions:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    async def get_region_info_by_id(self, region_id):
+        await asyncio.sleep(self.delay)
+        return dict(PARIS) if region_id == 1 else {}
+
+
+class _WeatherService:
+    def __init__(self, delays, failing=()):
+        self.delays = delays
+        self.failing = failing
+
+    async def _wait(self, name):
+        await asyncio.sleep(self.delays.get(name, 0.0))
+        if name in self.failing:
+            raise RuntimeError(f"{name} indisponible")
+
+    async def get_current_weather(self, region_name):
+        await self._wait("weather")
+        return WeatherResponse(region=region_name, temperature=21.0, condition="Sunny", humidity=50)
+
+    async def get_weather_forecast_series(self, region_name, days):
+        await self._wait("forecast")
+        return WeatherForecastSeriesResponse(region=region_name, days=0, forecasts=[])
+
+
+def _service(delays=None, failing=(), timeout_seconds=1.0, region_delay=0.0):
+    sessions = []
+
+    @asynccontextmanager
+    async def scope():
+        sessions.append("ouverte")
+        try:
+            yield _WeatherService(delays or {}, failing)
+        finally:
+            sessions[sessions.index("ouverte")] = "fermée"
+
+    return RegionOverviewService(_Regions(region_delay), scope, timeout_seconds), sessions
+
+
+def test_subqueries_run_concurrently_on_their_own_sessions():
+    service, sessions = _service({"weather": 0.1, "forecast": 0.1})
+
+    start = time.perf_counter()
+    overview = asyncio.run(service.get_region_overview(1, 3))
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.18
+    assert overview.region.name == "Paris"
+    assert overview.weather.temperature == 21.0 and overview.forecast.region == "Paris"
+    assert (overview.partial, overview.errors) == (False, {})
+    assert sessions == ["fermée", "fermée"]
+
+
+def test_failed_or_slow_subqueries_give_a_partial_overview():
+    service, _ = _service({"forecast": 0.5}, failing=("weather",), timeout_seconds=0.05)
+
+    overview = asyncio.run(service.get_region_overview(1, 3))
+
+    assert overview.partial is True
+    assert overview.errors == {"weather": "error", "forecast": "timeout"}
+    assert overview.weather is None and overview.forecast is None
+
+
+def test_unknown_or_unreachable_region():
+    service, sessions = _service()
+    assert asyncio.run(service.get_region_overview(2, 3)) is None
+    assert sessions == []
+
+    slow, _ = _service(timeout_seconds=0.01, region_delay=0.5)
+    with pytest.raises(TimeoutError):
+        asyncio.run(slow.get_region_overview(1, 3))
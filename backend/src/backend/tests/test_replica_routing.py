@@ -0,0 +1,112 @@
+"""
+Tests du routage primaire / réplicas : lectures sur une réplica choisie une fois par
+session, écritures et lectures suivantes sur la primaire, repli sans réplica saine.
+Chaque base est un fichier SQLite dont une table indique le nom.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import Column, MetaData, String, Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.database.routing import LEAST_BUSY, Replica, ReplicaRouter, RoutingSession, use_primary
+from backend.database.sqlite import sqlite_available
+
+metadata = MetaData()
+origin = Table("origin", metadata, Column("name", String, primary_key=True))
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """Moteurs de la primaire et de deux réplicas, chacun contenant son nom"""
+    if not sqlite_available():
+        pytest.skip("aiosqlite n'est pas installé (extra sqlite)")
+    engines = {name: create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+               for name in ("primary", "replica-1", "replica-2")}
+
+    async def prepare():
+        for name, engine in engines.items():
+            async with engine.begin() as conn:
+                await conn.run_sync(metadata.create_all)
+                await conn.execute(insert(origin).values(name=name))
+
+    asyncio.run(prepare())
+    return engines
+
+
+def _router(engines, **options):
+    replicas = [Replica(name, engines[name]) for name in ("replica-1", "replica-2")]
+    return ReplicaRouter(engines["primary"], replicas, **options)
+
+
+def _sessions(router):
+    return async_sessionmaker(router.primary, class_=AsyncSession, sync_session_class=RoutingSession,
+                              router=router, expire_on_commit=False)
+
+
+async def _origins(session):
+    return [(await session.execute(select(origin.c.name))).scalar_one() for _ in range(2)]
+
+
+def test_reads_go_to_one_replica_per_session_in_turn(databases):
+    router = _router(databases)
+
+    async def scenario():
+        seen = []
+        for _ in range(3):
+            async with _sessions(router)() as session:
+                seen.append(await _origins(session))
+        await router.close()
+        return seen
+
+    assert asyncio.run(scenario()) == [["replica-1"] * 2, ["replica-2"] * 2, ["replica-1"] * 2]
+    assert [replica.sessions for replica in router.replicas] == [0, 0]
+
+
+def test_writes_and_later_reads_use_the_primary(databases):
+    router = _router(databases)
+
+    async def scenario():
+        async with _sessions(router)() as session:
+            before = (await session.execute(select(origin.c.name))).scalar_one()
+            await session.execute(insert(origin).values(name="written"))
+            after = sorted((await session.execute(select(origin.c.name))).scalars())
+            await session.commit()
+        async with _sessions(router)() as session:
+            use_primary(session)
+            pinned = sorted((await session.execute(select(origin.c.name))).scalars())
+        await router.close()
+        return before, after, pinned
+
+    before, after, pinned = asyncio.run(scenario())
+    assert before == "replica-1"
+    assert after == pinned == ["primary", "written"]
+
+
+def test_unhealthy_replicas_are_skipped(databases):
+    router = _router(databases, strategy=LEAST_BUSY)
+    router.replicas[0].sessions = 3
+
+    async def scenario():
+        async with _sessions(router)() as session:
+            least_busy = await _origins(session)
+        for replica in router.replicas:
+            replica.mark_unhealthy("test")
+        async with _sessions(router)() as session:
+            fallback = await _origins(session)
+        await router.check_health()
+        healthy = [replica.healthy for replica in router.replicas]
+        await router.close()
+        return least_busy, fallback, healthy
+
+    least_busy, fallback, healthy = asyncio.run(scenario())
+    assert least_busy == ["replica-2"] * 2
+    assert fallback == ["primary"] * 2
+    # Vérification de santé réussie : réplicas réintégrées
+    assert healthy == [True, True]
+
+
+def test_unknown_strategy_is_refused(databases):
+    with pytest.raises(ValueError):
+        ReplicaRouter(databases["primary"], strategy="random")
@@ -0,0 +1,203 @@
+"""
+Tests du cache de second niveau : aller-retour du codec compact, entrées illisibles ou
+non sérialisables, puis présence, absence et invalidation derrière les repositories.
+"""
+
+import asyncio
+import math
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from backend.caching.backends import InMemoryCacheBackend
+from backend.caching.codec import COLUMNAR_MIN_ROWS, COMPRESS_MIN_BYTES, CodecError, CompactCodec
+from backend.caching.second_level import CacheNamespace, SecondLevelCache
+from backend.repositories.implementations.second_level_cached_region_repository import (
+    SecondLevelCachedRegionRepository
+)
+from backend.repositories.implementations.second_level_cached_weather_repository import (
+    FORECAST_FIELDS, FORECASTS, SecondLevelCachedWeatherRepository
+)
+
+CODEC = CompactCodec(FORECAST_FIELDS)
+
+
+def _round_trip(value):
+    return CODEC.decode(CODEC.encode(value))
+
+
+def test_nested_values_round_trip():
+    value = {
+        "region_name": "Île-de-France",
+        "humidity": 55,
+        "temperature": 21.45,
+        "pressure": 1013.250001,
+        "wind_speed": 1 / 3,
+        "precipitation_probability": None,
+        "alerts": [{"level": -3, "active": True, "sources": ["météo", None, False]}, []],
+        "counts": {"big": 2 ** 70, "negative": -2 ** 40},
+    }
+
+    assert _round_trip(value) == value
+    assert _round_trip([]) == [] and _round_trip({}) == {} and _round_trip(None) is None
+
+
+def test_special_floats_round_trip():
+    for value in (0.0, -0.0, 1e300, -1e-9, float("inf"), float("-inf")):
+        decoded = _round_trip(value)
+        assert decoded == value and math.copysign(1, decoded) == math.copysign(1, value)
+    assert math.isnan(_round_trip(float("nan")))
+
+
+def test_dates_and_timestamps_come_back_as_the_same_strings():
+    values = [
+        "2025-07-01",
+        "1969-12-31",
+        "2025-07-01T12:00:00",
+        "2025-07-01T12:00:00+00:00",
+        "2025-07-01T12:00:00.123456+05:30",
+        "2025-07-01T12:00:00.000000+00:00",  # microseconds nulles écrites : gardée en texte
+        "2025-07-01 12:00:00+00:00",
+        "2025-13-01",
+        "2025-07-01T12:00:00+00:00:30",
+    ]
+
+    assert _round_trip(values) == values
+    # Une date ISO tient en quelques octets au lieu de sa longueur en texte
+    assert len(CODEC.encode("2025-07-01T12:00:00.123456+05:30")) < 16
+
+
+def test_long_record_lists_are_written_by_columns():
+    records = [
+        {"id": position, "region_name": f"Région {position}", "temperature": position / 4,
+         "humidity": None if position % 3 else position, "is_forecast": position % 2 == 0,
+         "forecast_date": f"2025-07-{position % 28 + 1:02d}", "extra": [position] if position % 5 else "texte"}
+        for position in range(COLUMNAR_MIN_ROWS * 4)
+    ]
+
+    encoded = CODEC.encode(records)
+    assert CODEC.decode(encoded) == records
+    assert len(encoded) < len(str(records)) / 2
+    # Lignes de clés différentes : écrites valeur par valeur, relues à l'identique
+    uneven = records[:COLUMNAR_MIN_ROWS] + [{"id": -1}]
+    assert _round_trip(uneven) == uneven
+
+
+def test_large_payload_is_compressed():
+    value = ["Partly Cloudy"] * (COMPRESS_MIN_BYTES // 4)
+
+    encoded = CODEC.encode(value)
+    assert encoded[:1] == b"Z"
+    assert CODEC.decode(encoded) == value
+
+
+def test_objects_outside_the_format_are_refused():
+    for value in (Decimal("21.45"), datetime(2025, 7, 1, tzinfo=timezone.utc), {"when": {1, 2}}):
+        with pytest.raises(TypeError):
+            CODEC.encode(value)
+
+
+def test_unreadable_bytes_raise_codec_error():
+    encoded = CODEC.encode({"region_name": "Paris", "humidity": 55})
+    for corrupted in (encoded[:-1], encoded + b"\x00", b"X" + encoded[1:], b"Z" + b"pas du zlib"):
+        with pytest.raises(CodecError):
+            CODEC.decode(corrupted)
+
+
+def test_field_table_versions_the_keys():
+    assert CompactCodec(("a", "b")).fingerprint != CompactCodec(("b", "a")).fingerprint
+    first = CacheNamespace("forecasts", 1, FORECAST_FIELDS).key_prefix("weather-app")
+    assert first != CacheNamespace("forecasts", 2, FORECAST_FIELDS).key_prefix("weather-app")
+    assert first.startswith("weather-app:forecasts:v1.")
+
+
+def test_cache_skips_unserializable_values_and_unreadable_entries():
+    async def scenario():
+        backend = InMemoryCacheBackend()
+        cache = SecondLevelCache(backend)
+        await cache.set(FORECASTS, ("Paris", 7), [{"temperature": Decimal("21.45")}])
+        await backend.set_many({FORECASTS.key(cache.prefix, ("Lyon", 7)): b"T\xff"}, 30)
+        return cache, await cache.get(FORECASTS, "Paris", 7), await cache.get(FORECASTS, "Lyon", 7)
+
+    cache, paris, lyon = asyncio.run(scenario())
+    assert paris is None and lyon is None
+    assert cache.writes == 0
+    assert cache.misses == 2 and cache.errors == 0
+
+
+class _WeatherSource:
+    """Repository météo en mémoire qui compte ses lectures de prévisions"""
+
+    def __init__(self):
+        self.reads = 0
+
+    async def get_weather_forecast(self, region_name, days):
+        self.reads += 1
+        name = "Paris" if region_name.lower() in "paris" else region_name
+        return [{"region_name": name, "forecast_date": "2025-07-02", "temperature": 22.0 + self.reads}]
+
+    async def upsert_forecasts(self, forecast_records, batch_size=1000):
+        return len(forecast_records)
+
+
+def test_forecasts_hit_miss_and_invalidation():
+    async def scenario():
+        source = _WeatherSource()
+        repository = SecondLevelCachedWeatherRepository(source, SecondLevelCache(InMemoryCacheBackend()))
+        first = await repository.get_weather_forecast("Paris", 3)
+        cached = await repository.get_weather_forecast("Paris", 3)
+        other_length = await repository.get_weather_forecast("Paris", 5)
+        await repository.upsert_forecasts([{"region_name": "Paris", "forecast_date": "2025-07-02"}])
+        refreshed = await repository.get_weather_forecast("Paris", 3)
+        # Nom partiel : la réponse porte un autre nom, elle n'est pas mise en cache
+        await repository.get_weather_forecast("pari", 3)
+        await repository.get_weather_forecast("pari", 3)
+        return source.reads, first, cached, other_length, refreshed
+
+    reads, first, cached, other_length, refreshed = asyncio.run(scenario())
+    assert cached == first
+    assert other_length[0]["temperature"] == 24.0
+    assert refreshed[0]["temperature"] == 25.0
+    assert reads == 5
+
+
+class _RegionSource:
+    """Repository des régions dont l'empreinte change à chaque écriture"""
+
+    def __init__(self):
+        self.regions = [{"id": 1, "name": "Paris", "updated_at": "2025-07-01T12:00:00+00:00"}]
+        self.reads = 0
+
+    async def get_regions_watermark(self):
+        return {"count": len(self.regions), "max_updated_at": self.regions[-1]["updated_at"]}
+
+    async def get_all_regions(self):
+        self.reads += 1
+        return [dict(region) for region in self.regions]
+
+    async def create_region(self, region_data):
+        self.regions.append(region_data)
+        return region_data
+
+
+def test_cold_worker_reads_the_region_list_from_the_cache():
+    async def scenario():
+        source, cache = _RegionSource(), SecondLevelCache(InMemoryCacheBackend())
+        first_worker = SecondLevelCachedRegionRepository(source, cache)
+        second_worker = SecondLevelCachedRegionRepository(source, cache)
+        await first_worker.get_regions_watermark()
+        warm = await first_worker.get_all_regions()
+        await second_worker.get_regions_watermark()
+        cold = await second_worker.get_all_regions()
+        reads_before_write = source.reads
+        await first_worker.create_region({"id": 2, "name": "Lyon", "updated_at": "2025-07-02T08:00:00+00:00"})
+        after_write = await second_worker.get_all_regions()
+        return warm, cold, reads_before_write, after_write, source.reads
+
+    warm, cold, reads_before_write, after_write, reads = asyncio.run(scenario())
+    assert cold == warm
+    assert reads_before_write == 1
+    # Nouvelle empreinte : l'ancienne entrée n'est plus demandée
+    assert [region["name"] for region in after_write] == ["Paris", "Lyon"]
+    assert reads == 2
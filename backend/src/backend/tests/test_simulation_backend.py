@@ -0,0 +1,88 @@
+"""
+Tests du backend de simulation : jeu de données reproductible, écritures servies par les
+lectures suivantes, latence et erreurs injectées.
+"""
+
+import asyncio
+import statistics
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from backend.repositories.implementations.simulated_weather_repository import SimulatedWeatherRepository
+from backend.simulation.dataset import SimulatedDataset
+from backend.simulation.latency import LatencyModel, SimulatedDatabaseError
+
+
+def _regions(dataset):
+    # Horodatages de création : instant de la génération
+    return [{key: value for key, value in region.items() if not key.endswith("_at")} for region in dataset.snapshot().all()]
+
+
+def _dataset(seed=42):
+    return SimulatedDataset(region_count=50, readings_per_region=8, reading_interval_minutes=60, seed=seed)
+
+
+def test_same_seed_gives_the_same_dataset():
+    first, second, other = _dataset(), _dataset(), _dataset(seed=7)
+    name = first.snapshot().all()[0]["name"]
+    tomorrow = date.today() + timedelta(days=1)
+
+    assert len(first) == 50 and first.reading_count == 400
+    assert _regions(first) == _regions(second)
+    assert first.latest_readings() == second.latest_readings()
+    assert first.forecasts(name, tomorrow, 3) == second.forecasts(name, tomorrow, 3)
+    assert first.latest_readings() != other.latest_readings()
+
+
+def test_writes_are_served_by_later_reads():
+    dataset = _dataset()
+    name = dataset.snapshot().all()[0]["name"]
+    tomorrow = date.today() + timedelta(days=1)
+    repository = SimulatedWeatherRepository(dataset, LatencyModel())
+
+    async def scenario():
+        history = await repository.get_weather_history(name, days=1)
+        await repository.bulk_create_weather_data([{
+            "region_name": name, "temperature": 99.0, "condition": "Sunny", "humidity": 10,
+            "recorded_at": datetime.now(timezone.utc).isoformat()
+        }])
+        written = await repository.upsert_forecasts([
+            {"region_name": name, "forecast_date": tomorrow.isoformat(), "temperature_min": -5.0, "humidity": 1},
+            {"region_name": name, "forecast_date": tomorrow.isoformat(), "temperature_min": -6.0, "humidity": 1},
+        ], batch_size=1)
+        return (history, await repository.get_weather_by_region(name), written,
+                dataset.forecasts(name, tomorrow, 2), await repository.get_weather_history(name, days=1))
+
+    history, latest, written, forecasts, history_after = asyncio.run(scenario())
+    # 8 mesures horaires générées, toutes dans la dernière journée
+    assert len(history) == 8
+    assert latest["temperature"] == 99.0
+    assert written == 1
+    assert forecasts[0]["temperature_min"] == -6.0 and forecasts[1]["temperature_min"] != -6.0
+    assert len(history_after) == 9 and history_after[0]["temperature"] == 99.0
+
+
+def test_injected_errors_raise_on_reads_and_empty_on_single_writes():
+    latency = LatencyModel(error_rate=1.0, seed=1)
+    repository = SimulatedWeatherRepository(_dataset(), latency)
+
+    with pytest.raises(SimulatedDatabaseError):
+        asyncio.run(repository.get_weather_forecast("Paris", 3))
+    assert asyncio.run(repository.create_weather_data({"region_name": "Paris"})) == {}
+    assert (latency.calls, latency.errors) == (2, 2)
+
+
+def test_lognormal_latency_matches_its_median_and_p99():
+    latency = LatencyModel("lognormal", median_ms=4.0, p99_ms=20.0, seed=3)
+
+    samples = sorted(latency.sample_ms() for _ in range(20000))
+
+    assert statistics.median(samples) == pytest.approx(4.0, rel=0.05)
+    assert samples[int(len(samples) * 0.99)] == pytest.approx(20.0, rel=0.1)
+    assert LatencyModel("constant", median_ms=3.0).sample_ms() == 3.0
+    assert LatencyModel().sample_ms() == 0.0
+    with pytest.raises(ValueError):
+        LatencyModel("gaussian")
+    with pytest.raises(ValueError):
+        LatencyModel(error_rate=1.5)
@@ -0,0 +1,59 @@
+"""
+Tests de l'index spatial : KD-tree comparé au balayage complet, distances haversine,
+pôles et antiméridien.
+"""
+
+import random
+
+import pytest
+
+from backend.indexes.spatial_index import MAX_NEIGHBOURS, RegionSpatialIndex, haversine_km
+
+
+def _regions(count, seed=11):
+    generator = random.Random(seed)
+    return [
+        {"id": region_id, "latitude": generator.uniform(-90, 90), "longitude": generator.uniform(-180, 180)}
+        for region_id in range(count)
+    ]
+
+
+def test_haversine_distances():
+    assert haversine_km(48.856614, 2.352222, 48.856614, 2.352222) == 0
+    # Paris - Lyon : environ 392 km
+    assert haversine_km(48.856614, 2.352222, 45.764043, 4.835659) == pytest.approx(392, abs=2)
+    assert haversine_km(0, 179.5, 0, -179.5) == pytest.approx(111.2, abs=0.1)
+
+
+def test_kd_tree_matches_brute_force():
+    regions = _regions(3000)
+    index = RegionSpatialIndex(regions)
+    by_id = {region["id"]: region for region in regions}
+    generator = random.Random(3)
+
+    for _ in range(200):
+        latitude, longitude = generator.uniform(-90, 90), generator.uniform(-180, 180)
+        k = generator.choice([1, 5, MAX_NEIGHBOURS])
+        nearest = index.nearest(latitude, longitude, k)
+        reference = index.nearest_brute_force(latitude, longitude, k)
+        assert [region_id for region_id, _ in nearest] == [region_id for region_id, _ in reference]
+        for region_id, distance in nearest:
+            region = by_id[region_id]
+            assert distance == pytest.approx(haversine_km(latitude, longitude, region["latitude"], region["longitude"]),
+                                             abs=1e-6)
+
+
+def test_neighbours_across_the_antimeridian_and_near_the_poles():
+    index = RegionSpatialIndex([
+        {"id": 1, "latitude": 0.0, "longitude": 179.9},
+        {"id": 2, "latitude": 0.0, "longitude": 170.0},
+        {"id": 3, "latitude": 89.9, "longitude": -90.0},
+        {"id": 4, "latitude": 80.0, "longitude": 90.0},
+        {"id": 5, "latitude": None, "longitude": 10.0},
+    ])
+
+    assert len(index) == 4
+    assert index.nearest(0.0, -179.9, k=1)[0][0] == 1
+    assert index.nearest(89.9, 90.0, k=1)[0][0] == 3
+    assert len(index.nearest(0.0, 0.0, k=MAX_NEIGHBOURS + 5)) == 4
+    assert index.nearest(0.0, 0.0, k=0) == [] and RegionSpatialIndex([]).nearest(0.0, 0.0) == []
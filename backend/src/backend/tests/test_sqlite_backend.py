@@ -0,0 +1,93 @@
+"""
+Tests du backend SQLite : réglages des connexions, régions (recherche par préfixe, plus
+proches voisins en SQL), mesures écrites puis relues.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from backend.indexes.spatial_index import haversine_km
+from backend.repositories.implementations.sqlite_region_repository import SQLiteRegionRepository
+from backend.repositories.implementations.sqlite_weather_repository import SQLiteWeatherRepository
+
+REGIONS = [
+    {"name": "Paris", "nb_habitants": 2_100_000, "latitude": 48.856614, "longitude": 2.352222},
+    {"name": "Lyon", "nb_habitants": 520_000, "latitude": 45.764043, "longitude": 4.835659},
+    {"name": "Marseille", "nb_habitants": 870_000, "latitude": 43.296482, "longitude": 5.369780},
+    {"name": "Sans position", "nb_habitants": 1},
+]
+
+
+def _run(sqlite_database, steps):
+    async def scenario():
+        await sqlite_database.initialize()
+        try:
+            async with sqlite_database.session_factory() as session:
+                return await steps(session)
+        finally:
+            await sqlite_database.close()
+
+    return asyncio.run(scenario())
+
+
+def test_connections_use_wal_and_the_haversine_function(sqlite_database):
+    async def steps(session):
+        journal = (await session.execute(text("PRAGMA journal_mode"))).scalar_one()
+        distance = (await session.execute(text("SELECT haversine_km(48.856614, 2.352222, 45.764043, 4.835659)"))).scalar_one()
+        return journal, distance
+
+    journal, distance = _run(sqlite_database, steps)
+
+    assert journal == "wal"
+    assert distance == haversine_km(48.856614, 2.352222, 45.764043, 4.835659)
+
+
+def test_region_reads_and_writes(sqlite_database):
+    async def steps(session):
+        repository = SQLiteRegionRepository(session)
+        created = [await repository.create_region(region) for region in REGIONS]
+        watermark = await repository.get_regions_watermark()
+        updated = await repository.update_region(created[1]["id"], {"nb_habitants": 530_000})
+        deleted = await repository.delete_region(created[3]["id"])
+        return (created, watermark, updated, deleted, await repository.search_regions("mar"),
+                await repository.find_nearest_regions(45.0, 4.9, k=5), await repository.get_all_regions(),
+                await repository.get_regions_watermark())
+
+    created, watermark, updated, deleted, search, nearest, regions, watermark_after = _run(sqlite_database, steps)
+
+    assert [region["id"] for region in created] == [1, 2, 3, 4]
+    assert watermark["count"] == 4 and watermark_after["count"] == 3
+    assert updated["nb_habitants"] == 530_000 and deleted is True
+    assert [region["name"] for region in search] == ["Marseille"]
+    assert [region["name"] for region in nearest] == ["Lyon", "Marseille", "Paris"]
+    assert nearest[0]["distance_km"] == round(haversine_km(45.0, 4.9, 45.764043, 4.835659), 3)
+    assert sorted(region["name"] for region in regions) == ["Lyon", "Marseille", "Paris"]
+
+
+def test_weather_written_in_bulk_is_read_back(sqlite_database):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    readings = [
+        {"region_name": name, "temperature": 20.0 + hours, "condition": "Sunny", "humidity": 50,
+         "pressure": 1013.25, "wind_speed": 5.5, "recorded_at": (now - timedelta(hours=hours)).isoformat()}
+        for name in ("Paris", "Lyon") for hours in range(3)
+    ]
+
+    async def steps(session):
+        regions = SQLiteRegionRepository(session)
+        for region in REGIONS[:2]:
+            await regions.create_region(region)
+        repository = SQLiteWeatherRepository(session)
+        inserted = await repository.bulk_create_weather_data(readings)
+        return (inserted, await repository.get_weather_by_region("Paris"),
+                await repository.get_weather_history("Lyon", 1), await repository.get_latest_weather_by_region())
+
+    inserted, paris, lyon_history, latest = _run(sqlite_database, steps)
+
+    assert inserted == 6
+    assert (paris["temperature"], paris["pressure"]) == (20.0, 1013.25)
+    assert [reading["temperature"] for reading in lyon_history] == [20.0, 21.0, 22.0]
+    assert sorted((reading["region_name"], reading["temperature"], reading["latitude"]) for reading in latest) == [
+        ("Lyon", 20.0, 45.764043), ("Paris", 20.0, 48.856614)
+    ]
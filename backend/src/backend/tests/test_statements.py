@@ -0,0 +1,65 @@
+"""
+Tests du registre des instructions SQL : texte compilé stable, instructions de projection
+construites une fois, motifs LIKE échappés, compteurs du cache d'instructions préparées.
+"""
+
+import warnings
+
+from sqlalchemy.dialects import postgresql
+
+from backend.database.prepared_statements import PreparedStatementMonitor
+from backend.database.statements import (
+    HOT_STATEMENTS, LATEST_WEATHER_BY_REGION, like_prefix, weather_by_region_projection
+)
+
+
+def test_latest_weather_uses_distinct_on_without_deprecation():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        sql = str(LATEST_WEATHER_BY_REGION.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("SELECT DISTINCT ON (weather_data.region_name)")
+    assert sql.endswith("ORDER BY weather_data.region_name, weather_data.recorded_at DESC")
+
+
+def test_hot_statements_compile_to_stable_text():
+    for name, statement in HOT_STATEMENTS.items():
+        first = statement.compile(dialect=postgresql.dialect())
+        second = statement.compile(dialect=postgresql.dialect())
+        assert str(first) == str(second), name
+        # Clé de cache de la compilation identique d'un appel à l'autre
+        assert statement._generate_cache_key() == statement._generate_cache_key(), name
+
+
+def test_projection_statements_are_built_once_per_column_set():
+    first = weather_by_region_projection(("temperature", "humidity"))
+
+    assert weather_by_region_projection(("temperature", "humidity")) is first
+    assert weather_by_region_projection(("humidity", "temperature")) is not first
+    sql = " ".join(str(first.compile(dialect=postgresql.dialect())).split())
+    assert sql.startswith("SELECT weather_data.temperature, weather_data.humidity FROM weather_data")
+    assert "%(pattern)s" in sql and "LIMIT" in sql
+
+
+def test_like_prefix_escapes_wildcards():
+    assert like_prefix("Saint") == "Saint%"
+    assert like_prefix("50%_a/b") == "50/%/_a//b%"
+
+
+class _Connection:
+    def __init__(self, cache):
+        self.connection = type("Fairy", (), {"dbapi_connection": type("Dbapi", (), {"_prepared_statement_cache": cache})()})()
+
+
+def test_monitor_counts_statements_already_prepared_on_the_connection():
+    monitor = PreparedStatementMonitor()
+    cached = _Connection({"SELECT 1": object()})
+    uncached = _Connection(None)
+
+    monitor._on_execute(cached, None, "SELECT 1", {}, None, False)
+    monitor._on_execute(cached, None, "SELECT 2", {}, None, False)
+    monitor._on_execute(uncached, None, "SELECT 1", {}, None, False)
+    monitor._on_execute(cached, None, "INSERT", [{}], None, True)
+
+    assert (monitor.hits, monitor.misses) == (1, 2)
+    assert monitor.metrics()["hit_ratio"] == 0.333
@@ -0,0 +1,100 @@
+"""
+Tests du jeu de données synthétique et de son chargement : génération reproductible,
+entrelacement des stations, et chargement en fixtures mock sans base de données.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from backend.simulation.fixtures import MockFixtures
+from backend.simulation.seed import RECORDED_AT, DatasetSeeder, _interleaved, _recent
+from backend.simulation.synthetic import FORECAST_COLUMNS, READING_COLUMNS, SyntheticDataset
+
+END = date(2025, 7, 1)
+
+
+def _dataset(seed=42, **parameters):
+    options = {"regions": 4, "stations": 2, "years": 2 / 365, "interval_minutes": 60, "forecast_days": 3}
+    options.update(parameters)
+    return SyntheticDataset(end=END, seed=seed, **options)
+
+
+def test_invalid_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        _dataset(interval_minutes=7)
+    with pytest.raises(ValueError):
+        _dataset(regions=0)
+
+
+def test_same_seed_gives_the_same_readings_and_forecasts():
+    first, second, other = _dataset(), _dataset(), _dataset(seed=7)
+    region = first.regions()[1]
+
+    assert first.regions() == second.regions()
+    assert list(first.readings(region, 1)) == list(second.readings(region, 1))
+    assert first.forecasts(region) == second.forecasts(region)
+    assert list(first.readings(region, 1)) != list(other.readings(other.regions()[1], 1))
+
+
+def test_readings_cover_the_window_at_the_station_offset():
+    dataset = _dataset()
+    region = dataset.regions()[0]
+
+    readings = list(dataset.readings(region, 1))
+
+    assert dataset.readings_per_station == 48
+    assert dataset.reading_count == 4 * 2 * 48
+    assert all(len(row) == len(READING_COLUMNS) for row in readings)
+    assert {row[0] for row in readings} == {region["name"]}
+    # Deuxième station sur deux : décalée d'une demi-période
+    assert readings[0][RECORDED_AT] == dataset.start + timedelta(minutes=30)
+    assert readings[-1][RECORDED_AT] < dataset.start + timedelta(days=dataset.days)
+    assert all(isinstance(row[1], float) and 5 <= row[3] <= 100 for row in readings)
+
+
+def test_forecasts_start_at_the_end_of_the_history():
+    dataset = _dataset()
+
+    forecasts = dataset.forecasts(dataset.regions()[0])
+
+    assert [row[1] for row in forecasts] == [END, END + timedelta(days=1), END + timedelta(days=2)]
+    assert all(len(row) == len(FORECAST_COLUMNS) and row[3] <= row[5] <= row[4] for row in forecasts)
+
+
+def test_interleaved_alternates_stations_step_by_step():
+    streams = [iter([("a", 1), ("a", 2), ("a", 3)]), iter([("b", 1), ("b", 2), ("b", 3)])]
+
+    assert list(_interleaved(streams, 2)) == [("a", 1), ("b", 1), ("a", 2), ("b", 2)]
+    # Les itérateurs reprennent où le jour précédent s'est arrêté
+    assert list(_interleaved(streams, 2)) == [("a", 3), ("b", 3)]
+
+
+def test_recent_keeps_rows_after_start_and_passes_everything_through():
+    dataset = _dataset(stations=1)
+    region = dataset.regions()[0]
+    start = dataset.start + timedelta(days=1)
+    kept = []
+
+    passed = list(_recent(dataset.readings(region, 0), start, kept))
+
+    assert len(passed) == dataset.readings_per_station
+    assert kept == [row for row in passed if row[RECORDED_AT] >= start]
+    assert len(kept) == 24
+
+
+def test_seed_without_database_writes_fixtures(tmp_path):
+    dataset = _dataset()
+    seeder = DatasetSeeder(dataset, workers=1)
+
+    counts = asyncio.run(seeder.seed(str(tmp_path), fixture_days=1))
+    fixtures = MockFixtures.load(str(tmp_path))
+
+    assert counts == {"regions": 4, "readings": dataset.reading_count, "forecasts": 4 * 3}
+    assert "readings" in seeder.timings and "fixtures" in seeder.timings
+    assert len(fixtures.regions) == 4 and len(fixtures.forecasts) == 12
+    # Un jour de mesures gardé par station, la plus récente en tête de chaque historique
+    assert sum(len(history) for history in fixtures.history.values()) == 4 * 2 * 24
+    latest = fixtures.latest[dataset.regions()[0]["name"]]
+    assert latest["recorded_at"] == (dataset.start + timedelta(days=2) - timedelta(minutes=30)).isoformat()
@@ -0,0 +1,110 @@
+"""
+Tests de l'archive Parquet : écriture d'un mois, relecture filtrée d'une région, fusion
+par id, puis historique à cheval sur la limite de l'archive et la base.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pyarrow = pytest.importorskip("pyarrow")
+
+from backend.archive.weather_archive import ARCHIVE_COLUMNS, WeatherArchive, add_months, column_values, month_start
+from backend.repositories.implementations.archived_weather_repository import ArchivedWeatherRepository
+from backend.repositories.interfaces import weather_history_rows
+
+# Mois archivé : trois mois avant le mois en cours, la limite tombe donc deux mois avant
+MONTH = add_months(month_start(datetime.now(timezone.utc)), -3)
+BOUNDARY = add_months(MONTH, 1)
+
+
+def _row(row_id, region_name, moment, temperature=20.0):
+    return (row_id, region_name, temperature, "Sunny", 50, 1013.0, 5.0, "N", moment)
+
+
+def _archive(tmp_path, rows, row_group_size=4):
+    archive = WeatherArchive(str(tmp_path / "archive"), row_group_size=row_group_size)
+    temporary = archive.temporary_path(MONTH)
+    writer = archive.writer(temporary)
+    ordered = sorted(rows, key=lambda row: (row[1], row[-1]))
+    for position in range(0, len(ordered), row_group_size):
+        writer.write_batch(archive.batch(ordered[position:position + row_group_size]))
+    writer.close()
+    archive.publish(temporary, MONTH)
+    return archive
+
+
+def test_read_history_keeps_one_region_and_the_period(tmp_path):
+    rows = [_row(index, region, MONTH + timedelta(days=day), temperature=day)
+            for index, (region, day) in enumerate((region, day) for region in ("Lyon", "Paris", "Parisis")
+                                                   for day in range(10))]
+    archive = _archive(tmp_path, rows)
+
+    table = archive.read_history("Paris", MONTH + timedelta(days=2), MONTH + timedelta(days=5))
+
+    assert archive.months() == [MONTH] and archive.boundary() == BOUNDARY
+    assert table.column_names == list(ARCHIVE_COLUMNS)
+    assert set(table.column("region_name").to_pylist()) == {"Paris"}
+    assert column_values(table.column("temperature")) == [4.0, 3.0, 2.0]
+    assert column_values(table.column("recorded_at"))[0] == MONTH + timedelta(days=4)
+    # Aucun fichier pour la période : table vide au même schéma
+    assert archive.read_history("Paris", BOUNDARY, add_months(BOUNDARY, 1), ("region_name",)).num_rows == 0
+    assert not [name for name in os.listdir(archive.directory) if name.endswith(".tmp")]
+
+
+def test_merge_replaces_rows_of_the_same_id(tmp_path):
+    archive = _archive(tmp_path, [_row(1, "Paris", MONTH), _row(2, "Paris", MONTH + timedelta(hours=1))])
+
+    merged = archive.merge(archive.read_month(MONTH), [archive.batch([
+        _row(2, "Paris", MONTH + timedelta(hours=1), temperature=30.0), _row(3, "Lyon", MONTH)
+    ])])
+
+    assert merged.column("id").to_pylist() == [3, 1, 2]
+    assert merged.column("temperature").to_pylist() == [20.0, 20.0, 30.0]
+
+
+class _DatabaseHistory:
+    """Historique de la base : recherche partielle, comme `ILIKE '%nom%'`"""
+
+    def __init__(self, readings):
+        self.readings = readings
+
+    async def get_weather_history(self, region_name, days=7):
+        return [dict(reading) for reading in self.readings if region_name.lower() in reading["region_name"].lower()]
+
+    async def get_weather_history_rows(self, region_name, days=7):
+        return weather_history_rows(await self.get_weather_history(region_name, days))
+
+
+def _reading(region_name, moment, temperature):
+    return {"region_name": region_name, "temperature": temperature, "condition": "Sunny", "humidity": 50,
+            "pressure": 1013.0, "wind_speed": 5.0, "wind_direction": "N", "recorded_at": moment.isoformat()}
+
+
+def test_history_merges_database_and_archive_at_the_boundary(tmp_path):
+    archive = _archive(tmp_path, [_row(1, "Paris", MONTH + timedelta(days=1), temperature=1.0),
+                                  _row(2, "Parisis", MONTH + timedelta(days=1), temperature=2.0)])
+    database = _DatabaseHistory([
+        _reading("Paris", BOUNDARY + timedelta(days=1), 10.0),
+        _reading("Paris", BOUNDARY, 11.0),
+        # Antérieure à la limite : déjà (ou bientôt) dans le fichier du mois
+        _reading("Paris", BOUNDARY - timedelta(seconds=1), 12.0),
+        _reading("Parisis", BOUNDARY + timedelta(days=1), 13.0),
+    ])
+    repository = ArchivedWeatherRepository(database, archive)
+
+    async def scenario():
+        return (await repository.get_weather_history("Paris", 150), await repository.get_weather_history_rows("Paris", 150),
+                await repository.get_weather_history("Paris", 1), await repository.get_weather_history("Pari", 150))
+
+    readings, rows, recent_only, partial = asyncio.run(scenario())
+
+    assert [reading["temperature"] for reading in readings] == [10.0, 11.0, 1.0]
+    assert readings[-1]["recorded_at"] == (MONTH + timedelta(days=1)).isoformat()
+    assert [row[1] for row in rows.rows] == [10.0, 11.0, 1.0]
+    assert {row[0] for row in rows.rows} == {"Paris"}
+    # Période hors de l'archive : même règle de nom exact sur la base
+    assert [reading["region_name"] for reading in recent_only] == ["Paris", "Paris", "Paris"]
+    assert partial == []
@@ -0,0 +1,47 @@
+"""
+Tests de la série de prévisions : seules les prévisions présentes en base sont servies.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+from backend.repositories.implementations.sqlite_weather_repository import SQLiteWeatherRepository
+from backend.services.implementation.weather_service_injector import WeatherService
+
+
+def _series(sqlite_database, region_name: str, days: int, forecasts=()):
+    async def scenario():
+        await sqlite_database.initialize()
+        try:
+            async with sqlite_database.session_factory() as session:
+                repository = SQLiteWeatherRepository(session)
+                await repository.upsert_forecasts(list(forecasts))
+                return await WeatherService(repository).get_weather_forecast_series(region_name, days)
+        finally:
+            await sqlite_database.close()
+
+    return asyncio.run(scenario())
+
+
+def test_unknown_region_gets_an_empty_series(sqlite_database):
+    series = _series(sqlite_database, "Atlantis", 3)
+
+    assert series.region == "Atlantis"
+    assert series.days == 0
+    assert series.forecasts == []
+    assert series.stale is False
+
+
+def test_series_contains_only_stored_days(sqlite_database):
+    tomorrow = date.today() + timedelta(days=1)
+    forecasts = [
+        {"region_name": "Paris", "forecast_date": (tomorrow + timedelta(days=offset)).isoformat(),
+         "temperature_min": 14.0 + offset, "temperature_max": 25.0, "condition": "Sunny", "humidity": 55}
+        for offset in range(2)
+    ]
+
+    series = _series(sqlite_database, "Paris", 5, forecasts)
+
+    assert series.days == 2
+    assert [forecast.forecast_date for forecast in series.forecasts] == [tomorrow, tomorrow + timedelta(days=1)]
+    assert [forecast.temperature_min for forecast in series.forecasts] == [14.0, 15.0]
@@ -0,0 +1,114 @@
+"""
+Tests de la diffusion des mesures : fusion par région, tampon borné des abonnés,
+publication après écriture, puis événements SSE du flux.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.controllers import weather_info_controller
+from backend.repositories.implementations.notifying_weather_repository import NotifyingWeatherRepository
+from backend.services.schemas.weather_resp_schema import WeatherResponse
+from backend.streaming.weather_hub import TooManySubscribersError, WeatherHub
+
+
+def _reading(region_name, temperature):
+    return {"region_name": region_name, "temperature": temperature, "condition": "Sunny", "humidity": 50}
+
+
+def test_readings_of_a_region_are_coalesced():
+    async def scenario():
+        hub = WeatherHub(coalesce_seconds=0.01)
+        with hub.subscribe("ile de france") as subscription, hub.subscribe("Lyon") as other:
+            hub.publish(_reading("Île-de-France", 20.0))
+            hub.publish(_reading("ÎLE-DE-FRANCE", 21.0))
+            hub.publish(_reading("Marseille", 30.0))
+            received = await subscription.next(timeout=1)
+            nothing = await subscription.next(timeout=0.05)
+            other_nothing = await other.next(timeout=0.01)
+        return hub, received, nothing, other_nothing
+
+    hub, received, nothing, other_nothing = asyncio.run(scenario())
+    assert received["temperature"] == 21.0
+    assert nothing is None and other_nothing is None
+    assert hub.metrics() == {"subscribers": 0, "regions": 0, "published": 2, "coalesced": 1, "delivered": 1}
+
+
+def test_slow_subscriber_keeps_the_latest_readings():
+    async def scenario():
+        hub = WeatherHub(coalesce_seconds=0, buffer_size=2)
+        subscription = hub.subscribe("Paris")
+        for temperature in range(5):
+            hub.publish(_reading("Paris", float(temperature)))
+            await asyncio.sleep(0.001)
+        return subscription, [await subscription.next(timeout=0.01) for _ in range(3)]
+
+    subscription, received = asyncio.run(scenario())
+    assert [reading and reading["temperature"] for reading in received] == [3.0, 4.0, None]
+    assert subscription.dropped == 3
+
+
+def test_subscriber_limit_and_shared_feed():
+    hub = WeatherHub(max_subscribers=1)
+    first = hub.subscribe("Paris")
+    with pytest.raises(TooManySubscribersError):
+        hub.subscribe("Lyon")
+    first.close()
+    first.close()
+    hub.subscribe("Lyon")
+    # Notifications de la base actives : la publication locale est ignorée
+    hub.attach_shared_feed(lambda: True)
+    hub.publish_local(_reading("Lyon", 10.0))
+
+    assert hub.subscriber_count == 1 and hub.published == 0
+
+
+class _Storage:
+    async def bulk_create_weather_data(self, weather_records):
+        return len(weather_records)
+
+    async def create_weather_data(self, weather_data):
+        # Écriture en échec : le repository retourne un dictionnaire vide
+        return {}
+
+
+def test_written_readings_reach_subscribers():
+    async def scenario():
+        hub = WeatherHub(coalesce_seconds=0)
+        repository = NotifyingWeatherRepository(_Storage(), hub)
+        with hub.subscribe("Paris") as subscription:
+            await repository.create_weather_data(_reading("Paris", 1.0))
+            await repository.bulk_create_weather_data([
+                _reading("Paris", 2.0), {**_reading("Paris", 3.0), "is_forecast": True}
+            ])
+            return await subscription.next(timeout=1), await subscription.next(timeout=0.01)
+
+    received, nothing = asyncio.run(scenario())
+    assert received["temperature"] == 2.0 and nothing is None
+
+
+def test_stream_sends_current_weather_then_updates_and_keepalives(monkeypatch):
+    monkeypatch.setattr(weather_info_controller, "STREAM_KEEPALIVE_SECONDS", 0.01)
+    current = WeatherResponse(region="Paris", temperature=20.0, condition="Sunny", humidity=50)
+
+    async def scenario():
+        hub = WeatherHub(coalesce_seconds=0)
+        events = weather_info_controller._weather_events(current, hub.subscribe("Paris"))
+        received = [await anext(events)]
+        hub.publish({"region_name": "Paris", "temperature": 22.0, "condition": None, "humidity": 40})
+        received += [await anext(events), await anext(events)]
+        await events.aclose()
+        return hub, received
+
+    hub, received = asyncio.run(scenario())
+    first, update, keepalive = received
+    assert first.startswith("retry: 5000\nevent: weather\ndata: ")
+    assert json.loads(first.split("data: ", 1)[1])["temperature"] == 20.0
+    assert json.loads(update.split("data: ", 1)[1]) == {
+        "region": "Paris", "temperature": 22.0, "condition": "Unknown", "humidity": 40, "stale": False
+    }
+    assert keepalive == ": keepalive\n\n"
+    # Flux fermé : abonnement retiré
+    assert hub.subscriber_count == 0
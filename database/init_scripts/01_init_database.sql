@@ -20,11 +20,11 @@ CREATE TABLE IF NOT EXISTS regions (
 CREATE TABLE IF NOT EXISTS weather_data (
     id SERIAL PRIMARY KEY,
     region_name VARCHAR(100) NOT NULL,
-    temperature DECIMAL(5,2) NOT NULL,
+    temperature DOUBLE PRECISION NOT NULL,
     condition VARCHAR(100) NOT NULL,
     humidity INTEGER NOT NULL CHECK (humidity >= 0 AND humidity <= 100),
-    pressure DECIMAL(6,2),
-    wind_speed DECIMAL(5,2),
+    pressure DOUBLE PRECISION,
+    wind_speed DOUBLE PRECISION,
     wind_direction VARCHAR(3),
     recorded_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     is_forecast BOOLEAN DEFAULT FALSE,
@@ -37,22 +37,25 @@ CREATE TABLE IF NOT EXISTS weather_forecasts (
     region_name VARCHAR(100) NOT NULL,
     forecast_date DATE NOT NULL,
     day_name VARCHAR(20) NOT NULL,
-    temperature_min DECIMAL(5,2),
-    temperature_max DECIMAL(5,2),
-    temperature_avg DECIMAL(5,2),
+    temperature_min DOUBLE PRECISION,
+    temperature_max DOUBLE PRECISION,
+    temperature_avg DOUBLE PRECISION,
     condition VARCHAR(100) NOT NULL,
     humidity INTEGER NOT NULL CHECK (humidity >= 0 AND humidity <= 100),
-    pressure DECIMAL(6,2),
-    wind_speed DECIMAL(5,2),
+    pressure DOUBLE PRECISION,
+    wind_speed DOUBLE PRECISION,
     wind_direction VARCHAR(3),
     precipitation_probability INTEGER DEFAULT 0 CHECK (precipitation_probability >= 0 AND precipitation_probability <= 100),
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    -- Une prévision par région et par jour (cible des upserts ON CONFLICT)
+    CONSTRAINT uq_weather_forecasts_region_date UNIQUE (region_name, forecast_date)
 );
 
 -- Index pour améliorer les performances
 CREATE INDEX IF NOT EXISTS idx_regions_name ON regions(name);
 CREATE INDEX IF NOT EXISTS idx_weather_data_region_name ON weather_data(region_name);
 CREATE INDEX IF NOT EXISTS idx_weather_data_recorded_at ON weather_data(recorded_at);
+CREATE INDEX IF NOT EXISTS idx_weather_data_region_recorded_at ON weather_data(region_name, recorded_at DESC) WHERE is_forecast = FALSE;
 CREATE INDEX IF NOT EXISTS idx_weather_forecasts_region_name ON weather_forecasts(region_name);
 CREATE INDEX IF NOT EXISTS idx_weather_forecasts_date ON weather_forecasts(forecast_date);
 
@@ -104,4 +107,84 @@ CREATE TRIGGER update_regions_updated_at
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Notifications des modifications (LISTEN/NOTIFY) pour l'invalidation des caches des workers
+-- (copie de migrations/003_cache_invalidation_notify.sql, que init_database exécute : les garder identiques)
+-- regions : identifiants des lignes modifiées
+CREATE OR REPLACE FUNCTION notify_regions_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('cache_invalidation', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', TG_OP,
+                'sent_at', extract(epoch FROM clock_timestamp()),
+                'keys', json_agg(id))::text)
+    FROM (SELECT id, (row_number() OVER () - 1) / 500 AS page FROM changed_rows) numbered
+    GROUP BY page;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- weather_data : dernière mesure de chaque région modifiée (diffusée aux flux SSE des autres workers)
+CREATE OR REPLACE FUNCTION notify_weather_data_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('cache_invalidation', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', TG_OP,
+                'sent_at', extract(epoch FROM clock_timestamp()),
+                'keys', json_agg(region_name),
+                'rows', json_agg(json_build_object(
+                    'region_name', region_name,
+                    'temperature', temperature,
+                    'condition', condition,
+                    'humidity', humidity,
+                    'recorded_at', recorded_at,
+                    'is_forecast', is_forecast)))::text)
+    FROM (SELECT latest.*, (row_number() OVER () - 1) / 15 AS page
+          FROM (SELECT DISTINCT ON (region_name) region_name, temperature, condition, humidity, recorded_at, is_forecast
+                FROM changed_rows
+                ORDER BY region_name, recorded_at DESC) latest) numbered
+    GROUP BY page;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- weather_forecasts : régions dont les prévisions ont changé
+CREATE OR REPLACE FUNCTION notify_weather_forecasts_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('cache_invalidation', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', TG_OP,
+                'sent_at', extract(epoch FROM clock_timestamp()),
+                'keys', json_agg(region_name))::text)
+    FROM (SELECT region_name, (row_number() OVER () - 1) / 50 AS page
+          FROM (SELECT DISTINCT region_name FROM changed_rows) regions) numbered
+    GROUP BY page;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Une table de transition par déclencheur : un déclencheur par opération
+CREATE TRIGGER regions_notify_insert AFTER INSERT ON regions
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_regions_change();
+CREATE TRIGGER regions_notify_update AFTER UPDATE ON regions
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_regions_change();
+CREATE TRIGGER regions_notify_delete AFTER DELETE ON regions
+    REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_regions_change();
+
+CREATE TRIGGER weather_data_notify_insert AFTER INSERT ON weather_data
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_data_change();
+CREATE TRIGGER weather_data_notify_update AFTER UPDATE ON weather_data
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_data_change();
+CREATE TRIGGER weather_data_notify_delete AFTER DELETE ON weather_data
+    REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_data_change();
+
+CREATE TRIGGER weather_forecasts_notify_insert AFTER INSERT ON weather_forecasts
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_forecasts_change();
+CREATE TRIGGER weather_forecasts_notify_update AFTER UPDATE ON weather_forecasts
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_forecasts_change();
+CREATE TRIGGER weather_forecasts_notify_delete AFTER DELETE ON weather_forecasts
+    REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_forecasts_change();
+
 COMMIT;
@@ -0,0 +1,7 @@
+-- Migration 001 : index composite pour « dernière mesure par région »
+-- Sert DISTINCT ON (region_name) ... ORDER BY region_name, recorded_at DESC
+-- (interpolation spatiale) et get_weather_by_region sans tri supplémentaire.
+
+CREATE INDEX IF NOT EXISTS idx_weather_data_region_recorded_at
+    ON weather_data (region_name, recorded_at DESC)
+    WHERE is_forecast = FALSE;
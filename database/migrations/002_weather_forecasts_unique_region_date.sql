@@ -0,0 +1,19 @@
+-- Migration 002 : une seule prévision par (region_name, forecast_date)
+-- Cible des upserts INSERT ... ON CONFLICT ... DO UPDATE : rafraîchir les
+-- prévisions met à jour les lignes existantes au lieu d'en ajouter.
+-- L'index unique remplace aussi la recherche par région : la lecture des N
+-- prochains jours d'une région devient un parcours de plage de l'index.
+
+BEGIN;
+
+-- Conserver la prévision la plus récente (id le plus grand) de chaque doublon
+DELETE FROM weather_forecasts older
+    USING weather_forecasts newer
+    WHERE older.region_name = newer.region_name
+      AND older.forecast_date = newer.forecast_date
+      AND older.id < newer.id;
+
+ALTER TABLE weather_forecasts
+    ADD CONSTRAINT uq_weather_forecasts_region_date UNIQUE (region_name, forecast_date);
+
+COMMIT;
@@ -0,0 +1,97 @@
+-- Migration 003 : notifications des modifications (LISTEN/NOTIFY) pour l'invalidation des caches
+-- Chaque worker écoute le canal « cache_invalidation » et invalide ses caches locaux.
+-- Déclencheurs par instruction (tables de transition) : un lot de 10 000 mesures produit
+-- quelques notifications, pas 10 000. Les charges utiles sont découpées en pages pour
+-- rester sous la limite de 8 000 octets de NOTIFY. Les notifications ne sont délivrées
+-- qu'au COMMIT, et pas du tout en cas de ROLLBACK.
+
+BEGIN;
+
+-- regions : identifiants des lignes modifiées
+CREATE OR REPLACE FUNCTION notify_regions_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('cache_invalidation', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', TG_OP,
+                'sent_at', extract(epoch FROM clock_timestamp()),
+                'keys', json_agg(id))::text)
+    FROM (SELECT id, (row_number() OVER () - 1) / 500 AS page FROM changed_rows) numbered
+    GROUP BY page;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- weather_data : dernière mesure de chaque région modifiée (diffusée aux flux SSE des autres workers)
+CREATE OR REPLACE FUNCTION notify_weather_data_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('cache_invalidation', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', TG_OP,
+                'sent_at', extract(epoch FROM clock_timestamp()),
+                'keys', json_agg(region_name),
+                'rows', json_agg(json_build_object(
+                    'region_name', region_name,
+                    'temperature', temperature,
+                    'condition', condition,
+                    'humidity', humidity,
+                    'recorded_at', recorded_at,
+                    'is_forecast', is_forecast)))::text)
+    FROM (SELECT latest.*, (row_number() OVER () - 1) / 15 AS page
+          FROM (SELECT DISTINCT ON (region_name) region_name, temperature, condition, humidity, recorded_at, is_forecast
+                FROM changed_rows
+                ORDER BY region_name, recorded_at DESC) latest) numbered
+    GROUP BY page;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- weather_forecasts : régions dont les prévisions ont changé
+CREATE OR REPLACE FUNCTION notify_weather_forecasts_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('cache_invalidation', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', TG_OP,
+                'sent_at', extract(epoch FROM clock_timestamp()),
+                'keys', json_agg(region_name))::text)
+    FROM (SELECT region_name, (row_number() OVER () - 1) / 50 AS page
+          FROM (SELECT DISTINCT region_name FROM changed_rows) regions) numbered
+    GROUP BY page;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Une table de transition par déclencheur : un déclencheur par opération
+DROP TRIGGER IF EXISTS regions_notify_insert ON regions;
+DROP TRIGGER IF EXISTS regions_notify_update ON regions;
+DROP TRIGGER IF EXISTS regions_notify_delete ON regions;
+CREATE TRIGGER regions_notify_insert AFTER INSERT ON regions
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_regions_change();
+CREATE TRIGGER regions_notify_update AFTER UPDATE ON regions
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_regions_change();
+CREATE TRIGGER regions_notify_delete AFTER DELETE ON regions
+    REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_regions_change();
+
+DROP TRIGGER IF EXISTS weather_data_notify_insert ON weather_data;
+DROP TRIGGER IF EXISTS weather_data_notify_update ON weather_data;
+DROP TRIGGER IF EXISTS weather_data_notify_delete ON weather_data;
+CREATE TRIGGER weather_data_notify_insert AFTER INSERT ON weather_data
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_data_change();
+CREATE TRIGGER weather_data_notify_update AFTER UPDATE ON weather_data
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_data_change();
+CREATE TRIGGER weather_data_notify_delete AFTER DELETE ON weather_data
+    REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_data_change();
+
+DROP TRIGGER IF EXISTS weather_forecasts_notify_insert ON weather_forecasts;
+DROP TRIGGER IF EXISTS weather_forecasts_notify_update ON weather_forecasts;
+DROP TRIGGER IF EXISTS weather_forecasts_notify_delete ON weather_forecasts;
+CREATE TRIGGER weather_forecasts_notify_insert AFTER INSERT ON weather_forecasts
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_forecasts_change();
+CREATE TRIGGER weather_forecasts_notify_update AFTER UPDATE ON weather_forecasts
+    REFERENCING NEW TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_forecasts_change();
+CREATE TRIGGER weather_forecasts_notify_delete AFTER DELETE ON weather_forecasts
+    REFERENCING OLD TABLE AS changed_rows FOR EACH STATEMENT EXECUTE FUNCTION notify_weather_forecasts_change();
+
+COMMIT;
@@ -0,0 +1,26 @@
+-- Migration 004 : mesures (température, pression, vent) en double precision plutôt qu'en NUMERIC
+-- asyncpg décode double precision directement en float Python ; NUMERIC passait par un Decimal
+-- par valeur, puis par float() dans to_dict(). Les valeurs existantes (deux décimales) sont
+-- converties exactement à l'affichage (20.35 reste 20.35).
+--
+-- Le code fonctionne avant et après la migration (colonnes Double côté SQLAlchemy, converties
+-- selon le type réel de la colonne) : déployer le code d'abord, migrer ensuite.
+-- ALTER COLUMN TYPE réécrit chaque table et ses index sous verrou exclusif (lectures et
+-- écritures bloquées) : 3 s pour 500 000 lignes de weather_data en local, à prévoir
+-- dans une fenêtre de maintenance sur les grosses tables.
+
+BEGIN;
+
+ALTER TABLE weather_data
+    ALTER COLUMN temperature TYPE double precision,
+    ALTER COLUMN pressure TYPE double precision,
+    ALTER COLUMN wind_speed TYPE double precision;
+
+ALTER TABLE weather_forecasts
+    ALTER COLUMN temperature_min TYPE double precision,
+    ALTER COLUMN temperature_max TYPE double precision,
+    ALTER COLUMN temperature_avg TYPE double precision,
+    ALTER COLUMN pressure TYPE double precision,
+    ALTER COLUMN wind_speed TYPE double precision;
+
+COMMIT;
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { WeatherController } from '../controllers/weather_service_controller';
-import { WeatherInfo, WeatherForecast } from '../services/schemas/weather_resp_schema';
+import { WeatherInfo, WeatherForecastSeries } from '../services/schemas/weather_resp_schema';
 
 interface WeatherDisplayProps {
     region: string;
@@ -9,7 +9,7 @@ interface WeatherDisplayProps {
 export const WeatherDisplay: React.FC<WeatherDisplayProps> = ({ region }) => {
     const weatherService = WeatherController();
     const [weather, setWeather] = useState<WeatherInfo | null>(null);
-    const [forecast, setForecast] = useState<WeatherForecast | null>(null);
+    const [forecast, setForecast] = useState<WeatherForecastSeries | null>(null);
     const [error, setError] = useState<string | null>(null);
 
     useEffect(() => {
@@ -17,7 +17,7 @@ export const WeatherDisplay: React.FC<WeatherDisplayProps> = ({ region }) => {
             try {
                 const [currentWeather, forecastData] = await Promise.all([
                     weatherService.get_current_weather(region),
-                    weatherService.get_weather_forecast(region, 5)
+                    weatherService.get_weather_forecast_series(region, 5)
                 ]);
                 setWeather(currentWeather);
                 setForecast(forecastData);
@@ -27,6 +27,8 @@ export const WeatherDisplay: React.FC<WeatherDisplayProps> = ({ region }) => {
         };
 
         fetchData();
+        // Mises à jour poussées par le serveur au lieu de relire /weather/{region}
+        return weatherService.subscribe_current_weather(region, setWeather);
     }, [region]);
 
     if (error) return <div className="error">{error}</div>;
@@ -44,10 +46,15 @@ export const WeatherDisplay: React.FC<WeatherDisplayProps> = ({ region }) => {
             </div>
             <div className="forecast">
                 <h3>Forecast</h3>
-                <p>Temperature: {forecast.temperature}°C</p>
-                <p>Condition: {forecast.condition}</p>
-                <p>Humidity: {forecast.humidity}%</p>
-                <p>Day: {forecast.day}</p>
+                {forecast.forecasts.map((day) => (
+                    <div key={day.forecast_date} className="forecast-day">
+                        <p>Day: {day.day} ({day.forecast_date})</p>
+                        <p>Temperature: {day.temperature_min}°C / {day.temperature_max}°C</p>
+                        <p>Condition: {day.condition}</p>
+                        <p>Humidity: {day.humidity}%</p>
+                        <p>Precipitation: {day.precipitation_probability}%</p>
+                    </div>
+                ))}
             </div>
         </div>
     );
@@ -16,6 +16,15 @@ export class RegionInfoService1 implements IRegionService {
         }
         return response.json();
     }
+
+    async search_regions(query: string, limit: number = 10): Promise<RegionInfo[]> {
+        const params = new URLSearchParams({ q: query, limit: String(limit) });
+        const response = await fetch(`${this.baseUrl}/regions/search?${params}`);
+        if (!response.ok) {
+            throw new Error('Failed to call backend');
+        }
+        return response.json();
+    }
 }
 
 
@@ -29,4 +38,13 @@ export class RegionInfoServiceMock implements IRegionService {
             language: "English"
         };
     }
+
+    async search_regions(query: string, limit: number = 10): Promise<RegionInfo[]> {
+        return [{
+            id: 1,
+            name: `Mock ${query}`,
+            nb_habitants: 1000000,
+            language: "English"
+        }].slice(0, limit);
+    }
 }
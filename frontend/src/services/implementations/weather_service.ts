@@ -1,5 +1,5 @@
 import { IWeatherService } from '../interfaces/Iweather_service';
-import { WeatherForecast, WeatherInfo } from '../schemas/weather_resp_schema';
+import { WeatherForecast, WeatherForecastSeries, WeatherInfo } from '../schemas/weather_resp_schema';
 
 export class WeatherService implements IWeatherService {
     private baseUrl: string;
@@ -24,6 +24,24 @@ export class WeatherService implements IWeatherService {
         }
         return response.json();
     }
+
+    async get_weather_forecast_series(region: string, days: number): Promise<WeatherForecastSeries> {
+        const params = new URLSearchParams({ days: String(days) });
+        const response = await fetch(`${this.baseUrl}/weather/forecast/${region}/series?${params}`);
+        if (!response.ok) {
+            throw new Error('Failed to call backend');
+        }
+        return response.json();
+    }
+
+    subscribe_current_weather(region: string, on_update: (weather: WeatherInfo) => void): () => void {
+        // Le navigateur se reconnecte seul après une coupure (délai `retry` envoyé par le serveur)
+        const source = new EventSource(`${this.baseUrl}/weather/${encodeURIComponent(region)}/stream`);
+        source.addEventListener('weather', (event) => {
+            on_update(JSON.parse((event as MessageEvent).data));
+        });
+        return () => source.close();
+    }
 }
 
 export class WeatherService1 implements IWeatherService {
@@ -50,4 +68,17 @@ export class WeatherService1 implements IWeatherService {
         }
         return response.json();
     }
-}
\ No newline at end of file
+
+    async get_weather_forecast_series(region: string, days: number): Promise<WeatherForecastSeries> {
+        const params = new URLSearchParams({ days: String(days) });
+        const response = await fetch(`${this.baseUrl}/weather/forecast/${region}/series?${params}`);
+        if (!response.ok) {
+            throw new Error('Failed to call backend');
+        }
+        return response.json();
+    }
+
+    subscribe_current_weather(region: string, on_update: (weather: WeatherInfo) => void): () => void {
+        return () => {};
+    }
+}
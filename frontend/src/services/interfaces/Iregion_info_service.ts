@@ -2,5 +2,6 @@ import { RegionInfo } from "../schemas/region_resp_schema";
 
 export interface IRegionService {
     get_region_info(region_id: number): Promise<RegionInfo>;
+    search_regions(query: string, limit?: number): Promise<RegionInfo[]>;
 }
 
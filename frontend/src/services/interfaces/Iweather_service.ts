@@ -1,7 +1,10 @@
-import { WeatherForecast, WeatherInfo } from "../schemas/weather_resp_schema";
+import { WeatherForecast, WeatherForecastSeries, WeatherInfo } from "../schemas/weather_resp_schema";
 
 
 export interface IWeatherService {
     get_current_weather(region: string): Promise<WeatherInfo>;
     get_weather_forecast(region: string, days: number): Promise<WeatherForecast>;
+    get_weather_forecast_series(region: string, days: number): Promise<WeatherForecastSeries>;
+    // Abonnement aux nouvelles mesures (flux SSE) ; retourne la fonction de désabonnement
+    subscribe_current_weather(region: string, on_update: (weather: WeatherInfo) => void): () => void;
 }
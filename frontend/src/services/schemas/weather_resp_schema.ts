@@ -3,8 +3,29 @@ export interface WeatherInfo {
     temperature: number;
     condition: string;
     humidity: number;
+    stale?: boolean;
 }
 
 export interface WeatherForecast extends WeatherInfo {
-    day: number;
+    day: string;
+}
+
+export interface ForecastDay {
+    forecast_date: string;
+    day: string;
+    temperature_min: number | null;
+    temperature_max: number | null;
+    temperature_avg: number | null;
+    condition: string;
+    humidity: number;
+    pressure: number | null;
+    wind_speed: number | null;
+    wind_direction: string | null;
+    precipitation_probability: number;
+}
+
+export interface WeatherForecastSeries {
+    region: string;
+    days: number;
+    forecasts: ForecastDay[];
 }
\ No newline at end of file